@@ -0,0 +1,53 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#include <pybind11/pybind11.h>
+#include "oneflow/api/python/of_api_registry.h"
+#include "oneflow/core/ep/cpu/cpu_device.h"
+#include "oneflow/core/ep/include/device_manager_registry.h"
+
+namespace py = pybind11;
+
+namespace oneflow {
+
+namespace {
+
+Maybe<ep::CpuDevice*> GetCpuDevice() {
+  auto* registry = Global<ep::DeviceManagerRegistry>::Get();
+  CHECK_NOTNULL_OR_RETURN(registry) << "the environment is not initialized";
+  // The cpu device is held by its device manager, which lives as long as the registry
+  auto device = registry->GetDevice(DeviceType::kCPU, 0);
+  auto* cpu_device = dynamic_cast<ep::CpuDevice*>(device.get());
+  CHECK_NOTNULL_OR_RETURN(cpu_device);
+  return cpu_device;
+}
+
+Maybe<void> SetCpuNumThreads(int64_t num_threads) {
+  CHECK_GE_OR_RETURN(num_threads, 0) << "num_threads should be non-negative";
+  JUST(GetCpuDevice())->SetNumThreads(num_threads);
+  return Maybe<void>::Ok();
+}
+
+Maybe<int64_t> GetCpuNumThreads() { return JUST(GetCpuDevice())->GetNumThreads(); }
+
+}  // namespace
+
+ONEFLOW_API_PYBIND11_MODULE("", m) {
+  m.def("SetCpuNumThreads",
+        [](int64_t num_threads) { return SetCpuNumThreads(num_threads).GetOrThrow(); });
+  m.def("GetCpuNumThreads", []() { return GetCpuNumThreads().GetOrThrow(); });
+}
+
+}  // namespace oneflow
@@ -22,6 +22,17 @@ namespace py = pybind11;
 
 namespace oneflow {
 
+ONEFLOW_API_PYBIND11_MODULE("eager", m) {
+  py::class_<EagerCapture, std::shared_ptr<EagerCapture>>(m, "EagerCapture")
+      .def(py::init<>())
+      .def_property_readonly("capturing", &EagerCapture::capturing)
+      .def_property_readonly("num_instructions", &EagerCapture::num_instructions)
+      .def("begin", [](EagerCapture* self) { return self->Begin().GetOrThrow(); })
+      .def("end", [](EagerCapture* self) { return self->End().GetOrThrow(); })
+      .def("replay", [](const EagerCapture* self) { return self->Replay().GetOrThrow(); })
+      .def("reset", &EagerCapture::Reset);
+}
+
 namespace debug {
 
 ONEFLOW_API_PYBIND11_MODULE("debug", m) {
@@ -24,6 +24,7 @@ limitations under the License.
 #include "oneflow/core/register/blob.h"
 #include "oneflow/core/job/job.pb.h"
 #include "oneflow/core/job/job_ir.h"
+#include "oneflow/core/job/plan_util.h"
 
 namespace py = pybind11;
 
@@ -52,6 +53,7 @@ ONEFLOW_API_PYBIND11_MODULE("nn.graph.", m) {
              return graph.RegisterVariableOpNamesAndTensors(variable_op_names, variable_tensors)
                  .GetOrThrow();
            })
+      .def("set_plan_cache_dir", &NNGraph::set_plan_cache_dir)
       .def("complie_and_init_runtime",
            [](NNGraph& graph) { return graph.CompileAndInitRuntime().GetOrThrow(); });
 
@@ -77,6 +79,21 @@ ONEFLOW_API_PYBIND11_MODULE("nn.graph.", m) {
     LoadJobFromIR(&job, path).GetOrThrow();
     return py::bytes(job.SerializeAsString());
   });
+  m.def("GenSerializedPlansForRanks",
+        [](const py::bytes& serialized_plan, const std::vector<int64_t>& ranks,
+           const std::vector<std::string>& variable_op_names) {
+          Plan plan;
+          CHECK(plan.ParseFromString(static_cast<std::string>(serialized_plan)));
+          HashSet<std::string> variable_op_name_set(variable_op_names.begin(),
+                                                    variable_op_names.end());
+          std::vector<py::bytes> rank_plans;
+          for (int64_t rank : ranks) {
+            Plan rank_plan;
+            PlanUtil::GenPlanForRank(plan, rank, variable_op_name_set, &rank_plan);
+            rank_plans.emplace_back(rank_plan.SerializeAsString());
+          }
+          return rank_plans;
+        });
 }
 
 }  // namespace oneflow
@@ -128,6 +128,29 @@ void ApiSetRequiresGrad(Tensor& tensor, bool requires_grad) {
   }
 }
 
+void ApiSetGrad(const std::shared_ptr<Tensor>& tensor, const std::shared_ptr<Tensor>& grad) {
+  if (!tensor->is_leaf()) {
+    throw std::runtime_error("You can only change gradient of leaf tensors.");
+  }
+  // The autograd meta of a leaf tensor is created with its accumulate function node
+  if (!tensor->grad_fn_node()) { AddAccumulateFunctionNode(tensor).GetOrThrow(); }
+  if (grad != nullptr) {
+    tensor->set_acc_grad(grad->detach().GetPtrOrThrow()).GetOrThrow();
+  } else {
+    tensor->set_acc_grad(nullptr).GetOrThrow();
+  }
+  // A grad assigned by the user replaces the one accumulated in place
+  tensor->mut_autograd_meta()->set_is_grad_acc_inplace(false);
+}
+
+void ApiSetIsGradAccInplace(const std::shared_ptr<Tensor>& tensor, bool is_grad_acc_inplace) {
+  if (!(tensor->is_leaf() && tensor->requires_grad())) {
+    throw std::runtime_error("Only leaf tensors requiring grad accumulate grad.");
+  }
+  if (!tensor->grad_fn_node()) { AddAccumulateFunctionNode(tensor).GetOrThrow(); }
+  tensor->mut_autograd_meta()->set_is_grad_acc_inplace(is_grad_acc_inplace);
+}
+
 std::shared_ptr<Parameter> ApiNewParameter(const std::shared_ptr<Tensor>& data,
                                            bool requires_grad) {
   return std::make_shared<Parameter>(data, requires_grad);
@@ -154,17 +177,13 @@ ONEFLOW_API_PYBIND11_MODULE("", m) {
               return std::shared_ptr<Tensor>();
             }
           },
-          [](Tensor& t, const std::shared_ptr<Tensor>& grad) {
-            if (t.is_leaf()) {
-              if (grad != nullptr) {
-                t.set_acc_grad(grad->detach().GetPtrOrThrow()).GetOrThrow();
-              } else {
-                t.set_acc_grad(nullptr).GetOrThrow();
-              }
-            } else {
-              throw std::runtime_error("You can only change gradient of leaf tensors.");
-            }
-          })
+          &ApiSetGrad)
+      .def_property(
+          "_is_grad_acc_inplace",
+          [](Tensor& t) {
+            return t.has_autograd_meta() && t.mut_autograd_meta()->is_grad_acc_inplace();
+          },
+          &ApiSetIsGradAccInplace)
       .def_property(
           "data", [](Tensor& t) { return t.data().GetPtrOrThrow(); },
           [](Tensor& t, const std::shared_ptr<Tensor>& other) { t.set_data(other).GetOrThrow(); })
@@ -52,7 +52,8 @@ ONEFLOW_FUNCTION_LIBRARY(m) {
       [](const std::shared_ptr<OpExpr>& op, const std::string& data_dir, int32_t data_part_num,
          const std::string& part_name_prefix, int32_t part_name_suffix_length, int32_t batch_size,
          int32_t shuffle_buffer_size, bool random_shuffle, bool shuffle_after_epoch, int64_t seed,
-         const Optional<Symbol<Device>>& device) -> Maybe<Tensor> {
+         int32_t num_loader_threads, int32_t prefetch_depth, bool ordered, bool use_index,
+         int64_t skip_records, const Optional<Symbol<Device>>& device) -> Maybe<Tensor> {
         MutableAttrMap attrs;
         JUST(attrs.SetAttr("data_dir", data_dir));
         JUST(attrs.SetAttr("data_part_num", data_part_num));
@@ -63,6 +64,11 @@ ONEFLOW_FUNCTION_LIBRARY(m) {
         JUST(attrs.SetAttr("random_shuffle", random_shuffle));
         JUST(attrs.SetAttr("shuffle_after_epoch", shuffle_after_epoch));
         JUST(attrs.SetAttr("seed", seed));
+        JUST(attrs.SetAttr("num_loader_threads", num_loader_threads));
+        JUST(attrs.SetAttr("prefetch_depth", prefetch_depth));
+        JUST(attrs.SetAttr("ordered", ordered));
+        JUST(attrs.SetAttr("use_index", use_index));
+        JUST(attrs.SetAttr("skip_records", skip_records));
         return OpInterpUtil::Dispatch<Tensor>(*op, {}, OpExprInterpContext(attrs, JUST(device)));
       });
   m.add_functor(
@@ -70,7 +76,8 @@ ONEFLOW_FUNCTION_LIBRARY(m) {
       [](const std::shared_ptr<OpExpr>& op, const std::string& data_dir, int32_t data_part_num,
          const std::string& part_name_prefix, int32_t part_name_suffix_length, int32_t batch_size,
          int32_t shuffle_buffer_size, bool random_shuffle, bool shuffle_after_epoch, int64_t seed,
-         const Symbol<ParallelDesc>& placement,
+         int32_t num_loader_threads, int32_t prefetch_depth, bool ordered, bool use_index,
+         int64_t skip_records, const Symbol<ParallelDesc>& placement,
          const std::vector<Symbol<cfg::SbpParallel>>& sbp_tuple) -> Maybe<Tensor> {
         MutableAttrMap attrs;
         JUST(attrs.SetAttr("data_dir", data_dir));
@@ -82,6 +89,11 @@ ONEFLOW_FUNCTION_LIBRARY(m) {
         JUST(attrs.SetAttr("random_shuffle", random_shuffle));
         JUST(attrs.SetAttr("shuffle_after_epoch", shuffle_after_epoch));
         JUST(attrs.SetAttr("seed", seed));
+        JUST(attrs.SetAttr("num_loader_threads", num_loader_threads));
+        JUST(attrs.SetAttr("prefetch_depth", prefetch_depth));
+        JUST(attrs.SetAttr("ordered", ordered));
+        JUST(attrs.SetAttr("use_index", use_index));
+        JUST(attrs.SetAttr("skip_records", skip_records));
         JUST(attrs.SetAttr("nd_sbp", *JUST(GetNdSbpStrList(sbp_tuple))));
         auto nd_sbp = JUST(GetNdSbp(sbp_tuple));
         return OpInterpUtil::Dispatch<Tensor>(*op, {},
@@ -266,7 +278,8 @@ ONEFLOW_FUNCTION_LIBRARY(m) {
       [](const std::shared_ptr<OpExpr>& op, const std::string& image_dir,
          const std::string& annotation_file, int64_t batch_size, bool shuffle_after_epoch,
          int64_t random_seed, bool group_by_ratio, bool remove_images_without_annotations,
-         bool stride_partition, int64_t session_id,
+         bool stride_partition, int64_t session_id, int32_t num_loader_threads,
+         int32_t prefetch_depth, bool ordered,
          const Optional<Symbol<Device>>& device) -> Maybe<TensorTuple> {
         MutableAttrMap attrs;
         JUST(attrs.SetAttr("session_id", session_id));
@@ -278,6 +291,9 @@ ONEFLOW_FUNCTION_LIBRARY(m) {
         JUST(attrs.SetAttr("group_by_ratio", group_by_ratio));
         JUST(attrs.SetAttr("remove_images_without_annotations", remove_images_without_annotations));
         JUST(attrs.SetAttr("stride_partition", stride_partition));
+        JUST(attrs.SetAttr("num_loader_threads", num_loader_threads));
+        JUST(attrs.SetAttr("prefetch_depth", prefetch_depth));
+        JUST(attrs.SetAttr("ordered", ordered));
         return OpInterpUtil::Dispatch<TensorTuple>(*op, {},
                                                    OpExprInterpContext(attrs, JUST(device)));
       });
@@ -286,7 +302,8 @@ ONEFLOW_FUNCTION_LIBRARY(m) {
       [](const std::shared_ptr<OpExpr>& op, const std::string& image_dir,
          const std::string& annotation_file, int64_t batch_size, bool shuffle_after_epoch,
          int64_t random_seed, bool group_by_ratio, bool remove_images_without_annotations,
-         bool stride_partition, int64_t session_id, const Symbol<ParallelDesc>& placement,
+         bool stride_partition, int64_t session_id, int32_t num_loader_threads,
+         int32_t prefetch_depth, bool ordered, const Symbol<ParallelDesc>& placement,
          const std::vector<Symbol<cfg::SbpParallel>>& sbp_tuple) -> Maybe<TensorTuple> {
         MutableAttrMap attrs;
         JUST(attrs.SetAttr("session_id", session_id));
@@ -298,6 +315,9 @@ ONEFLOW_FUNCTION_LIBRARY(m) {
         JUST(attrs.SetAttr("group_by_ratio", group_by_ratio));
         JUST(attrs.SetAttr("remove_images_without_annotations", remove_images_without_annotations));
         JUST(attrs.SetAttr("stride_partition", stride_partition));
+        JUST(attrs.SetAttr("num_loader_threads", num_loader_threads));
+        JUST(attrs.SetAttr("prefetch_depth", prefetch_depth));
+        JUST(attrs.SetAttr("ordered", ordered));
         JUST(attrs.SetAttr("nd_sbp", *JUST(GetNdSbpStrList(sbp_tuple))));
         auto nd_sbp = JUST(GetNdSbp(sbp_tuple));
         return OpInterpUtil::Dispatch<TensorTuple>(*op, {},
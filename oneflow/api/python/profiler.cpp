@@ -14,9 +14,13 @@ See the License for the specific language governing permissions and
 limitations under the License.
 */
 #include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
 #include "oneflow/api/python/of_api_registry.h"
 
+#include "oneflow/core/device/cpu_conv_util.h"
+#include "oneflow/core/framework/infer_cache_stats.h"
 #include "oneflow/core/profiler/profiler.h"
+#include "oneflow/user/data/data_reader_stats.h"
 
 namespace py = pybind11;
 
@@ -30,6 +34,22 @@ ONEFLOW_API_PYBIND11_MODULE("profiler", m) {
   m.def("ProfilerStart", []() { profiler::ProfilerStart(); });
 
   m.def("ProfilerStop", []() { profiler::ProfilerStop(); });
+
+  m.def("GetInferCacheStats", &GetInferCacheStats);
+
+  m.def("ResetInferCacheStats", &ResetInferCacheStats);
+
+  m.def("GetInferCacheCapacity", &InferCacheCapacity);
+
+  m.def("SetInferCacheCapacity", &SetInferCacheCapacity);
+
+  m.def("GetDataReaderStats", &data::GetDataReaderStats);
+
+  m.def("ResetDataReaderStats", &data::ResetDataReaderStats);
+
+  m.def("GetCpuConvStats", &GetCpuConvStats);
+
+  m.def("ResetCpuConvStats", &ResetCpuConvStats);
 }
 
 }  // namespace oneflow
@@ -34,6 +34,7 @@ ONEFLOW_API_PYBIND11_MODULE("", m) {
   m.def("CreateMultiClientSessionContext", &CreateMultiClientSessionContext);
   m.def("InitMultiClientSessionContext", &InitMultiClientSessionContext);
   m.def("MultiClientSessionContextAddCGraph", &MultiClientSessionContextAddCGraph);
+  m.def("MultiClientSessionContextRemoveCGraph", &MultiClientSessionContextRemoveCGraph);
   m.def("TryDestroyMultiClientSessionContext", &TryDestroyMultiClientSessionContext);
 
   using namespace oneflow;
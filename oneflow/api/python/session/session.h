@@ -134,6 +134,12 @@ inline Maybe<void> MultiClientSessionContextAddCGraph(
   return Maybe<void>::Ok();
 }
 
+inline Maybe<void> MultiClientSessionContextRemoveCGraph(
+    const std::shared_ptr<oneflow::NNGraph>& c_graph_ptr) {
+  JUST(Global<MultiClientSessionContext>::Get()->RemoveCGraph(c_graph_ptr));
+  return Maybe<void>::Ok();
+}
+
 inline Maybe<void> TryDestroyMultiClientSessionContext() {
   // Global<T>::Delete is not allowed to be called here
   // because glog is not constructed yet and LOG(INFO) has bad bahavior
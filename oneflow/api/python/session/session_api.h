@@ -48,6 +48,11 @@ inline void MultiClientSessionContextAddCGraph(
   return oneflow::MultiClientSessionContextAddCGraph(c_graph_ptr).GetOrThrow();
 }
 
+inline void MultiClientSessionContextRemoveCGraph(
+    const std::shared_ptr<oneflow::NNGraph>& c_graph_ptr) {
+  return oneflow::MultiClientSessionContextRemoveCGraph(c_graph_ptr).GetOrThrow();
+}
+
 inline void TryDestroyMultiClientSessionContext() {
   return oneflow::TryDestroyMultiClientSessionContext().GetOrThrow();
 }
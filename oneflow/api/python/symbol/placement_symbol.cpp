@@ -244,6 +244,10 @@ ONEFLOW_API_PYBIND11_MODULE("", m) {
                                return device_type;
                              })
       .def_property_readonly("hierarchy", [](Symbol<ParallelDesc> p) { return p->hierarchy(); })
+      .def_property_readonly("machine_id2device_id_list",
+                             [](Symbol<ParallelDesc> p) {
+                               return PlacementSymbolExportUtil::MachineId2DeviceIdList(*p);
+                             })
       .def("__str__", &PlacementSymbolExportUtil::PlacementSymbol2String)
       .def("__repr__", &PlacementSymbolExportUtil::PlacementSymbol2String)
       .def(py::self == py::self)
@@ -0,0 +1,64 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#include <pybind11/pybind11.h>
+#include "oneflow/api/python/of_api_registry.h"
+#ifdef WITH_CUDA
+#include <cuda_runtime.h>
+#endif  // WITH_CUDA
+
+namespace oneflow {
+
+namespace py = pybind11;
+
+namespace {
+
+// Page-locks an existing host buffer, e.g. the pooled batch buffers of DataLoader, so that
+// copies from it to cuda devices are done by DMA. Returns false if the buffer can not be
+// page-locked, in which case it is still usable as pageable memory.
+bool CudaHostRegister(uint64_t ptr, size_t size) {
+#ifdef WITH_CUDA
+  int device_count = 0;
+  if (cudaGetDeviceCount(&device_count) != cudaSuccess || device_count == 0) {
+    (void)cudaGetLastError();
+    return false;
+  }
+  if (cudaHostRegister(reinterpret_cast<void*>(ptr), size, cudaHostRegisterDefault)
+      != cudaSuccess) {
+    (void)cudaGetLastError();
+    return false;
+  }
+  return true;
+#else
+  return false;
+#endif  // WITH_CUDA
+}
+
+void CudaHostUnregister(uint64_t ptr) {
+#ifdef WITH_CUDA
+  if (cudaHostUnregister(reinterpret_cast<void*>(ptr)) != cudaSuccess) {
+    (void)cudaGetLastError();
+  }
+#endif  // WITH_CUDA
+}
+
+}  // namespace
+
+ONEFLOW_API_PYBIND11_MODULE("", m) {
+  m.def("CudaHostRegister", &CudaHostRegister, py::call_guard<py::gil_scoped_release>());
+  m.def("CudaHostUnregister", &CudaHostUnregister, py::call_guard<py::gil_scoped_release>());
+}
+
+}  // namespace oneflow
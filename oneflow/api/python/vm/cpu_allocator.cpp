@@ -0,0 +1,47 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+#include "oneflow/api/python/of_api_registry.h"
+#include "oneflow/core/common/global.h"
+#include "oneflow/core/vm/cpu_allocator.h"
+
+namespace oneflow {
+namespace vm {
+
+namespace py = pybind11;
+
+ONEFLOW_API_PYBIND11_MODULE("vm", m) {
+  m.def(
+      "CpuAllocatorEmptyCache", []() { Global<CpuAllocator>::Get()->EmptyCache(); },
+      py::call_guard<py::gil_scoped_release>());
+  m.def("CpuAllocatorStats", []() {
+    const CpuAllocatorStats& stats = Global<CpuAllocator>::Get()->GetStats();
+    return std::map<std::string, int64_t>{
+        {"in_use_bytes", stats.in_use_bytes},
+        {"cached_bytes", stats.cached_bytes},
+        {"peak_in_use_bytes", stats.peak_in_use_bytes},
+        {"num_allocations", stats.num_allocations},
+        {"num_system_allocations", stats.num_system_allocations},
+    };
+  });
+  m.def("CpuAllocatorSetCachingLimits", [](size_t max_cached_bytes, size_t max_cached_block_size) {
+    Global<CpuAllocator>::Get()->SetCachingLimits(max_cached_bytes, max_cached_block_size);
+  });
+}
+
+}  // namespace vm
+}  // namespace oneflow
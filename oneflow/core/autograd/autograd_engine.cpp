@@ -46,7 +46,12 @@ Maybe<void> CopyOrAccGrad(AutogradMeta* autograd_meta, bool autograd_mode) {
     auto new_grad = hook(current_grad);
     if (new_grad) { current_grad = new_grad; }
   }
-  if (autograd_meta->acc_grad()) {
+  if (autograd_meta->acc_grad() && autograd_meta->is_grad_acc_inplace()) {
+    // acc_grad is owned by the user (e.g. a view of a flat gradient buffer) and never shared
+    // with other grads, so it's safe to accumulate in place.
+    DevVmDepObjectConsumeModeGuard guard(DevVmDepObjectConsumeMode::NONE);
+    JUST(functional::Add(autograd_meta->acc_grad(), current_grad, /*alpha=*/1, /*inplace=*/true));
+  } else if (autograd_meta->acc_grad()) {
     DevVmDepObjectConsumeModeGuard guard(DevVmDepObjectConsumeMode::NONE);
     // Should not inplace accumulate grad. For example,
     // >>> z = x + y
@@ -48,6 +48,7 @@ class AutogradMeta final {
       : is_leaf_(is_leaf),
         requires_grad_(requires_grad),
         retain_grad_(false),
+        is_grad_acc_inplace_(false),
         current_grad_(new TensorArg) {}
 
   // Getters
@@ -56,6 +57,7 @@ class AutogradMeta final {
   bool requires_grad() const { return requires_grad_; }
   bool is_leaf() const { return is_leaf_; }
   bool retain_grad() const { return retain_grad_; }
+  bool is_grad_acc_inplace() const { return is_grad_acc_inplace_; }
   using Hook = std::function<std::shared_ptr<Tensor>(const std::shared_ptr<const Tensor>&)>;
   const std::vector<Hook>& hooks() const { return hooks_; }
 
@@ -65,6 +67,9 @@ class AutogradMeta final {
   void set_requires_grad(bool requires_grad) { requires_grad_ = requires_grad; }
   void set_retain_grad(bool retain_grad) { retain_grad_ = retain_grad; }
   void set_is_leaf(bool is_leaf) { is_leaf_ = is_leaf; }
+  void set_is_grad_acc_inplace(bool is_grad_acc_inplace) {
+    is_grad_acc_inplace_ = is_grad_acc_inplace;
+  }
   void add_hook(const Hook& hook) { hooks_.emplace_back(hook); }
 
  private:
@@ -76,6 +81,10 @@ class AutogradMeta final {
   // Oney meaningful on non_leaf Tensors (must be false otherwise)
   bool retain_grad_;
 
+  // Only meaningful on leaf Tensors. If true, grads are accumulated into acc_grad in place
+  // instead of replacing it, so that acc_grad may be a view of a buffer owned by the user.
+  bool is_grad_acc_inplace_;
+
   std::shared_ptr<Tensor> acc_grad_;
   std::shared_ptr<TensorArg> current_grad_;
   std::vector<Hook> hooks_;
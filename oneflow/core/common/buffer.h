@@ -33,6 +33,7 @@ class Buffer final {
   BufferStatus Pull(T* item);
   BufferStatus TryReceive(T* item);
   void Close();
+  size_t Size() const;
 
  private:
   std::queue<T> queue_;
@@ -73,6 +74,12 @@ BufferStatus Buffer<T>::TryReceive(T* item) {
   return kBufferStatusSuccess;
 }
 
+template<typename T>
+size_t Buffer<T>::Size() const {
+  std::unique_lock<std::mutex> lock(mutex_);
+  return queue_.size();
+}
+
 template<typename T>
 void Buffer<T>::Close() {
   std::unique_lock<std::mutex> lock(mutex_);
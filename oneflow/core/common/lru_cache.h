@@ -0,0 +1,82 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#ifndef ONEFLOW_CORE_COMMON_LRU_CACHE_H_
+#define ONEFLOW_CORE_COMMON_LRU_CACHE_H_
+
+#include <list>
+#include <unordered_map>
+#include "oneflow/core/common/hash_eq_trait_ptr.h"
+#include "oneflow/core/common/util.h"
+
+namespace oneflow {
+
+// A hash map which evicts its least recently used entries beyond a capacity.
+template<typename K, typename V, typename Hash = std::hash<K>>
+class LruCache final {
+ public:
+  OF_DISALLOW_COPY_AND_MOVE(LruCache);
+  LruCache() = default;
+  ~LruCache() = default;
+
+  size_t size() const { return key2entry_.size(); }
+
+  // Returns the value of `key` and marks it most recently used, or nullptr if there is none.
+  V* Find(const K& key) {
+    const auto& iter = key2entry_.find(HashEqTraitPtr<const K>(&key, Hash()(key)));
+    if (iter == key2entry_.end()) { return nullptr; }
+    entries_.splice(entries_.begin(), entries_, iter->second);
+    return &iter->second->second;
+  }
+
+  // Inserts a new entry as the most recently used one, then evicts the least recently used
+  // entries while there are more than `capacity` (0 means unbounded). Returns the number of
+  // evicted entries.
+  size_t Put(const K& key, V value, size_t capacity) {
+    entries_.emplace_front(key, std::move(value));
+    const K* new_key = &entries_.front().first;
+    CHECK(key2entry_.emplace(HashEqTraitPtr<const K>(new_key, Hash()(*new_key)), entries_.begin())
+              .second);
+    size_t num_evicted = 0;
+    while (capacity > 0 && entries_.size() > capacity) {
+      const K& lru_key = entries_.back().first;
+      key2entry_.erase(HashEqTraitPtr<const K>(&lru_key, Hash()(lru_key)));
+      entries_.pop_back();
+      ++num_evicted;
+    }
+    return num_evicted;
+  }
+
+  void Clear() {
+    key2entry_.clear();
+    entries_.clear();
+  }
+
+  // Iterators of the entries stay valid in the swapped caches.
+  void Swap(LruCache* other) {
+    std::swap(entries_, other->entries_);
+    std::swap(key2entry_, other->key2entry_);
+  }
+
+ private:
+  using EntryList = std::list<std::pair<K, V>>;
+
+  EntryList entries_;
+  std::unordered_map<HashEqTraitPtr<const K>, typename EntryList::iterator> key2entry_;
+};
+
+}  // namespace oneflow
+
+#endif  // ONEFLOW_CORE_COMMON_LRU_CACHE_H_
@@ -0,0 +1,495 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#include "oneflow/core/device/cpu_conv_util.h"
+#include "oneflow/core/common/blas.h"
+#include "oneflow/core/ep/cpu/cpu_stream.h"
+#include <atomic>
+#include <chrono>
+
+namespace oneflow {
+
+namespace {
+
+// The bytes of the scratch buffers of a work item, about the size of a L2 cache
+constexpr int64_t kBlockBytes = 1 << 20;
+// The minimal number of output positions (or winograd tiles) of a work item, below which the
+// gemms get inefficient
+constexpr int64_t kMinBlockSize = 64;
+// The minimal number of output channels of a work item
+constexpr int64_t kMinOutChannelTile = 16;
+// The number of elements of a transformed winograd tile
+constexpr int64_t kWinogradTileElems = 16;
+
+template<typename T>
+void Gemm(int m, int n, int k, const T* a, int lda, const T* b, int ldb, T* c, int ldc) {
+  cblas_gemm<T>(CblasRowMajor, CblasNoTrans, CblasNoTrans, m, n, k, static_cast<T>(1), a, lda, b,
+                ldb, static_cast<T>(0), c, ldc);
+}
+
+// A batch is split into work items, each computing a block of output positions of a tile of out
+// channels of a sample. The out channels are only split when there are too few blocks to keep
+// the threads busy, since each tile redoes the transform of the input block.
+class WorkPartition final {
+ public:
+  WorkPartition(const CpuConvParams& params, int64_t num_positions, int64_t bytes_per_position)
+      : num_positions_(num_positions), num_out_channels_(params.out_channels) {
+    block_size_ = std::max<int64_t>(
+        1, std::min(num_positions, std::max(kMinBlockSize, kBlockBytes / bytes_per_position)));
+    num_blocks_ = (num_positions + block_size_ - 1) / block_size_;
+    const int64_t num_sample_blocks = params.batch_size * num_blocks_;
+    const int64_t max_num_tiles = std::max<int64_t>(1, num_out_channels_ / kMinOutChannelTile);
+    const int64_t num_tiles = std::min(
+        max_num_tiles,
+        std::max<int64_t>(1, (params.num_threads + num_sample_blocks - 1) / num_sample_blocks));
+    out_channel_tile_ = (num_out_channels_ + num_tiles - 1) / num_tiles;
+    num_out_channel_tiles_ = (num_out_channels_ + out_channel_tile_ - 1) / out_channel_tile_;
+  }
+
+  int64_t block_size() const { return block_size_; }
+  int64_t out_channel_tile() const { return out_channel_tile_; }
+
+  // Calls func(buffer, sample, position_begin, position_end, out_channel_begin, out_channel_end)
+  // for each item, with a scratch buffer of buffer_size elements for each thread
+  template<typename T, typename F>
+  void ForEachItem(ep::Stream* stream, int64_t batch_size, int64_t buffer_size,
+                   const F& func) const {
+    const int64_t num_items = batch_size * num_blocks_ * num_out_channel_tiles_;
+    stream->As<ep::CpuStream>()->ParallelFor(
+        0, num_items,
+        [&](int64_t begin, int64_t end) {
+          std::vector<T> buffer(buffer_size);
+          for (int64_t i = begin; i < end; ++i) {
+            const int64_t tile = i % num_out_channel_tiles_;
+            const int64_t block = i / num_out_channel_tiles_ % num_blocks_;
+            const int64_t sample = i / num_out_channel_tiles_ / num_blocks_;
+            const int64_t position_begin = block * block_size_;
+            const int64_t out_channel_begin = tile * out_channel_tile_;
+            func(buffer.data(), sample, position_begin,
+                 std::min(num_positions_, position_begin + block_size_), out_channel_begin,
+                 std::min(num_out_channels_, out_channel_begin + out_channel_tile_));
+          }
+        },
+        1);
+  }
+
+ private:
+  int64_t num_positions_;
+  int64_t num_out_channels_;
+  int64_t block_size_;
+  int64_t num_blocks_;
+  int64_t out_channel_tile_;
+  int64_t num_out_channel_tiles_;
+};
+
+int64_t InChannelSize(const CpuConvParams& p) { return p.in_dims[0] * p.in_dims[1] * p.in_dims[2]; }
+
+int64_t OutChannelSize(const CpuConvParams& p) {
+  return p.out_dims[0] * p.out_dims[1] * p.out_dims[2];
+}
+
+template<typename T>
+void AddBias(const T* bias, int64_t out_channel_begin, int64_t out_channel_end,
+             int64_t out_channel_size, int64_t position_begin, int64_t position_end, T* out) {
+  if (bias == nullptr) { return; }
+  for (int64_t o = out_channel_begin; o < out_channel_end; ++o) {
+    T* out_channel = out + o * out_channel_size;
+    for (int64_t j = position_begin; j < position_end; ++j) { out_channel[j] += bias[o]; }
+  }
+}
+
+// Writes the columns [col_begin, col_end) of the im2col matrix of a sample, which has a row of
+// out positions for each (c, kd, kh, kw)
+template<typename T>
+void Im2ColBlock(const CpuConvParams& p, const T* in, int64_t col_begin, int64_t col_end, T* col) {
+  const int64_t num_cols = col_end - col_begin;
+  const int64_t out_plane_size = p.out_dims[1] * p.out_dims[2];
+  T* row = col;
+  for (int64_t c = 0; c < p.in_channels; ++c) {
+    const T* in_channel = in + c * InChannelSize(p);
+    for (int64_t kd = 0; kd < p.kernel_dims[0]; ++kd) {
+      for (int64_t kh = 0; kh < p.kernel_dims[1]; ++kh) {
+        for (int64_t kw = 0; kw < p.kernel_dims[2]; ++kw) {
+          const int64_t iw_offset = kw * p.dilation_rate[2] - p.padding_before[2];
+          // The columns are split into segments of output rows
+          for (int64_t j = col_begin; j < col_end;) {
+            const int64_t od = j / out_plane_size;
+            const int64_t oh = (j - od * out_plane_size) / p.out_dims[2];
+            const int64_t ow_begin = j - od * out_plane_size - oh * p.out_dims[2];
+            const int64_t ow_end = std::min(p.out_dims[2], ow_begin + col_end - j);
+            const int64_t id = od * p.strides[0] - p.padding_before[0] + kd * p.dilation_rate[0];
+            const int64_t ih = oh * p.strides[1] - p.padding_before[1] + kh * p.dilation_rate[1];
+            T* dst = row + (j - col_begin) - ow_begin;
+            if (id < 0 || id >= p.in_dims[0] || ih < 0 || ih >= p.in_dims[1]) {
+              std::fill(dst + ow_begin, dst + ow_end, static_cast<T>(0));
+            } else {
+              const T* src = in_channel + (id * p.in_dims[1] + ih) * p.in_dims[2];
+              for (int64_t ow = ow_begin; ow < ow_end; ++ow) {
+                const int64_t iw = ow * p.strides[2] + iw_offset;
+                dst[ow] = (iw >= 0 && iw < p.in_dims[2]) ? src[iw] : static_cast<T>(0);
+              }
+            }
+            j += ow_end - ow_begin;
+          }
+          row += num_cols;
+        }
+      }
+    }
+  }
+}
+
+template<typename T>
+void Im2ColGemmForward(ep::Stream* stream, const CpuConvParams& p, const T* in, const T* weight,
+                       const T* bias, T* out) {
+  const int64_t col_rows = p.in_channels * p.kernel_dims[0] * p.kernel_dims[1] * p.kernel_dims[2];
+  const int64_t num_positions = OutChannelSize(p);
+  const WorkPartition partition(p, num_positions, col_rows * sizeof(T));
+  partition.ForEachItem<T>(
+      stream, p.batch_size, col_rows * partition.block_size(),
+      [&](T* col, int64_t sample, int64_t position_begin, int64_t position_end,
+          int64_t out_channel_begin, int64_t out_channel_end) {
+        const T* in_sample = in + sample * p.in_channels * InChannelSize(p);
+        T* out_sample = out + sample * p.out_channels * num_positions;
+        const int64_t num_cols = position_end - position_begin;
+        Im2ColBlock(p, in_sample, position_begin, position_end, col);
+        Gemm<T>(out_channel_end - out_channel_begin, num_cols, col_rows,
+                weight + out_channel_begin * col_rows, col_rows, col, num_cols,
+                out_sample + out_channel_begin * num_positions + position_begin, num_positions);
+        AddBias(bias, out_channel_begin, out_channel_end, num_positions, position_begin,
+                position_end, out_sample);
+      });
+}
+
+template<typename T>
+void Gemm1x1Forward(ep::Stream* stream, const CpuConvParams& p, const T* in, const T* weight,
+                    const T* bias, T* out) {
+  const int64_t num_positions = OutChannelSize(p);
+  const WorkPartition partition(p, num_positions, p.in_channels * sizeof(T));
+  partition.ForEachItem<T>(
+      stream, p.batch_size, 0,
+      [&](T* /*buffer*/, int64_t sample, int64_t position_begin, int64_t position_end,
+          int64_t out_channel_begin, int64_t out_channel_end) {
+        const T* in_sample = in + sample * p.in_channels * num_positions;
+        T* out_sample = out + sample * p.out_channels * num_positions;
+        Gemm<T>(out_channel_end - out_channel_begin, position_end - position_begin, p.in_channels,
+                weight + out_channel_begin * p.in_channels, p.in_channels,
+                in_sample + position_begin, num_positions,
+                out_sample + out_channel_begin * num_positions + position_begin, num_positions);
+        AddBias(bias, out_channel_begin, out_channel_end, num_positions, position_begin,
+                position_end, out_sample);
+      });
+}
+
+// u = G g G^T, with g a 3x3 filter and G = [[1, 0, 0], [1/2, 1/2, 1/2], [1/2, -1/2, 1/2],
+// [0, 0, 1]]. u[i] is stored at u[i * stride].
+template<typename T>
+void WinogradTransformFilter(const T* g, int64_t stride, T* u) {
+  T gg[4][3];
+  for (int j = 0; j < 3; ++j) {
+    gg[0][j] = g[j];
+    gg[1][j] = (g[j] + g[3 + j] + g[6 + j]) / 2;
+    gg[2][j] = (g[j] - g[3 + j] + g[6 + j]) / 2;
+    gg[3][j] = g[6 + j];
+  }
+  for (int i = 0; i < 4; ++i) {
+    u[(i * 4 + 0) * stride] = gg[i][0];
+    u[(i * 4 + 1) * stride] = (gg[i][0] + gg[i][1] + gg[i][2]) / 2;
+    u[(i * 4 + 2) * stride] = (gg[i][0] - gg[i][1] + gg[i][2]) / 2;
+    u[(i * 4 + 3) * stride] = gg[i][2];
+  }
+}
+
+// v = B^T d B, with d a 4x4 input tile and B^T = [[1, 0, -1, 0], [0, 1, 1, 0], [0, -1, 1, 0],
+// [0, 1, 0, -1]]. v[i] is stored at v[i * stride].
+template<typename T>
+void WinogradTransformInput(const T (&d)[4][4], int64_t stride, T* v) {
+  T bd[4][4];
+  for (int j = 0; j < 4; ++j) {
+    bd[0][j] = d[0][j] - d[2][j];
+    bd[1][j] = d[1][j] + d[2][j];
+    bd[2][j] = d[2][j] - d[1][j];
+    bd[3][j] = d[1][j] - d[3][j];
+  }
+  for (int i = 0; i < 4; ++i) {
+    v[(i * 4 + 0) * stride] = bd[i][0] - bd[i][2];
+    v[(i * 4 + 1) * stride] = bd[i][1] + bd[i][2];
+    v[(i * 4 + 2) * stride] = bd[i][2] - bd[i][1];
+    v[(i * 4 + 3) * stride] = bd[i][1] - bd[i][3];
+  }
+}
+
+// y = A^T m A, with m a 4x4 tile read from m[i * stride] and A^T = [[1, 1, 1, 0], [0, 1, -1, -1]]
+template<typename T>
+void WinogradTransformOutput(const T* m, int64_t stride, T (&y)[2][2]) {
+  T am[2][4];
+  for (int j = 0; j < 4; ++j) {
+    am[0][j] = m[j * stride] + m[(4 + j) * stride] + m[(8 + j) * stride];
+    am[1][j] = m[(4 + j) * stride] - m[(8 + j) * stride] - m[(12 + j) * stride];
+  }
+  for (int i = 0; i < 2; ++i) {
+    y[i][0] = am[i][0] + am[i][1] + am[i][2];
+    y[i][1] = am[i][1] - am[i][2] - am[i][3];
+  }
+}
+
+template<typename T>
+void Winograd3x3Forward(ep::Stream* stream, const CpuConvParams& p, const T* in, const T* weight,
+                        const T* bias, T* out) {
+  const int64_t ih_num = p.in_dims[1];
+  const int64_t iw_num = p.in_dims[2];
+  const int64_t oh_num = p.out_dims[1];
+  const int64_t ow_num = p.out_dims[2];
+  const int64_t tw_num = (ow_num + 1) / 2;
+  const int64_t num_tiles = (oh_num + 1) / 2 * tw_num;
+  const int64_t in_channels = p.in_channels;
+  const int64_t out_channels = p.out_channels;
+
+  // The transformed filters, as 16 matrices of out_channels x in_channels
+  std::vector<T> u(kWinogradTileElems * out_channels * in_channels);
+  stream->As<ep::CpuStream>()->ParallelFor(
+      0, out_channels,
+      [&](int64_t begin, int64_t end) {
+        for (int64_t o = begin; o < end; ++o) {
+          for (int64_t c = 0; c < in_channels; ++c) {
+            WinogradTransformFilter(weight + (o * in_channels + c) * 9, out_channels * in_channels,
+                                    u.data() + o * in_channels + c);
+          }
+        }
+      },
+      std::max<int64_t>(1, ep::kParallelForDefaultGrainSize / (in_channels * 9)));
+
+  const WorkPartition partition(p, num_tiles,
+                                kWinogradTileElems * (in_channels + out_channels) * sizeof(T));
+  const int64_t buffer_size =
+      kWinogradTileElems * (in_channels + partition.out_channel_tile()) * partition.block_size();
+  partition.ForEachItem<T>(
+      stream, p.batch_size, buffer_size,
+      [&](T* buffer, int64_t sample, int64_t tile_begin, int64_t tile_end,
+          int64_t out_channel_begin, int64_t out_channel_end) {
+        const T* in_sample = in + sample * in_channels * ih_num * iw_num;
+        T* out_sample = out + sample * out_channels * oh_num * ow_num;
+        const int64_t num_block_tiles = tile_end - tile_begin;
+        const int64_t num_block_out_channels = out_channel_end - out_channel_begin;
+        // v: 16 matrices of in_channels x num_block_tiles
+        T* v = buffer;
+        // m: 16 matrices of num_block_out_channels x num_block_tiles
+        T* m = buffer + kWinogradTileElems * in_channels * num_block_tiles;
+        for (int64_t c = 0; c < in_channels; ++c) {
+          const T* in_channel = in_sample + c * ih_num * iw_num;
+          for (int64_t t = tile_begin; t < tile_end; ++t) {
+            const int64_t ih_begin = t / tw_num * 2 - p.padding_before[1];
+            const int64_t iw_begin = t % tw_num * 2 - p.padding_before[2];
+            T d[4][4];
+            for (int64_t i = 0; i < 4; ++i) {
+              const int64_t ih = ih_begin + i;
+              for (int64_t j = 0; j < 4; ++j) {
+                const int64_t iw = iw_begin + j;
+                d[i][j] = (ih >= 0 && ih < ih_num && iw >= 0 && iw < iw_num)
+                              ? in_channel[ih * iw_num + iw]
+                              : static_cast<T>(0);
+              }
+            }
+            WinogradTransformInput(d, in_channels * num_block_tiles,
+                                   v + c * num_block_tiles + (t - tile_begin));
+          }
+        }
+        for (int64_t i = 0; i < kWinogradTileElems; ++i) {
+          Gemm<T>(num_block_out_channels, num_block_tiles, in_channels,
+                  u.data() + (i * out_channels + out_channel_begin) * in_channels, in_channels,
+                  v + i * in_channels * num_block_tiles, num_block_tiles,
+                  m + i * num_block_out_channels * num_block_tiles, num_block_tiles);
+        }
+        for (int64_t o = out_channel_begin; o < out_channel_end; ++o) {
+          T* out_channel = out_sample + o * oh_num * ow_num;
+          const T bias_value = bias == nullptr ? static_cast<T>(0) : bias[o];
+          for (int64_t t = tile_begin; t < tile_end; ++t) {
+            T y[2][2];
+            WinogradTransformOutput(
+                m + (o - out_channel_begin) * num_block_tiles + (t - tile_begin),
+                num_block_out_channels * num_block_tiles, y);
+            const int64_t oh_begin = t / tw_num * 2;
+            const int64_t ow_begin = t % tw_num * 2;
+            for (int64_t i = 0; i < 2 && oh_begin + i < oh_num; ++i) {
+              for (int64_t j = 0; j < 2 && ow_begin + j < ow_num; ++j) {
+                out_channel[(oh_begin + i) * ow_num + ow_begin + j] = y[i][j] + bias_value;
+              }
+            }
+          }
+        }
+      });
+}
+
+const CpuConvAlgo kCpuConvAlgos[] = {CpuConvAlgo::kIm2ColGemm, CpuConvAlgo::kGemm1x1,
+                                     CpuConvAlgo::kWinograd3x3};
+
+struct CpuConvCounters final {
+  std::atomic<int64_t> num_hits{0};
+  std::atomic<int64_t> num_misses{0};
+  // Indexed by CpuConvAlgo
+  std::atomic<int64_t> num_runs[sizeof(kCpuConvAlgos) / sizeof(CpuConvAlgo)]{};
+};
+
+CpuConvCounters* MutCpuConvCounters() {
+  static CpuConvCounters counters;
+  return &counters;
+}
+
+bool GetCpuConvAlgoFromEnv(CpuConvAlgo* algo) {
+  const std::string name = GetStringFromEnv("ONEFLOW_CPU_CONV_ALGO", "");
+  if (name.empty()) { return false; }
+  for (CpuConvAlgo candidate : kCpuConvAlgos) {
+    if (name == CpuConvAlgoName(candidate)) {
+      *algo = candidate;
+      return true;
+    }
+  }
+  LOG(WARNING) << "Unknown ONEFLOW_CPU_CONV_ALGO " << name;
+  return false;
+}
+
+}  // namespace
+
+bool operator==(const CpuConvParams& a, const CpuConvParams& b) {
+  auto ptr1 = reinterpret_cast<const uint8_t*>(&a);
+  auto ptr2 = reinterpret_cast<const uint8_t*>(&b);
+  return memcmp(ptr1, ptr2, sizeof(CpuConvParams)) == 0;
+}
+
+CpuConvAlgo CpuConvAlgoCache::Remember(
+    const CpuConvParams& params,
+    const std::function<CpuConvAlgo(const CpuConvParams& params)>& InferFn) {
+  CpuConvCounters* counters = MutCpuConvCounters();
+  {
+    std::unique_lock<std::mutex> lock(store_mutex_);
+    const auto it = store_.find(params);
+    if (it != store_.end()) {
+      counters->num_hits.fetch_add(1, std::memory_order_relaxed);
+      return it->second;
+    }
+  }
+  counters->num_misses.fetch_add(1, std::memory_order_relaxed);
+  // Convs of other params don't wait for the timing. Convs of the same params racing here may
+  // all time the algorithms, the first result is kept.
+  const CpuConvAlgo algo = InferFn(params);
+  std::unique_lock<std::mutex> lock(store_mutex_);
+  return store_.emplace(params, algo).first->second;
+}
+
+CpuConvStats GetCpuConvStats() {
+  const CpuConvCounters& counters = *MutCpuConvCounters();
+  CpuConvStats stats;
+  stats["algo_cache"]["num_hits"] = counters.num_hits.load(std::memory_order_relaxed);
+  stats["algo_cache"]["num_misses"] = counters.num_misses.load(std::memory_order_relaxed);
+  for (CpuConvAlgo algo : kCpuConvAlgos) {
+    stats["algo_runs"][CpuConvAlgoName(algo)] =
+        counters.num_runs[static_cast<int>(algo)].load(std::memory_order_relaxed);
+  }
+  return stats;
+}
+
+void ResetCpuConvStats() {
+  CpuConvCounters* counters = MutCpuConvCounters();
+  counters->num_hits = 0;
+  counters->num_misses = 0;
+  for (auto& num_runs : counters->num_runs) { num_runs = 0; }
+}
+
+const char* CpuConvAlgoName(CpuConvAlgo algo) {
+  switch (algo) {
+    case CpuConvAlgo::kIm2ColGemm: return "im2col_gemm";
+    case CpuConvAlgo::kGemm1x1: return "gemm_1x1";
+    case CpuConvAlgo::kWinograd3x3: return "winograd_3x3";
+    default: UNIMPLEMENTED(); return "";
+  }
+}
+
+bool IsCpuConvAlgoSupported(const CpuConvParams& params, CpuConvAlgo algo) {
+  const auto AllEqual = [](const auto& dims, std::initializer_list<int64_t> values) {
+    return std::equal(values.begin(), values.end(), dims);
+  };
+  switch (algo) {
+    case CpuConvAlgo::kIm2ColGemm: return true;
+    case CpuConvAlgo::kGemm1x1:
+      return AllEqual(params.kernel_dims, {1, 1, 1}) && AllEqual(params.strides, {1, 1, 1})
+             && AllEqual(params.padding_before, {0, 0, 0});
+    case CpuConvAlgo::kWinograd3x3:
+      return AllEqual(params.in_dims, {1}) && AllEqual(params.out_dims, {1})
+             && AllEqual(params.kernel_dims, {1, 3, 3}) && AllEqual(params.strides, {1, 1, 1})
+             && params.dilation_rate[1] == 1 && params.dilation_rate[2] == 1
+             && params.padding_before[0] == 0;
+    default: return false;
+  }
+}
+
+template<typename T>
+void CpuConvForwardWithAlgo(ep::Stream* stream, CpuConvAlgo algo, const CpuConvParams& params,
+                            const T* in, const T* weight, const T* bias, T* out) {
+  CHECK(IsCpuConvAlgoSupported(params, algo)) << CpuConvAlgoName(algo);
+  switch (algo) {
+    case CpuConvAlgo::kIm2ColGemm:
+      Im2ColGemmForward<T>(stream, params, in, weight, bias, out);
+      break;
+    case CpuConvAlgo::kGemm1x1: Gemm1x1Forward<T>(stream, params, in, weight, bias, out); break;
+    case CpuConvAlgo::kWinograd3x3:
+      Winograd3x3Forward<T>(stream, params, in, weight, bias, out);
+      break;
+    default: UNIMPLEMENTED();
+  }
+}
+
+template<typename T>
+void CpuConvForward(ep::Stream* stream, const CpuConvParams& params, const T* in, const T* weight,
+                    const T* bias, T* out) {
+  CpuConvAlgo algo = CpuConvAlgo::kIm2ColGemm;
+  if (!GetCpuConvAlgoFromEnv(&algo) || !IsCpuConvAlgoSupported(params, algo)) {
+    CpuConvParams params_with_threads = params;
+    params_with_threads.num_threads = stream->As<ep::CpuStream>()->num_threads();
+    // Times each supported algorithm on this convolution
+    auto Infer = [&](const CpuConvParams& p) -> CpuConvAlgo {
+      CpuConvAlgo best_algo = CpuConvAlgo::kIm2ColGemm;
+      double best_time = std::numeric_limits<double>::max();
+      for (CpuConvAlgo candidate : kCpuConvAlgos) {
+        if (!IsCpuConvAlgoSupported(p, candidate)) { continue; }
+        const auto start = std::chrono::steady_clock::now();
+        CpuConvForwardWithAlgo<T>(stream, candidate, p, in, weight, bias, out);
+        const double time =
+            std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+        if (time < best_time) {
+          best_algo = candidate;
+          best_time = time;
+        }
+      }
+      VLOG(2) << "cpu conv algo " << CpuConvAlgoName(best_algo);
+      return best_algo;
+    };
+    algo = Global<CpuConvAlgoCache>::Get()->Remember(params_with_threads, Infer);
+  }
+  MutCpuConvCounters()->num_runs[static_cast<int>(algo)].fetch_add(1, std::memory_order_relaxed);
+  CpuConvForwardWithAlgo<T>(stream, algo, params, in, weight, bias, out);
+}
+
+#define INSTANTIATE_CPU_CONV_FORWARD(T)                                                          \
+  template void CpuConvForward<T>(ep::Stream * stream, const CpuConvParams& params, const T* in, \
+                                  const T* weight, const T* bias, T* out);                       \
+  template void CpuConvForwardWithAlgo<T>(ep::Stream * stream, CpuConvAlgo algo,                 \
+                                          const CpuConvParams& params, const T* in,              \
+                                          const T* weight, const T* bias, T* out);
+
+INSTANTIATE_CPU_CONV_FORWARD(float)
+INSTANTIATE_CPU_CONV_FORWARD(double)
+
+#undef INSTANTIATE_CPU_CONV_FORWARD
+
+}  // namespace oneflow
@@ -0,0 +1,123 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#ifndef ONEFLOW_CORE_DEVICE_CPU_CONV_UTIL_H_
+#define ONEFLOW_CORE_DEVICE_CPU_CONV_UTIL_H_
+
+#include <map>
+#include <string>
+#include "oneflow/core/common/util.h"
+#include "oneflow/core/common/data_type.h"
+
+namespace oneflow {
+
+namespace ep {
+
+class Stream;
+
+}  // namespace ep
+
+enum class CpuConvAlgo {
+  // im2col of blocks of output positions sized to fit in cache, each followed by a gemm
+  kIm2ColGemm = 0,
+  // a gemm on the input directly, for 1x1 convs with unit strides and no padding
+  kGemm1x1 = 1,
+  // Winograd F(2x2, 3x3), for 2d 3x3 convs with unit strides and dilations
+  kWinograd3x3 = 2,
+};
+
+// A channels first convolution with 3 spatial dims, the missing dims of 1d and 2d convs being 1
+struct CpuConvParams {
+  static constexpr size_t kConvMaxDims = 3;
+
+  DataType data_type;
+  int64_t batch_size;
+  int64_t in_channels;
+  int64_t out_channels;
+  int64_t in_dims[kConvMaxDims];
+  int64_t out_dims[kConvMaxDims];
+  int64_t kernel_dims[kConvMaxDims];
+  int32_t strides[kConvMaxDims];
+  int32_t dilation_rate[kConvMaxDims];
+  int32_t padding_before[kConvMaxDims];
+  // The number of threads the algorithm is chosen for, set by CpuConvForward
+  int64_t num_threads;
+};
+
+bool operator==(const CpuConvParams& a, const CpuConvParams& b);
+
+}  // namespace oneflow
+
+namespace std {
+
+template<>
+struct hash<oneflow::CpuConvParams> final {
+  static_assert(std::is_pod<oneflow::CpuConvParams>::value, "CpuConvParams is not POD");
+
+  size_t operator()(const oneflow::CpuConvParams& params) const {
+    const auto* ptr = reinterpret_cast<const uint8_t*>(&params);
+    uint32_t value = 0x811C9DC5;
+    for (int i = 0; i < (int)sizeof(oneflow::CpuConvParams); ++i) {
+      value ^= ptr[i];
+      value *= 0x01000193;
+    }
+    return (size_t)value;
+  }
+};
+
+}  // namespace std
+
+namespace oneflow {
+
+// The fastest algorithm of each params, measured on the first convolution with them
+class CpuConvAlgoCache final {
+ public:
+  OF_DISALLOW_COPY_AND_MOVE(CpuConvAlgoCache);
+  CpuConvAlgoCache() = default;
+  ~CpuConvAlgoCache() = default;
+
+  CpuConvAlgo Remember(const CpuConvParams& params,
+                       const std::function<CpuConvAlgo(const CpuConvParams& params)>& InferFn);
+
+ private:
+  HashMap<CpuConvParams, CpuConvAlgo> store_;
+  std::mutex store_mutex_;
+};
+
+// "algo_cache" -> num_hits and num_misses of CpuConvAlgoCache, "algo_runs" -> algorithm name ->
+// the number of convs run with it, the runs timing the algorithms excluded
+using CpuConvStats = std::map<std::string, std::map<std::string, int64_t>>;
+
+CpuConvStats GetCpuConvStats();
+void ResetCpuConvStats();
+
+const char* CpuConvAlgoName(CpuConvAlgo algo);
+
+bool IsCpuConvAlgoSupported(const CpuConvParams& params, CpuConvAlgo algo);
+
+// out = conv(in, weight) + bias for a batch of channels first samples, bias being optional. The
+// algorithm is the one set by the ONEFLOW_CPU_CONV_ALGO environment variable (im2col_gemm,
+// gemm_1x1 or winograd_3x3) if it supports the params, or else the one cached for the params.
+template<typename T>
+void CpuConvForward(ep::Stream* stream, const CpuConvParams& params, const T* in, const T* weight,
+                    const T* bias, T* out);
+
+template<typename T>
+void CpuConvForwardWithAlgo(ep::Stream* stream, CpuConvAlgo algo, const CpuConvParams& params,
+                            const T* in, const T* weight, const T* bias, T* out);
+
+}  // namespace oneflow
+
+#endif  // ONEFLOW_CORE_DEVICE_CPU_CONV_UTIL_H_
@@ -17,13 +17,35 @@ limitations under the License.
 #include "oneflow/core/ep/cpu/cpu_event.h"
 #include "oneflow/core/ep/cpu/cpu_stream.h"
 #include "oneflow/core/ep/include/device_manager_registry.h"
+#include "oneflow/core/thread/thread_pool.h"
 
 namespace oneflow {
 
 namespace ep {
 
+CpuDevice::CpuDevice(DeviceManager* device_manager)
+    : device_manager_(device_manager),
+      default_num_threads_(
+          std::max<int64_t>(ParseIntegerFromEnv("ONEFLOW_EP_CPU_NUM_THREADS", 0), 0)),
+      num_threads_(default_num_threads_) {}
+
 void CpuDevice::SetAsActiveDevice() {}
 
+void CpuDevice::SetNumThreads(size_t num_threads) {
+  num_threads_ = num_threads == 0 ? default_num_threads_ : num_threads;
+}
+
+size_t CpuDevice::GetNumThreads() const {
+  ThreadPool* thread_pool = Global<ThreadPool>::Get();
+  if (thread_pool == nullptr) { return 1; }
+  // The calling thread runs a part of the op too, so an op never keeps more threads busy than
+  // the pool has
+  const size_t max_num_threads = thread_pool->thread_num();
+  const size_t num_threads = num_threads_;
+  if (num_threads == 0) { return max_num_threads; }
+  return std::min(num_threads, max_num_threads);
+}
+
 Stream* CpuDevice::CreateStream() { return new CpuStream(this); }
 
 void CpuDevice::DestroyStream(Stream* stream) { delete stream; }
@@ -17,6 +17,7 @@ limitations under the License.
 #define ONEFLOW_CORE_EP_CPU_CPU_DEVICE_H_
 
 #include "oneflow/core/ep/include/device.h"
+#include <atomic>
 
 namespace oneflow {
 
@@ -25,7 +26,7 @@ namespace ep {
 class CpuDevice : public Device {
  public:
   OF_DISALLOW_COPY_AND_MOVE(CpuDevice);
-  explicit CpuDevice(DeviceManager* device_manager) : device_manager_(device_manager) {}
+  explicit CpuDevice(DeviceManager* device_manager);
   ~CpuDevice() override = default;
 
   void SetAsActiveDevice() override;
@@ -45,8 +46,18 @@ class CpuDevice : public Device {
   Maybe<void> AllocPinned(const AllocationOptions& options, void** ptr, size_t size) override;
   void FreePinned(const AllocationOptions& options, void* ptr) override;
 
+  // The number of threads (including the calling thread) an op runs on, capped by the size of
+  // the compute thread pool. 0 restores the default, which is ONEFLOW_EP_CPU_NUM_THREADS or else
+  // the size of the pool.
+  void SetNumThreads(size_t num_threads);
+  size_t GetNumThreads() const;
+
  private:
   DeviceManager* device_manager_;
+  // From ONEFLOW_EP_CPU_NUM_THREADS, 0 if it is not set
+  const size_t default_num_threads_;
+  // 0 means the size of the compute thread pool
+  std::atomic<size_t> num_threads_;
 };
 
 }  // namespace ep
@@ -14,6 +14,10 @@ See the License for the specific language governing permissions and
 limitations under the License.
 */
 #include "oneflow/core/ep/cpu/cpu_stream.h"
+#include "oneflow/core/ep/cpu/cpu_device.h"
+#include "oneflow/core/common/blocking_counter.h"
+#include "oneflow/core/platform/include/pthread_fork.h"
+#include "oneflow/core/thread/thread_pool.h"
 
 namespace oneflow {
 
@@ -27,6 +31,39 @@ Maybe<void> CpuStream::Sync() { return Maybe<void>::Ok(); }
 
 void CpuStream::RecordEvent(Event* /*event*/) {}
 
+namespace {
+
+thread_local bool in_parallel_region = false;
+
+}  // namespace
+
+size_t CpuStream::num_threads() const { return static_cast<CpuDevice*>(device_)->GetNumThreads(); }
+
+int64_t CpuStream::ParallelForNumChunks(int64_t num_elements, int64_t grain_size) const {
+  // Nested parallelism would wait for the threads running the outer loop
+  if (in_parallel_region || pthread_fork::IsForkedSubProcess()) { return 1; }
+  grain_size = std::max<int64_t>(grain_size, 1);
+  const int64_t max_num_chunks = (num_elements + grain_size - 1) / grain_size;
+  return std::min<int64_t>(num_threads(), max_num_chunks);
+}
+
+void CpuStream::ParallelRun(int64_t num_chunks, const std::function<void(int64_t)>& func) {
+  ThreadPool* thread_pool = Global<ThreadPool>::Get();
+  BlockingCounter bc(num_chunks - 1);
+  for (int64_t chunk_id = 1; chunk_id < num_chunks; ++chunk_id) {
+    thread_pool->AddWork([&bc, &func, chunk_id]() {
+      in_parallel_region = true;
+      func(chunk_id);
+      in_parallel_region = false;
+      bc.Decrease();
+    });
+  }
+  in_parallel_region = true;
+  func(0);
+  in_parallel_region = false;
+  bc.WaitUntilCntEqualZero();
+}
+
 }  // namespace ep
 
 }  // namespace oneflow
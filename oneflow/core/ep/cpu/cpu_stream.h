@@ -17,6 +17,7 @@ limitations under the License.
 #define ONEFLOW_CORE_EP_CPU_CPU_STREAM_H_
 
 #include "oneflow/core/ep/include/stream.h"
+#include <functional>
 #ifdef WITH_ONEDNN
 #include <oneapi/dnnl/dnnl.hpp>
 #endif
@@ -25,6 +26,10 @@ namespace oneflow {
 
 namespace ep {
 
+// The minimal number of elements processed by a thread in ParallelFor. Smaller ranges run on the
+// calling thread only, since waking up threads costs microseconds.
+constexpr int64_t kParallelForDefaultGrainSize = 32768;
+
 class CpuStream : public Stream {
  public:
   OF_DISALLOW_COPY_AND_MOVE(CpuStream);
@@ -42,11 +47,38 @@ class CpuStream : public Stream {
   Maybe<void> Sync() override;
   void RecordEvent(Event* event) override;
 
+  size_t num_threads() const;
+
+  // Calls func(chunk_begin, chunk_end) on disjoint chunks covering [begin, end) with up to
+  // num_threads() threads, each chunk having at least grain_size elements. Runs serially when
+  // called inside another ParallelFor.
+  template<typename F>
+  void ParallelFor(int64_t begin, int64_t end, const F& func,
+                   int64_t grain_size = kParallelForDefaultGrainSize) {
+    if (begin >= end) { return; }
+    const int64_t num_chunks = ParallelForNumChunks(end - begin, grain_size);
+    if (num_chunks <= 1) {
+      func(begin, end);
+      return;
+    }
+    const int64_t chunk_size = (end - begin + num_chunks - 1) / num_chunks;
+    ParallelRun(num_chunks, [&](int64_t chunk_id) {
+      const int64_t chunk_begin = begin + chunk_id * chunk_size;
+      const int64_t chunk_end = std::min(end, chunk_begin + chunk_size);
+      if (chunk_begin < chunk_end) { func(chunk_begin, chunk_end); }
+    });
+  }
+
 #ifdef WITH_ONEDNN
   dnnl::engine* onednn_engine() const { return onednn_engine_.get(); }
   dnnl::stream* onednn_stream() const { return onednn_stream_.get(); }
+#endif
 
  private:
+  int64_t ParallelForNumChunks(int64_t num_elements, int64_t grain_size) const;
+  void ParallelRun(int64_t num_chunks, const std::function<void(int64_t)>& func);
+
+#ifdef WITH_ONEDNN
   std::unique_ptr<dnnl::engine> onednn_engine_;
   std::unique_ptr<dnnl::stream> onednn_stream_;
 #endif
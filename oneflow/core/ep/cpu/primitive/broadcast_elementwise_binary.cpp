@@ -18,6 +18,8 @@ limitations under the License.
 #include "oneflow/core/ep/common/primitive/broadcast_elementwise_binary.h"
 #include "oneflow/core/ep/cpu/primitive/binary_functor.h"
 #include "oneflow/core/ep/cpu/primitive/type_seq.h"
+#include "oneflow/core/ep/cpu/cpu_stream.h"
+#include "oneflow/core/ep/cpu/primitive/simd_kernels.h"
 #include "oneflow/core/ndarray/ndarray_util.h"
 #include "oneflow/core/ndarray/xpu_var_ndarray.h"
 
@@ -39,6 +41,27 @@ float16 GetValue<float16>(Scalar value) {
   return static_cast<float16>(GetValue<float>(value));
 }
 
+// The vectorized kernel of an op, or nullptr if there isn't one
+template<BinaryOp binary_op, typename Src, typename Dst>
+struct SimdBinaryKernel {
+  static simd::BinaryKernel Get() { return nullptr; }
+};
+
+#define SPECIALIZE_SIMD_BINARY_KERNEL(binary_op, kernel)                  \
+  template<>                                                              \
+  struct SimdBinaryKernel<binary_op, float, float> {                      \
+    static simd::BinaryKernel Get() { return simd::GetKernels().kernel; } \
+  };
+
+SPECIALIZE_SIMD_BINARY_KERNEL(BinaryOp::kAdd, add)
+SPECIALIZE_SIMD_BINARY_KERNEL(BinaryOp::kSub, sub)
+SPECIALIZE_SIMD_BINARY_KERNEL(BinaryOp::kMul, mul)
+SPECIALIZE_SIMD_BINARY_KERNEL(BinaryOp::kDiv, div)
+SPECIALIZE_SIMD_BINARY_KERNEL(BinaryOp::kMax, max)
+SPECIALIZE_SIMD_BINARY_KERNEL(BinaryOp::kMin, min)
+
+#undef SPECIALIZE_SIMD_BINARY_KERNEL
+
 template<BinaryOp binary_op, typename Src, typename Dst,
          void (*binary_func)(ep::Stream* stream, const XpuVarNdarray<Dst>& z,
                              const XpuVarNdarray<const Src>& x, const XpuVarNdarray<const Src>& y)>
@@ -52,24 +75,21 @@ class BroadcastElementwiseBinaryImpl : public BroadcastElementwiseBinary {
               const void* src1, void* dst) override {
     int64_t elem_cnt = GetElementCount(num_src1_dims, src1_dims);
     Src src0_val = GetValue<Src>(src0);
-    binary_func(stream, XpuVarNdarray<Dst>(Shape({elem_cnt}), reinterpret_cast<Dst*>(dst), 1),
-                XpuVarNdarray<const Src>(Shape({1}), &src0_val, 1),
-                XpuVarNdarray<const Src>(Shape({elem_cnt}), reinterpret_cast<const Src*>(src1), 1));
+    const int64_t scalar_dims[1] = {1};
+    LaunchParallel(stream, 1, scalar_dims, &src0_val, &elem_cnt,
+                   reinterpret_cast<const Src*>(src1), &elem_cnt, reinterpret_cast<Dst*>(dst));
   }
   void Launch(Stream* stream, size_t num_src0_dims, const int64_t* src0_dims, const void* src0,
               Scalar src1, void* dst) override {
     int64_t elem_cnt = GetElementCount(num_src0_dims, src0_dims);
     Src src1_val = GetValue<Src>(src1);
-    binary_func(stream, XpuVarNdarray<Dst>(Shape({elem_cnt}), reinterpret_cast<Dst*>(dst), 1),
-                XpuVarNdarray<const Src>(Shape({elem_cnt}), reinterpret_cast<const Src*>(src0), 1),
-                XpuVarNdarray<const Src>(Shape({1}), &src1_val, 1));
+    const int64_t scalar_dims[1] = {1};
+    LaunchParallel(stream, 1, &elem_cnt, reinterpret_cast<const Src*>(src0), scalar_dims,
+                   &src1_val, &elem_cnt, reinterpret_cast<Dst*>(dst));
   }
   void Launch(Stream* stream, size_t num_src0_dims, const int64_t* src0_dims, const void* src0,
               size_t num_src1_dims, const int64_t* src1_dims, const void* src1,
               void* dst) override {
-    DimVector src0_dim_vec;
-    DimVector src1_dim_vec;
-    DimVector dst_dim_vec;
     size_t num_dims = 0;
     int64_t simplified_src0_dims[kMaxNumDims];
     int64_t simplified_src1_dims[kMaxNumDims];
@@ -79,16 +99,85 @@ class BroadcastElementwiseBinaryImpl : public BroadcastElementwiseBinary {
                                        simplified_dst_dims);
     CheckInplace(num_dims, simplified_src0_dims, src0, simplified_src1_dims, src1,
                  simplified_dst_dims, dst);
-    for (int64_t i = 0; i < num_dims; ++i) {
-      src0_dim_vec.push_back(simplified_src0_dims[i]);
-      src1_dim_vec.push_back(simplified_src1_dims[i]);
-      dst_dim_vec.push_back(simplified_dst_dims[i]);
+    LaunchParallel(stream, num_dims, simplified_src0_dims, reinterpret_cast<const Src*>(src0),
+                   simplified_src1_dims, reinterpret_cast<const Src*>(src1), simplified_dst_dims,
+                   reinterpret_cast<Dst*>(dst));
+  }
+
+ private:
+  // Splits dst along its first dim, so that each thread computes a block of rows.
+  void LaunchParallel(Stream* stream, size_t num_dims, const int64_t* src0_dims, const Src* src0,
+                      const int64_t* src1_dims, const Src* src1, const int64_t* dst_dims,
+                      Dst* dst) {
+    const simd::BinaryKernel simd_kernel = SimdBinaryKernel<binary_op, Src, Dst>::Get();
+    if (simd_kernel != nullptr && num_dims >= 1 && num_dims <= 2) {
+      LaunchSimd(stream, simd_kernel, num_dims, src0_dims, src0, src1_dims, src1, dst_dims, dst);
+      return;
+    }
+    int64_t src0_row_size = 1;
+    int64_t src1_row_size = 1;
+    int64_t dst_row_size = 1;
+    for (size_t i = 1; i < num_dims; ++i) {
+      src0_row_size *= src0_dims[i];
+      src1_row_size *= src1_dims[i];
+      dst_row_size *= dst_dims[i];
     }
-    binary_func(
-        stream, XpuVarNdarray<Dst>(Shape(dst_dim_vec), reinterpret_cast<Dst*>(dst), num_dims),
-        XpuVarNdarray<const Src>(Shape(src0_dim_vec), reinterpret_cast<const Src*>(src0), num_dims),
-        XpuVarNdarray<const Src>(Shape(src1_dim_vec), reinterpret_cast<const Src*>(src1),
-                                 num_dims));
+    const int64_t grain_size =
+        std::max<int64_t>(1, kParallelForDefaultGrainSize / std::max<int64_t>(dst_row_size, 1));
+    stream->As<CpuStream>()->ParallelFor(
+        0, dst_dims[0],
+        [&](int64_t begin, int64_t end) {
+          DimVector src0_dim_vec(src0_dims, src0_dims + num_dims);
+          DimVector src1_dim_vec(src1_dims, src1_dims + num_dims);
+          DimVector dst_dim_vec(dst_dims, dst_dims + num_dims);
+          const Src* src0_rows = src0;
+          const Src* src1_rows = src1;
+          // A src broadcast along the first dim is used as a whole by all threads
+          if (src0_dims[0] != 1) {
+            src0_dim_vec[0] = end - begin;
+            src0_rows += begin * src0_row_size;
+          }
+          if (src1_dims[0] != 1) {
+            src1_dim_vec[0] = end - begin;
+            src1_rows += begin * src1_row_size;
+          }
+          dst_dim_vec[0] = end - begin;
+          binary_func(
+              stream,
+              XpuVarNdarray<Dst>(Shape(dst_dim_vec), dst + begin * dst_row_size, num_dims),
+              XpuVarNdarray<const Src>(Shape(src0_dim_vec), src0_rows, num_dims),
+              XpuVarNdarray<const Src>(Shape(src1_dim_vec), src1_rows, num_dims));
+        },
+        grain_size);
+  }
+
+  // Computes dst as rows, with each src either a whole matrix, a row broadcast along the first
+  // dim, a column broadcast along the second dim or a scalar, so that every segment of a row is
+  // a same-shape or scalar-operand call of the vectorized kernel.
+  void LaunchSimd(Stream* stream, simd::BinaryKernel simd_kernel, size_t num_dims,
+                  const int64_t* src0_dims, const Src* src0, const int64_t* src1_dims,
+                  const Src* src1, const int64_t* dst_dims, Dst* dst) {
+    const int64_t rows = num_dims == 2 ? dst_dims[0] : 1;
+    const int64_t cols = dst_dims[num_dims - 1];
+    const bool src0_row_broadcast = num_dims == 1 || src0_dims[0] == 1;
+    const bool src1_row_broadcast = num_dims == 1 || src1_dims[0] == 1;
+    const int64_t src0_cols = src0_dims[num_dims - 1];
+    const int64_t src1_cols = src1_dims[num_dims - 1];
+    const auto* x = reinterpret_cast<const float*>(src0);
+    const auto* y = reinterpret_cast<const float*>(src1);
+    auto* z = reinterpret_cast<float*>(dst);
+    stream->As<CpuStream>()->ParallelFor(0, rows * cols, [&](int64_t begin, int64_t end) {
+      for (int64_t i = begin; i < end;) {
+        const int64_t row = i / cols;
+        const int64_t col = i - row * cols;
+        const int64_t n = std::min(end - i, cols - col);
+        const float* x_seg = x + (src0_row_broadcast ? 0 : row * src0_cols);
+        const float* y_seg = y + (src1_row_broadcast ? 0 : row * src1_cols);
+        simd_kernel(n, src0_cols == 1 ? x_seg : x_seg + col, src0_cols == 1,
+                    src1_cols == 1 ? y_seg : y_seg + col, src1_cols == 1, z + i);
+        i += n;
+      }
+    });
   }
 };
 
@@ -16,6 +16,8 @@ limitations under the License.
 #include "oneflow/core/ep/common/primitive/elementwise_unary.h"
 #include "oneflow/core/ep/cpu/primitive/unary_functor.h"
 #include "oneflow/core/ep/cpu/primitive/type_seq.h"
+#include "oneflow/core/ep/cpu/cpu_stream.h"
+#include "oneflow/core/ep/cpu/primitive/simd_kernels.h"
 
 namespace oneflow {
 
@@ -24,6 +26,27 @@ namespace primitive {
 
 namespace {
 
+// The vectorized kernel of an op, or nullptr if there isn't one
+template<UnaryOp unary_op, typename Src, typename Dst>
+struct SimdUnaryKernel {
+  static simd::UnaryKernel Get() { return nullptr; }
+};
+
+template<>
+struct SimdUnaryKernel<UnaryOp::kRelu, float, float> {
+  static simd::UnaryKernel Get() { return simd::GetKernels().relu; }
+};
+
+template<>
+struct SimdUnaryKernel<UnaryOp::kGelu, float, float> {
+  static simd::UnaryKernel Get() { return simd::GetKernels().gelu; }
+};
+
+template<>
+struct SimdUnaryKernel<UnaryOp::kTanh, float, float> {
+  static simd::UnaryKernel Get() { return simd::GetKernels().tanh; }
+};
+
 template<UnaryOp unary_op, typename Src, typename Dst>
 class ElementwiseUnaryImpl : public ElementwiseUnary {
  public:
@@ -34,9 +57,20 @@ class ElementwiseUnaryImpl : public ElementwiseUnary {
   void Launch(Stream* stream, const void* src_ptr, void* dst_ptr, size_t count) override {
     Dst* dst = reinterpret_cast<Dst*>(dst_ptr);
     const Src* src = reinterpret_cast<const Src*>(src_ptr);
-    for (size_t i = 0; i < count; ++i) {
-      dst[i] = UnaryFunctor<DeviceType::kCPU, unary_op, Dst, Src>()(src[i]);
+    const simd::UnaryKernel simd_kernel = SimdUnaryKernel<unary_op, Src, Dst>::Get();
+    if (simd_kernel != nullptr) {
+      stream->As<CpuStream>()->ParallelFor(
+          0, count, [simd_kernel, src, dst](int64_t begin, int64_t end) {
+            simd_kernel(end - begin, reinterpret_cast<const float*>(src + begin),
+                        reinterpret_cast<float*>(dst + begin));
+          });
+      return;
     }
+    stream->As<CpuStream>()->ParallelFor(0, count, [src, dst](int64_t begin, int64_t end) {
+      for (int64_t i = begin; i < end; ++i) {
+        dst[i] = UnaryFunctor<DeviceType::kCPU, unary_op, Dst, Src>()(src[i]);
+      }
+    });
   }
 };
 
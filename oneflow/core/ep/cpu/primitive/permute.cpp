@@ -15,6 +15,7 @@ limitations under the License.
 */
 #include "oneflow/core/ep/include/primitive/permute.h"
 #include "oneflow/core/ep/common/primitive/permute_impl.h"
+#include "oneflow/core/ep/cpu/cpu_stream.h"
 
 namespace oneflow {
 
@@ -28,11 +29,12 @@ namespace internal {
 namespace {
 
 template<size_t num_dims, size_t movement_size, typename IndexType>
-void PermuteKernel(PermuteKernelParams<num_dims, IndexType> params) {
+void PermuteKernel(const PermuteKernelParams<num_dims, IndexType>& params, IndexType begin,
+                   IndexType end) {
   using T = typename std::aligned_storage<movement_size, movement_size>::type;
   const T* src = reinterpret_cast<const T*>(params.src);
   T* dst = reinterpret_cast<T*>(params.dst);
-  for (IndexType i = 0; i < params.count; ++i) {
+  for (IndexType i = begin; i < end; ++i) {
     IndexType src_index[num_dims];
     IndexType dst_index[num_dims];
     params.dst_index_helper.OffsetToNdIndex(i, dst_index);
@@ -49,7 +51,9 @@ void LaunchKernel(Stream* stream, const int64_t* src_dims, const void* src, cons
                   void* dst, size_t count) {
   PermuteKernelParams<num_dims, IndexType> params =
       MakePermuteParams<num_dims, IndexType>(src_dims, src, permutation, dst, count);
-  PermuteKernel<num_dims, movement_size, IndexType>(params);
+  stream->As<CpuStream>()->ParallelFor(0, count, [&params](int64_t begin, int64_t end) {
+    PermuteKernel<num_dims, movement_size, IndexType>(params, begin, end);
+  });
 }
 class PermuteImpl : public Permute {
  public:
@@ -0,0 +1,319 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#include "oneflow/core/ep/cpu/primitive/simd_kernels.h"
+#include <algorithm>
+#include <cmath>
+#include <cstdlib>
+#include <cstring>
+#include <limits>
+
+#if (defined(__x86_64__) || defined(__i386__)) && (defined(__GNUC__) || defined(__clang__))
+#define OF_SIMD_X86
+#include <immintrin.h>
+#endif
+
+namespace oneflow {
+
+namespace ep {
+namespace primitive {
+namespace simd {
+
+namespace scalar {
+
+// The reference kernels, computed element by element as the scalar functors do
+
+void ReluKernel(int64_t n, const float* x, float* y) {
+  for (int64_t i = 0; i < n; ++i) { y[i] = x[i] > 0.0f ? x[i] : 0.0f; }
+}
+
+void GeluKernel(int64_t n, const float* x, float* y) {
+  const float inv_sqrt2 = std::sqrt(0.5f);
+  for (int64_t i = 0; i < n; ++i) { y[i] = 0.5f * x[i] * (1.0f + std::erf(inv_sqrt2 * x[i])); }
+}
+
+void TanhKernel(int64_t n, const float* x, float* y) {
+  for (int64_t i = 0; i < n; ++i) { y[i] = std::tanh(x[i]); }
+}
+
+void ExpKernel(int64_t n, const float* x, float* y) {
+  for (int64_t i = 0; i < n; ++i) { y[i] = std::exp(x[i]); }
+}
+
+template<typename F>
+void BinaryLoop(int64_t n, const float* x, bool x_is_scalar, const float* y, bool y_is_scalar,
+                float* z, const F& f) {
+  for (int64_t i = 0; i < n; ++i) { z[i] = f(x[x_is_scalar ? 0 : i], y[y_is_scalar ? 0 : i]); }
+}
+
+#define OF_SIMD_DEFINE_BINARY_KERNEL(name, expr)                                             \
+  void name(int64_t n, const float* x, bool x_is_scalar, const float* y, bool y_is_scalar,   \
+            float* z) {                                                                      \
+    BinaryLoop(n, x, x_is_scalar, y, y_is_scalar, z, [](float a, float b) { return expr; }); \
+  }
+
+OF_SIMD_DEFINE_BINARY_KERNEL(AddKernel, a + b)
+OF_SIMD_DEFINE_BINARY_KERNEL(SubKernel, a - b)
+OF_SIMD_DEFINE_BINARY_KERNEL(MulKernel, a* b)
+OF_SIMD_DEFINE_BINARY_KERNEL(DivKernel, a / b)
+OF_SIMD_DEFINE_BINARY_KERNEL(MaxKernel, a > b ? a : b)
+OF_SIMD_DEFINE_BINARY_KERNEL(MinKernel, a < b ? a : b)
+
+#undef OF_SIMD_DEFINE_BINARY_KERNEL
+
+float ReduceMaxKernel(int64_t n, const float* x) {
+  float result = -std::numeric_limits<float>::infinity();
+  for (int64_t i = 0; i < n; ++i) { result = std::max(result, x[i]); }
+  return result;
+}
+
+float ReduceSumKernel(int64_t n, const float* x) {
+  float result = 0.0f;
+  for (int64_t i = 0; i < n; ++i) { result += x[i]; }
+  return result;
+}
+
+float ExpSumKernel(int64_t n, const float* x, float shift, float* y) {
+  float result = 0.0f;
+  for (int64_t i = 0; i < n; ++i) {
+    const float e = std::exp(x[i] - shift);
+    if (y != nullptr) { y[i] = e; }
+    result += e;
+  }
+  return result;
+}
+
+const Kernels kKernels = {
+    CpuIsa::kScalar, &ReluKernel,      &GeluKernel,      &TanhKernel,   &ExpKernel,
+    &AddKernel,      &SubKernel,       &MulKernel,       &DivKernel,    &MaxKernel,
+    &MinKernel,      &ReduceMaxKernel, &ReduceSumKernel, &ExpSumKernel,
+};
+
+}  // namespace scalar
+
+#ifdef OF_SIMD_X86
+
+// Each isa is compiled with its instructions enabled for the functions in its section only, so
+// the rest of the binary still runs on any x86-64 cpu.
+#if defined(__clang__)
+#define OF_SIMD_PUSH_TARGET_SSE4 \
+  _Pragma("clang attribute push(__attribute__((target(\"sse4.1\"))), apply_to = function)")
+#define OF_SIMD_PUSH_TARGET_AVX2 \
+  _Pragma("clang attribute push(__attribute__((target(\"avx2,fma\"))), apply_to = function)")
+#define OF_SIMD_PUSH_TARGET_AVX512 \
+  _Pragma(                         \
+      "clang attribute push(__attribute__((target(\"avx512f,avx2,fma\"))), apply_to = function)")
+#define OF_SIMD_POP_TARGET _Pragma("clang attribute pop")
+#define OF_SIMD_POP_TARGET_AVX512 OF_SIMD_POP_TARGET
+#else
+#define OF_SIMD_PUSH_TARGET_SSE4 _Pragma("GCC push_options") _Pragma("GCC target(\"sse4.1\")")
+#define OF_SIMD_PUSH_TARGET_AVX2 _Pragma("GCC push_options") _Pragma("GCC target(\"avx2,fma\")")
+// The avx512 intrinsics of gcc 12 trigger false maybe-uninitialized warnings
+#define OF_SIMD_PUSH_TARGET_AVX512                                        \
+  _Pragma("GCC push_options") _Pragma("GCC target(\"avx512f,avx2,fma\")") \
+      _Pragma("GCC diagnostic push") _Pragma("GCC diagnostic ignored \"-Wmaybe-uninitialized\"")
+#define OF_SIMD_POP_TARGET _Pragma("GCC pop_options")
+#define OF_SIMD_POP_TARGET_AVX512 _Pragma("GCC diagnostic pop") _Pragma("GCC pop_options")
+#endif
+
+OF_SIMD_PUSH_TARGET_SSE4
+namespace sse4 {
+
+constexpr CpuIsa kIsa = CpuIsa::kSse4;
+constexpr int64_t kWidth = 4;
+using Vec = __m128;
+
+inline Vec Load(const float* p) { return _mm_loadu_ps(p); }
+inline void Store(float* p, Vec a) { _mm_storeu_ps(p, a); }
+inline Vec Set1(float a) { return _mm_set1_ps(a); }
+inline Vec Add(Vec a, Vec b) { return _mm_add_ps(a, b); }
+inline Vec Sub(Vec a, Vec b) { return _mm_sub_ps(a, b); }
+inline Vec Mul(Vec a, Vec b) { return _mm_mul_ps(a, b); }
+inline Vec Div(Vec a, Vec b) { return _mm_div_ps(a, b); }
+inline Vec Max(Vec a, Vec b) { return _mm_max_ps(a, b); }
+inline Vec Min(Vec a, Vec b) { return _mm_min_ps(a, b); }
+inline Vec Fma(Vec a, Vec b, Vec c) { return _mm_add_ps(_mm_mul_ps(a, b), c); }
+inline Vec Floor(Vec a) { return _mm_floor_ps(a); }
+inline Vec Pow2n(Vec n) {
+  const __m128i e = _mm_add_epi32(_mm_cvttps_epi32(n), _mm_set1_epi32(127));
+  return _mm_castsi128_ps(_mm_slli_epi32(e, 23));
+}
+inline float ReduceAdd(Vec a) {
+  float buf[kWidth];
+  Store(buf, a);
+  return (buf[0] + buf[1]) + (buf[2] + buf[3]);
+}
+inline float ReduceMax(Vec a) {
+  float buf[kWidth];
+  Store(buf, a);
+  return std::max(std::max(buf[0], buf[1]), std::max(buf[2], buf[3]));
+}
+
+#include "oneflow/core/ep/cpu/primitive/simd_kernels_impl.h"
+
+}  // namespace sse4
+OF_SIMD_POP_TARGET
+
+OF_SIMD_PUSH_TARGET_AVX2
+namespace avx2 {
+
+constexpr CpuIsa kIsa = CpuIsa::kAvx2;
+constexpr int64_t kWidth = 8;
+using Vec = __m256;
+
+inline Vec Load(const float* p) { return _mm256_loadu_ps(p); }
+inline void Store(float* p, Vec a) { _mm256_storeu_ps(p, a); }
+inline Vec Set1(float a) { return _mm256_set1_ps(a); }
+inline Vec Add(Vec a, Vec b) { return _mm256_add_ps(a, b); }
+inline Vec Sub(Vec a, Vec b) { return _mm256_sub_ps(a, b); }
+inline Vec Mul(Vec a, Vec b) { return _mm256_mul_ps(a, b); }
+inline Vec Div(Vec a, Vec b) { return _mm256_div_ps(a, b); }
+inline Vec Max(Vec a, Vec b) { return _mm256_max_ps(a, b); }
+inline Vec Min(Vec a, Vec b) { return _mm256_min_ps(a, b); }
+inline Vec Fma(Vec a, Vec b, Vec c) { return _mm256_fmadd_ps(a, b, c); }
+inline Vec Floor(Vec a) { return _mm256_floor_ps(a); }
+inline Vec Pow2n(Vec n) {
+  const __m256i e = _mm256_add_epi32(_mm256_cvttps_epi32(n), _mm256_set1_epi32(127));
+  return _mm256_castsi256_ps(_mm256_slli_epi32(e, 23));
+}
+inline float ReduceAdd(Vec a) {
+  const __m128 sum = _mm_add_ps(_mm256_castps256_ps128(a), _mm256_extractf128_ps(a, 1));
+  float buf[4];
+  _mm_storeu_ps(buf, sum);
+  return (buf[0] + buf[1]) + (buf[2] + buf[3]);
+}
+inline float ReduceMax(Vec a) {
+  const __m128 max = _mm_max_ps(_mm256_castps256_ps128(a), _mm256_extractf128_ps(a, 1));
+  float buf[4];
+  _mm_storeu_ps(buf, max);
+  return std::max(std::max(buf[0], buf[1]), std::max(buf[2], buf[3]));
+}
+
+#include "oneflow/core/ep/cpu/primitive/simd_kernels_impl.h"
+
+}  // namespace avx2
+OF_SIMD_POP_TARGET
+
+OF_SIMD_PUSH_TARGET_AVX512
+namespace avx512 {
+
+constexpr CpuIsa kIsa = CpuIsa::kAvx512;
+constexpr int64_t kWidth = 16;
+using Vec = __m512;
+
+inline Vec Load(const float* p) { return _mm512_loadu_ps(p); }
+inline void Store(float* p, Vec a) { _mm512_storeu_ps(p, a); }
+inline Vec Set1(float a) { return _mm512_set1_ps(a); }
+inline Vec Add(Vec a, Vec b) { return _mm512_add_ps(a, b); }
+inline Vec Sub(Vec a, Vec b) { return _mm512_sub_ps(a, b); }
+inline Vec Mul(Vec a, Vec b) { return _mm512_mul_ps(a, b); }
+inline Vec Div(Vec a, Vec b) { return _mm512_div_ps(a, b); }
+inline Vec Max(Vec a, Vec b) { return _mm512_max_ps(a, b); }
+inline Vec Min(Vec a, Vec b) { return _mm512_min_ps(a, b); }
+inline Vec Fma(Vec a, Vec b, Vec c) { return _mm512_fmadd_ps(a, b, c); }
+inline Vec Floor(Vec a) {
+  return _mm512_roundscale_ps(a, _MM_FROUND_TO_NEG_INF | _MM_FROUND_NO_EXC);
+}
+inline Vec Pow2n(Vec n) {
+  const __m512i e = _mm512_add_epi32(_mm512_cvttps_epi32(n), _mm512_set1_epi32(127));
+  return _mm512_castsi512_ps(_mm512_slli_epi32(e, 23));
+}
+inline float ReduceAdd(Vec a) {
+  float buf[kWidth];
+  Store(buf, a);
+  float result = 0.0f;
+  for (int64_t i = 0; i < kWidth; ++i) { result += buf[i]; }
+  return result;
+}
+inline float ReduceMax(Vec a) {
+  float buf[kWidth];
+  Store(buf, a);
+  return *std::max_element(buf, buf + kWidth);
+}
+
+#include "oneflow/core/ep/cpu/primitive/simd_kernels_impl.h"
+
+}  // namespace avx512
+OF_SIMD_POP_TARGET_AVX512
+
+#endif  // OF_SIMD_X86
+
+namespace {
+
+CpuIsa CpuIsaFromEnv() {
+  const char* env = std::getenv("ONEFLOW_EP_CPU_ISA");
+  if (env == nullptr) { return CpuIsa::kAvx512; }
+  for (CpuIsa isa : {CpuIsa::kScalar, CpuIsa::kSse4, CpuIsa::kAvx2, CpuIsa::kAvx512}) {
+    if (std::strcmp(env, CpuIsaName(isa)) == 0) { return isa; }
+  }
+  return CpuIsa::kAvx512;
+}
+
+}  // namespace
+
+bool IsCpuIsaSupported(CpuIsa isa) {
+  switch (isa) {
+    case CpuIsa::kScalar: return true;
+#ifdef OF_SIMD_X86
+    case CpuIsa::kSse4: return __builtin_cpu_supports("sse4.1");
+    case CpuIsa::kAvx2: return __builtin_cpu_supports("avx2") && __builtin_cpu_supports("fma");
+    case CpuIsa::kAvx512: return __builtin_cpu_supports("avx512f");
+#endif
+    default: return false;
+  }
+}
+
+CpuIsa GetCpuIsa() {
+  static const CpuIsa cpu_isa = []() {
+    const CpuIsa max_isa = CpuIsaFromEnv();
+    for (CpuIsa isa : {CpuIsa::kAvx512, CpuIsa::kAvx2, CpuIsa::kSse4}) {
+      if (isa <= max_isa && IsCpuIsaSupported(isa)) { return isa; }
+    }
+    return CpuIsa::kScalar;
+  }();
+  return cpu_isa;
+}
+
+const char* CpuIsaName(CpuIsa isa) {
+  switch (isa) {
+    case CpuIsa::kScalar: return "scalar";
+    case CpuIsa::kSse4: return "sse4";
+    case CpuIsa::kAvx2: return "avx2";
+    case CpuIsa::kAvx512: return "avx512";
+    default: return "unknown";
+  }
+}
+
+const Kernels& GetKernels(CpuIsa isa) {
+  switch (isa) {
+#ifdef OF_SIMD_X86
+    case CpuIsa::kSse4: return sse4::kKernels;
+    case CpuIsa::kAvx2: return avx2::kKernels;
+    case CpuIsa::kAvx512: return avx512::kKernels;
+#endif
+    default: return scalar::kKernels;
+  }
+}
+
+const Kernels& GetKernels() {
+  static const Kernels& kernels = GetKernels(GetCpuIsa());
+  return kernels;
+}
+
+}  // namespace simd
+}  // namespace primitive
+}  // namespace ep
+
+}  // namespace oneflow
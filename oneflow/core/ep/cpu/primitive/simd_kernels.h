@@ -0,0 +1,82 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#ifndef ONEFLOW_CORE_EP_CPU_PRIMITIVE_SIMD_KERNELS_H_
+#define ONEFLOW_CORE_EP_CPU_PRIMITIVE_SIMD_KERNELS_H_
+
+#include <cstdint>
+
+namespace oneflow {
+
+namespace ep {
+namespace primitive {
+namespace simd {
+
+// Instruction sets the float kernels are compiled for. The one used is picked at runtime.
+enum class CpuIsa {
+  kScalar = 0,
+  kSse4 = 1,    // SSE4.1
+  kAvx2 = 2,    // AVX2 and FMA
+  kAvx512 = 3,  // AVX-512F
+};
+
+// y[i] = f(x[i])
+using UnaryKernel = void (*)(int64_t n, const float* x, float* y);
+// z[i] = f(x[x_is_scalar ? 0 : i], y[y_is_scalar ? 0 : i])
+using BinaryKernel = void (*)(int64_t n, const float* x, bool x_is_scalar, const float* y,
+                              bool y_is_scalar, float* z);
+using ReduceKernel = float (*)(int64_t n, const float* x);
+// Returns the sum of exp(x[i] - shift), and stores exp(x[i] - shift) into y[i] if y isn't null
+using ExpSumKernel = float (*)(int64_t n, const float* x, float shift, float* y);
+
+struct Kernels {
+  CpuIsa isa;
+  UnaryKernel relu;
+  UnaryKernel gelu;
+  UnaryKernel tanh;
+  UnaryKernel exp;
+  BinaryKernel add;
+  BinaryKernel sub;
+  BinaryKernel mul;
+  BinaryKernel div;
+  BinaryKernel max;
+  BinaryKernel min;
+  ReduceKernel reduce_max;
+  ReduceKernel reduce_sum;
+  ExpSumKernel exp_sum;
+};
+
+bool IsCpuIsaSupported(CpuIsa isa);
+
+// The best isa supported by the cpu and the build, capped by the ONEFLOW_EP_CPU_ISA environment
+// variable (one of scalar, sse4, avx2 and avx512).
+CpuIsa GetCpuIsa();
+
+const char* CpuIsaName(CpuIsa isa);
+
+// The kernels of a supported isa. The scalar kernels compute with the functions of <cmath>, the
+// others with polynomial approximations accurate to a few ulps.
+const Kernels& GetKernels(CpuIsa isa);
+
+// The kernels of GetCpuIsa()
+const Kernels& GetKernels();
+
+}  // namespace simd
+}  // namespace primitive
+}  // namespace ep
+
+}  // namespace oneflow
+
+#endif  // ONEFLOW_CORE_EP_CPU_PRIMITIVE_SIMD_KERNELS_H_
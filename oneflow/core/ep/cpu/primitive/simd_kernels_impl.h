@@ -0,0 +1,207 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+// The float kernels written with the vector functions of an isa. It's included by
+// simd_kernels.cpp once per isa, in the namespace of the isa and with the isa enabled, so it has
+// no include guard.
+//
+// Before including it, the namespace should define
+//   kIsa, the isa;
+//   kWidth, the number of floats in a vector;
+//   Vec, the vector type, and the functions Load, Store, Set1, Add, Sub, Mul, Div, Max, Min,
+//   Fma (a * b + c), Floor, Pow2n (2^n for an integral n), ReduceAdd and ReduceMax on it.
+// Max(a, b) and Min(a, b) return b if a or b is NaN.
+
+template<typename F>
+inline void UnaryLoop(int64_t n, const float* x, float* y, const F& f) {
+  int64_t i = 0;
+  for (; i + kWidth <= n; i += kWidth) { Store(y + i, f(Load(x + i))); }
+  if (i < n) {
+    float buf[kWidth] = {};
+    std::copy(x + i, x + n, buf);
+    Store(buf, f(Load(buf)));
+    std::copy(buf, buf + (n - i), y + i);
+  }
+}
+
+template<typename F>
+inline void BinaryLoop(int64_t n, const float* x, bool x_is_scalar, const float* y,
+                       bool y_is_scalar, float* z, const F& f) {
+  const Vec x_vec = Set1(x_is_scalar ? x[0] : 0.0f);
+  const Vec y_vec = Set1(y_is_scalar ? y[0] : 0.0f);
+  int64_t i = 0;
+  for (; i + kWidth <= n; i += kWidth) {
+    Store(z + i, f(x_is_scalar ? x_vec : Load(x + i), y_is_scalar ? y_vec : Load(y + i)));
+  }
+  if (i < n) {
+    float x_buf[kWidth] = {};
+    float y_buf[kWidth] = {};
+    if (!x_is_scalar) { std::copy(x + i, x + n, x_buf); }
+    if (!y_is_scalar) { std::copy(y + i, y + n, y_buf); }
+    Store(x_buf, f(x_is_scalar ? x_vec : Load(x_buf), y_is_scalar ? y_vec : Load(y_buf)));
+    std::copy(x_buf, x_buf + (n - i), z + i);
+  }
+}
+
+// Cephes expf. The clamping keeps NaN since Max and Min return their second argument for it.
+// Results beyond the float range overflow to inf, and the denormal ones are flushed to zero.
+inline Vec Exp(Vec x) {
+  x = Min(Set1(89.0f), Max(Set1(-88.3762626647949f), x));
+  const Vec fx = Floor(Fma(x, Set1(1.44269504088896341f), Set1(0.5f)));
+  Vec r = Sub(x, Mul(fx, Set1(0.693359375f)));
+  r = Sub(r, Mul(fx, Set1(-2.12194440e-4f)));
+  Vec y = Set1(1.9875691500e-4f);
+  y = Fma(y, r, Set1(1.3981999507e-3f));
+  y = Fma(y, r, Set1(8.3334519073e-3f));
+  y = Fma(y, r, Set1(4.1665795894e-2f));
+  y = Fma(y, r, Set1(1.6666665459e-1f));
+  y = Fma(y, r, Set1(5.0000001201e-1f));
+  y = Add(Fma(y, Mul(r, r), r), Set1(1.0f));
+  // 2^fx is out of range for fx = 128, so it's multiplied in two steps
+  const Vec fx_hi = Max(Sub(fx, Set1(127.0f)), Set1(0.0f));
+  return Mul(Mul(y, Pow2n(Sub(fx, fx_hi))), Pow2n(fx_hi));
+}
+
+// The 13/6 rational approximation of Eigen, saturated beyond +-7.9
+inline Vec Tanh(Vec x) {
+  x = Min(Set1(7.90531110763549805f), Max(Set1(-7.90531110763549805f), x));
+  const Vec x2 = Mul(x, x);
+  Vec p = Set1(-2.76076847742355e-16f);
+  p = Fma(p, x2, Set1(2.00018790482477e-13f));
+  p = Fma(p, x2, Set1(-8.60467152213735e-11f));
+  p = Fma(p, x2, Set1(5.12229709037114e-08f));
+  p = Fma(p, x2, Set1(1.48572235717979e-05f));
+  p = Fma(p, x2, Set1(6.37261928875436e-04f));
+  p = Fma(p, x2, Set1(4.89352455891786e-03f));
+  p = Mul(p, x);
+  Vec q = Set1(1.19825839466702e-06f);
+  q = Fma(q, x2, Set1(1.18534705686654e-04f));
+  q = Fma(q, x2, Set1(2.26843463243900e-03f));
+  q = Fma(q, x2, Set1(4.89352518554385e-03f));
+  return Div(p, q);
+}
+
+// The 13/8 rational approximation of Eigen, saturated beyond +-4
+inline Vec Erf(Vec x) {
+  x = Min(Set1(4.0f), Max(Set1(-4.0f), x));
+  const Vec x2 = Mul(x, x);
+  Vec p = Set1(-2.72614225801306e-10f);
+  p = Fma(p, x2, Set1(2.77068142495902e-08f));
+  p = Fma(p, x2, Set1(-2.10102402082508e-06f));
+  p = Fma(p, x2, Set1(-5.69250639462346e-05f));
+  p = Fma(p, x2, Set1(-7.34990630326855e-04f));
+  p = Fma(p, x2, Set1(-2.95459980854025e-03f));
+  p = Fma(p, x2, Set1(-1.60960333262415e-02f));
+  p = Mul(p, x);
+  Vec q = Set1(-1.45660718464996e-05f);
+  q = Fma(q, x2, Set1(-2.13374055278905e-04f));
+  q = Fma(q, x2, Set1(-1.68282697438203e-03f));
+  q = Fma(q, x2, Set1(-7.37332916720468e-03f));
+  q = Fma(q, x2, Set1(-1.42647390514189e-02f));
+  return Div(p, q);
+}
+
+// The functors are structs rather than lambdas, whose conversion to function pointers wouldn't be
+// compiled for the isa.
+struct ReluFunctor {
+  Vec operator()(Vec v) const { return Max(v, Set1(0.0f)); }
+};
+
+struct GeluFunctor {
+  Vec operator()(Vec v) const {
+    const Vec half_v = Mul(Set1(0.5f), v);
+    return Fma(half_v, Erf(Mul(v, Set1(0.70710678118654752f))), half_v);
+  }
+};
+
+struct TanhFunctor {
+  Vec operator()(Vec v) const { return Tanh(v); }
+};
+
+struct ExpFunctor {
+  Vec operator()(Vec v) const { return Exp(v); }
+};
+
+#define OF_SIMD_DEFINE_UNARY_KERNEL(name, functor) \
+  inline void name(int64_t n, const float* x, float* y) { UnaryLoop(n, x, y, functor()); }
+
+OF_SIMD_DEFINE_UNARY_KERNEL(ReluKernel, ReluFunctor)
+OF_SIMD_DEFINE_UNARY_KERNEL(GeluKernel, GeluFunctor)
+OF_SIMD_DEFINE_UNARY_KERNEL(TanhKernel, TanhFunctor)
+OF_SIMD_DEFINE_UNARY_KERNEL(ExpKernel, ExpFunctor)
+
+#undef OF_SIMD_DEFINE_UNARY_KERNEL
+
+#define OF_SIMD_DEFINE_BINARY_KERNEL(name, func)                                                  \
+  struct name##Functor {                                                                          \
+    Vec operator()(Vec a, Vec b) const { return func(a, b); }                                     \
+  };                                                                                              \
+  inline void name(int64_t n, const float* x, bool x_is_scalar, const float* y, bool y_is_scalar, \
+                   float* z) {                                                                    \
+    BinaryLoop(n, x, x_is_scalar, y, y_is_scalar, z, name##Functor());                            \
+  }
+
+OF_SIMD_DEFINE_BINARY_KERNEL(AddKernel, Add)
+OF_SIMD_DEFINE_BINARY_KERNEL(SubKernel, Sub)
+OF_SIMD_DEFINE_BINARY_KERNEL(MulKernel, Mul)
+OF_SIMD_DEFINE_BINARY_KERNEL(DivKernel, Div)
+OF_SIMD_DEFINE_BINARY_KERNEL(MaxKernel, Max)
+OF_SIMD_DEFINE_BINARY_KERNEL(MinKernel, Min)
+
+#undef OF_SIMD_DEFINE_BINARY_KERNEL
+
+inline float ReduceMaxKernel(int64_t n, const float* x) {
+  Vec acc = Set1(-std::numeric_limits<float>::infinity());
+  int64_t i = 0;
+  for (; i + kWidth <= n; i += kWidth) { acc = Max(acc, Load(x + i)); }
+  float result = ReduceMax(acc);
+  for (; i < n; ++i) { result = std::max(result, x[i]); }
+  return result;
+}
+
+inline float ReduceSumKernel(int64_t n, const float* x) {
+  Vec acc = Set1(0.0f);
+  int64_t i = 0;
+  for (; i + kWidth <= n; i += kWidth) { acc = Add(acc, Load(x + i)); }
+  float result = ReduceAdd(acc);
+  for (; i < n; ++i) { result += x[i]; }
+  return result;
+}
+
+inline float ExpSumKernel(int64_t n, const float* x, float shift, float* y) {
+  const Vec shift_vec = Set1(shift);
+  Vec acc = Set1(0.0f);
+  int64_t i = 0;
+  for (; i + kWidth <= n; i += kWidth) {
+    const Vec e = Exp(Sub(Load(x + i), shift_vec));
+    if (y != nullptr) { Store(y + i, e); }
+    acc = Add(acc, e);
+  }
+  float result = ReduceAdd(acc);
+  if (i < n) {
+    float buf[kWidth] = {};
+    std::copy(x + i, x + n, buf);
+    Store(buf, Exp(Sub(Load(buf), shift_vec)));
+    for (int64_t j = 0; j < n - i; ++j) { result += buf[j]; }
+    if (y != nullptr) { std::copy(buf, buf + (n - i), y + i); }
+  }
+  return result;
+}
+
+const Kernels kKernels = {
+    kIsa,       &ReluKernel,      &GeluKernel,      &TanhKernel,   &ExpKernel,
+    &AddKernel, &SubKernel,       &MulKernel,       &DivKernel,    &MaxKernel,
+    &MinKernel, &ReduceMaxKernel, &ReduceSumKernel, &ExpSumKernel,
+};
@@ -0,0 +1,155 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#include "oneflow/core/ep/cpu/primitive/simd_kernels.h"
+#include <gtest/gtest.h>
+#include <algorithm>
+#include <cmath>
+#include <limits>
+#include <random>
+#include <vector>
+
+namespace oneflow {
+
+namespace ep {
+namespace primitive {
+namespace simd {
+
+namespace {
+
+// Sizes around the vector widths, to cover the tails
+const int64_t kSizes[] = {0, 1, 3, 4, 7, 8, 15, 16, 17, 33, 1000};
+
+std::vector<CpuIsa> SupportedSimdIsas() {
+  std::vector<CpuIsa> isas;
+  for (CpuIsa isa : {CpuIsa::kSse4, CpuIsa::kAvx2, CpuIsa::kAvx512}) {
+    if (IsCpuIsaSupported(isa)) { isas.push_back(isa); }
+  }
+  return isas;
+}
+
+std::vector<float> RandomVector(int64_t n, float low, float high, uint32_t seed) {
+  std::mt19937 engine(seed);
+  std::uniform_real_distribution<float> dist(low, high);
+  std::vector<float> v(n);
+  for (auto& x : v) { x = dist(engine); }
+  return v;
+}
+
+void ExpectClose(const std::vector<float>& expected, const std::vector<float>& actual,
+                 float tolerance) {
+  ASSERT_EQ(expected.size(), actual.size());
+  for (size_t i = 0; i < expected.size(); ++i) {
+    if (std::isnan(expected[i])) {
+      ASSERT_TRUE(std::isnan(actual[i])) << i;
+    } else if (std::isinf(expected[i])) {
+      ASSERT_EQ(expected[i], actual[i]) << i;
+    } else {
+      ASSERT_NEAR(expected[i], actual[i], tolerance * std::max(1.0f, std::fabs(expected[i]))) << i;
+    }
+  }
+}
+
+void TestUnaryKernel(UnaryKernel (*get)(const Kernels&), float low, float high, float tolerance) {
+  const Kernels& scalar_kernels = GetKernels(CpuIsa::kScalar);
+  for (CpuIsa isa : SupportedSimdIsas()) {
+    for (int64_t n : kSizes) {
+      std::vector<float> x = RandomVector(n, low, high, n);
+      if (n > 2) {
+        x[0] = std::numeric_limits<float>::quiet_NaN();
+        x[1] = 0.0f;
+      }
+      std::vector<float> expected(n);
+      std::vector<float> actual(n);
+      get(scalar_kernels)(n, x.data(), expected.data());
+      get(GetKernels(isa))(n, x.data(), actual.data());
+      ExpectClose(expected, actual, tolerance);
+    }
+  }
+}
+
+void TestBinaryKernel(BinaryKernel (*get)(const Kernels&)) {
+  const Kernels& scalar_kernels = GetKernels(CpuIsa::kScalar);
+  for (CpuIsa isa : SupportedSimdIsas()) {
+    for (int64_t n : kSizes) {
+      const std::vector<float> x = RandomVector(n + 1, -10.0f, 10.0f, n);
+      const std::vector<float> y = RandomVector(n + 1, 0.5f, 10.0f, n + 1);
+      for (bool x_is_scalar : {false, true}) {
+        for (bool y_is_scalar : {false, true}) {
+          std::vector<float> expected(n);
+          std::vector<float> actual(n);
+          get(scalar_kernels)(n, x.data(), x_is_scalar, y.data(), y_is_scalar, expected.data());
+          get(GetKernels(isa))(n, x.data(), x_is_scalar, y.data(), y_is_scalar, actual.data());
+          // The same instructions as the scalar ones, so the results are exact
+          ExpectClose(expected, actual, 0.0f);
+        }
+      }
+    }
+  }
+}
+
+}  // namespace
+
+TEST(SimdKernels, Isa) {
+  ASSERT_TRUE(IsCpuIsaSupported(CpuIsa::kScalar));
+  ASSERT_TRUE(IsCpuIsaSupported(GetCpuIsa()));
+  ASSERT_EQ(GetKernels().isa, GetCpuIsa());
+  for (CpuIsa isa : SupportedSimdIsas()) { ASSERT_EQ(GetKernels(isa).isa, isa); }
+}
+
+TEST(SimdKernels, Unary) {
+  TestUnaryKernel([](const Kernels& k) { return k.relu; }, -10.0f, 10.0f, 0.0f);
+  TestUnaryKernel([](const Kernels& k) { return k.gelu; }, -10.0f, 10.0f, 2e-6f);
+  TestUnaryKernel([](const Kernels& k) { return k.tanh; }, -10.0f, 10.0f, 2e-6f);
+  TestUnaryKernel([](const Kernels& k) { return k.exp; }, -80.0f, 80.0f, 2e-6f);
+  // Overflow to inf
+  TestUnaryKernel([](const Kernels& k) { return k.exp; }, 88.0f, 100.0f, 2e-6f);
+}
+
+TEST(SimdKernels, Binary) {
+  TestBinaryKernel([](const Kernels& k) { return k.add; });
+  TestBinaryKernel([](const Kernels& k) { return k.sub; });
+  TestBinaryKernel([](const Kernels& k) { return k.mul; });
+  TestBinaryKernel([](const Kernels& k) { return k.div; });
+  TestBinaryKernel([](const Kernels& k) { return k.max; });
+  TestBinaryKernel([](const Kernels& k) { return k.min; });
+}
+
+TEST(SimdKernels, Reduce) {
+  const Kernels& scalar_kernels = GetKernels(CpuIsa::kScalar);
+  for (CpuIsa isa : SupportedSimdIsas()) {
+    const Kernels& kernels = GetKernels(isa);
+    for (int64_t n : kSizes) {
+      const std::vector<float> x = RandomVector(n, -10.0f, 10.0f, n);
+      const float tolerance = 1e-5f * std::max<int64_t>(n, 1);
+      ASSERT_EQ(scalar_kernels.reduce_max(n, x.data()), kernels.reduce_max(n, x.data()));
+      ASSERT_NEAR(scalar_kernels.reduce_sum(n, x.data()), kernels.reduce_sum(n, x.data()),
+                  tolerance);
+      std::vector<float> expected(n);
+      std::vector<float> actual(n);
+      const float expected_sum = scalar_kernels.exp_sum(n, x.data(), 3.0f, expected.data());
+      const float actual_sum = kernels.exp_sum(n, x.data(), 3.0f, actual.data());
+      ASSERT_NEAR(expected_sum, actual_sum, tolerance * std::max(1.0f, expected_sum));
+      ASSERT_EQ(actual_sum, kernels.exp_sum(n, x.data(), 3.0f, nullptr));
+      ExpectClose(expected, actual, 2e-6f);
+    }
+  }
+}
+
+}  // namespace simd
+}  // namespace primitive
+}  // namespace ep
+
+}  // namespace oneflow
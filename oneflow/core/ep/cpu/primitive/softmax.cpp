@@ -16,6 +16,8 @@ limitations under the License.
 #include "oneflow/core/ep/include/primitive/softmax.h"
 #include "oneflow/core/ep/include/primitive/log_softmax.h"
 #include "oneflow/core/ep/cpu/primitive/type_seq.h"
+#include "oneflow/core/ep/cpu/cpu_stream.h"
+#include "oneflow/core/ep/cpu/primitive/simd_kernels.h"
 
 namespace oneflow {
 
@@ -61,6 +63,32 @@ void SoftmaxCpu(size_t rows, size_t cols, const T* x, T* y) {
   }
 }
 
+template<Algorithm algorithm, typename T>
+void SoftmaxRows(size_t rows, size_t cols, const T* x, T* y) {
+  SoftmaxCpu<algorithm, T>(rows, cols, x, y);
+}
+
+// Float rows are computed with the vectorized kernels
+template<Algorithm algorithm>
+void SoftmaxRows(size_t rows, size_t cols, const float* x, float* y) {
+  const simd::Kernels& kernels = simd::GetKernels();
+  for (size_t i = 0; i < rows; ++i) {
+    const float* row_x = x + i * cols;
+    float* row_y = y + i * cols;
+    const float row_max = kernels.reduce_max(cols, row_x);
+    if (algorithm == Algorithm::kSoftmax) {
+      const float row_sum = kernels.exp_sum(cols, row_x, row_max, row_y);
+      kernels.div(cols, row_y, false, &row_sum, true, row_y);
+    } else if (algorithm == Algorithm::kLogSoftmax) {
+      const float log_row_sum = std::log(kernels.exp_sum(cols, row_x, row_max, nullptr));
+      kernels.sub(cols, row_x, false, &row_max, true, row_y);
+      kernels.sub(cols, row_y, false, &log_row_sum, true, row_y);
+    } else {
+      UNIMPLEMENTED();
+    }
+  }
+}
+
 template<typename SoftmaxBase, Algorithm algorithm, typename T>
 class SoftmaxImpl : public SoftmaxBase {
  public:
@@ -69,7 +97,17 @@ class SoftmaxImpl : public SoftmaxBase {
   ~SoftmaxImpl() override = default;
 
   void Launch(Stream* stream, size_t rows, size_t cols, const void* x, void* y) override {
-    SoftmaxCpu<algorithm, T>(rows, cols, reinterpret_cast<const T*>(x), reinterpret_cast<T*>(y));
+    const T* x_ptr = reinterpret_cast<const T*>(x);
+    T* y_ptr = reinterpret_cast<T*>(y);
+    // Rows are split among threads
+    const int64_t grain_size =
+        std::max<int64_t>(1, kParallelForDefaultGrainSize / std::max<size_t>(cols, 1));
+    stream->As<CpuStream>()->ParallelFor(
+        0, rows,
+        [x_ptr, y_ptr, cols](int64_t begin, int64_t end) {
+          SoftmaxRows<algorithm>(end - begin, cols, x_ptr + begin * cols, y_ptr + begin * cols);
+        },
+        grain_size);
   }
 };
 
@@ -337,28 +337,42 @@ class UserOpExprOpDeviceInferContext final : public user_op::DeviceInferContext
   return std::shared_ptr<const ConsistentTensorInferResult>(std::move(result));
 }
 
+ConsistentTensorInferCache::ConsistentTensorInferCache(
+    const std::shared_ptr<const UserOpExpr>& user_op_expr)
+    : user_op_expr_(user_op_expr),
+      counters_(InferCacheCounters4OpType("consistent_tensor_infer_cache",
+                                          user_op_expr->op_type_name())) {}
+
 Maybe<const ConsistentTensorInferResult> ConsistentTensorInferCache::GetOrInfer(
     const ConsistentTensorMetaInferArgs& infer_args) {
-  auto iter = cache_.find(infer_args);
-  if (iter == cache_.end()) {
-    const auto& user_op_expr = user_op_expr_.lock();
-    CHECK_OR_RETURN(static_cast<bool>(user_op_expr));
-    const auto& output_tensor_metas = JUST(Infer(*user_op_expr, infer_args));
-    iter = cache_.emplace(infer_args, output_tensor_metas).first;
+  const auto* cached = cache_.Find(infer_args);
+  if (cached != nullptr) {
+    counters_->num_hits.fetch_add(1, std::memory_order_relaxed);
+    return *cached;
   }
-  return iter->second;
+  counters_->num_misses.fetch_add(1, std::memory_order_relaxed);
+  const auto& user_op_expr = user_op_expr_.lock();
+  CHECK_OR_RETURN(static_cast<bool>(user_op_expr));
+  const auto& output_tensor_metas = JUST(Infer(*user_op_expr, infer_args));
+  size_t num_evicted = cache_.Put(infer_args, output_tensor_metas, InferCacheCapacity());
+  counters_->num_evictions.fetch_add(num_evicted, std::memory_order_relaxed);
+  return output_tensor_metas;
 }
 
 Maybe<const ConsistentTensorInferResult> ConsistentTensorInferCache::GetOrInfer(
     const SrcOpConsistentTensorMetaInferArgs& infer_args) {
-  auto iter = src_op_cache_.find(infer_args);
-  if (iter == src_op_cache_.end()) {
-    const auto& user_op_expr = user_op_expr_.lock();
-    CHECK_OR_RETURN(static_cast<bool>(user_op_expr));
-    const auto& output_tensor_metas = JUST(Infer(*user_op_expr, infer_args));
-    iter = src_op_cache_.emplace(infer_args, output_tensor_metas).first;
+  const auto* cached = src_op_cache_.Find(infer_args);
+  if (cached != nullptr) {
+    counters_->num_hits.fetch_add(1, std::memory_order_relaxed);
+    return *cached;
   }
-  return iter->second;
+  counters_->num_misses.fetch_add(1, std::memory_order_relaxed);
+  const auto& user_op_expr = user_op_expr_.lock();
+  CHECK_OR_RETURN(static_cast<bool>(user_op_expr));
+  const auto& output_tensor_metas = JUST(Infer(*user_op_expr, infer_args));
+  size_t num_evicted = src_op_cache_.Put(infer_args, output_tensor_metas, InferCacheCapacity());
+  counters_->num_evictions.fetch_add(num_evicted, std::memory_order_relaxed);
+  return output_tensor_metas;
 }
 
 }  // namespace one
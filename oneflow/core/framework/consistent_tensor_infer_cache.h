@@ -19,6 +19,8 @@ limitations under the License.
 #include "oneflow/core/common/symbol.h"
 #include "oneflow/core/common/maybe.h"
 #include "oneflow/core/common/optional.h"
+#include "oneflow/core/common/lru_cache.h"
+#include "oneflow/core/framework/infer_cache_stats.h"
 #include "oneflow/core/framework/attr_map.h"
 #include "oneflow/core/framework/device.h"
 #include "oneflow/core/framework/tensor_meta.h"
@@ -209,8 +211,7 @@ class ConsistentTensorInferResult final {
 
 class ConsistentTensorInferCache final {
  public:
-  ConsistentTensorInferCache(const std::shared_ptr<const UserOpExpr>& user_op_expr)
-      : user_op_expr_(user_op_expr) {}
+  explicit ConsistentTensorInferCache(const std::shared_ptr<const UserOpExpr>& user_op_expr);
 
   Maybe<const ConsistentTensorInferResult> GetOrInfer(
       const ConsistentTensorMetaInferArgs& infer_args);
@@ -229,9 +230,11 @@ class ConsistentTensorInferCache final {
                                              const ConsistentTensorMetaInferArgs& infer_args);
 
   std::weak_ptr<const UserOpExpr> user_op_expr_;
-  HashMap<ConsistentTensorMetaInferArgs, std::shared_ptr<const ConsistentTensorInferResult>> cache_;
-  HashMap<SrcOpConsistentTensorMetaInferArgs, std::shared_ptr<const ConsistentTensorInferResult>>
+  LruCache<ConsistentTensorMetaInferArgs, std::shared_ptr<const ConsistentTensorInferResult>>
+      cache_;
+  LruCache<SrcOpConsistentTensorMetaInferArgs, std::shared_ptr<const ConsistentTensorInferResult>>
       src_op_cache_;
+  InferCacheCounters* counters_;
 };
 
 }  // namespace one
@@ -0,0 +1,83 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#include <memory>
+#include <mutex>
+#include "oneflow/core/framework/infer_cache_stats.h"
+#include "oneflow/core/common/util.h"
+
+namespace oneflow {
+
+namespace {
+
+constexpr int64_t kDefaultInferCacheCapacity = 4096;
+
+std::mutex* CountersMutex() {
+  static std::mutex mutex;
+  return &mutex;
+}
+
+std::map<std::pair<std::string, std::string>, std::unique_ptr<InferCacheCounters>>*
+MutCounters() {
+  static std::map<std::pair<std::string, std::string>, std::unique_ptr<InferCacheCounters>>
+      counters;
+  return &counters;
+}
+
+std::atomic<size_t>* MutInferCacheCapacity() {
+  static std::atomic<size_t> capacity(
+      ParseIntegerFromEnv("ONEFLOW_INFER_CACHE_CAPACITY", kDefaultInferCacheCapacity));
+  return &capacity;
+}
+
+}  // namespace
+
+InferCacheCounters* InferCacheCounters4OpType(const std::string& cache_name,
+                                              const std::string& op_type_name) {
+  std::unique_lock<std::mutex> lock(*CountersMutex());
+  auto& counters = (*MutCounters())[std::make_pair(cache_name, op_type_name)];
+  if (!counters) { counters.reset(new InferCacheCounters()); }
+  return counters.get();
+}
+
+InferCacheStats GetInferCacheStats() {
+  InferCacheStats stats;
+  std::unique_lock<std::mutex> lock(*CountersMutex());
+  for (const auto& pair : *MutCounters()) {
+    auto* op_stats = &stats[pair.first.first][pair.first.second];
+    const InferCacheCounters& counters = *pair.second;
+    (*op_stats)["num_hits"] = counters.num_hits.load(std::memory_order_relaxed);
+    (*op_stats)["num_misses"] = counters.num_misses.load(std::memory_order_relaxed);
+    (*op_stats)["num_evictions"] = counters.num_evictions.load(std::memory_order_relaxed);
+  }
+  return stats;
+}
+
+void ResetInferCacheStats() {
+  std::unique_lock<std::mutex> lock(*CountersMutex());
+  for (const auto& pair : *MutCounters()) {
+    pair.second->num_hits = 0;
+    pair.second->num_misses = 0;
+    pair.second->num_evictions = 0;
+  }
+}
+
+size_t InferCacheCapacity() { return MutInferCacheCapacity()->load(std::memory_order_relaxed); }
+
+void SetInferCacheCapacity(size_t capacity) {
+  MutInferCacheCapacity()->store(capacity, std::memory_order_relaxed);
+}
+
+}  // namespace oneflow
@@ -0,0 +1,51 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#ifndef ONEFLOW_CORE_FRAMEWORK_INFER_CACHE_STATS_H_
+#define ONEFLOW_CORE_FRAMEWORK_INFER_CACHE_STATS_H_
+
+#include <atomic>
+#include <map>
+#include <string>
+
+namespace oneflow {
+
+struct InferCacheCounters final {
+  std::atomic<int64_t> num_hits{0};
+  std::atomic<int64_t> num_misses{0};
+  std::atomic<int64_t> num_evictions{0};
+};
+
+// Counters shared by the infer caches named `cache_name` of all ops of `op_type_name`. The
+// returned pointer is valid until the process exits.
+InferCacheCounters* InferCacheCounters4OpType(const std::string& cache_name,
+                                              const std::string& op_type_name);
+
+// cache name -> op type name -> counter name -> value
+using InferCacheStats =
+    std::map<std::string, std::map<std::string, std::map<std::string, int64_t>>>;
+
+InferCacheStats GetInferCacheStats();
+void ResetInferCacheStats();
+
+// The maximum number of entries of each infer cache, 0 means unbounded. Defaults to the
+// ONEFLOW_INFER_CACHE_CAPACITY environment variable or 4096. A new capacity applies to the
+// caches from their next insertion on.
+size_t InferCacheCapacity();
+void SetInferCacheCapacity(size_t capacity);
+
+}  // namespace oneflow
+
+#endif  // ONEFLOW_CORE_FRAMEWORK_INFER_CACHE_STATS_H_
@@ -33,8 +33,67 @@ std::list<intrusive::shared_ptr<vm::InstructionMsg>>* RecordedInstructionList()
   return &list;
 }
 
+EagerCapture** CurrentEagerCapturePtr() {
+  static thread_local EagerCapture* capture = nullptr;
+  return &capture;
+}
+
+// Host callbacks (tensor data access, synchronization) capture objects of the python call which
+// issued them, replaying them would run callbacks of a finished call.
+bool IsHostCallbackInstruction(const std::string& instr_type_name) {
+  return instr_type_name.find("AccessBlobByCallback") != std::string::npos
+         || instr_type_name == "ComputeRankFrontSeqCallback"
+         || instr_type_name == "ComputeGlobalFrontSeqBarrier"
+         || instr_type_name == "RemoveForeignCallback";
+}
+
 }  // namespace
 
+EagerCapture::~EagerCapture() {
+  if (Current() == this) { *CurrentEagerCapturePtr() = nullptr; }
+}
+
+EagerCapture* EagerCapture::Current() { return *CurrentEagerCapturePtr(); }
+
+Maybe<void> EagerCapture::Begin() {
+  CHECK_OR_RETURN(Current() == nullptr) << "eager capture can not be nested";
+  CHECK_OR_RETURN(instructions_.empty()) << "eager capture has been recorded, reset it first";
+  capturing_ = true;
+  *CurrentEagerCapturePtr() = this;
+  return Maybe<void>::Ok();
+}
+
+Maybe<void> EagerCapture::End() {
+  CHECK_OR_RETURN(capturing_) << "eager capture is not recording";
+  CHECK_OR_RETURN(Current() == this) << "eager capture should end on the thread it begins";
+  capturing_ = false;
+  *CurrentEagerCapturePtr() = nullptr;
+  return Maybe<void>::Ok();
+}
+
+Maybe<void> EagerCapture::Record(const intrusive::shared_ptr<vm::InstructionMsg>& instruction) {
+  CHECK_OR_RETURN(!IsHostCallbackInstruction(instruction->instr_type_name()))
+      << "accessing tensor data on host or synchronizing (like Tensor.numpy() or creating a "
+         "tensor from host data) is not supported in eager capture, instruction: "
+      << instruction->instr_type_name();
+  instructions_.emplace_back(instruction);
+  return Maybe<void>::Ok();
+}
+
+Maybe<void> EagerCapture::Replay() const {
+  CHECK_OR_RETURN(!capturing_) << "eager capture can not be replayed before it ends";
+  vm::InstructionMsgList instr_msg_list;
+  EagerCapture* current = Current();
+  for (const auto& instr_msg : instructions_) {
+    const auto& cloned = instr_msg->Clone();
+    // Replaying in another capture records the replayed instructions into it
+    if (current != nullptr) { JUST(current->Record(cloned)); }
+    instr_msg_list.EmplaceBack(cloned);
+  }
+  JUST(vm::Run(&instr_msg_list));
+  return Maybe<void>::Ok();
+}
+
 namespace debug {
 
 bool RecordingInstructions() { return *RecordingInstructionsFlag(); }
@@ -17,10 +17,41 @@ limitations under the License.
 #ifndef ONEFLOW_CORE_FRAMEWORK_INSTRUCTION_REPLAY_H_
 #define ONEFLOW_CORE_FRAMEWORK_INSTRUCTION_REPLAY_H_
 
+#include <vector>
+#include "oneflow/core/common/maybe.h"
 #include "oneflow/core/vm/instruction.h"
 
 namespace oneflow {
 
+// Records the instructions of the eager ops run by this thread between Begin() and End(), so that
+// Replay() re-runs the same kernels on the same tensors without python dispatch, functional api
+// argument parsing or op infer. The recorded tensors are kept alive and act as static buffers:
+// new inputs are fed by writing into the captured input tensors in place, and results are read
+// from the captured output tensors after each replay.
+class EagerCapture final {
+ public:
+  EagerCapture(const EagerCapture&) = delete;
+  EagerCapture(EagerCapture&&) = delete;
+  EagerCapture() : capturing_(false) {}
+  ~EagerCapture();
+
+  // The capture recording the instructions of this thread, or nullptr.
+  static EagerCapture* Current();
+
+  bool capturing() const { return capturing_; }
+  size_t num_instructions() const { return instructions_.size(); }
+
+  Maybe<void> Begin();
+  Maybe<void> End();
+  Maybe<void> Record(const intrusive::shared_ptr<vm::InstructionMsg>& instruction);
+  Maybe<void> Replay() const;
+  void Reset() { instructions_.clear(); }
+
+ private:
+  bool capturing_;
+  std::vector<intrusive::shared_ptr<vm::InstructionMsg>> instructions_;
+};
+
 namespace debug {
 
 bool RecordingInstructions();
@@ -1864,6 +1864,11 @@ Maybe<void> PhysicalRun(const std::function<Maybe<void>(InstructionsBuilder*)>&
       debug::RecordInstruction(instruction_msg);
     }
   }
+  if (EagerCapture* capture = EagerCapture::Current()) {
+    INTRUSIVE_FOR_EACH(instruction_msg, instructions_builder.mut_instruction_list()) {
+      JUST(capture->Record(instruction_msg));
+    }
+  }
   JUST(Global<vm::EagerOneflow>::Get()->RunPhysicalInstruction(
       instructions_builder.mut_instruction_list(), instructions_builder.eager_symbol_list()));
   return Maybe<void>::Ok();
@@ -123,6 +123,19 @@ Maybe<void> MultiClientSessionContext::AddCGraph(
   return Maybe<void>::Ok();
 }
 
+Maybe<void> MultiClientSessionContext::RemoveCGraph(
+    const std::shared_ptr<oneflow::NNGraph>& c_graph_ptr) {
+  CHECK_OR_RETURN(is_inited_) << " session must be inited when remove graph.";
+  const auto& it = std::find(graphs_.begin(), graphs_.end(), c_graph_ptr);
+  CHECK_OR_RETURN(it != graphs_.end())
+      << " graph " << c_graph_ptr->job_name() << " is not added to the session.";
+  // sync to ensure LaunchLazyJob instructions of the graph were completed and released
+  JUST(vm::ClusterSync());
+  JUST(c_graph_ptr->Close());
+  graphs_.erase(it);
+  return Maybe<void>::Ok();
+}
+
 Maybe<void> MultiClientSessionContext::TryClose() {
   if (is_inited_) {
     VLOG(2) << "Try to delete multi client session context." << std::endl;
@@ -32,6 +32,8 @@ class MultiClientSessionContext {
 
   Maybe<void> TryInit(const ConfigProto& config_proto);
   Maybe<void> AddCGraph(const std::shared_ptr<oneflow::NNGraph>& c_graph_ptr);
+  // Closes the graph and releases its runtime before the session is closed.
+  Maybe<void> RemoveCGraph(const std::shared_ptr<oneflow::NNGraph>& c_graph_ptr);
   Maybe<void> TryClose();
 
   // NOTE(chengcheng): for nn.Graph catch free EagerTensor in Graph.build().
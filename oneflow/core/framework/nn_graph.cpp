@@ -31,6 +31,7 @@ limitations under the License.
 #include "oneflow/core/job/job_instance.h"
 #include "oneflow/core/job/critical_section_instance.h"
 #include "oneflow/core/job/lazy_mode.h"
+#include "oneflow/core/job/plan_cache.h"
 #include "oneflow/core/job/plan_util.h"
 #include "oneflow/core/persistence/tee_persistent_log_stream.h"
 #include "oneflow/core/vm/vm_util.h"
@@ -247,34 +248,66 @@ Maybe<void> NNGraph::CompileAndInitRuntime() {
   auto scope = std::make_unique<GlobalJobDescScope>(job_.job_conf(), job_ctx->job_id());
   if (GlobalProcessCtx::IsThisProcessMaster()) {
     double start = GetCurTime();
-    // TODO(chengcheng): new memory reused by chunk
-    Compiler().Compile(&job_, &plan_, /* need_job_complete */ true);
-    PlanUtil::GenMemBlockAndChunkWithVariableOpNames4Plan(&plan_, variable_op_names_);
-
-    LOG(INFO) << "\njob_id: " << job_ctx->job_id() << " , job_name: " << name_
-              << " , compile time: " << (GetCurTime() - start) / 1000000000.0 << " seconds.\n";
-    if (Global<ResourceDesc, ForSession>::Get()->enable_debug_mode()) {
-      TeePersistentLogStream::Create("job_" + name_ + "_plan")->Write(plan_);
-      PlanUtil::ToDotFile(plan_, "job_" + name_ + "_plan.dot");
+    PlanCacheKey plan_cache_key;
+    bool is_plan_cached = false;
+    if (!plan_cache_dir_.empty()) {
+      JUST(MakePlanCacheKey(job_, job_ctx->job_id(), variable_op_names_, &plan_cache_key));
+      is_plan_cached = JUST(TryLoadPlanFromCache(plan_cache_dir_, plan_cache_key, &plan_));
+    }
+    if (is_plan_cached) {
+      LOG(INFO) << "\njob_id: " << job_ctx->job_id() << " , job_name: " << name_
+                << " , load plan from cache " << plan_cache_dir_
+                << " time: " << (GetCurTime() - start) / 1000000000.0 << " seconds.\n";
+    } else {
+      // TODO(chengcheng): new memory reused by chunk
+      Compiler().Compile(&job_, &plan_, /* need_job_complete */ true);
+      PlanUtil::GenMemBlockAndChunkWithVariableOpNames4Plan(&plan_, variable_op_names_);
+
+      LOG(INFO) << "\njob_id: " << job_ctx->job_id() << " , job_name: " << name_
+                << " , compile time: " << (GetCurTime() - start) / 1000000000.0 << " seconds.\n";
+      if (Global<ResourceDesc, ForSession>::Get()->enable_debug_mode()) {
+        TeePersistentLogStream::Create("job_" + name_ + "_plan")->Write(plan_);
+        PlanUtil::ToDotFile(plan_, "job_" + name_ + "_plan.dot");
+      }
+      // TODO(chengcheng): test collective boxing for multi-job.
+      PlanUtil::GenCollectiveBoxingPlan(&job_, &plan_);
+      // PlanUtil::SetForceInplaceMemBlock(&plan_); NOTE(chengcheng): only for ssp.
+      PlanUtil::DumpCtrlRegstInfoToPlan(&plan_);
+      if (!plan_cache_dir_.empty()) {
+        JUST(SavePlanToCache(plan_cache_dir_, plan_cache_key, name_,
+                             (GetCurTime() - start) / 1000000000.0, &plan_));
+      }
     }
-    // TODO(chengcheng): test collective boxing for multi-job.
-    PlanUtil::GenCollectiveBoxingPlan(&job_, &plan_);
-    // PlanUtil::SetForceInplaceMemBlock(&plan_); NOTE(chengcheng): only for ssp.
-    PlanUtil::DumpCtrlRegstInfoToPlan(&plan_);
     PlanUtil::PlanMemoryLog(&plan_, name_);
   }
   if (GlobalProcessCtx::WorldSize() > 1) {
-    std::string plan_name = "plan:" + job_name();
+    // NOTE: Each rank only receives its own part of the plan, so the traffic and the peak memory
+    //     of a rank don't grow with the world size.
+    auto RankPlanName = [&](int64_t rank) {
+      return "plan:" + job_name() + ":" + std::to_string(rank);
+    };
     if (GlobalProcessCtx::IsThisProcessMaster()) {
-      // TODO(chengcheng): split plan for each rank.
-      Global<CtrlClient>::Get()->PushKV(plan_name, plan_);
+      for (int64_t rank = 0; rank < GlobalProcessCtx::WorldSize(); ++rank) {
+        if (rank == GlobalProcessCtx::Rank()) { continue; }
+        Plan rank_plan;
+        PlanUtil::GenPlanForRank(plan_, rank, variable_op_names_, &rank_plan);
+        Global<CtrlClient>::Get()->PushKV(RankPlanName(rank), rank_plan);
+      }
+      Plan master_plan;
+      PlanUtil::GenPlanForRank(plan_, GlobalProcessCtx::Rank(), variable_op_names_, &master_plan);
+      plan_.Swap(&master_plan);
     } else {
-      Global<CtrlClient>::Get()->PullKV(plan_name, &plan_);
+      Global<CtrlClient>::Get()->PullKV(RankPlanName(GlobalProcessCtx::Rank()), &plan_);
     }
     OF_SESSION_BARRIER();
     // NOTE(zwx): After barrier plan is synchronized between all ranks,
     //     then it can be cleared for saving mem.
-    if (GlobalProcessCtx::IsThisProcessMaster()) { Global<CtrlClient>::Get()->ClearKV(plan_name); }
+    if (GlobalProcessCtx::IsThisProcessMaster()) {
+      for (int64_t rank = 0; rank < GlobalProcessCtx::WorldSize(); ++rank) {
+        if (rank == GlobalProcessCtx::Rank()) { continue; }
+        Global<CtrlClient>::Get()->ClearKV(RankPlanName(rank));
+      }
+    }
   }
   // NOTE(chengcheng): recovery op_attr
   PlanUtil::PopulateOpAttribute(&plan_, plan_.job_id2op_attribute_ref_table());
@@ -51,6 +51,8 @@ class NNGraph final : public NNGraphIf {
   Maybe<void> RegisterVariableOpNamesAndTensors(
       const std::vector<std::string>& variable_op_names,
       const std::vector<std::shared_ptr<one::Tensor>>& variable_tensors);
+  // Plans are loaded from and saved to `plan_cache_dir` if it's not empty.
+  void set_plan_cache_dir(const std::string& plan_cache_dir) { plan_cache_dir_ = plan_cache_dir; }
   Maybe<void> CompileAndInitRuntime();
   Maybe<void> Close();
 
@@ -74,6 +76,7 @@ class NNGraph final : public NNGraphIf {
   HashSet<std::string> variable_op_names_;
   Job job_;
   Plan plan_;
+  std::string plan_cache_dir_;
   // TODO(chengcheng): temp impl using runtime now, need reimplement for dynamic multi nn.Graph.
   std::unique_ptr<Runtime> runtime_;
   bool runtime_inited_;
@@ -28,19 +28,24 @@ OpKernelInferCache::OpKernelInferCache(const KernelConf& kernel_conf, const void
   cache_key_.op_conf_sym = op->GetOpConfWithoutOpNameAndLbn();
   cache_key_.ibn_idx2shape_sym.resize(op->input_bns().size());
   cache_key_.dtype_signature_sym = SymbolOf(kernel_conf.dtype_signature());
+  cache_.reset(new Cache());
+  counters_ =
+      InferCacheCounters4OpType("op_kernel_infer_cache", op_conf.user_conf().op_type_name());
 }
 
-bool OpKernelInferCache::IsCacheHit() const {
-  size_t hash_value = std::hash<KeyType>()(cache_key_);
-  HashEqTraitPtr<const KeyType> ptr_wrapper(&cache_key_, hash_value);
-  return cached_key2value_.find(ptr_wrapper) != cached_key2value_.end();
+bool OpKernelInferCache::IsCacheHit() {
+  if (cache_->Find(cache_key_) != nullptr) {
+    counters_->num_hits.fetch_add(1, std::memory_order_relaxed);
+    return true;
+  }
+  counters_->num_misses.fetch_add(1, std::memory_order_relaxed);
+  return false;
 }
 
-OpKernelInferCache::ValueType OpKernelInferCache::GetCacheValue() const {
-  size_t hash_value = std::hash<KeyType>()(cache_key_);
-  HashEqTraitPtr<const KeyType> ptr_wrapper(&cache_key_, hash_value);
-  CHECK(cached_key2value_.find(ptr_wrapper) != cached_key2value_.end());
-  return cached_key2value_.at(ptr_wrapper);
+OpKernelInferCache::ValueType OpKernelInferCache::GetCacheValue() {
+  const ValueType* value = cache_->Find(cache_key_);
+  CHECK(value != nullptr);
+  return *value;
 }
 
 void OpKernelInferCache::UpdateCacheKey(KernelInferContext* ctx) {
@@ -57,8 +62,6 @@ void OpKernelInferCache::UpdateCacheKey(KernelInferContext* ctx) {
 }
 
 void OpKernelInferCache::UpdateCacheValue(KernelInferContext* ctx) {
-  // TODO: make max size configurable
-  if (cached_key2value_.size() >= kReleaseInIndependentThreadThreshold) { Reset(); }
   auto* cache_value = new OpInferCacheValue();
   cache_value->obn_idx2shape_sym.resize(ctx->outputs().size());
   FOR_RANGE(int, i, 0, ctx->outputs().size()) {
@@ -69,29 +72,16 @@ void OpKernelInferCache::UpdateCacheValue(KernelInferContext* ctx) {
     out_shape_view.ToShape(&out_shape);
     cache_value->obn_idx2shape_sym.at(i).reset(out_shape);
   }
-  KeyType* new_key = new KeyType(cache_key_);
-  key_storage_.emplace_back(new_key);
-  size_t hash_value = std::hash<KeyType>()(cache_key_);
-  HashEqTraitPtr<const KeyType> ptr_wrapper(new_key, hash_value);
-  CHECK(cached_key2value_.emplace(ptr_wrapper, ValueType(cache_value)).second);
+  size_t num_evicted = cache_->Put(cache_key_, ValueType(cache_value), InferCacheCapacity());
+  counters_->num_evictions.fetch_add(num_evicted, std::memory_order_relaxed);
 }
 
 void OpKernelInferCache::Reset() {
-  CHECK_EQ(cached_key2value_.size(), key_storage_.size());
-  HashMap to_release_key2values;
-  KeyStorage to_release_key_storage;
-  std::swap(cached_key2value_, to_release_key2values);
-  std::swap(key_storage_, to_release_key_storage);
-  if (to_release_key2values.size() <= kReleaseInIndependentThreadThreshold) {
-    to_release_key2values.clear();
-    to_release_key_storage.clear();
-  } else {
-    std::thread(
-        [](HashMap&& cache, KeyStorage&& key_storage) {
-          cache.clear();
-          key_storage.clear();
-        },
-        std::move(to_release_key2values), std::move(to_release_key_storage));
+  std::unique_ptr<Cache> to_release_cache(new Cache());
+  std::swap(cache_, to_release_cache);
+  if (to_release_cache->size() > kReleaseInIndependentThreadThreshold) {
+    std::thread([](std::unique_ptr<Cache>&& cache) { cache.reset(); }, std::move(to_release_cache))
+        .detach();
   }
 }
 
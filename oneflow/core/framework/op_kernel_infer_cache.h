@@ -17,7 +17,8 @@ limitations under the License.
 #define ONEFLOW_CORE_FRAMEWORK_OP_KERNEL_INFER_CACHE_H_
 
 #include "oneflow/core/operator/op_infer_cache.h"
-#include "oneflow/core/common/hash_eq_trait_ptr.h"
+#include "oneflow/core/common/lru_cache.h"
+#include "oneflow/core/framework/infer_cache_stats.h"
 #include "oneflow/core/kernel/kernel.pb.h"
 
 namespace oneflow {
@@ -30,23 +31,22 @@ class OpKernelInferCache final {
  public:
   using KeyType = OpInferCacheKey;
   using ValueType = std::shared_ptr<const OpInferCacheValue>;
-  using HashMap = std::unordered_map<HashEqTraitPtr<const KeyType>, ValueType>;
-  using KeyStorage = std::list<std::unique_ptr<KeyType>>;
+  using Cache = LruCache<KeyType, ValueType>;
   static constexpr size_t kReleaseInIndependentThreadThreshold = 4096;
 
   OpKernelInferCache(const KernelConf& kernel_conf, const void* scope);
   ~OpKernelInferCache() = default;
 
-  bool IsCacheHit() const;
-  ValueType GetCacheValue() const;
+  bool IsCacheHit();
+  ValueType GetCacheValue();
   void UpdateCacheKey(KernelInferContext* ctx);
   void UpdateCacheValue(KernelInferContext* ctx);
   void Reset();
 
  private:
   KeyType cache_key_;
-  HashMap cached_key2value_;
-  KeyStorage key_storage_;
+  std::unique_ptr<Cache> cache_;
+  InferCacheCounters* counters_;
 };
 
 }  // namespace user_op
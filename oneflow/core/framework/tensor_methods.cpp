@@ -132,6 +132,20 @@ Maybe<Tensor> Reshape(const std::shared_ptr<Tensor>& input, const Shape& shape)
   return output;
 }
 
+Maybe<Tensor> BufferView(const std::shared_ptr<Tensor>& buffer, const Shape& shape,
+                         int64_t offset) {
+  if (!(buffer->is_eager() && buffer->is_local())) {
+    return Error::RuntimeError() << "view::BufferView(): buffer should be eager local tensor, "
+                                 << "but got " << (buffer->is_lazy() ? "lazy" : "consistent");
+  }
+  CHECK_OR_RETURN(JUST(IsContiguous(buffer))) << "view::BufferView(): buffer should be contiguous";
+  CHECK_GE_OR_RETURN(offset, 0) << "view::BufferView(): offset should be non-negative";
+  CHECK_LE_OR_RETURN(offset + shape.elem_cnt(), buffer->shape()->elem_cnt())
+      << "view::BufferView(): the view of shape " << shape.ToString() << " at offset " << offset
+      << " is out of the buffer of shape " << buffer->shape()->ToString();
+  return BasicView(buffer, shape, offset);
+}
+
 }  // namespace view
 }  // namespace one
 }  // namespace oneflow
@@ -29,10 +29,15 @@ Maybe<bool> IsContiguous(const std::shared_ptr<Tensor>& tensor);
 namespace view {
 
 Maybe<Tensor> BasicView(const std::shared_ptr<Tensor>& input, const Shape& target_shape,
-                        const Stride& target_strides, int64_t storage_offset);
+                        int64_t storage_offset);
 
 Maybe<Tensor> Reshape(const std::shared_ptr<Tensor>& input, const Shape& shape);
 
+// Returns a contiguous tensor of `shape` viewing the elements of the contiguous `buffer`
+// starting at element `offset`.
+Maybe<Tensor> BufferView(const std::shared_ptr<Tensor>& buffer, const Shape& shape,
+                         int64_t offset);
+
 }  // namespace view
 }  // namespace one
 }  // namespace oneflow
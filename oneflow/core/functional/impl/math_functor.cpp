@@ -70,6 +70,38 @@ class AddNFunctor {
   std::vector<std::shared_ptr<OpExpr>> op_;
 };
 
+class MultiUnscaleCountNotFiniteFunctor {
+ public:
+  MultiUnscaleCountNotFiniteFunctor() {
+    op_.resize(kMaxInputCount /*the maximum number of inputs*/);
+    for (int n = 0; n < op_.size(); ++n) {
+      op_[n] = CHECK_JUST(one::OpBuilder("multi_unscale_count_not_finite")
+                              .Input("x", n + 1)
+                              .Input("inv_scale")
+                              .Output("y")
+                              .Build());
+    }
+  }
+  Maybe<Tensor> operator()(const TensorTuple& x,
+                           const std::shared_ptr<one::Tensor>& inv_scale) const {
+    CHECK_GE_OR_RETURN(x.size(), 1);
+    std::shared_ptr<Tensor> count;
+    for (int i = 0; i < x.size(); i += kMaxInputCount) {
+      size_t size = (i + kMaxInputCount) < x.size() ? kMaxInputCount : x.size() - i;
+      TensorTuple inputs(size + 1);
+      std::copy(x.begin() + i, x.begin() + i + size, inputs.begin());
+      inputs.at(size) = inv_scale;
+      const auto& partial_count = JUST(OpInterpUtil::Dispatch<Tensor>(*op_.at(size - 1), inputs));
+      count = count ? JUST(functional::Add(count, partial_count, /*alpha=*/1, /*inplace=*/false))
+                    : partial_count;
+    }
+    return count;
+  }
+
+ private:
+  std::vector<std::shared_ptr<OpExpr>> op_;
+};
+
 class ScalarMathBaseFunctor {
  public:
   explicit ScalarMathBaseFunctor(std::string op_name) {
@@ -1825,6 +1857,7 @@ using namespace impl;
 
 ONEFLOW_FUNCTION_LIBRARY(m) {
   m.add_functor<AddNFunctor>("Add");
+  m.add_functor<MultiUnscaleCountNotFiniteFunctor>("MultiUnscaleCountNotFinite");
   m.add_functor<ScalarAddFunctor, ScalarAdd2Functor>("ScalarAdd");
   m.add_functor<ScalarSubFunctor, ScalarSub2Functor>("ScalarSub");
   m.add_functor<ScalarMulFunctor, ScalarMul2Functor>("ScalarMul");
@@ -30,6 +30,13 @@ class TaskIdGenerator final {
 
   TaskId Generate(const StreamId& stream_id);
 
+  const HashMap<StreamId, task_index_t>& stream_id2task_index_counter() const {
+    return stream_id2task_index_counter_;
+  }
+  void set_task_index_counter(const StreamId& stream_id, task_index_t task_index) {
+    stream_id2task_index_counter_[stream_id] = task_index;
+  }
+
  private:
   HashMap<StreamId, task_index_t> stream_id2task_index_counter_;
 };
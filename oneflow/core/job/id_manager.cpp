@@ -28,4 +28,24 @@ IDMgr::IDMgr() {
   chunk_id_count_ = 0;
 }
 
+void IDMgr::SaveIdState(IdState* id_state) const {
+  id_state->set_regst_desc_id_count(regst_desc_id_count_);
+  id_state->set_mem_block_id_count(mem_block_id_count_);
+  id_state->set_chunk_id_count(chunk_id_count_);
+  auto* stream_id2task_index_count = id_state->mutable_stream_id2task_index_count();
+  stream_id2task_index_count->clear();
+  for (const auto& pair : task_id_gen_.stream_id2task_index_counter()) {
+    (*stream_id2task_index_count)[EncodeStreamIdToInt64(pair.first)] = pair.second;
+  }
+}
+
+void IDMgr::RestoreIdState(const IdState& id_state) {
+  regst_desc_id_count_ = id_state.regst_desc_id_count();
+  mem_block_id_count_ = id_state.mem_block_id_count();
+  chunk_id_count_ = id_state.chunk_id_count();
+  for (const auto& pair : id_state.stream_id2task_index_count()) {
+    task_id_gen_.set_task_index_counter(DecodeStreamIdFromInt64(pair.first), pair.second);
+  }
+}
+
 }  // namespace oneflow
@@ -21,6 +21,7 @@ limitations under the License.
 #include "oneflow/core/job/resource_desc.h"
 #include "oneflow/core/job/global_for.h"
 #include "oneflow/core/graph/task_id_generator.h"
+#include "oneflow/core/job/plan_cache.pb.h"
 
 namespace oneflow {
 
@@ -35,6 +36,10 @@ class IDMgr final {
 
   TaskIdGenerator* GetTaskIdGenerator() { return &task_id_gen_; }
 
+  // Saves/restores the id counters, e.g. to reuse a plan compiled in a previous process.
+  void SaveIdState(IdState* id_state) const;
+  void RestoreIdState(const IdState& id_state);
+
  private:
   friend class Global<IDMgr>;
   IDMgr();
@@ -0,0 +1,160 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#include "oneflow/core/job/plan_cache.h"
+#include <sys/types.h>
+#include <unistd.h>
+#include <utime.h>
+#include <algorithm>
+#include <climits>
+#include <cstdio>
+#include <ctime>
+#include <fstream>
+#include <google/protobuf/io/coded_stream.h>
+#include <google/protobuf/io/zero_copy_stream_impl.h>
+#include <google/protobuf/io/zero_copy_stream_impl_lite.h>
+#include <google/protobuf/util/message_differencer.h>
+#include "oneflow/core/common/protobuf.h"
+#include "oneflow/core/common/str_util.h"
+#include "oneflow/core/control/global_process_ctx.h"
+#include "oneflow/core/job/global_for.h"
+#include "oneflow/core/job/id_manager.h"
+#include "oneflow/core/job/resource_desc.h"
+#include "oneflow/core/job/version.h"
+#include "oneflow/core/persistence/file_system.h"
+
+namespace oneflow {
+
+namespace {
+
+std::string DeterministicSerialize(const PbMessage& message) {
+  std::string bytes;
+  {
+    google::protobuf::io::StringOutputStream string_stream(&bytes);
+    google::protobuf::io::CodedOutputStream coded_stream(&string_stream);
+    coded_stream.SetSerializationDeterministic(true);
+    message.SerializeToCodedStream(&coded_stream);
+  }
+  return bytes;
+}
+
+std::string EntryPath(const std::string& cache_dir, const std::string& key_hash,
+                      const std::string& suffix) {
+  return JoinPath(cache_dir, key_hash + suffix);
+}
+
+bool ParseLargeProtoFromFile(const std::string& file_path, PbMessage* proto) {
+  std::ifstream in_stream(file_path.c_str(), std::ifstream::in | std::ifstream::binary);
+  if (!in_stream.is_open()) { return false; }
+  google::protobuf::io::IstreamInputStream input(&in_stream);
+  google::protobuf::io::CodedInputStream coded_input(&input);
+  // plans of large models exceed the default limit of protobuf
+  coded_input.SetTotalBytesLimit(INT_MAX);
+  return proto->ParseFromCodedStream(&coded_input);
+}
+
+// Writes to a temporary file then renames it, so readers and concurrent writers never see a
+// partially written entry.
+Maybe<void> AtomicallyWriteFile(const std::string& file_path, const std::string& bytes) {
+  const std::string tmp_path = file_path + ".tmp." + std::to_string(getpid());
+  {
+    std::ofstream out_stream(tmp_path.c_str(),
+                             std::ofstream::out | std::ofstream::binary | std::ofstream::trunc);
+    CHECK_OR_RETURN(out_stream.is_open()) << "failed to open " << tmp_path;
+    out_stream.write(bytes.data(), bytes.size());
+    out_stream.flush();
+    CHECK_OR_RETURN(out_stream.good()) << "failed to write " << tmp_path;
+  }
+  const bool renamed = std::rename(tmp_path.c_str(), file_path.c_str()) == 0;
+  if (!renamed) { std::remove(tmp_path.c_str()); }
+  CHECK_OR_RETURN(renamed) << "failed to rename " << tmp_path << " to " << file_path;
+  return Maybe<void>::Ok();
+}
+
+}  // namespace
+
+Maybe<void> MakePlanCacheKey(const Job& job, int64_t job_id,
+                             const HashSet<std::string>& variable_op_names, PlanCacheKey* key) {
+  key->Clear();
+  key->set_oneflow_version(GetOneFlowGitVersion());
+  key->set_world_size(GlobalProcessCtx::WorldSize());
+  *key->mutable_resource() = Global<ResourceDesc, ForSession>::Get()->resource();
+  key->set_job_id(job_id);
+  *key->mutable_job() = job;
+  std::vector<std::string> sorted_variable_op_names(variable_op_names.begin(),
+                                                    variable_op_names.end());
+  std::sort(sorted_variable_op_names.begin(), sorted_variable_op_names.end());
+  for (const std::string& name : sorted_variable_op_names) { key->add_variable_op_names(name); }
+  Global<IDMgr>::Get()->SaveIdState(key->mutable_id_state());
+  return Maybe<void>::Ok();
+}
+
+std::string PlanCacheKeyHash(const PlanCacheKey& key) {
+  char hex[17];
+  snprintf(hex, sizeof(hex), "%016zx", std::hash<std::string>()(DeterministicSerialize(key)));
+  return std::string(hex);
+}
+
+Maybe<bool> TryLoadPlanFromCache(const std::string& cache_dir, const PlanCacheKey& key,
+                                 Plan* plan) {
+  const std::string key_hash = PlanCacheKeyHash(key);
+  const std::string plan_path = EntryPath(cache_dir, key_hash, ".plan");
+  if (!LocalFS()->FileExists(plan_path)) { return false; }
+  PlanCacheEntry entry;
+  if (!ParseLargeProtoFromFile(plan_path, &entry)) {
+    LOG(WARNING) << "Plan cache entry " << plan_path << " is corrupted and is removed.";
+    std::remove(plan_path.c_str());
+    std::remove(EntryPath(cache_dir, key_hash, ".meta").c_str());
+    return false;
+  }
+  if (!google::protobuf::util::MessageDifferencer::Equals(entry.key(), key)) {
+    LOG(INFO) << "Plan cache entry " << plan_path << " has a different key and is ignored.";
+    return false;
+  }
+  plan->Swap(entry.mutable_plan());
+  Global<IDMgr>::Get()->RestoreIdState(entry.id_state());
+  // Update the modification time, pruning removes the least recently used entries first.
+  utime(plan_path.c_str(), nullptr);
+  return true;
+}
+
+Maybe<void> SavePlanToCache(const std::string& cache_dir, const PlanCacheKey& key,
+                            const std::string& job_name, double compile_time, Plan* plan) {
+  LocalFS()->RecursivelyCreateDirIfNotExist(cache_dir);
+  const std::string key_hash = PlanCacheKeyHash(key);
+  PlanCacheEntry entry;
+  *entry.mutable_key() = key;
+  Global<IDMgr>::Get()->SaveIdState(entry.mutable_id_state());
+  // Borrow the plan instead of copying it.
+  entry.mutable_plan()->Swap(plan);
+  std::string bytes;
+  const bool serialized = entry.SerializeToString(&bytes);
+  entry.mutable_plan()->Swap(plan);
+  CHECK_OR_RETURN(serialized) << "failed to serialize plan of job " << job_name;
+  JUST(AtomicallyWriteFile(EntryPath(cache_dir, key_hash, ".plan"), bytes));
+
+  PlanCacheMeta meta;
+  meta.set_key_hash(key_hash);
+  meta.set_job_name(job_name);
+  meta.set_oneflow_version(key.oneflow_version());
+  meta.set_world_size(key.world_size());
+  meta.set_plan_size(bytes.size());
+  meta.set_compile_time(compile_time);
+  meta.set_create_time(std::time(nullptr));
+  JUST(AtomicallyWriteFile(EntryPath(cache_dir, key_hash, ".meta"), PbMessage2TxtString(meta)));
+  return Maybe<void>::Ok();
+}
+
+}  // namespace oneflow
@@ -0,0 +1,50 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#ifndef ONEFLOW_CORE_JOB_PLAN_CACHE_H_
+#define ONEFLOW_CORE_JOB_PLAN_CACHE_H_
+
+#include "oneflow/core/common/maybe.h"
+#include "oneflow/core/common/util.h"
+#include "oneflow/core/job/job.pb.h"
+#include "oneflow/core/job/plan.pb.h"
+#include "oneflow/core/job/plan_cache.pb.h"
+
+namespace oneflow {
+
+// A directory of plans compiled by nn.Graph. A restarted process which builds the same job with
+// the same config, world size and library version loads the plan instead of compiling it.
+//
+// Each entry is `<key_hash>.plan` holding a PlanCacheEntry and `<key_hash>.meta` holding a text
+// PlanCacheMeta for inspecting and pruning the cache. The key is compared as a whole when an
+// entry is loaded, so a hash collision or a stale entry is a cache miss.
+
+// Makes the key of a job to be compiled with the current id state of IDMgr.
+Maybe<void> MakePlanCacheKey(const Job& job, int64_t job_id,
+                             const HashSet<std::string>& variable_op_names, PlanCacheKey* key);
+
+std::string PlanCacheKeyHash(const PlanCacheKey& key);
+
+// Returns true and restores the id state after the plan if `cache_dir` has a plan for `key`.
+Maybe<bool> TryLoadPlanFromCache(const std::string& cache_dir, const PlanCacheKey& key,
+                                 Plan* plan);
+
+// Saves `plan` along with the current id state of IDMgr.
+Maybe<void> SavePlanToCache(const std::string& cache_dir, const PlanCacheKey& key,
+                            const std::string& job_name, double compile_time, Plan* plan);
+
+}  // namespace oneflow
+
+#endif  // ONEFLOW_CORE_JOB_PLAN_CACHE_H_
@@ -973,6 +973,46 @@ void PlanUtil::PopulateOpAttribute(
   }
 }
 
+/*static*/ void PlanUtil::GenPlanForRank(const Plan& plan, int64_t rank,
+                                         const HashSet<std::string>& variable_op_names,
+                                         Plan* rank_plan) {
+  rank_plan->Clear();
+  HashMap<int64_t, HashSet<std::string>> job_id2op_attribute_refs;
+  for (const auto& task : plan.task()) {
+    if (task.machine_id() != rank) { continue; }
+    *rank_plan->add_task() = task;
+    for (const auto& exec_node : task.exec_sequence().exec_node()) {
+      if (exec_node.kernel_conf().has_op_attribute_ref()) {
+        job_id2op_attribute_refs[task.job_id()].insert(exec_node.kernel_conf().op_attribute_ref());
+      }
+    }
+  }
+  for (const auto& mem_block : plan.block_chunk_list().mem_block()) {
+    if (mem_block.machine_id() != rank) { continue; }
+    *rank_plan->mutable_block_chunk_list()->add_mem_block() = mem_block;
+  }
+  for (const auto& chunk : plan.block_chunk_list().chunk()) {
+    if (chunk.machine_id() != rank) { continue; }
+    *rank_plan->mutable_block_chunk_list()->add_chunk() = chunk;
+  }
+  *rank_plan->mutable_job_confs() = plan.job_confs();
+  *rank_plan->mutable_collective_boxing_plan() = plan.collective_boxing_plan();
+  *rank_plan->mutable_ctrl_regst_desc_info() = plan.ctrl_regst_desc_info();
+  for (const auto& pair : plan.job_id2op_attribute_ref_table()) {
+    const auto& op_attribute_refs = job_id2op_attribute_refs[pair.first];
+    auto* op_name2op_attribute =
+        (*rank_plan->mutable_job_id2op_attribute_ref_table())[pair.first]
+            .mutable_op_name2op_attribute();
+    for (const auto& op_name7op_attribute : pair.second.op_name2op_attribute()) {
+      const std::string& op_name = op_name7op_attribute.first;
+      // NOTE: variable op attributes are read by every rank to get the optimized sbp.
+      if (op_attribute_refs.count(op_name) > 0 || variable_op_names.count(op_name) > 0) {
+        (*op_name2op_attribute)[op_name] = op_name7op_attribute.second;
+      }
+    }
+  }
+}
+
 /*static*/ StreamId PlanUtil::GetStreamId(const TaskProto& task) {
   return DecodeStreamIdFromInt64(task.thrd_id());
 }
@@ -46,6 +46,11 @@ struct PlanUtil {
   static void PopulateOpAttribute(
       Plan* plan,
       const PbMap<int64_t, ::oneflow::OpAttributeRefTable>& job_id2op_attribute_ref_table);
+  // Extracts what the runtime of `rank` needs from a plan of all ranks: the tasks, mem blocks and
+  // chunks of `rank`, the op attributes referred by its tasks or of `variable_op_names`, and the
+  // job confs, collective boxing plan and ctrl regst desc info shared by all ranks.
+  static void GenPlanForRank(const Plan& plan, int64_t rank,
+                             const HashSet<std::string>& variable_op_names, Plan* rank_plan);
   static StreamId GetStreamId(const TaskProto& task);
   static int64_t GetDeviceIndex(const TaskProto& task);
 };
@@ -20,11 +20,113 @@ limitations under the License.
 namespace oneflow {
 namespace vm {
 
+namespace {
+
+constexpr int64_t kDefaultMaxCachedBytes = 1LL << 30;
+constexpr int64_t kDefaultMaxCachedBlockSize = 256LL << 20;
+
+}  // namespace
+
+CpuAllocator::CpuAllocator()
+    : max_cached_bytes_(
+        ParseIntegerFromEnv("ONEFLOW_CPU_ALLOCATOR_MAX_CACHED_BYTES", kDefaultMaxCachedBytes)),
+      max_cached_block_size_(ParseIntegerFromEnv("ONEFLOW_CPU_ALLOCATOR_MAX_CACHED_BLOCK_SIZE",
+                                                 kDefaultMaxCachedBlockSize)),
+      stats_{} {}
+
+CpuAllocator::~CpuAllocator() { EmptyCache(); }
+
+/* static */ size_t CpuAllocator::SizeClass(size_t size) {
+  if (size <= kHostAlignSize) { return kHostAlignSize; }
+  // The largest power of 2 less than size
+  size_t floor_pow2 = size_t(1) << (63 - __builtin_clzll(size - 1));
+  size_t step = std::max(floor_pow2 / 4, kHostAlignSize);
+  return RoundUp(size, step);
+}
+
 void CpuAllocator::Allocate(char** mem_ptr, std::size_t size) {
-  *mem_ptr = reinterpret_cast<char*>(aligned_alloc(kHostAlignSize, size));
+  size_t block_size = SizeClass(size);
+  char* ptr = nullptr;
+  {
+    std::unique_lock<std::mutex> lock(mutex_);
+    stats_.num_allocations += 1;
+    auto iter = size2free_ptrs_.find(block_size);
+    if (iter != size2free_ptrs_.end() && !iter->second.empty()) {
+      ptr = iter->second.back();
+      iter->second.pop_back();
+      stats_.cached_bytes -= block_size;
+    } else {
+      stats_.num_system_allocations += 1;
+    }
+  }
+  if (ptr == nullptr) {
+    ptr = reinterpret_cast<char*>(aligned_alloc(kHostAlignSize, block_size));
+    if (ptr == nullptr) {
+      // Retry after returning the cached blocks to the system
+      EmptyCache();
+      ptr = reinterpret_cast<char*>(aligned_alloc(kHostAlignSize, block_size));
+    }
+    CHECK(ptr != nullptr) << "failed to allocate " << block_size << " bytes of host memory";
+  }
+  std::unique_lock<std::mutex> lock(mutex_);
+  occupied_ptr2size_.emplace(ptr, block_size);
+  stats_.in_use_bytes += block_size;
+  stats_.peak_in_use_bytes = std::max(stats_.peak_in_use_bytes, stats_.in_use_bytes);
+  *mem_ptr = ptr;
+}
+
+void CpuAllocator::Deallocate(char* mem_ptr, std::size_t size) {
+  if (mem_ptr == nullptr) { return; }
+  std::unique_lock<std::mutex> lock(mutex_);
+  auto iter = occupied_ptr2size_.find(mem_ptr);
+  CHECK(iter != occupied_ptr2size_.end());
+  size_t block_size = iter->second;
+  occupied_ptr2size_.erase(iter);
+  stats_.in_use_bytes -= block_size;
+  if (block_size > max_cached_block_size_
+      || stats_.cached_bytes + block_size > max_cached_bytes_) {
+    lock.unlock();
+    std::free(mem_ptr);
+    return;
+  }
+  size2free_ptrs_[block_size].emplace_back(mem_ptr);
+  stats_.cached_bytes += block_size;
+}
+
+void CpuAllocator::EmptyCache() {
+  std::unique_lock<std::mutex> lock(mutex_);
+  ReleaseCachedBlocks(0);
+}
+
+CpuAllocatorStats CpuAllocator::GetStats() {
+  std::unique_lock<std::mutex> lock(mutex_);
+  return stats_;
+}
+
+void CpuAllocator::SetCachingLimits(size_t max_cached_bytes, size_t max_cached_block_size) {
+  std::unique_lock<std::mutex> lock(mutex_);
+  max_cached_bytes_ = max_cached_bytes;
+  max_cached_block_size_ = max_cached_block_size;
+  auto iter = size2free_ptrs_.upper_bound(max_cached_block_size_);
+  for (auto it = iter; it != size2free_ptrs_.end(); ++it) {
+    for (char* ptr : it->second) { std::free(ptr); }
+    stats_.cached_bytes -= it->first * it->second.size();
+  }
+  size2free_ptrs_.erase(iter, size2free_ptrs_.end());
+  ReleaseCachedBlocks(max_cached_bytes_);
 }
 
-void CpuAllocator::Deallocate(char* mem_ptr, std::size_t size) { std::free(mem_ptr); }
+void CpuAllocator::ReleaseCachedBlocks(size_t max_bytes) {
+  for (auto iter = size2free_ptrs_.rbegin();
+       iter != size2free_ptrs_.rend() && stats_.cached_bytes > max_bytes; ++iter) {
+    auto* ptrs = &iter->second;
+    while (!ptrs->empty() && stats_.cached_bytes > max_bytes) {
+      std::free(ptrs->back());
+      ptrs->pop_back();
+      stats_.cached_bytes -= iter->first;
+    }
+  }
+}
 
 COMMAND(Global<CpuAllocator>::SetAllocated(new CpuAllocator()));
 
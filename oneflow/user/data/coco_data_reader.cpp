@@ -30,7 +30,6 @@ COCODataReader::COCODataReader(user_op::KernelInitContext* ctx) : DataReader<COC
   std::shared_ptr<const COCOMeta> meta(new COCOMeta(
       ctx->Attr<int64_t>("session_id"), ctx->Attr<std::string>("annotation_file"),
       ctx->Attr<std::string>("image_dir"), ctx->Attr<bool>("remove_images_without_annotations")));
-  std::unique_ptr<RandomAccessDataset<COCOImage>> coco_dataset_ptr(new COCODataset(ctx, meta));
 
   int64_t parallel_id = 0;
   int64_t parallel_num = 0;
@@ -44,23 +43,26 @@ COCODataReader::COCODataReader(user_op::KernelInitContext* ctx) : DataReader<COC
     parallel_id = ctx->parallel_ctx().parallel_id();
     parallel_num = ctx->parallel_ctx().parallel_num();
   }
-  loader_.reset(new DistributedTrainingDataset<COCOImage>(
-      parallel_num, parallel_id, ctx->Attr<bool>("stride_partition"),
-      ctx->Attr<bool>("shuffle_after_epoch"), ctx->Attr<int64_t>("random_seed"),
-      std::move(coco_dataset_ptr)));
 
   size_t batch_size = ctx->TensorDesc4ArgNameAndIndex("image", 0)->shape().elem_cnt();
-  if (ctx->Attr<bool>("group_by_ratio")) {
-    auto GetGroupId = [](const std::shared_ptr<COCOImage>& sample) {
-      return static_cast<int64_t>(sample->height / sample->width);
-    };
-    loader_.reset(new GroupBatchDataset<COCOImage>(batch_size, GetGroupId, std::move(loader_)));
-  } else {
-    loader_.reset(new BatchDataset<COCOImage>(batch_size, std::move(loader_)));
-  }
-
   parser_.reset(new COCOParser(meta));
-  StartLoadThread();
+  // every loader thread reads its own shard of the images of this rank
+  StartLoadThreads(DataReaderConf4Ctx(ctx), [&](int32_t thread_id, int32_t num_threads) {
+    std::unique_ptr<RandomAccessDataset<COCOImage>> coco_dataset_ptr(new COCODataset(ctx, meta));
+    std::unique_ptr<Dataset<COCOImage>> loader(new DistributedTrainingDataset<COCOImage>(
+        parallel_num * num_threads, parallel_id * num_threads + thread_id,
+        ctx->Attr<bool>("stride_partition"), ctx->Attr<bool>("shuffle_after_epoch"),
+        ctx->Attr<int64_t>("random_seed"), std::move(coco_dataset_ptr)));
+    if (ctx->Attr<bool>("group_by_ratio")) {
+      auto GetGroupId = [](const std::shared_ptr<COCOImage>& sample) {
+        return static_cast<int64_t>(sample->height / sample->width);
+      };
+      loader.reset(new GroupBatchDataset<COCOImage>(batch_size, GetGroupId, std::move(loader)));
+    } else {
+      loader.reset(new BatchDataset<COCOImage>(batch_size, std::move(loader)));
+    }
+    return loader;
+  });
 }
 
 COCOMeta::COCOMeta(int64_t session_id, const std::string& annotation_file,
@@ -30,7 +30,6 @@ class COCODataReader final : public DataReader<COCOImage> {
   ~COCODataReader() = default;
 
  protected:
-  using DataReader<COCOImage>::loader_;
   using DataReader<COCOImage>::parser_;
 };
 
@@ -18,6 +18,7 @@ limitations under the License.
 
 #include "oneflow/core/common/buffer.h"
 #include "oneflow/core/framework/op_kernel.h"
+#include "oneflow/user/data/data_reader_stats.h"
 #include "oneflow/user/data/dataset.h"
 #include "oneflow/user/data/parser.h"
 
@@ -26,63 +27,154 @@ namespace data {
 
 static const int32_t kDataReaderBatchBufferSize = 4;
 
+struct DataReaderConf {
+  // every loader thread owns a replica of the loader which reads a disjoint shard of the data
+  int32_t num_loader_threads = 1;
+  // the max number of batches loaded ahead of the consumer
+  int32_t prefetch_depth = kDataReaderBatchBufferSize;
+  // ordered readers deliver the batches of the loader threads round-robin, which makes the
+  // batch sequence reproducible for a given num_loader_threads; unordered readers deliver
+  // whichever batch is loaded first
+  bool ordered = true;
+};
+
+inline DataReaderConf DataReaderConf4Ctx(user_op::KernelInitContext* ctx) {
+  DataReaderConf conf;
+  conf.num_loader_threads = ctx->Attr<int32_t>("num_loader_threads");
+  conf.prefetch_depth = ctx->Attr<int32_t>("prefetch_depth");
+  conf.ordered = ctx->Attr<bool>("ordered");
+  CHECK_GE(conf.num_loader_threads, 1);
+  CHECK_GE(conf.prefetch_depth, 1);
+  return conf;
+}
+
 template<typename LoadTarget>
 class DataReader {
  public:
   using LoadTargetPtr = std::shared_ptr<LoadTarget>;
   using LoadTargetPtrList = std::vector<LoadTargetPtr>;
+  using BatchBuffer = Buffer<std::shared_ptr<LoadTargetPtrList>>;
+  // makes the loader of the loader thread `thread_id` out of `num_threads`
+  using LoaderFactory =
+      std::function<std::unique_ptr<Dataset<LoadTarget>>(int32_t thread_id, int32_t num_threads)>;
+
   DataReader(user_op::KernelInitContext* ctx)
-      : is_closed_(false), batch_buffer_(kDataReaderBatchBufferSize) {}
+      : is_closed_(false),
+        prefetch_capacity_(0),
+        read_cnt_(0),
+        counters_(DataReaderCounters4OpType(ctx->op_type_name())) {}
   virtual ~DataReader() {
     Close();
-    if (load_thrd_.joinable()) { load_thrd_.join(); }
+    for (auto& load_thrd : load_thrds_) {
+      if (load_thrd.joinable()) { load_thrd.join(); }
+    }
   }
 
   void Read(user_op::KernelComputeContext* ctx) {
-    CHECK(load_thrd_.joinable()) << "You should call StartLoadThread before read data";
+    CHECK(!load_thrds_.empty()) << "You should call StartLoadThread before read data";
     auto batch_data = FetchBatchData();
     parser_->Parse(batch_data, ctx);
   }
 
   void Close() {
     is_closed_.store(true);
-    bool buffer_drained = false;
-    while (!buffer_drained) {
-      std::shared_ptr<LoadTargetPtrList> abandoned_batch_data(nullptr);
-      auto status = batch_buffer_.TryReceive(&abandoned_batch_data);
-      CHECK_NE(status, BufferStatus::kBufferStatusErrorClosed);
-      buffer_drained = (status == BufferStatus::kBufferStatusEmpty);
+    for (auto& batch_buffer : batch_buffers_) {
+      bool buffer_drained = false;
+      while (!buffer_drained) {
+        std::shared_ptr<LoadTargetPtrList> abandoned_batch_data(nullptr);
+        auto status = batch_buffer->TryReceive(&abandoned_batch_data);
+        CHECK_NE(status, BufferStatus::kBufferStatusErrorClosed);
+        buffer_drained = (status == BufferStatus::kBufferStatusEmpty);
+      }
+      batch_buffer->Close();
     }
-    batch_buffer_.Close();
   }
 
  protected:
+  // Loads batches from loader_ on a single thread.
   void StartLoadThread() {
-    if (load_thrd_.joinable()) { return; }
-    load_thrd_ = std::thread([this] {
-      while (!is_closed_.load() && LoadBatch()) {}
-    });
+    if (!load_thrds_.empty()) { return; }
+    CHECK(loader_);
+    std::vector<std::unique_ptr<Dataset<LoadTarget>>> loaders;
+    loaders.emplace_back(std::move(loader_));
+    LaunchLoadThreads(DataReaderConf(), std::move(loaders));
+  }
+
+  // Loads batches on conf.num_loader_threads threads, each from its own loader made by
+  // MakeLoader.
+  void StartLoadThreads(const DataReaderConf& conf, const LoaderFactory& MakeLoader) {
+    if (!load_thrds_.empty()) { return; }
+    std::vector<std::unique_ptr<Dataset<LoadTarget>>> loaders;
+    for (int32_t i = 0; i < conf.num_loader_threads; ++i) {
+      loaders.emplace_back(MakeLoader(i, conf.num_loader_threads));
+    }
+    LaunchLoadThreads(conf, std::move(loaders));
   }
 
   std::unique_ptr<Dataset<LoadTarget>> loader_;
   std::unique_ptr<Parser<LoadTarget>> parser_;
 
  private:
+  void LaunchLoadThreads(const DataReaderConf& conf,
+                         std::vector<std::unique_ptr<Dataset<LoadTarget>>>&& loaders) {
+    const int32_t num_threads = loaders.size();
+    CHECK_GT(num_threads, 0);
+    CHECK_GT(conf.prefetch_depth, 0);
+    loaders_ = std::move(loaders);
+    // an ordered reader gives every loader thread its own buffer and pulls them round-robin,
+    // an unordered one shares a single buffer among all the loader threads
+    const int32_t num_buffers = conf.ordered ? num_threads : 1;
+    const int32_t buffer_size = (conf.prefetch_depth + num_buffers - 1) / num_buffers;
+    prefetch_capacity_ = static_cast<int64_t>(buffer_size) * num_buffers;
+    for (int32_t i = 0; i < num_buffers; ++i) {
+      batch_buffers_.emplace_back(new BatchBuffer(buffer_size));
+    }
+    for (int32_t i = 0; i < num_threads; ++i) {
+      Dataset<LoadTarget>* loader = loaders_.at(i).get();
+      BatchBuffer* batch_buffer = batch_buffers_.at(i % num_buffers).get();
+      load_thrds_.emplace_back(std::thread([this, loader, batch_buffer] {
+        while (!is_closed_.load() && LoadBatch(loader, batch_buffer)) {}
+      }));
+    }
+  }
+
   std::shared_ptr<LoadTargetPtrList> FetchBatchData() {
+    BatchBuffer* batch_buffer = batch_buffers_.at(read_cnt_ % batch_buffers_.size()).get();
+    read_cnt_ += 1;
+    int64_t occupancy = 0;
+    for (const auto& buffer : batch_buffers_) { occupancy += buffer->Size(); }
+    counters_->num_reads.fetch_add(1, std::memory_order_relaxed);
+    counters_->sum_queue_occupancy.fetch_add(occupancy, std::memory_order_relaxed);
+    if (occupancy >= prefetch_capacity_) {
+      counters_->num_full_reads.fetch_add(1, std::memory_order_relaxed);
+    }
     std::shared_ptr<LoadTargetPtrList> batch_data(nullptr);
-    CHECK_EQ(batch_buffer_.Pull(&batch_data), BufferStatus::kBufferStatusSuccess);
+    if (batch_buffer->Size() > 0) {
+      CHECK_EQ(batch_buffer->Pull(&batch_data), BufferStatus::kBufferStatusSuccess);
+    } else {
+      counters_->num_starved_reads.fetch_add(1, std::memory_order_relaxed);
+      const auto start = std::chrono::steady_clock::now();
+      CHECK_EQ(batch_buffer->Pull(&batch_data), BufferStatus::kBufferStatusSuccess);
+      const auto wait_time = std::chrono::duration_cast<std::chrono::microseconds>(
+          std::chrono::steady_clock::now() - start);
+      counters_->wait_time_us.fetch_add(wait_time.count(), std::memory_order_relaxed);
+    }
     return batch_data;
   }
 
-  bool LoadBatch() {
+  bool LoadBatch(Dataset<LoadTarget>* loader, BatchBuffer* batch_buffer) {
     std::shared_ptr<LoadTargetPtrList> batch_data =
-        std::make_shared<LoadTargetPtrList>(std::move(loader_->Next()));
-    return batch_buffer_.Push(batch_data) == BufferStatus::kBufferStatusSuccess;
+        std::make_shared<LoadTargetPtrList>(loader->Next());
+    return batch_buffer->Push(batch_data) == BufferStatus::kBufferStatusSuccess;
   }
 
   std::atomic<bool> is_closed_;
-  Buffer<std::shared_ptr<LoadTargetPtrList>> batch_buffer_;
-  std::thread load_thrd_;
+  std::vector<std::unique_ptr<Dataset<LoadTarget>>> loaders_;
+  std::vector<std::unique_ptr<BatchBuffer>> batch_buffers_;
+  int64_t prefetch_capacity_;
+  int64_t read_cnt_;
+  DataReaderCounters* counters_;
+  std::vector<std::thread> load_thrds_;
 };
 
 }  // namespace data
@@ -0,0 +1,72 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#include <memory>
+#include <mutex>
+#include "oneflow/user/data/data_reader_stats.h"
+
+namespace oneflow {
+namespace data {
+
+namespace {
+
+std::mutex* CountersMutex() {
+  static std::mutex mutex;
+  return &mutex;
+}
+
+std::map<std::string, std::unique_ptr<DataReaderCounters>>* MutCounters() {
+  static std::map<std::string, std::unique_ptr<DataReaderCounters>> counters;
+  return &counters;
+}
+
+}  // namespace
+
+DataReaderCounters* DataReaderCounters4OpType(const std::string& op_type_name) {
+  std::unique_lock<std::mutex> lock(*CountersMutex());
+  auto& counters = (*MutCounters())[op_type_name];
+  if (!counters) { counters.reset(new DataReaderCounters()); }
+  return counters.get();
+}
+
+DataReaderStats GetDataReaderStats() {
+  DataReaderStats stats;
+  std::unique_lock<std::mutex> lock(*CountersMutex());
+  for (const auto& pair : *MutCounters()) {
+    auto* op_stats = &stats[pair.first];
+    const DataReaderCounters& counters = *pair.second;
+    (*op_stats)["num_reads"] = counters.num_reads.load(std::memory_order_relaxed);
+    (*op_stats)["num_starved_reads"] = counters.num_starved_reads.load(std::memory_order_relaxed);
+    (*op_stats)["num_full_reads"] = counters.num_full_reads.load(std::memory_order_relaxed);
+    (*op_stats)["sum_queue_occupancy"] =
+        counters.sum_queue_occupancy.load(std::memory_order_relaxed);
+    (*op_stats)["wait_time_us"] = counters.wait_time_us.load(std::memory_order_relaxed);
+  }
+  return stats;
+}
+
+void ResetDataReaderStats() {
+  std::unique_lock<std::mutex> lock(*CountersMutex());
+  for (const auto& pair : *MutCounters()) {
+    pair.second->num_reads = 0;
+    pair.second->num_starved_reads = 0;
+    pair.second->num_full_reads = 0;
+    pair.second->sum_queue_occupancy = 0;
+    pair.second->wait_time_us = 0;
+  }
+}
+
+}  // namespace data
+}  // namespace oneflow
@@ -0,0 +1,52 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#ifndef ONEFLOW_USER_DATA_DATA_READER_STATS_H_
+#define ONEFLOW_USER_DATA_DATA_READER_STATS_H_
+
+#include <atomic>
+#include <map>
+#include <string>
+
+namespace oneflow {
+namespace data {
+
+// Prefetch queue counters, updated by the consumer of a DataReader on every read.
+struct DataReaderCounters final {
+  std::atomic<int64_t> num_reads{0};
+  // reads which found no prefetched batch and had to wait for a loader thread
+  std::atomic<int64_t> num_starved_reads{0};
+  // reads which found the prefetch queue full, i.e. the loader threads were blocked
+  std::atomic<int64_t> num_full_reads{0};
+  // sum of the prefetched batches found by every read, divided by num_reads is the mean
+  // queue occupancy
+  std::atomic<int64_t> sum_queue_occupancy{0};
+  std::atomic<int64_t> wait_time_us{0};
+};
+
+// Counters shared by the readers of all ops of `op_type_name`. The returned pointer is valid
+// until the process exits.
+DataReaderCounters* DataReaderCounters4OpType(const std::string& op_type_name);
+
+// op type name -> counter name -> value
+using DataReaderStats = std::map<std::string, std::map<std::string, int64_t>>;
+
+DataReaderStats GetDataReaderStats();
+void ResetDataReaderStats();
+
+}  // namespace data
+}  // namespace oneflow
+
+#endif  // ONEFLOW_USER_DATA_DATA_READER_STATS_H_
@@ -63,6 +63,19 @@ class DistributedTrainingDataset final : public Dataset<LoadTarget> {
     // iter0 | 0, 1, 2, | 3, 4, 5, | 6, 7, 8, | 9, 0, 1, |
     // iter1 | 2, 3, 4, | 5, 6, 7, | 8, 9, 0, | 1, 2, 3, |
     LoadTargetShdPtrVec ret = base_dataset_->At(index_seq_.at(pos_));
+    Advance();
+    return ret;
+  }
+
+  // Skips the next `num_samples` samples without loading them, which resumes a reader from the
+  // same position of the same (shuffled) index sequences.
+  void Skip(int64_t num_samples) {
+    CHECK_GE(num_samples, 0);
+    for (int64_t i = 0; i < num_samples; ++i) { Advance(); }
+  }
+
+ private:
+  void Advance() {
     if (stride_partition_) {
       pos_ += num_shards_;
     } else {
@@ -74,10 +87,8 @@ class DistributedTrainingDataset final : public Dataset<LoadTarget> {
       }
     }
     CheckRanOutOfSize();
-    return ret;
   }
 
- private:
   void CheckRanOutOfSize() {
     if (pos_ >= index_seq_.size()) {
       GenNewIndexSequence();
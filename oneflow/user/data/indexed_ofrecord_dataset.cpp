@@ -0,0 +1,80 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#include "oneflow/user/data/indexed_ofrecord_dataset.h"
+
+namespace oneflow {
+namespace data {
+
+namespace {
+
+// both the record offsets of an index file and the record length headers of a part file
+constexpr int64_t kInt64Size = sizeof(int64_t);
+
+}  // namespace
+
+OFRecordIndex::OFRecordIndex(const std::vector<std::string>& data_file_paths) {
+  for (const std::string& data_file_path : data_file_paths) {
+    const std::string index_file_path = data_file_path + kOFRecordIndexFileSuffix;
+    CHECK(DataFS()->FileExists(index_file_path))
+        << "index file " << index_file_path
+        << " not found, build it by python3 -m oneflow.utils.data.ofrecord_index";
+    const int64_t data_file_size = DataFS()->GetFileSize(data_file_path);
+    const int64_t index_file_size = DataFS()->GetFileSize(index_file_path);
+    CHECK_EQ(index_file_size % kInt64Size, 0) << index_file_path;
+    std::unique_ptr<fs::RandomAccessFile> index_file;
+    DataFS()->NewRandomAccessFile(index_file_path, &index_file);
+    const int64_t num_records = index_file_size / kInt64Size;
+    const int64_t part_begin = offsets_.size();
+    offsets_.resize(part_begin + num_records);
+    if (num_records > 0) {
+      index_file->Read(0, index_file_size, reinterpret_cast<char*>(offsets_.data() + part_begin));
+    }
+    const int64_t part_end = offsets_.size();
+    FOR_RANGE(int64_t, i, part_begin, part_end) {
+      const int64_t end = (i + 1 < part_end) ? offsets_.at(i + 1) : data_file_size;
+      CHECK(offsets_.at(i) >= 0 && offsets_.at(i) + kInt64Size < end)
+          << "index file " << index_file_path << " doesn't match " << data_file_path;
+    }
+    part_begins_.emplace_back(part_begin);
+    data_file_sizes_.emplace_back(data_file_size);
+    data_files_.emplace_back();
+    DataFS()->NewRandomAccessFile(data_file_path, &data_files_.back());
+  }
+  part_begins_.emplace_back(offsets_.size());
+  CHECK_GT(offsets_.size(), 0) << "no record in the part files";
+}
+
+void OFRecordIndex::ReadRecord(int64_t index, TensorBuffer* record) const {
+  CHECK_GE(index, 0);
+  CHECK_LT(index, Size());
+  // the last part whose first record is not after `index`
+  const int64_t part_id = std::upper_bound(part_begins_.cbegin(), part_begins_.cend(), index)
+                          - part_begins_.cbegin() - 1;
+  const int64_t offset = offsets_.at(index);
+  const int64_t end = (index + 1 < part_begins_.at(part_id + 1)) ? offsets_.at(index + 1)
+                                                                 : data_file_sizes_.at(part_id);
+  const fs::RandomAccessFile* data_file = data_files_.at(part_id).get();
+  int64_t record_size = -1;
+  data_file->Read(offset, kInt64Size, reinterpret_cast<char*>(&record_size));
+  // the record ends where the next one begins, a mismatch means the index is stale
+  CHECK_EQ(offset + kInt64Size + record_size, end)
+      << "record " << index << " doesn't match its index, rebuild the index files";
+  record->Resize(Shape({record_size}), DataType::kChar);
+  data_file->Read(offset + kInt64Size, record_size, record->mut_data<char>());
+}
+
+}  // namespace data
+}  // namespace oneflow
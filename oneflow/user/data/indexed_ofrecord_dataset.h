@@ -0,0 +1,76 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#ifndef ONEFLOW_USER_DATA_INDEXED_OFRECORD_DATASET_H_
+#define ONEFLOW_USER_DATA_INDEXED_OFRECORD_DATASET_H_
+
+#include "oneflow/core/persistence/file_system.h"
+#include "oneflow/user/data/dataset.h"
+
+namespace oneflow {
+namespace data {
+
+// The index of an OFRecord part file is stored next to it as `<part file><suffix>`. It is a
+// sequence of int64 byte offsets, one per record, each pointing at the int64 length header of
+// the record in the part file. oneflow.utils.data.ofrecord_index builds the index files.
+constexpr char kOFRecordIndexFileSuffix[] = ".idx";
+
+// Maps the global index of a record of all the part files to its location, so that any record
+// can be read without scanning the records before it.
+class OFRecordIndex final {
+ public:
+  OF_DISALLOW_COPY_AND_MOVE(OFRecordIndex);
+  explicit OFRecordIndex(const std::vector<std::string>& data_file_paths);
+  ~OFRecordIndex() = default;
+
+  int64_t Size() const { return offsets_.size(); }
+  // Safe for concurrent use by multiple threads.
+  void ReadRecord(int64_t index, TensorBuffer* record) const;
+
+ private:
+  std::vector<std::unique_ptr<fs::RandomAccessFile>> data_files_;
+  std::vector<int64_t> data_file_sizes_;
+  // the global index of the first record of every part file, and the number of records
+  std::vector<int64_t> part_begins_;
+  // the offsets of all the records, part after part
+  std::vector<int64_t> offsets_;
+};
+
+class IndexedOFRecordDataset final : public RandomAccessDataset<TensorBuffer> {
+ public:
+  using LoadTargetShdPtr = std::shared_ptr<TensorBuffer>;
+  using LoadTargetShdPtrVec = std::vector<LoadTargetShdPtr>;
+
+  explicit IndexedOFRecordDataset(const std::shared_ptr<const OFRecordIndex>& index)
+      : index_(index) {}
+  ~IndexedOFRecordDataset() = default;
+
+  LoadTargetShdPtrVec At(int64_t index) const override {
+    LoadTargetShdPtrVec ret;
+    LoadTargetShdPtr sample(new TensorBuffer());
+    index_->ReadRecord(index, sample.get());
+    ret.emplace_back(std::move(sample));
+    return ret;
+  }
+  size_t Size() const override { return index_->Size(); }
+
+ private:
+  std::shared_ptr<const OFRecordIndex> index_;
+};
+
+}  // namespace data
+}  // namespace oneflow
+
+#endif  // ONEFLOW_USER_DATA_INDEXED_OFRECORD_DATASET_H_
@@ -21,6 +21,8 @@ limitations under the License.
 #include "oneflow/user/data/ofrecord_parser.h"
 #include "oneflow/user/data/random_shuffle_dataset.h"
 #include "oneflow/user/data/batch_dataset.h"
+#include "oneflow/user/data/distributed_training_dataset.h"
+#include "oneflow/user/data/indexed_ofrecord_dataset.h"
 #include <iostream>
 
 namespace oneflow {
@@ -29,20 +31,73 @@ namespace data {
 class OFRecordDataReader final : public DataReader<TensorBuffer> {
  public:
   OFRecordDataReader(user_op::KernelInitContext* ctx) : DataReader<TensorBuffer>(ctx) {
-    loader_.reset(new OFRecordDataset(ctx));
     parser_.reset(new OFRecordParser());
-    if (ctx->Attr<bool>("random_shuffle")) {
-      loader_.reset(new RandomShuffleDataset<TensorBuffer>(ctx, std::move(loader_)));
-    }
     int32_t batch_size = ctx->TensorDesc4ArgNameAndIndex("out", 0)->shape().elem_cnt();
-    loader_.reset(new BatchDataset<TensorBuffer>(batch_size, std::move(loader_)));
-    StartLoadThread();
+    const DataReaderConf conf = DataReaderConf4Ctx(ctx);
+    if (ctx->Attr<bool>("use_index")) {
+      StartIndexedLoadThreads(ctx, conf, batch_size);
+      return;
+    }
+    CHECK_EQ(ctx->Attr<int64_t>("skip_records"), 0) << "skip_records requires use_index";
+    StartLoadThreads(conf, [ctx, batch_size](int32_t thread_id, int32_t num_threads) {
+      std::unique_ptr<Dataset<TensorBuffer>> loader(
+          new OFRecordDataset(ctx, num_threads, thread_id));
+      if (ctx->Attr<bool>("random_shuffle")) {
+        loader.reset(new RandomShuffleDataset<TensorBuffer>(ctx, std::move(loader)));
+      }
+      loader.reset(new BatchDataset<TensorBuffer>(batch_size, std::move(loader)));
+      return loader;
+    });
   }
   ~OFRecordDataReader() = default;
 
  protected:
-  using DataReader<TensorBuffer>::loader_;
   using DataReader<TensorBuffer>::parser_;
+
+ private:
+  // Reads the records through the index files of the part files, which shards the records
+  // rather than the part files among the ranks and shuffles all of them every epoch.
+  void StartIndexedLoadThreads(user_op::KernelInitContext* ctx, const DataReaderConf& conf,
+                               int32_t batch_size) {
+    std::shared_ptr<const OFRecordIndex> index(new OFRecordIndex(GetOFRecordDataFilePaths(ctx)));
+    int32_t parallel_id = 0;
+    int32_t parallel_num = 0;
+    GetOFRecordParallelIdAndNum(ctx, &parallel_id, &parallel_num);
+    const bool shuffle =
+        ctx->Attr<bool>("random_shuffle") || ctx->Attr<bool>("shuffle_after_epoch");
+    // all the ranks must shuffle alike to split the records of an epoch
+    int64_t seed = ctx->Attr<int64_t>("seed");
+    if (seed == -1) { seed = kOneflowDatasetSeed; }
+    const int64_t skip_records = ctx->Attr<int64_t>("skip_records");
+    CHECK_GE(skip_records, 0);
+    if (conf.num_loader_threads > 1) {
+      CHECK_EQ(skip_records % batch_size, 0)
+          << "skip_records should be a multiple of the batch size with several loader threads";
+    }
+    StartLoadThreads(conf, [&](int32_t thread_id, int32_t num_threads) {
+      // The batches of the shards are delivered round-robin, the g-th batch coming from shard
+      // g % num_threads. The reader resumes at batch skip_records / batch_size, so the first
+      // loader thread takes the shard of that batch and every shard skips the batches it
+      // delivered before.
+      const int64_t num_skipped_batches = skip_records / batch_size;
+      const int64_t shard_id = (thread_id + num_skipped_batches) % num_threads;
+      std::unique_ptr<DistributedTrainingDataset<TensorBuffer>> records(
+          new DistributedTrainingDataset<TensorBuffer>(
+              parallel_num * num_threads, parallel_id * num_threads + shard_id,
+              /*stride_partition=*/true, shuffle, seed,
+              std::unique_ptr<RandomAccessDataset<TensorBuffer>>(
+                  new IndexedOFRecordDataset(index))));
+      if (num_threads == 1) {
+        records->Skip(skip_records);
+      } else {
+        records->Skip((num_skipped_batches + num_threads - 1 - shard_id) / num_threads
+                      * batch_size);
+      }
+      std::unique_ptr<Dataset<TensorBuffer>> loader(std::move(records));
+      loader.reset(new BatchDataset<TensorBuffer>(batch_size, std::move(loader)));
+      return loader;
+    });
+  }
 };
 
 }  // namespace data
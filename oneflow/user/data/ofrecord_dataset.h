@@ -29,51 +29,70 @@ limitations under the License.
 namespace oneflow {
 namespace data {
 
+inline std::vector<std::string> GetOFRecordDataFilePaths(user_op::KernelInitContext* ctx) {
+  const int32_t data_part_num = ctx->Attr<int32_t>("data_part_num");
+  const std::string& data_dir = ctx->Attr<std::string>("data_dir");
+  const std::string& part_name_prefix = ctx->Attr<std::string>("part_name_prefix");
+  const int32_t part_name_suffix_length = ctx->Attr<int32_t>("part_name_suffix_length");
+  std::vector<std::string> data_file_paths;
+  for (int i = 0; i < data_part_num; ++i) {
+    std::string num = std::to_string(i);
+    int32_t zero_count = std::max(part_name_suffix_length - static_cast<int32_t>(num.length()), 0);
+    data_file_paths.emplace_back(
+        JoinPath(data_dir, part_name_prefix + std::string(zero_count, '0') + num));
+  }
+  return data_file_paths;
+}
+
+// Gets the rank and the number of ranks the data of an OFRecord reader is split among.
+inline void GetOFRecordParallelIdAndNum(user_op::KernelInitContext* ctx, int32_t* parallel_id,
+                                        int32_t* parallel_num) {
+  bool is_local = false;
+  // NOTE(zwx): OFRecordDataset is used by OFRecordDataReader and
+  // OFRecordImageClassificationDataReader both, the latter has no attr nd_sbp,
+  // so it couldn't work in DDP for now. The If condition here could be removed when
+  // OFRecordImageClassificationDataReader had supported DDP (add attr nd_sbp)
+  // or been deprecated.
+  if (ctx->op_type_name() == "OFRecordReader") {
+    auto nd_sbp_str_vec = ctx->Attr<std::vector<std::string>>("nd_sbp");
+    // NOTE(zwx): OFRecordDataset is not consistent since attr nd_sbp is empty,
+    // we assume that it works in DDP
+    if (nd_sbp_str_vec.empty() && CHECK_JUST(IsMultiClient())) { is_local = true; }
+  }
+  if (is_local) {
+    *parallel_id = GlobalProcessCtx::Rank();
+    *parallel_num = GlobalProcessCtx::WorldSize();
+  } else {
+    *parallel_id = ctx->parallel_ctx().parallel_id();
+    *parallel_num = ctx->parallel_ctx().parallel_num();
+  }
+}
+
 class OFRecordDataset final : public Dataset<TensorBuffer> {
  public:
   using LoadTargetPtr = std::shared_ptr<TensorBuffer>;
   using LoadTargetPtrList = std::vector<LoadTargetPtr>;
   OF_DISALLOW_COPY_AND_MOVE(OFRecordDataset);
-  OFRecordDataset(user_op::KernelInitContext* ctx) {
+  explicit OFRecordDataset(user_op::KernelInitContext* ctx) : OFRecordDataset(ctx, 1, 0) {}
+  // Reads the local part files of shard `local_shard_id` out of `num_local_shards`, which lets
+  // every loader thread of a reader read its own part files.
+  OFRecordDataset(user_op::KernelInitContext* ctx, int32_t num_local_shards,
+                  int32_t local_shard_id) {
     current_epoch_ = 0;
     shuffle_after_epoch_ = ctx->Attr<bool>("shuffle_after_epoch");
 
     // in stream
     data_part_num_ = ctx->Attr<int32_t>("data_part_num");
-    std::string data_dir = ctx->Attr<std::string>("data_dir");
-    std::string part_name_prefix = ctx->Attr<std::string>("part_name_prefix");
-    int32_t part_name_suffix_length = ctx->Attr<int32_t>("part_name_suffix_length");
-
-    for (int i = 0; i < data_part_num_; ++i) {
-      std::string num = std::to_string(i);
-      int32_t zero_count =
-          std::max(part_name_suffix_length - static_cast<int32_t>(num.length()), 0);
-      data_file_paths_.emplace_back(
-          JoinPath(data_dir, part_name_prefix + std::string(zero_count, '0') + num));
-    }
-
-    bool is_local = false;
-    // NOTE(zwx): OFRecordDataset is used by OFRecordDataReader and
-    // OFRecordImageClassificationDataReader both, the latter has no attr nd_sbp,
-    // so it couldn't work in DDP for now. The If condition here could be removed when
-    // OFRecordImageClassificationDataReader had supported DDP (add attr nd_sbp)
-    // or been deprecated.
-    if (ctx->op_type_name() == "OFRecordReader") {
-      auto nd_sbp_str_vec = ctx->Attr<std::vector<std::string>>("nd_sbp");
-      // NOTE(zwx): OFRecordDataset is not consistent since attr nd_sbp is empty,
-      // we assume that it works in DDP
-      if (nd_sbp_str_vec.empty() && CHECK_JUST(IsMultiClient())) { is_local = true; }
-    }
-    if (is_local) {
-      parallel_id_ = GlobalProcessCtx::Rank();
-      parallel_num_ = GlobalProcessCtx::WorldSize();
-    } else {
-      parallel_id_ = ctx->parallel_ctx().parallel_id();
-      parallel_num_ = ctx->parallel_ctx().parallel_num();
-    }
-    CHECK_LE(parallel_num_, data_part_num_);
-    BalancedSplitter bs(data_part_num_, parallel_num_);
-    range_ = bs.At(parallel_id_);
+    data_file_paths_ = GetOFRecordDataFilePaths(ctx);
+    GetOFRecordParallelIdAndNum(ctx, &parallel_id_, &parallel_num_);
+    CHECK_GE(local_shard_id, 0);
+    CHECK_LT(local_shard_id, num_local_shards);
+    const int64_t num_shards = static_cast<int64_t>(parallel_num_) * num_local_shards;
+    CHECK_LE(num_shards, data_part_num_)
+        << "every loader thread needs at least one part file, data_part_num: " << data_part_num_
+        << ", parallel_num: " << parallel_num_ << ", num_loader_threads: " << num_local_shards;
+    BalancedSplitter bs(data_part_num_, num_shards);
+    range_ = bs.At(parallel_id_ * num_local_shards + local_shard_id);
     std::vector<std::string> local_file_paths = GetLocalFilePaths();
     in_stream_.reset(
         new PersistentInStream(DataFS(), local_file_paths, !shuffle_after_epoch_, false));
@@ -33,21 +33,24 @@ class OFRecordImageClassificationDataReader final
  public:
   explicit OFRecordImageClassificationDataReader(user_op::KernelInitContext* ctx)
       : DataReader<ImageClassificationDataInstance>(ctx) {
-    std::unique_ptr<Dataset<TensorBuffer>> base(new OFRecordDataset(ctx));
-    if (ctx->Attr<bool>("random_shuffle")) {
-      base.reset(new RandomShuffleDataset<TensorBuffer>(ctx, std::move(base)));
-    }
-    loader_.reset(new OFRecordImageClassificationDataset(ctx, std::move(base)));
-    const int64_t batch_size = ctx->TensorDesc4ArgNameAndIndex("image", 0)->shape().elem_cnt();
-    loader_.reset(
-        new BatchDataset<ImageClassificationDataInstance>(batch_size, std::move(loader_)));
     parser_.reset(new OFRecordImageClassificationParser());
-    StartLoadThread();
+    const int64_t batch_size = ctx->TensorDesc4ArgNameAndIndex("image", 0)->shape().elem_cnt();
+    StartLoadThreads(DataReaderConf4Ctx(ctx), [ctx, batch_size](int32_t thread_id,
+                                                                int32_t num_threads) {
+      std::unique_ptr<Dataset<TensorBuffer>> base(new OFRecordDataset(ctx, num_threads, thread_id));
+      if (ctx->Attr<bool>("random_shuffle")) {
+        base.reset(new RandomShuffleDataset<TensorBuffer>(ctx, std::move(base)));
+      }
+      std::unique_ptr<Dataset<ImageClassificationDataInstance>> loader(
+          new OFRecordImageClassificationDataset(ctx, std::move(base), num_threads));
+      loader.reset(
+          new BatchDataset<ImageClassificationDataInstance>(batch_size, std::move(loader)));
+      return loader;
+    });
   }
   ~OFRecordImageClassificationDataReader() override = default;
 
  protected:
-  using DataReader<ImageClassificationDataInstance>::loader_;
   using DataReader<ImageClassificationDataInstance>::parser_;
 };
 
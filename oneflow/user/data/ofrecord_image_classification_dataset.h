@@ -151,8 +151,10 @@ class OFRecordImageClassificationDataset final : public Dataset<ImageClassificat
   using LoadTargetPtr = std::shared_ptr<ImageClassificationDataInstance>;
   using LoadTargetPtrList = std::vector<LoadTargetPtr>;
   OF_DISALLOW_COPY_AND_MOVE(OFRecordImageClassificationDataset);
+  // `num_replicas` datasets share the decode threads of the machine when a reader runs several
+  // loader threads.
   OFRecordImageClassificationDataset(user_op::KernelInitContext* ctx,
-                                     std::unique_ptr<BaseDataset>&& base)
+                                     std::unique_ptr<BaseDataset>&& base, int32_t num_replicas)
       : base_(std::move(base)), out_thread_idx_(0) {
     const std::string& color_space = ctx->Attr<std::string>("color_space");
     const std::string& image_feature_name = ctx->Attr<std::string>("image_feature_name");
@@ -160,8 +162,12 @@ class OFRecordImageClassificationDataset final : public Dataset<ImageClassificat
     const auto num_decode_threads_per_machine =
         ctx->Attr<int32_t>("num_decode_threads_per_machine");
     const auto decode_buffer_size_per_thread = ctx->Attr<int32_t>("decode_buffer_size_per_thread");
-    const int32_t num_local_decode_threads = GetNumLocalDecodeThreads(
-        num_decode_threads_per_machine, ctx->parallel_desc(), ctx->parallel_ctx());
+    CHECK_GT(num_replicas, 0);
+    const int32_t num_local_decode_threads =
+        std::max<int32_t>(GetNumLocalDecodeThreads(num_decode_threads_per_machine,
+                                                   ctx->parallel_desc(), ctx->parallel_ctx())
+                              / num_replicas,
+                          1);
     decode_in_buffers_.resize(num_local_decode_threads);
     decode_out_buffers_.resize(num_local_decode_threads);
     for (int64_t i = 0; i < num_local_decode_threads; ++i) {
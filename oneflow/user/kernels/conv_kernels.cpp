@@ -18,6 +18,7 @@ limitations under the License.
 #include "oneflow/core/kernel/new_kernel_util.h"
 #include "oneflow/core/kernel/kernel_util.h"
 #include "oneflow/core/ep/include/primitive/add.h"
+#include "oneflow/core/device/cpu_conv_util.h"
 
 namespace oneflow {
 
@@ -369,6 +370,25 @@ std::shared_ptr<ConvOpKernelCache<T>> CreateConvOpKernelCache(user_op::KernelCac
   return cache;
 }
 
+template<typename T>
+CpuConvParams MakeCpuConvParams(const ConvOpKernelCache<T>& cache) {
+  CHECK_EQ(cache.idx_offset_, 2) << "only channels first convs are supported";
+  CpuConvParams params{};
+  params.data_type = GetDataType<T>::value;
+  params.batch_size = cache.in_5d_shape_.At(0);
+  params.in_channels = cache.in_5d_shape_.At(1);
+  params.out_channels = cache.out_5d_shape_.At(1);
+  FOR_RANGE(size_t, i, 0, CpuConvParams::kConvMaxDims) {
+    params.in_dims[i] = cache.in_5d_shape_.At(2 + i);
+    params.out_dims[i] = cache.out_5d_shape_.At(2 + i);
+    params.kernel_dims[i] = cache.weight_5d_shape_.At(2 + i);
+    params.strides[i] = cache.strides_3d_.at(i);
+    params.dilation_rate[i] = cache.dilation_rate_3d_.at(i);
+    params.padding_before[i] = cache.padding_before_3d_.at(i);
+  }
+  return params;
+}
+
 template<typename T>
 void InitBiasMulBuf(T* dptr, int64_t num) {
   for (int64_t i = 0; i < num; ++i) { dptr[i] = 1; }
@@ -395,9 +415,19 @@ class ConvCpuKernel final : public user_op::OpKernel {
 
     const user_op::Tensor* in = ctx->Tensor4ArgNameAndIndex("in", 0);
     const user_op::Tensor* weight = ctx->Tensor4ArgNameAndIndex("weight", 0);
-    user_op::Tensor* tmp_buffer = ctx->Tensor4ArgNameAndIndex("tmp_buffer", 0);
     user_op::Tensor* out = ctx->Tensor4ArgNameAndIndex("out", 0);
 
+    // Channels first convs are computed by the batch parallel cpu conv engine, which picks the
+    // algorithm by the shapes
+    if (conv_cache->idx_offset_ == 2) {
+      const user_op::Tensor* bias = ctx->Tensor4ArgNameAndIndex("bias", 0);
+      CpuConvForward<T>(ctx->stream(), MakeCpuConvParams(*conv_cache), in->dptr<T>(),
+                        weight->dptr<T>(), bias == nullptr ? nullptr : bias->dptr<T>(),
+                        out->mut_dptr<T>());
+      return;
+    }
+
+    user_op::Tensor* tmp_buffer = ctx->Tensor4ArgNameAndIndex("tmp_buffer", 0);
     T* col_buf_dptr = tmp_buffer->mut_dptr<T>();
 
     bool is_bias_mul_inited = false;
@@ -457,6 +487,8 @@ class ConvCpuKernel final : public user_op::OpKernel {
         const auto& weight_shape = ctx->InputTensorDesc("weight", 0).shape();               \
                                                                                             \
         int64_t idx_offset = IdxOffset(ctx->Attr<std::string>("data_format"));              \
+        /* the cpu conv engine of channels first convs allocates its own blocks */          \
+        if (idx_offset == 2) { return tmp_buffer_size; }                                    \
         tmp_buffer_size +=                                                                  \
             CalcElemNumOfColBuf(out_shape, weight_shape, idx_offset) * sizeof(dtype);       \
         bool has_bias = ctx->has_input("bias", 0);                                          \
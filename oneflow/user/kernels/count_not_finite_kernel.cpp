@@ -58,4 +58,38 @@ REGISTER_COUNT_NOT_FINITE_CPU_KERNEL(double)
 REGISTER_MULTI_COUNT_NOT_FINITE_CPU_KERNEL(float)
 REGISTER_MULTI_COUNT_NOT_FINITE_CPU_KERNEL(double)
 
+template<typename T>
+class MultiUnscaleCountNotFiniteCpuKernel final : public user_op::OpKernel {
+ public:
+  MultiUnscaleCountNotFiniteCpuKernel() = default;
+  ~MultiUnscaleCountNotFiniteCpuKernel() override = default;
+
+ private:
+  void Compute(user_op::KernelComputeContext* ctx) const override {
+    const T inv_scale =
+        static_cast<T>(*ctx->Tensor4ArgNameAndIndex("inv_scale", 0)->dptr<float>());
+    user_op::Tensor* y = ctx->Tensor4ArgNameAndIndex("y", 0);
+    int64_t count = 0;
+    FOR_RANGE(int32_t, i, 0, ctx->input_size("x")) {
+      user_op::Tensor* x = ctx->Tensor4ArgNameAndIndex("x", i);
+      T* x_ptr = x->mut_dptr<T>();
+      FOR_RANGE(int64_t, j, 0, x->shape().elem_cnt()) {
+        x_ptr[j] *= inv_scale;
+        if (!std::isfinite(x_ptr[j])) { count++; }
+      }
+    }
+    *y->mut_dptr<int64_t>() = count;
+  }
+  bool AlwaysComputeWhenAllOutputsEmpty() const override { return false; }
+};
+
+#define REGISTER_MULTI_UNSCALE_COUNT_NOT_FINITE_CPU_KERNEL(dtype)     \
+  REGISTER_USER_KERNEL("multi_unscale_count_not_finite")              \
+      .SetCreateFn<MultiUnscaleCountNotFiniteCpuKernel<dtype>>()      \
+      .SetIsMatchedHob((user_op::HobDeviceType() == DeviceType::kCPU) \
+                       && (user_op::HobDataType("x", 0) == GetDataType<dtype>::value));
+
+REGISTER_MULTI_UNSCALE_COUNT_NOT_FINITE_CPU_KERNEL(float)
+REGISTER_MULTI_UNSCALE_COUNT_NOT_FINITE_CPU_KERNEL(double)
+
 }  // namespace oneflow
@@ -67,6 +67,52 @@ __global__ void MultiCountNotFiniteGpu(Param<T, N> param) {
   if (threadIdx.x == 0) { AtomicAdd(param.y, block_count_sum); }
 }
 
+template<typename T, int32_t N>
+struct UnscaleParam {
+  T* x[N];
+  int64_t x_elem_cnt[N];
+  const float* inv_scale;
+  int64_t* y;
+  int64_t num_x;
+};
+
+template<typename T>
+struct UnscaleFunctor {
+  __device__ explicit UnscaleFunctor(float inv_scale) : inv_scale(static_cast<T>(inv_scale)) {}
+  __device__ T operator()(T x) const { return x * inv_scale; }
+  __device__ bool IsFinite(T x) const { return isfinite(x); }
+  const T inv_scale;
+};
+
+template<>
+struct UnscaleFunctor<half> {
+  __device__ explicit UnscaleFunctor(float inv_scale) : inv_scale(inv_scale) {}
+  // Multiplied in float, the product is checked after rounding back to half,
+  // which overflows to inf beyond 65504
+  __device__ half operator()(half x) const { return __float2half(__half2float(x) * inv_scale); }
+  __device__ bool IsFinite(half x) const { return isfinite(__half2float(x)); }
+  const float inv_scale;
+};
+
+template<typename T, int32_t N>
+__global__ void MultiUnscaleCountNotFiniteGpu(UnscaleParam<T, N> param) {
+  typedef cub::BlockReduce<int64_t, kCudaThreadsNumPerBlock> BlockReduce;
+  __shared__ typename BlockReduce::TempStorage cub_reduce_tmp_storage;
+  const UnscaleFunctor<T> unscale(*param.inv_scale);
+  int64_t thread_count = 0;
+  for (int32_t k = 0; k < param.num_x; ++k) {
+    T* x = param.x[k];
+    CUDA_1D_KERNEL_LOOP(i, param.x_elem_cnt[k]) {
+      const T unscaled = unscale(x[i]);
+      x[i] = unscaled;
+      if (!unscale.IsFinite(unscaled)) { thread_count += 1; }
+    }
+  }
+  __syncthreads();
+  int64_t block_count_sum = BlockReduce(cub_reduce_tmp_storage).Reduce(thread_count, cub::Sum());
+  if (threadIdx.x == 0) { AtomicAdd(param.y, block_count_sum); }
+}
+
 constexpr int64_t kCountNotFiniteNumBlocks = 512;
 
 int GetCountNotFiniteNumBlocks(const int64_t elem_cnt) {
@@ -157,4 +203,53 @@ class MultiCountNotFiniteGpuKernel final : public user_op::OpKernel,
 REGISTER_MULTI_COUNT_NOT_FINITE_CUDA_KERNEL(float)
 REGISTER_MULTI_COUNT_NOT_FINITE_CUDA_KERNEL(double)
 
+template<typename T>
+class MultiUnscaleCountNotFiniteGpuKernel final : public user_op::OpKernel,
+                                                  public user_op::CudaGraphSupport {
+ public:
+  MultiUnscaleCountNotFiniteGpuKernel() = default;
+  ~MultiUnscaleCountNotFiniteGpuKernel() override = default;
+
+ private:
+  using user_op::OpKernel::Compute;
+  void Compute(user_op::KernelComputeContext* ctx) const override {
+    using DevT = typename DevDType<DeviceType::kCUDA, T>::type;
+    user_op::Tensor* y = ctx->Tensor4ArgNameAndIndex("y", 0);
+    UnscaleParam<DevT, 128> para;
+    Memset<DeviceType::kCUDA>(ctx->stream(), y->mut_dptr<int64_t>(), 0,
+                              y->shape().elem_cnt() * sizeof(int64_t));
+    para.inv_scale = ctx->Tensor4ArgNameAndIndex("inv_scale", 0)->dptr<float>();
+    para.y = y->mut_dptr<int64_t>();
+
+    int64_t remain_size = ctx->input_size("x");
+    int64_t input_id = 0;
+    while (remain_size > 0) {
+      para.num_x = std::min<int64_t>(remain_size, 128);
+      remain_size -= para.num_x;
+      int64_t max_elem_cnt = 0;
+      for (int32_t i = 0; i < para.num_x; ++i) {
+        user_op::Tensor* x = ctx->Tensor4ArgNameAndIndex("x", input_id);
+        input_id++;
+        para.x[i] = reinterpret_cast<DevT*>(x->mut_dptr<T>());
+        para.x_elem_cnt[i] = x->shape().elem_cnt();
+        max_elem_cnt = std::max(max_elem_cnt, x->shape().elem_cnt());
+      }
+      MultiUnscaleCountNotFiniteGpu<DevT, 128>
+          <<<GetCountNotFiniteNumBlocks(max_elem_cnt), kCudaThreadsNumPerBlock, 0,
+             ctx->stream()->As<ep::CudaStream>()->cuda_stream()>>>(para);
+    }
+  }
+  bool AlwaysComputeWhenAllOutputsEmpty() const override { return false; }
+};
+
+#define REGISTER_MULTI_UNSCALE_COUNT_NOT_FINITE_CUDA_KERNEL(dtype)     \
+  REGISTER_USER_KERNEL("multi_unscale_count_not_finite")               \
+      .SetCreateFn<MultiUnscaleCountNotFiniteGpuKernel<dtype>>()       \
+      .SetIsMatchedHob((user_op::HobDeviceType() == DeviceType::kCUDA) \
+                       && (user_op::HobDataType("x", 0) == GetDataType<dtype>::value));
+
+REGISTER_MULTI_UNSCALE_COUNT_NOT_FINITE_CUDA_KERNEL(float16)
+REGISTER_MULTI_UNSCALE_COUNT_NOT_FINITE_CUDA_KERNEL(float)
+REGISTER_MULTI_UNSCALE_COUNT_NOT_FINITE_CUDA_KERNEL(double)
+
 }  // namespace oneflow
@@ -81,4 +81,63 @@ namespace oneflow {
   return Maybe<void>::Ok();
 }
 
+/* static */ Maybe<void> MultiUnscaleCountNotFiniteOp::InferLogicalTensorDesc(
+    user_op::InferContext* ctx) {
+  CHECK_EQ_OR_RETURN(ctx->InputTensorDesc("inv_scale", 0).shape().elem_cnt(), 1);
+  user_op::TensorDesc* y_desc = ctx->OutputTensorDesc("y", 0);
+  *y_desc->mut_shape() = Shape({1});
+  return Maybe<void>::Ok();
+}
+
+/*static*/ Maybe<void> MultiUnscaleCountNotFiniteOp::InferPhysicalTensorDesc(
+    user_op::InferContext* ctx) {
+  return InferLogicalTensorDesc(ctx);
+}
+
+/* static */ Maybe<void> MultiUnscaleCountNotFiniteOp::GetSbp(user_op::SbpContext* ctx) {
+  const int32_t num_x = ctx->user_op_conf().input_size("x");
+  std::vector<user_op::OpArg> x_args;
+  int64_t min_num_axes = ctx->LogicalTensorDesc4InputArgNameAndIndex("x", 0).shape().NumAxes();
+  for (int32_t i = 0; i < num_x; ++i) {
+    x_args.emplace_back("x", i);
+    min_num_axes = std::min(min_num_axes,
+                            ctx->LogicalTensorDesc4InputArgNameAndIndex("x", i).shape().NumAxes());
+  }
+  for (int64_t i = 0; i < min_num_axes; ++i) {
+    ctx->NewBuilder()
+        .Split(x_args, i)
+        .Broadcast(user_op::OpArg("inv_scale", 0))
+        .PartialSum(user_op::OpArg("y", 0))
+        .Build();
+  }
+  return Maybe<void>::Ok();
+}
+
+/* static */ Maybe<void> MultiUnscaleCountNotFiniteOp::InferDataType(user_op::InferContext* ctx) {
+  const user_op::TensorDesc& first_x_desc = ctx->InputTensorDesc("x", 0);
+  for (int32_t i = 1; i < ctx->input_size("x"); ++i) {
+    CHECK_EQ_OR_RETURN(ctx->InputTensorDesc("x", i).data_type(), first_x_desc.data_type());
+  }
+  CHECK_EQ_OR_RETURN(ctx->InputTensorDesc("inv_scale", 0).data_type(), DataType::kFloat);
+  user_op::TensorDesc* y_desc = ctx->OutputTensorDesc("y", 0);
+  *y_desc->mut_data_type() = DataType::kInt64;
+  return Maybe<void>::Ok();
+}
+
+/* static */ Maybe<void> MultiUnscaleCountNotFiniteOp::ModifyInputArg(
+    const GetInputArgModifier& GetInputArgModifierFn, const user_op::UserOpConfWrapper& conf) {
+  for (int32_t i = 0; i < conf.input_size("x"); ++i) {
+    user_op::InputArgModifier* x_modifier = GetInputArgModifierFn("x", i);
+    CHECK_NOTNULL_OR_RETURN(x_modifier);
+    x_modifier->set_is_mutable(true);
+  }
+  return Maybe<void>::Ok();
+}
+
+/*static*/ Maybe<void> MultiUnscaleCountNotFiniteOp::CheckAttr(
+    const user_op::UserOpDefWrapper&, const user_op::UserOpConfWrapper& op_conf) {
+  CHECK_OR_RETURN(op_conf.input_size("x") >= 1);
+  return Maybe<void>::Ok();
+}
+
 }  // namespace oneflow
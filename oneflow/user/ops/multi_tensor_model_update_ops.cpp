@@ -0,0 +1,213 @@
+/*
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+*/
+#include "oneflow/core/framework/framework.h"
+#include "oneflow/core/framework/op_generated.h"
+
+namespace oneflow {
+
+namespace {
+
+Maybe<void> CheckMultiTensorArgSize(const user_op::UserOpConfWrapper& conf,
+                                    const std::vector<std::string>& state_names) {
+  const int32_t num_models = conf.input_size("model");
+  CHECK_GE_OR_RETURN(num_models, 1);
+  CHECK_EQ_OR_RETURN(conf.input_size("model_diff"), num_models);
+  for (const auto& state_name : state_names) {
+    CHECK_EQ_OR_RETURN(conf.input_size(state_name), num_models)
+        << "the number of " << state_name << " should be equal to the number of models";
+  }
+  return Maybe<void>::Ok();
+}
+
+Maybe<void> InferMultiTensorUpdateTensorDesc(user_op::InferContext* ctx,
+                                             const std::vector<std::string>& state_names) {
+  for (int32_t i = 0; i < ctx->input_size("model"); ++i) {
+    const user_op::TensorDesc& model = ctx->InputTensorDesc("model", i);
+    CHECK_EQ_OR_RETURN(ctx->InputTensorDesc("model_diff", i).shape(), model.shape());
+    for (const auto& state_name : state_names) {
+      if (!ctx->has_input(state_name, 0)) { continue; }
+      CHECK_EQ_OR_RETURN(ctx->InputTensorDesc(state_name, i).shape(), model.shape());
+    }
+  }
+  return Maybe<void>::Ok();
+}
+
+Maybe<void> InferMultiTensorUpdateDataType(user_op::InferContext* ctx,
+                                           const std::vector<std::string>& state_names) {
+  const DataType data_type = ctx->InputTensorDesc("model", 0).data_type();
+  const DataType diff_data_type = ctx->InputTensorDesc("model_diff", 0).data_type();
+  for (int32_t i = 0; i < ctx->input_size("model"); ++i) {
+    CHECK_EQ_OR_RETURN(ctx->InputTensorDesc("model", i).data_type(), data_type)
+        << "all models should have the same data type";
+    CHECK_EQ_OR_RETURN(ctx->InputTensorDesc("model_diff", i).data_type(), diff_data_type)
+        << "all model diffs should have the same data type";
+    for (const auto& state_name : state_names) {
+      if (!ctx->has_input(state_name, 0)) { continue; }
+      CHECK_EQ_OR_RETURN(ctx->InputTensorDesc(state_name, i).data_type(), data_type);
+    }
+  }
+  return Maybe<void>::Ok();
+}
+
+Maybe<void> GetMultiTensorUpdateSbp(user_op::SbpContext* ctx) {
+  int64_t min_num_axes = ctx->LogicalTensorDesc4InputArgNameAndIndex("model", 0).shape().NumAxes();
+  for (int32_t i = 1; i < ctx->user_op_conf().input_size("model"); ++i) {
+    min_num_axes = std::min(
+        min_num_axes, ctx->LogicalTensorDesc4InputArgNameAndIndex("model", i).shape().NumAxes());
+  }
+  ctx->NewBuilder().Broadcast(ctx->inputs()).Build();
+  FOR_RANGE(int64_t, axis, 0, min_num_axes) {
+    ctx->NewBuilder().Split(ctx->inputs(), axis).Build();
+  }
+  return Maybe<void>::Ok();
+}
+
+Maybe<void> SetMultiTensorInputArgModifierMutable(
+    const user_op::GetInputArgModifier& GetInputArgModifierFn,
+    const user_op::UserOpConfWrapper& conf, const std::vector<std::string>& arg_names) {
+  for (const auto& arg_name : arg_names) {
+    for (int32_t i = 0; i < conf.input_size(arg_name); ++i) {
+      user_op::InputArgModifier* arg_modifier = GetInputArgModifierFn(arg_name, i);
+      CHECK_NOTNULL_OR_RETURN(arg_modifier);
+      arg_modifier->set_is_mutable(true);
+    }
+  }
+  return Maybe<void>::Ok();
+}
+
+}  // namespace
+
+/* static */ Maybe<void> MultiTensorSgdUpdateOp::InferLogicalTensorDesc(
+    user_op::InferContext* ctx) {
+  return InferMultiTensorUpdateTensorDesc(ctx, {});
+}
+
+/*static*/ Maybe<void> MultiTensorSgdUpdateOp::InferPhysicalTensorDesc(
+    user_op::InferContext* ctx) {
+  return InferLogicalTensorDesc(ctx);
+}
+
+/* static */ Maybe<void> MultiTensorSgdUpdateOp::GetSbp(user_op::SbpContext* ctx) {
+  return GetMultiTensorUpdateSbp(ctx);
+}
+
+/* static */ Maybe<void> MultiTensorSgdUpdateOp::ModifyInputArg(
+    const GetInputArgModifier& GetInputArgModifierFn, const user_op::UserOpConfWrapper& conf) {
+  return SetMultiTensorInputArgModifierMutable(GetInputArgModifierFn, conf, {"model"});
+}
+
+/* static */ Maybe<void> MultiTensorSgdUpdateOp::InferDataType(user_op::InferContext* ctx) {
+  return InferMultiTensorUpdateDataType(ctx, {});
+}
+
+/*static*/ Maybe<void> MultiTensorSgdUpdateOp::CheckAttr(
+    const user_op::UserOpDefWrapper&, const user_op::UserOpConfWrapper& op_conf) {
+  return CheckMultiTensorArgSize(op_conf, {});
+}
+
+/* static */ Maybe<void> MultiTensorMomentumUpdateOp::InferLogicalTensorDesc(
+    user_op::InferContext* ctx) {
+  return InferMultiTensorUpdateTensorDesc(ctx, {"momentum"});
+}
+
+/*static*/ Maybe<void> MultiTensorMomentumUpdateOp::InferPhysicalTensorDesc(
+    user_op::InferContext* ctx) {
+  return InferLogicalTensorDesc(ctx);
+}
+
+/* static */ Maybe<void> MultiTensorMomentumUpdateOp::GetSbp(user_op::SbpContext* ctx) {
+  return GetMultiTensorUpdateSbp(ctx);
+}
+
+/* static */ Maybe<void> MultiTensorMomentumUpdateOp::ModifyInputArg(
+    const GetInputArgModifier& GetInputArgModifierFn, const user_op::UserOpConfWrapper& conf) {
+  return SetMultiTensorInputArgModifierMutable(GetInputArgModifierFn, conf,
+                                               {"model", "momentum"});
+}
+
+/* static */ Maybe<void> MultiTensorMomentumUpdateOp::InferDataType(user_op::InferContext* ctx) {
+  return InferMultiTensorUpdateDataType(ctx, {"momentum"});
+}
+
+/*static*/ Maybe<void> MultiTensorMomentumUpdateOp::CheckAttr(
+    const user_op::UserOpDefWrapper&, const user_op::UserOpConfWrapper& op_conf) {
+  return CheckMultiTensorArgSize(op_conf, {"momentum"});
+}
+
+/* static */ Maybe<void> MultiTensorAdamUpdateOp::InferLogicalTensorDesc(
+    user_op::InferContext* ctx) {
+  return InferMultiTensorUpdateTensorDesc(ctx, {"m", "v", "max_v"});
+}
+
+/*static*/ Maybe<void> MultiTensorAdamUpdateOp::InferPhysicalTensorDesc(
+    user_op::InferContext* ctx) {
+  return InferLogicalTensorDesc(ctx);
+}
+
+/* static */ Maybe<void> MultiTensorAdamUpdateOp::GetSbp(user_op::SbpContext* ctx) {
+  return GetMultiTensorUpdateSbp(ctx);
+}
+
+/* static */ Maybe<void> MultiTensorAdamUpdateOp::ModifyInputArg(
+    const GetInputArgModifier& GetInputArgModifierFn, const user_op::UserOpConfWrapper& conf) {
+  return SetMultiTensorInputArgModifierMutable(GetInputArgModifierFn, conf,
+                                               {"model", "m", "v", "max_v"});
+}
+
+/* static */ Maybe<void> MultiTensorAdamUpdateOp::InferDataType(user_op::InferContext* ctx) {
+  return InferMultiTensorUpdateDataType(ctx, {"m", "v", "max_v"});
+}
+
+/*static*/ Maybe<void> MultiTensorAdamUpdateOp::CheckAttr(
+    const user_op::UserOpDefWrapper&, const user_op::UserOpConfWrapper& op_conf) {
+  return CheckMultiTensorArgSize(op_conf, {"m", "v", "max_v"});
+}
+
+/* static */ Maybe<void> MultiTensorRmspropUpdateOp::InferLogicalTensorDesc(
+    user_op::InferContext* ctx) {
+  CHECK_EQ_OR_RETURN(ctx->has_input("mean_gradient", 0), ctx->Attr<bool>("centered"))
+      << "mean_gradient should be given if and only if centered is true";
+  return InferMultiTensorUpdateTensorDesc(ctx, {"mean_square", "mean_gradient"});
+}
+
+/*static*/ Maybe<void> MultiTensorRmspropUpdateOp::InferPhysicalTensorDesc(
+    user_op::InferContext* ctx) {
+  return InferLogicalTensorDesc(ctx);
+}
+
+/* static */ Maybe<void> MultiTensorRmspropUpdateOp::GetSbp(user_op::SbpContext* ctx) {
+  return GetMultiTensorUpdateSbp(ctx);
+}
+
+/* static */ Maybe<void> MultiTensorRmspropUpdateOp::ModifyInputArg(
+    const GetInputArgModifier& GetInputArgModifierFn, const user_op::UserOpConfWrapper& conf) {
+  return SetMultiTensorInputArgModifierMutable(GetInputArgModifierFn, conf,
+                                               {"model", "mean_square", "mean_gradient"});
+}
+
+/* static */ Maybe<void> MultiTensorRmspropUpdateOp::InferDataType(user_op::InferContext* ctx) {
+  return InferMultiTensorUpdateDataType(ctx, {"mean_square", "mean_gradient"});
+}
+
+/*static*/ Maybe<void> MultiTensorRmspropUpdateOp::CheckAttr(
+    const user_op::UserOpDefWrapper&, const user_op::UserOpConfWrapper& op_conf) {
+  if (op_conf.input_size("mean_gradient") == 0) {
+    return CheckMultiTensorArgSize(op_conf, {"mean_square"});
+  }
+  return CheckMultiTensorArgSize(op_conf, {"mean_square", "mean_gradient"});
+}
+
+}  // namespace oneflow
@@ -191,6 +191,7 @@ import oneflow.framework.scope_util as scope_util
 import oneflow.framework.session_context as session_ctx
 from oneflow.framework.multi_client_session import MultiClientSession
 from oneflow.framework.tensor_str import set_printoptions
+from oneflow.framework.num_threads import set_num_threads, get_num_threads
 
 if not env_util.HasAllMultiClientEnvVars():
     env_util.SetDefaultMultiClientEnvVars()
@@ -271,6 +272,7 @@ import oneflow.nn.image
 
 from oneflow.framework.check_point_v2 import load
 from oneflow.framework.check_point_v2 import save
+from oneflow.framework.check_point_v2 import async_save
 from oneflow.framework.dtype import convert_oneflow_dtype_to_numpy_dtype, dtypes
 from oneflow.framework.env_util import (
     api_enable_eager_execution as enable_eager_execution,
@@ -290,6 +292,7 @@ from oneflow.framework.generator import (
 from oneflow.framework.scope_util import api_current_scope as current_scope
 from oneflow.framework.tensor import Tensor
 from oneflow.framework.tensor import is_nonzero
+from oneflow.framework.eager_capture import EagerCapture, eager_capture
 
 from oneflow.nn.modules.pooling import (
     adaptive_avg_pool1d,
@@ -394,8 +397,10 @@ from . import (
 import oneflow.utils.data
 import oneflow.comm
 import oneflow.framework.docstr as docstr
+import oneflow.cpu
 import oneflow.cuda
 import oneflow.multiprocessing
+import oneflow.profiler
 
 if oneflow._oneflow_internal.flags.with_mlir():
     oneflow_internal_path = oneflow._oneflow_internal.__file__
@@ -15,7 +15,44 @@ limitations under the License.
 """
 
 
+from collections import defaultdict
+from enum import Enum
+
+import oneflow as flow
+
+
+class _OptimizerStage(Enum):
+    READY = 0
+    UNSCALED = 1
+    STEPPED = 2
+
+
 class GradScaler(object):
+    r"""Scales the loss to keep small gradients of reduced precision training
+    from underflowing, and adjusts the scale dynamically: it is multiplied by
+    ``backoff_factor`` when gradients have inf or nan, and by ``growth_factor``
+    after ``growth_interval`` steps without them.
+
+    In nn.Graph, set it with ``nn.Graph.set_grad_scaler()``. In eager mode, use
+    :meth:`scale`, :meth:`step` and :meth:`update`:
+
+    .. code-block:: python
+
+        scaler = flow.amp.GradScaler()
+        for x, y in dataloader:
+            loss = loss_fn(model(x), y)
+            scaler.scale(loss).backward()
+            scaler.step(optimizer)  # skipped if gradients have inf or nan
+            scaler.update()
+            optimizer.zero_grad()
+
+    Args:
+        init_scale (float, optional): the initial scale. Default: ``2.0 ** 16``.
+        growth_factor (float, optional): Default: 2.0.
+        backoff_factor (float, optional): must be ``1.0 / growth_factor``. Default: 0.5.
+        growth_interval (int, optional): Default: 2000.
+    """
+
     def __init__(
         self,
         init_scale=2.0 ** 16,
@@ -32,6 +69,142 @@ class GradScaler(object):
                 "got {}".format(backoff_factor)
             )
         self._growth_interval = growth_interval
+        # The states of eager mode
+        self._scale = float(init_scale)
+        self._growth_tracker = 0
+        self._inv_scale_tensors = {}
+        self._per_optimizer_states = defaultdict(self._new_optimizer_state)
+
+    @staticmethod
+    def _new_optimizer_state():
+        return {"stage": _OptimizerStage.READY, "num_not_finite": []}
+
+    def get_scale(self):
+        r"""Returns the current scale."""
+        return self._scale
+
+    def scale(self, outputs):
+        r"""Multiplies a tensor or a (nested) list or tuple of tensors by the
+        scale, usually the loss before ``backward()``.
+        """
+        if isinstance(outputs, (flow.Tensor, flow._oneflow_internal.Tensor)):
+            return outputs * self._scale
+        if isinstance(outputs, (list, tuple)):
+            return type(outputs)(self.scale(output) for output in outputs)
+        raise ValueError("outputs must be a Tensor or a list or tuple of Tensors")
+
+    def _inv_scale_tensor(self, device):
+        key = str(device)
+        if key not in self._inv_scale_tensors:
+            self._inv_scale_tensors[key] = flow.tensor(
+                [1.0 / self._scale], dtype=flow.float32, device=device
+            )
+        return self._inv_scale_tensors[key]
+
+    def unscale_(self, optimizer):
+        r"""Divides the gradients of ``optimizer`` by the scale in place and
+        checks them for inf and nan, with one fused kernel for all gradients of
+        the same device and dtype. Call it before modifying the gradients, e.g.
+        by ``clip_grad_norm_()``, :meth:`step` unscales them otherwise.
+        """
+        state = self._per_optimizer_states[id(optimizer)]
+        if state["stage"] is _OptimizerStage.UNSCALED:
+            raise RuntimeError(
+                "unscale_() has already been called on this optimizer since the last update()."
+            )
+        elif state["stage"] is _OptimizerStage.STEPPED:
+            raise RuntimeError("unscale_() is being called after step().")
+
+        device_dtype2grads = defaultdict(list)
+        for param_group in optimizer.param_groups:
+            for param in param_group.parameters:
+                if param.grad is None:
+                    continue
+                device_dtype2grads[(str(param.grad.device), param.grad.dtype)].append(
+                    param.grad
+                )
+        with flow.no_grad():
+            for ((device, _), grads) in device_dtype2grads.items():
+                state["num_not_finite"].append(
+                    flow._C.multi_unscale_count_not_finite(
+                        grads, self._inv_scale_tensor(device)
+                    )
+                )
+        state["stage"] = _OptimizerStage.UNSCALED
+
+    def _found_inf(self, state):
+        return any(count.numpy()[0] > 0 for count in state["num_not_finite"])
+
+    def step(self, optimizer, *args, **kwargs):
+        r"""Unscales the gradients of ``optimizer`` if :meth:`unscale_` was not
+        called, then runs ``optimizer.step(*args, **kwargs)`` unless the gradients
+        have inf or nan. Returns what ``optimizer.step()`` returns, or None if
+        the step is skipped.
+        """
+        state = self._per_optimizer_states[id(optimizer)]
+        if state["stage"] is _OptimizerStage.STEPPED:
+            raise RuntimeError(
+                "step() has already been called since the last update()."
+            )
+        if state["stage"] is _OptimizerStage.READY:
+            self.unscale_(optimizer)
+        retval = None
+        if not self._found_inf(state):
+            retval = optimizer.step(*args, **kwargs)
+        state["stage"] = _OptimizerStage.STEPPED
+        return retval
+
+    def update(self, new_scale=None):
+        r"""Updates the scale at the end of an iteration: backs off if any
+        optimizer stepped in this iteration found inf or nan, grows after
+        ``growth_interval`` iterations without them.
+
+        Raises RuntimeError if no optimizer has been unscaled or stepped since
+        the last update, unless ``new_scale`` is given.
+
+        Args:
+            new_scale (float, optional): sets the scale to it instead.
+        """
+        if new_scale is not None:
+            self._scale = float(new_scale)
+        else:
+            if all(
+                state["stage"] is _OptimizerStage.READY
+                for state in self._per_optimizer_states.values()
+            ):
+                raise RuntimeError("No inf checks were recorded prior to update().")
+            found_inf = any(
+                self._found_inf(state) for state in self._per_optimizer_states.values()
+            )
+            if found_inf:
+                self._scale *= self._backoff_factor
+                self._growth_tracker = 0
+            else:
+                self._growth_tracker += 1
+                if self._growth_tracker == self._growth_interval:
+                    self._scale *= self._growth_factor
+                    self._growth_tracker = 0
+        self._inv_scale_tensors.clear()
+        self._per_optimizer_states.clear()
+
+    def state_dict(self):
+        r"""Returns the state of the scaler as a dict."""
+        return {
+            "scale": self._scale,
+            "growth_factor": self._growth_factor,
+            "backoff_factor": self._backoff_factor,
+            "growth_interval": self._growth_interval,
+            "_growth_tracker": self._growth_tracker,
+        }
+
+    def load_state_dict(self, state_dict):
+        r"""Loads the state of the scaler from a dict returned by :meth:`state_dict`."""
+        self._scale = float(state_dict["scale"])
+        self._growth_factor = state_dict["growth_factor"]
+        self._backoff_factor = state_dict["backoff_factor"]
+        self._growth_interval = state_dict["growth_interval"]
+        self._growth_tracker = state_dict["_growth_tracker"]
+        self._inv_scale_tensors.clear()
 
     def _generate_conf_for_graph(self, train_conf):
         train_conf.mutable_dynamic_loss_scale_policy().set_initial_loss_scale(
@@ -0,0 +1,87 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import argparse
+import shutil
+import tempfile
+import time
+
+import oneflow as flow
+
+parser = argparse.ArgumentParser(description="flags for checkpoint io benchmark")
+parser.add_argument("--num_tensors", type=int, default=1000)
+parser.add_argument(
+    "--total_size_mb", type=int, default=2048, help="total size of the state_dict"
+)
+parser.add_argument(
+    "--num_io_threads",
+    type=str,
+    default="1,2,4,8,16",
+    help="concurrency levels to sweep, split by comma",
+)
+parser.add_argument("--iters", type=int, default=3)
+parser.add_argument(
+    "--save_dir", type=str, default=None, help="directory on the tested filesystem"
+)
+args = parser.parse_args()
+
+
+def make_state_dict():
+    numel = args.total_size_mb * 1024 * 1024 // 4 // args.num_tensors
+    return {f"param_{i}": flow.randn(numel) for i in range(args.num_tensors)}
+
+
+def timeit(fn):
+    durations = []
+    for _ in range(args.iters):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def main():
+    state_dict = make_state_dict()
+    nbytes = sum(v.numel() * 4 for v in state_dict.values())
+    gb = nbytes / 1e9
+    print(f"{args.num_tensors} tensors, {gb:.3f} GB in total")
+    print(f"{'layout':>10} {'threads':>8} {'save GB/s':>10} {'load GB/s':>10}")
+    for packed in [True, False]:
+        for num_io_threads in [int(x) for x in args.num_io_threads.split(",")]:
+            path = tempfile.mkdtemp(dir=args.save_dir)
+            try:
+                save_time = timeit(
+                    lambda: flow.save(
+                        state_dict, path, packed=packed, num_io_threads=num_io_threads
+                    )
+                )
+
+                def load():
+                    loaded = flow.load(
+                        path, use_mmap=False, num_io_threads=num_io_threads
+                    )
+                    assert len(loaded) == len(state_dict)
+
+                load_time = timeit(load)
+            finally:
+                shutil.rmtree(path)
+            print(
+                f"{'packed' if packed else 'directory':>10} {num_io_threads:>8} "
+                f"{gb / save_time:>10.3f} {gb / load_time:>10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
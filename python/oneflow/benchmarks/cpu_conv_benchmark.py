@@ -0,0 +1,104 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import argparse
+import os
+import time
+
+import oneflow as flow
+
+parser = argparse.ArgumentParser(description="flags for cpu conv benchmark")
+parser.add_argument(
+    "--shapes",
+    type=str,
+    default="8x64x56x56:64:3,8x64x56x56:256:1,8x128x28x28:128:3,8x3x224x224:64:7",
+    help="convs to sweep, split by comma, each as NxCxHxW:out_channels:kernel_size",
+)
+parser.add_argument(
+    "--algos",
+    type=str,
+    default="auto,im2col_gemm,gemm_1x1,winograd_3x3",
+    help="algorithms to sweep, split by comma. auto is the cached choice",
+)
+parser.add_argument(
+    "--num_threads",
+    type=str,
+    default="1,0",
+    help="thread counts to sweep, split by comma. 0 is the default thread count",
+)
+parser.add_argument("--iters", type=int, default=10)
+args = parser.parse_args()
+
+
+def parse_shape(shape):
+    (in_shape, out_channels, kernel_size) = shape.split(":")
+    return (
+        [int(x) for x in in_shape.split("x")],
+        int(out_channels),
+        int(kernel_size),
+    )
+
+
+def supports(algo, kernel_size):
+    if algo == "gemm_1x1":
+        return kernel_size == 1
+    if algo == "winograd_3x3":
+        return kernel_size == 3
+    return True
+
+
+def timeit(fn):
+    fn().numpy()
+    start = time.perf_counter()
+    for _ in range(args.iters):
+        out = fn()
+    # wait for the async ops
+    out.numpy()
+    return (time.perf_counter() - start) / args.iters
+
+
+def main():
+    algos = args.algos.split(",")
+    print(f"{'shape':>28} {'threads':>8}", end="")
+    for algo in algos:
+        print(f" {algo + ' ms':>16}", end="")
+    print()
+    try:
+        for shape in args.shapes.split(","):
+            (in_shape, out_channels, kernel_size) = parse_shape(shape)
+            x = flow.randn(*in_shape)
+            conv = flow.nn.Conv2d(
+                in_shape[1], out_channels, kernel_size, padding=kernel_size // 2
+            )
+            for num_threads in [int(x) for x in args.num_threads.split(",")]:
+                flow.set_num_threads(num_threads)
+                print(f"{shape:>28} {flow.get_num_threads():>8}", end="")
+                for algo in algos:
+                    if not supports(algo, kernel_size):
+                        print(f" {'-':>16}", end="")
+                        continue
+                    if algo == "auto":
+                        os.environ.pop("ONEFLOW_CPU_CONV_ALGO", None)
+                    else:
+                        os.environ["ONEFLOW_CPU_CONV_ALGO"] = algo
+                    print(f" {timeit(lambda: conv(x)) * 1e3:>16.2f}", end="")
+                print()
+    finally:
+        os.environ.pop("ONEFLOW_CPU_CONV_ALGO", None)
+        flow.set_num_threads(0)
+
+
+if __name__ == "__main__":
+    main()
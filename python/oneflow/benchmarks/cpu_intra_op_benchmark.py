@@ -0,0 +1,82 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import argparse
+import time
+
+import oneflow as flow
+
+parser = argparse.ArgumentParser(description="flags for cpu intra-op benchmark")
+parser.add_argument(
+    "--sizes",
+    type=str,
+    default="1024,65536,1048576,16777216",
+    help="element counts to sweep, split by comma",
+)
+parser.add_argument(
+    "--num_threads",
+    type=str,
+    default="1,2,4,8,16,32,64",
+    help="thread counts to sweep, split by comma",
+)
+parser.add_argument("--iters", type=int, default=20)
+args = parser.parse_args()
+
+
+def make_cases(numel):
+    cols = 1024 if numel >= 1024 else numel
+    x = flow.randn(numel // cols, cols)
+    y = flow.randn(numel // cols, cols)
+    row = flow.randn(1, cols)
+    return {
+        "exp": lambda: flow.exp(x),
+        "add": lambda: x + y,
+        "broadcast_mul": lambda: x * row,
+        "softmax": lambda: flow.softmax(x, dim=-1),
+        "permute": lambda: x.permute(1, 0).contiguous(),
+        "cast": lambda: x.to(flow.float64),
+    }
+
+
+def timeit(fn):
+    fn().numpy()
+    start = time.perf_counter()
+    for _ in range(args.iters):
+        out = fn()
+    # wait for the async ops
+    out.numpy()
+    return (time.perf_counter() - start) / args.iters
+
+
+def main():
+    num_threads_list = [int(x) for x in args.num_threads.split(",")]
+    print(f"{'op':>14} {'numel':>10}", end="")
+    for num_threads in num_threads_list:
+        print(f" {str(num_threads) + ' thr us':>12}", end="")
+    print()
+    try:
+        for numel in [int(x) for x in args.sizes.split(",")]:
+            for (name, fn) in make_cases(numel).items():
+                print(f"{name:>14} {numel:>10}", end="")
+                for num_threads in num_threads_list:
+                    flow.set_num_threads(num_threads)
+                    print(f" {timeit(fn) * 1e6:>12.1f}", end="")
+                print()
+    finally:
+        flow.set_num_threads(0)
+
+
+if __name__ == "__main__":
+    main()
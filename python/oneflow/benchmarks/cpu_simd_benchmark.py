@@ -0,0 +1,105 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+parser = argparse.ArgumentParser(description="flags for cpu simd kernels benchmark")
+parser.add_argument(
+    "--isas",
+    type=str,
+    default="scalar,sse4,avx2,avx512",
+    help="isas to sweep, split by comma. isas the cpu lacks fall back to the best one it has",
+)
+parser.add_argument(
+    "--sizes",
+    type=str,
+    default="4096,262144,16777216",
+    help="element counts to sweep, split by comma",
+)
+parser.add_argument("--num_threads", type=int, default=1)
+parser.add_argument("--iters", type=int, default=20)
+# internal flag, set when the benchmark runs itself with an isa
+parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+args = parser.parse_args()
+
+
+def run_child():
+    import oneflow as flow
+
+    def make_cases(numel):
+        cols = 1024 if numel >= 1024 else numel
+        x = flow.randn(numel // cols, cols)
+        y = flow.randn(numel // cols, cols)
+        row = flow.randn(1, cols)
+        return {
+            "relu": lambda: flow.relu(x),
+            "gelu": lambda: flow.gelu(x),
+            "tanh": lambda: flow.tanh(x),
+            "add": lambda: x + y,
+            "broadcast_mul": lambda: x * row,
+            "maximum": lambda: flow.maximum(x, y),
+            "softmax": lambda: flow.softmax(x, dim=-1),
+            "log_softmax": lambda: flow.log_softmax(x, dim=-1),
+        }
+
+    def timeit(fn):
+        fn().numpy()
+        start = time.perf_counter()
+        for _ in range(args.iters):
+            out = fn()
+        # wait for the async ops
+        out.numpy()
+        return (time.perf_counter() - start) / args.iters
+
+    flow.set_num_threads(args.num_threads)
+    results = {}
+    for numel in [int(x) for x in args.sizes.split(",")]:
+        for (name, fn) in make_cases(numel).items():
+            results[f"{name},{numel}"] = timeit(fn)
+    print(json.dumps(results))
+
+
+def main():
+    # The isa is picked once per process, so each one is measured in a new process
+    isas = args.isas.split(",")
+    results = {}
+    for isa in isas:
+        env = dict(os.environ, ONEFLOW_EP_CPU_ISA=isa)
+        output = subprocess.check_output(
+            [sys.executable, __file__, "--child"] + sys.argv[1:], env=env
+        )
+        results[isa] = json.loads(output.decode().strip().splitlines()[-1])
+    print(f"{'op':>14} {'numel':>10}", end="")
+    for isa in isas:
+        print(f" {isa + ' us':>12}", end="")
+    print(f" {'speedup':>8}")
+    for key in results[isas[0]]:
+        (name, numel) = key.split(",")
+        print(f"{name:>14} {numel:>10}", end="")
+        for isa in isas:
+            print(f" {results[isa][key] * 1e6:>12.1f}", end="")
+        print(f" {results[isas[0]][key] / results[isas[-1]][key]:>8.2f}")
+
+
+if __name__ == "__main__":
+    if args.child:
+        run_child()
+    else:
+        main()
@@ -0,0 +1,105 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import argparse
+import os
+import struct
+import tempfile
+import time
+
+import oneflow as flow
+from oneflow.core.record import record_pb2
+
+parser = argparse.ArgumentParser(description="flags for data reader prefetch benchmark")
+parser.add_argument(
+    "--ofrecord_dir",
+    type=str,
+    default=None,
+    help="dataset to read, synthetic part files are written to a temp dir if not set",
+)
+parser.add_argument("--data_part_num", type=int, default=8)
+parser.add_argument("--records_per_part", type=int, default=512)
+parser.add_argument("--record_bytes", type=int, default=128 * 1024)
+parser.add_argument("--batch_size", type=int, default=32)
+parser.add_argument(
+    "--num_loader_threads",
+    type=str,
+    default="1,2,4,8",
+    help="loader thread counts to sweep, split by comma",
+)
+parser.add_argument("--prefetch_depth", type=int, default=8)
+parser.add_argument("--iters", type=int, default=50)
+args = parser.parse_args()
+
+
+def write_synthetic_parts(data_dir):
+    payload = os.urandom(args.record_bytes)
+    for part in range(args.data_part_num):
+        with open(os.path.join(data_dir, "part-{}".format(part)), "wb") as f:
+            for i in range(args.records_per_part):
+                record = record_pb2.OFRecord()
+                record.feature["encoded"].bytes_list.value.append(payload)
+                record.feature["class/label"].int32_list.value.append(i)
+                buf = record.SerializeToString()
+                f.write(struct.pack("q", len(buf)))
+                f.write(buf)
+
+
+def bench(data_dir, num_loader_threads, ordered):
+    reader = flow.nn.OFRecordReader(
+        data_dir,
+        batch_size=args.batch_size,
+        data_part_num=args.data_part_num,
+        num_loader_threads=num_loader_threads,
+        prefetch_depth=args.prefetch_depth,
+        ordered=ordered,
+    )
+    decoder = flow.nn.OFRecordRawDecoder("class/label", shape=(), dtype=flow.int32)
+    decoder(reader()).numpy()
+    flow.profiler.reset_data_reader_stats()
+    start = time.perf_counter()
+    for _ in range(args.iters):
+        out = decoder(reader())
+    # wait for the async ops
+    out.numpy()
+    elapsed = time.perf_counter() - start
+    stats = flow.profiler.data_reader_stats()["OFRecordReader"]
+    return (args.iters * args.batch_size / elapsed, stats)
+
+
+def main():
+    print(
+        f"{'threads':>8} {'ordered':>8} {'samples/s':>12} {'starved':>8} "
+        f"{'full':>8} {'occupancy':>10} {'wait ms':>10}"
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_dir = args.ofrecord_dir
+        if data_dir is None:
+            data_dir = tmp_dir
+            write_synthetic_parts(data_dir)
+        for num_loader_threads in [int(x) for x in args.num_loader_threads.split(",")]:
+            for ordered in (True, False):
+                (throughput, stats) = bench(data_dir, num_loader_threads, ordered)
+                num_reads = max(stats["num_reads"], 1)
+                print(
+                    f"{num_loader_threads:>8} {str(ordered):>8} {throughput:>12.1f} "
+                    f"{stats['num_starved_reads']:>8} {stats['num_full_reads']:>8} "
+                    f"{stats['sum_queue_occupancy'] / num_reads:>10.2f} "
+                    f"{stats['wait_time_us'] / 1e3:>10.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import argparse
+import time
+
+import numpy as np
+
+import oneflow as flow
+
+parser = argparse.ArgumentParser(
+    description="flags for per-sample vs batched (__getitems__) fetch benchmark"
+)
+parser.add_argument("--num_samples", type=int, default=200000)
+parser.add_argument("--num_features", type=int, default=32)
+parser.add_argument("--batch_size", type=int, default=256)
+parser.add_argument("--num_workers", type=int, default=0)
+parser.add_argument("--epochs", type=int, default=3)
+args = parser.parse_args()
+
+
+class TabularDataset(flow.utils.data.Dataset):
+    def __init__(self, features, labels):
+        self.features = features
+        self.labels = labels
+
+    def __getitem__(self, index):
+        return self.features[index], self.labels[index]
+
+    def __len__(self):
+        return len(self.labels)
+
+
+class BatchedTabularDataset(TabularDataset):
+    def __getitems__(self, indices):
+        return self.features[indices], self.labels[indices]
+
+
+def samples_per_second(dataset):
+    data_loader = flow.utils.data.DataLoader(
+        dataset, batch_size=args.batch_size, shuffle=True, num_workers=args.num_workers,
+    )
+    best = 0
+    for _ in range(args.epochs):
+        start = time.perf_counter()
+        num_samples = 0
+        for (_, labels) in data_loader:
+            num_samples += labels.shape[0]
+        best = max(best, num_samples / (time.perf_counter() - start))
+    return best
+
+
+def main():
+    features = np.random.randn(args.num_samples, args.num_features).astype(np.float32)
+    labels = np.random.randint(0, 10, size=args.num_samples)
+    per_sample = samples_per_second(TabularDataset(features, labels))
+    batched = samples_per_second(BatchedTabularDataset(features, labels))
+    tensor_dataset = samples_per_second(
+        flow.utils.data.TensorDataset(flow.tensor(features), flow.tensor(labels))
+    )
+    print(f"{'fetch':>16} {'samples/s':>12}")
+    print(f"{'__getitem__':>16} {per_sample:>12.0f}")
+    print(f"{'__getitems__':>16} {batched:>12.0f} ({batched / per_sample:.1f}x)")
+    print(f"{'TensorDataset':>16} {tensor_dataset:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""
+Run with:
+    python3 -m oneflow.distributed.launch --nproc_per_node 2 ddp_bucket_benchmark.py
+"""
+import argparse
+import time
+
+import oneflow as flow
+from oneflow.nn.parallel import DistributedDataParallel as ddp
+
+parser = argparse.ArgumentParser(description="flags for ddp bucketing benchmark")
+parser.add_argument("--device", type=str, default="cpu")
+parser.add_argument("--num_layers", type=int, default=64)
+parser.add_argument("--hidden_size", type=int, default=256)
+parser.add_argument("--batch_size", type=int, default=32)
+parser.add_argument(
+    "--bucket_cap_mb",
+    type=str,
+    default="0,1,5,25,100",
+    help="bucket sizes to sweep, split by comma",
+)
+parser.add_argument("--contiguous", action="store_true")
+parser.add_argument("--warmup_iters", type=int, default=5)
+parser.add_argument("--iters", type=int, default=50)
+args = parser.parse_args()
+
+
+def make_model():
+    layers = []
+    for _ in range(args.num_layers):
+        layers.append(flow.nn.Linear(args.hidden_size, args.hidden_size))
+        layers.append(flow.nn.ReLU())
+    model = flow.nn.Sequential(*layers).to(args.device)
+    if args.contiguous:
+        model.contiguous_parameters()
+    return model
+
+
+def run(bucket_cap_mb):
+    model = ddp(make_model(), bucket_cap_mb=bucket_cap_mb)
+    x = flow.randn(args.batch_size, args.hidden_size, device=flow.device(args.device))
+
+    def train_step():
+        model(x).sum().backward()
+        for p in model.parameters():
+            p.grad.zeros_()
+
+    for _ in range(args.warmup_iters):
+        train_step()
+    # sync the async device
+    next(model.parameters()).grad.numpy()
+    start = time.perf_counter()
+    for _ in range(args.iters):
+        train_step()
+    next(model.parameters()).grad.numpy()
+    return args.iters * args.batch_size / (time.perf_counter() - start)
+
+
+def main():
+    rank = flow.env.get_rank()
+    if rank == 0:
+        print(
+            f"{args.num_layers} layers of {args.hidden_size}x{args.hidden_size}, "
+            f"{flow.env.get_world_size()} ranks on {args.device}"
+        )
+        print(f"{'bucket MB':>10} {'samples/s':>12}")
+    for bucket_cap_mb in [float(x) for x in args.bucket_cap_mb.split(",")]:
+        throughput = run(bucket_cap_mb)
+        if rank == 0:
+            print(f"{bucket_cap_mb:>10g} {throughput:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
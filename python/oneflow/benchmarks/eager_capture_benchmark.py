@@ -0,0 +1,78 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import argparse
+import time
+
+import oneflow as flow
+
+parser = argparse.ArgumentParser(description="flags for eager capture benchmark")
+parser.add_argument("--device", type=str, default="cpu")
+parser.add_argument("--num_layers", type=int, default=16)
+parser.add_argument("--hidden_size", type=int, default=64)
+parser.add_argument("--batch_size", type=int, default=1)
+parser.add_argument("--iters", type=int, default=1000)
+parser.add_argument("--warmup_iters", type=int, default=50)
+args = parser.parse_args()
+
+
+def make_model():
+    layers = []
+    for _ in range(args.num_layers):
+        layers += [flow.nn.Linear(args.hidden_size, args.hidden_size), flow.nn.GELU()]
+    return flow.nn.Sequential(*layers).to(args.device)
+
+
+def timeit(step, output):
+    for _ in range(args.warmup_iters):
+        step()
+    # numpy() waits for the queued ops
+    output().numpy()
+    start = time.perf_counter()
+    for _ in range(args.iters):
+        step()
+    output().numpy()
+    return time.perf_counter() - start
+
+
+def main():
+    model = make_model()
+    x = flow.randn(args.batch_size, args.hidden_size, device=args.device)
+    with flow.no_grad():
+        outputs = [model(x)]
+
+        def eager_step():
+            outputs[0] = model(x)
+
+        eager_time = timeit(eager_step, lambda: outputs[0])
+
+        with flow.eager_capture() as g:
+            y = model(x)
+        capture_time = timeit(g.replay, lambda: y)
+
+    # Linear and GELU, plus the bias add of Linear
+    num_ops = args.num_layers * 3 * args.iters
+    print(
+        f"{args.num_layers} layers, hidden size {args.hidden_size}, "
+        f"batch size {args.batch_size}, {g.num_instructions} captured instructions"
+    )
+    print(f"{'mode':>8} {'ops/s':>12} {'us/step':>10}")
+    for (mode, t) in [("eager", eager_time), ("capture", capture_time)]:
+        print(f"{mode:>8} {num_ops / t:>12.0f} {t / args.iters * 1e6:>10.1f}")
+    print(f"speedup: {eager_time / capture_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
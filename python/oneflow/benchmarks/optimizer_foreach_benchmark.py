@@ -0,0 +1,86 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import argparse
+import time
+
+import oneflow as flow
+
+parser = argparse.ArgumentParser(description="flags for optimizer foreach benchmark")
+parser.add_argument("--num_params", type=int, default=2000)
+parser.add_argument(
+    "--param_size", type=int, default=256, help="number of elements of a parameter"
+)
+parser.add_argument(
+    "--optimizers",
+    type=str,
+    default="sgd,momentum,adam,adamw,rmsprop",
+    help="optimizers to benchmark, split by comma",
+)
+parser.add_argument("--device", type=str, default="cpu")
+parser.add_argument("--warmup_iters", type=int, default=5)
+parser.add_argument("--iters", type=int, default=50)
+args = parser.parse_args()
+
+OPTIMIZERS = {
+    "sgd": lambda params, **kw: flow.optim.SGD(params, lr=0.1, **kw),
+    "momentum": lambda params, **kw: flow.optim.SGD(params, lr=0.1, momentum=0.9, **kw),
+    "adam": lambda params, **kw: flow.optim.Adam(params, lr=0.001, **kw),
+    "adamw": lambda params, **kw: flow.optim.AdamW(params, lr=0.001, **kw),
+    "rmsprop": lambda params, **kw: flow.optim.RMSprop(params, lr=0.001, **kw),
+}
+
+
+def make_params():
+    params = []
+    for _ in range(args.num_params):
+        param = flow.nn.Parameter(flow.randn(args.param_size, device=args.device))
+        param.grad = flow.randn(args.param_size, device=args.device)
+        params.append(param)
+    return params
+
+
+def sync(params):
+    # fetching a value waits for all the updates queued in the vm
+    params[-1].numpy()
+
+
+def benchmark(name, **kwargs):
+    params = make_params()
+    optimizer = OPTIMIZERS[name](params, **kwargs)
+    for _ in range(args.warmup_iters):
+        optimizer.step()
+    sync(params)
+    start = time.perf_counter()
+    for _ in range(args.iters):
+        optimizer.step()
+    sync(params)
+    return (time.perf_counter() - start) / args.iters * 1000
+
+
+def main():
+    print(
+        f"{args.num_params} parameters of {args.param_size} elements on {args.device}"
+    )
+    print(f"{'optimizer':>10} {'loop ms':>10} {'foreach ms':>11} {'flat ms':>10}")
+    for name in args.optimizers.split(","):
+        loop_time = benchmark(name, foreach=False)
+        foreach_time = benchmark(name, foreach=True)
+        flat_time = benchmark(name, foreach=True, flatten_state=True)
+        print(f"{name:>10} {loop_time:>10.3f} {foreach_time:>11.3f} {flat_time:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""
+Compares distributing a whole nn.Graph plan to every rank with distributing
+only the part of each rank, against a simulated world size.
+
+A plan of the current process is compiled (through the plan cache), then its
+tasks, mem blocks and chunks are replicated once per simulated rank, which is
+what the plan of a data parallel graph looks like. For each world size this
+reports the bytes the master sends, the time to generate and serialize them,
+the time for a rank to parse what it receives, and the peak RSS of a fresh
+process parsing it.
+"""
+import argparse
+import multiprocessing
+import resource
+import tempfile
+import time
+
+import oneflow as flow
+import oneflow.core.job.plan_cache_pb2 as plan_cache_pb
+import oneflow.core.job.plan_pb2 as plan_pb
+from oneflow.nn.graph.compiled_plan_cache import list_plan_cache
+
+parser = argparse.ArgumentParser(description="flags for plan distribution benchmark")
+parser.add_argument(
+    "--world_sizes",
+    type=str,
+    default="2,8,32,128",
+    help="simulated world sizes to sweep, split by comma",
+)
+parser.add_argument("--num_layers", type=int, default=64)
+parser.add_argument("--hidden_size", type=int, default=256)
+args = parser.parse_args()
+
+
+def compile_plan(cache_dir):
+    layers = []
+    for _ in range(args.num_layers):
+        layers += [flow.nn.Linear(args.hidden_size, args.hidden_size), flow.nn.ReLU()]
+    model = flow.nn.Sequential(*layers)
+
+    class MLPGraph(flow.nn.Graph):
+        def __init__(self):
+            super().__init__()
+            self.model = model
+            self.config.enable_plan_cache(cache_dir=cache_dir)
+
+        def build(self, x):
+            return self.model(x)
+
+    MLPGraph()(flow.randn(8, args.hidden_size))
+    (entry_info,) = list_plan_cache(cache_dir)
+    entry = plan_cache_pb.PlanCacheEntry()
+    with open(f"{cache_dir}/{entry_info['key_hash']}.plan", "rb") as f:
+        entry.ParseFromString(f.read())
+    variable_op_names = list(entry.key.variable_op_names)
+    return entry.plan, variable_op_names
+
+
+def simulate_plan(plan, world_size):
+    simulated = plan_pb.Plan()
+    simulated.CopyFrom(plan)
+    del simulated.task[:]
+    del simulated.block_chunk_list.mem_block[:]
+    del simulated.block_chunk_list.chunk[:]
+    for rank in range(world_size):
+        for task in plan.task:
+            simulated.task.add().CopyFrom(task)
+            simulated.task[-1].machine_id = rank
+        for mem_block in plan.block_chunk_list.mem_block:
+            simulated.block_chunk_list.mem_block.add().CopyFrom(mem_block)
+            simulated.block_chunk_list.mem_block[-1].machine_id = rank
+        for chunk in plan.block_chunk_list.chunk:
+            simulated.block_chunk_list.chunk.add().CopyFrom(chunk)
+            simulated.block_chunk_list.chunk[-1].machine_id = rank
+    return simulated.SerializeToString()
+
+
+def parse_and_report_rss(serialized_plan, conn):
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    plan = plan_pb.Plan()
+    plan.ParseFromString(serialized_plan)
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    conn.send((rss_after - rss_before) / 1024)
+    conn.close()
+
+
+def rank_rss_mb(serialized_plan):
+    ctx = multiprocessing.get_context("fork")
+    (recv_conn, send_conn) = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=parse_and_report_rss, args=(serialized_plan, send_conn))
+    proc.start()
+    rss = recv_conn.recv()
+    proc.join()
+    return rss
+
+
+def parse_time(serialized_plan):
+    start = time.perf_counter()
+    plan_pb.Plan().ParseFromString(serialized_plan)
+    return time.perf_counter() - start
+
+
+def main():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        (plan, variable_op_names) = compile_plan(cache_dir)
+    print(
+        f"{len(plan.task)} tasks per rank, {plan.ByteSize() / 1e6:.2f} MB plan of one rank"
+    )
+    print(
+        f"{'world':>6} {'mode':>6} {'sent MB':>10} {'send s':>8} {'parse s':>8} "
+        f"{'rank RSS MB':>12}"
+    )
+    for world_size in [int(x) for x in args.world_sizes.split(",")]:
+        full_plan = simulate_plan(plan, world_size)
+
+        # The whole plan is serialized once and pulled by every other rank
+        start = time.perf_counter()
+        sent = plan_pb.Plan()
+        sent.ParseFromString(full_plan)
+        sent.SerializeToString()
+        send_time = time.perf_counter() - start
+        print(
+            f"{world_size:>6} {'full':>6} {len(full_plan) * (world_size - 1) / 1e6:>10.2f} "
+            f"{send_time:>8.3f} {parse_time(full_plan):>8.3f} "
+            f"{rank_rss_mb(full_plan):>12.1f}"
+        )
+
+        # Each rank only gets its own part
+        start = time.perf_counter()
+        rank_plans = flow._oneflow_internal.nn.graph.GenSerializedPlansForRanks(
+            full_plan, list(range(1, world_size)), variable_op_names
+        )
+        send_time = time.perf_counter() - start
+        rank_plan = rank_plans[-1]
+        print(
+            f"{world_size:>6} {'split':>6} {sum(len(p) for p in rank_plans) / 1e6:>10.2f} "
+            f"{send_time:>8.3f} {parse_time(rank_plan):>8.3f} "
+            f"{rank_rss_mb(rank_plan):>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -2162,6 +2162,9 @@ def ofrecord_image_classification_reader(
     decode_buffer_size_per_thread: int = 32,
     num_decode_threads_per_machine: Optional[int] = None,
     name: Optional[str] = None,
+    num_loader_threads: int = 1,
+    prefetch_depth: int = 4,
+    ordered: bool = True,
 ) -> oneflow._oneflow_internal.BlobDesc:
     """This operator creates a reader for image classification tasks.
 
@@ -2180,6 +2183,9 @@ def ofrecord_image_classification_reader(
         decode_buffer_size_per_thread (int, optional): The decode buffer size for per thread. Defaults to 32.
         num_decode_threads_per_machine (Optional[int], optional): The amounts of decode threads for each machine. Defaults to None.
         name (Optional[str], optional): The name for the operation. Defaults to None.
+        num_loader_threads (int, optional): The amounts of threads loading batches, each of them reads its own part files. Defaults to 1.
+        prefetch_depth (int, optional): The max amounts of batches loaded ahead. Defaults to 4.
+        ordered (bool, optional): Whether to deliver the batches of the loader threads in a fixed round-robin order. Defaults to True.
 
     Returns:
         oneflow._oneflow_internal.BlobDesc: The result Blob.
@@ -2239,6 +2245,9 @@ def ofrecord_image_classification_reader(
         .Attr("label_feature_name", label_feature_name)
         .Attr("decode_buffer_size_per_thread", decode_buffer_size_per_thread)
         .Attr("num_decode_threads_per_machine", num_decode_threads_per_machine or 0)
+        .Attr("num_loader_threads", num_loader_threads)
+        .Attr("prefetch_depth", prefetch_depth)
+        .Attr("ordered", ordered)
         .Build()
         .InferAndTryRun()
         .RemoteBlobList()
@@ -0,0 +1,55 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+from typing import Dict
+
+import oneflow as flow
+
+
+def empty_cache() -> None:
+    r"""Returns the host memory blocks cached by the cpu allocator to the
+    system. Blocks held by tensors are not affected.
+    """
+    flow._oneflow_internal.vm.CpuAllocatorEmptyCache()
+
+
+def memory_stats() -> Dict[str, int]:
+    r"""Returns the statistics of the cpu allocator:
+
+    * ``in_use_bytes``: bytes of the blocks held by tensors.
+    * ``cached_bytes``: bytes of the free blocks kept for reuse.
+    * ``peak_in_use_bytes``: the maximum of ``in_use_bytes``.
+    * ``num_allocations``: the number of allocations.
+    * ``num_system_allocations``: allocations which got a new block from the
+      system instead of a cached one.
+    """
+    return flow._oneflow_internal.vm.CpuAllocatorStats()
+
+
+def set_caching_limits(max_cached_bytes: int, max_cached_block_size: int) -> None:
+    r"""Sets the limits of the cpu allocator cache. A freed block is returned to
+    the system instead of cached if the cache would exceed ``max_cached_bytes``
+    or if the block is larger than ``max_cached_block_size``. Blocks already
+    cached beyond the new limits are returned to the system.
+
+    The defaults are 1GB and 256MB, or the ``ONEFLOW_CPU_ALLOCATOR_MAX_CACHED_BYTES``
+    and ``ONEFLOW_CPU_ALLOCATOR_MAX_CACHED_BLOCK_SIZE`` environment variables.
+    Set ``max_cached_bytes`` to 0 to disable caching.
+    """
+    assert max_cached_bytes >= 0, "max_cached_bytes should be non-negative"
+    assert max_cached_block_size >= 0, "max_cached_block_size should be non-negative"
+    flow._oneflow_internal.vm.CpuAllocatorSetCachingLimits(
+        max_cached_bytes, max_cached_block_size
+    )
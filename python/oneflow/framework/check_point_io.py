@@ -0,0 +1,203 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import os
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Union
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_NUM_IO_THREADS = 8
+DEFAULT_IO_CHUNK_SIZE = 16 << 20
+
+
+def default_num_io_threads() -> int:
+    return int(os.getenv("ONEFLOW_CHECKPOINT_IO_THREADS", DEFAULT_NUM_IO_THREADS))
+
+
+def default_io_chunk_size() -> int:
+    return int(os.getenv("ONEFLOW_CHECKPOINT_IO_CHUNK_SIZE", DEFAULT_IO_CHUNK_SIZE))
+
+
+def _as_bytes_view(array: np.ndarray) -> memoryview:
+    assert array.flags.c_contiguous
+    return memoryview(array.reshape(-1)).cast("B")
+
+
+def _pwrite_all(fd: int, view: memoryview, offset: int) -> None:
+    while len(view) > 0:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+
+def _pread_all(fd: int, view: memoryview, offset: int) -> None:
+    while len(view) > 0:
+        read = os.preadv(fd, [view], offset)
+        if read == 0:
+            raise EOFError(f"Unexpected end of file at offset {offset}")
+        view = view[read:]
+        offset += read
+
+
+class TensorIOEngine:
+    r"""A thread-pool based I/O engine for checkpoint files.
+
+    Tensor data is streamed in fixed-size chunks with positional reads and
+    writes (which release the GIL), so several chunks of the same file or of
+    different files are in flight at the same time. This keeps NVMe and
+    network filesystems busy instead of paying their latency once per tensor.
+
+    Args:
+        num_threads (int, optional): The number of concurrent readers/writers.
+            Defaults to the ``ONEFLOW_CHECKPOINT_IO_THREADS`` environment
+            variable or 8.
+        chunk_size (int, optional): The size in bytes of a single read/write.
+            Defaults to the ``ONEFLOW_CHECKPOINT_IO_CHUNK_SIZE`` environment
+            variable or 16MB.
+    """
+
+    def __init__(
+        self, num_threads: Optional[int] = None, chunk_size: Optional[int] = None
+    ):
+        self.num_threads_ = (
+            num_threads if num_threads is not None else default_num_io_threads()
+        )
+        self.chunk_size_ = (
+            chunk_size if chunk_size is not None else default_io_chunk_size()
+        )
+        assert self.num_threads_ > 0, "num_threads should be positive"
+        assert self.chunk_size_ > 0, "chunk_size should be positive"
+        self.executor_ = ThreadPoolExecutor(
+            max_workers=self.num_threads_, thread_name_prefix="ckpt_io"
+        )
+
+    @property
+    def num_threads(self) -> int:
+        return self.num_threads_
+
+    @property
+    def chunk_size(self) -> int:
+        return self.chunk_size_
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        self.executor_.shutdown(wait=True)
+
+    def map(self, fn: Callable, iterable: Iterable) -> List[Any]:
+        r"""Runs `fn` on every item concurrently and returns the results in
+        order. Exceptions raised by `fn` are re-raised here.
+        """
+        return [f.result() for f in [self.executor_.submit(fn, x) for x in iterable]]
+
+    def _chunks(self, view: memoryview, offset: int):
+        for start in range(0, len(view), self.chunk_size_):
+            yield view[start : start + self.chunk_size_], offset + start
+
+    def write_arrays(
+        self,
+        file_path: Union[str, Path],
+        arrays: Sequence[np.ndarray],
+        offsets: Sequence[int],
+        total_size: int,
+    ) -> None:
+        r"""Writes `arrays` at `offsets` into a file of `total_size` bytes.
+        Gaps between arrays are left as holes (read back as zeros).
+        """
+        assert len(arrays) == len(offsets)
+        fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, total_size)
+            futures = []
+            for (array, offset) in zip(arrays, offsets):
+                for (chunk, chunk_offset) in self._chunks(
+                    _as_bytes_view(array), offset
+                ):
+                    futures.append(
+                        self.executor_.submit(_pwrite_all, fd, chunk, chunk_offset)
+                    )
+            for f in futures:
+                f.result()
+        finally:
+            os.close(fd)
+
+    def read_arrays(
+        self,
+        file_path: Union[str, Path],
+        arrays: Sequence[np.ndarray],
+        offsets: Sequence[int],
+    ) -> None:
+        r"""Fills the preallocated `arrays` with data read from `offsets` of
+        the file.
+        """
+        assert len(arrays) == len(offsets)
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            futures = []
+            for (array, offset) in zip(arrays, offsets):
+                for (chunk, chunk_offset) in self._chunks(
+                    _as_bytes_view(array), offset
+                ):
+                    futures.append(
+                        self.executor_.submit(_pread_all, fd, chunk, chunk_offset)
+                    )
+            for f in futures:
+                f.result()
+        finally:
+            os.close(fd)
+
+    def write_file(self, file_path: Union[str, Path], array: np.ndarray) -> None:
+        self.write_arrays(file_path, [array], [0], array.nbytes)
+
+    def read_file(self, file_path: Union[str, Path], array: np.ndarray) -> None:
+        self.read_arrays(file_path, [array], [0])
+
+
+def write_array_to_file(
+    file_path: Union[str, Path], array: np.ndarray, chunk_size: Optional[int] = None
+) -> None:
+    r"""Streams `array` into a file chunk by chunk on the calling thread,
+    without materializing a bytes copy of the whole array.
+    """
+    chunk_size = chunk_size if chunk_size is not None else default_io_chunk_size()
+    view = _as_bytes_view(np.ascontiguousarray(array))
+    with open(file_path, "wb") as f:
+        for start in range(0, len(view), chunk_size):
+            f.write(view[start : start + chunk_size])
+
+
+def read_array_from_file(
+    file_path: Union[str, Path], array: np.ndarray, chunk_size: Optional[int] = None
+) -> np.ndarray:
+    r"""Fills the preallocated `array` from a file chunk by chunk on the
+    calling thread.
+    """
+    chunk_size = chunk_size if chunk_size is not None else default_io_chunk_size()
+    view = _as_bytes_view(array)
+    with open(file_path, "rb", buffering=0) as f:
+        for start in range(0, len(view), chunk_size):
+            chunk = view[start : start + chunk_size]
+            while len(chunk) > 0:
+                read = f.readinto(chunk)
+                if read == 0:
+                    raise EOFError(f"Unexpected end of file {file_path}")
+                chunk = chunk[read:]
+    return array
@@ -13,8 +13,17 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 """
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
+import atexit
+import hashlib
+import io
+import mmap
 import os
+import re
+import shutil
+import struct
+import uuid
 import warnings
 from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 from pathlib import Path
@@ -27,6 +36,7 @@ import oneflow
 import oneflow as flow
 import oneflow._oneflow_internal
 import oneflow.core.framework.variable_meta_info_pb2 as variable_meta_info_pb
+import oneflow.framework.check_point_io as check_point_io
 import oneflow.framework.dtype as dtype_util
 import oneflow.framework.id_util as id_util
 from oneflow.framework.tensor import Tensor
@@ -37,8 +47,29 @@ SNAPSHOT_DONE_FILENAME = "snapshot_done"
 META_INFO_FILENAME = "meta"
 PICKLE_FILENAME = "pickled_data"
 DATA_FILENAME = "out"
+PACKED_DATA_FILENAME = "packed_data"
+PACKED_INDEX_FILENAME = "packed_index"
+PACKED_HASHES_FILENAME = "packed_hashes"
+SHARD_DIR_PREFIX = "shard_"
+SHARD_INDEX_FILENAME = "shard_index"
 PROTOCOL_VERSION = 1
 
+PACKED_INDEX_MAGIC = b"OFPK"
+PACKED_INDEX_VERSION = 2
+# Tensor data in the packed data file starts at multiples of this value
+PACKED_ALIGNMENT = 64
+# magic, version, alignment, number of entries
+_PACKED_HEADER = struct.Struct("<4sIIQ")
+# offset, nbytes, proto data type, ndim (followed by ndim int64 dims)
+_PACKED_ENTRY_V1 = struct.Struct("<QQiI")
+# Same as v1 plus the source of the data: -1 means the data file of this
+# checkpoint, otherwise it is the index of the base checkpoint holding the
+# data and offset is the index of the tensor in that checkpoint.
+_PACKED_ENTRY = struct.Struct("<QQiIi")
+# The length of the utf-8 encoded path of a base checkpoint
+_PACKED_BASE = struct.Struct("<I")
+_PACKED_HASH_SIZE = 16
+
 
 class FileBackendVariableBlob:
     def __init__(
@@ -104,24 +135,750 @@ class FileBackendVariableBlob:
         ).reshape(self.shape)
 
 
-def _save_tensor_to_disk(tensor: "oneflow.Tensor", dir_name: Union[str, Path]) -> None:
+def _save_array_to_disk(
+    array: np.ndarray, data_type: int, dir_name: Union[str, Path]
+) -> None:
     os.makedirs(dir_name, exist_ok=True)
     meta_info = variable_meta_info_pb.VariableMetaInfo()
-    meta_info.shape.dim[:] = tensor.shape
-    meta_info.data_type = oneflow._oneflow_internal.deprecated.GetProtoDtype4OfDtype(
-        tensor.dtype
-    )
+    meta_info.shape.dim[:] = array.shape
+    meta_info.data_type = data_type
     data_path = os.path.join(dir_name, DATA_FILENAME)
-    with open(data_path, "wb") as f:
-        f.write(tensor.numpy().tobytes())
+    check_point_io.write_array_to_file(data_path, array)
 
     with open(os.path.join(dir_name, META_INFO_FILENAME), "w") as f:
         f.write(text_format.MessageToString(meta_info))
 
 
+def _save_tensor_to_disk(tensor: "oneflow.Tensor", dir_name: Union[str, Path]) -> None:
+    _save_array_to_disk(
+        tensor.numpy(),
+        oneflow._oneflow_internal.deprecated.GetProtoDtype4OfDtype(tensor.dtype),
+        dir_name,
+    )
+
+
+def _load_array_from_disk(var_dir: str) -> np.ndarray:
+    blob = FileBackendVariableBlob(var_dir)
+    array = np.empty(
+        blob.shape, dtype=dtype_util.convert_oneflow_dtype_to_numpy_dtype(blob.dtype)
+    )
+    return check_point_io.read_array_from_file(blob.file_path, array)
+
+
+def _tensor_to_host_array(tensor: "oneflow.Tensor", copy: bool = False) -> np.ndarray:
+    array = tensor.numpy()
+    # numpy() of a cpu tensor shares memory with it, take a real copy when
+    # the tensor may be modified before the array is written
+    if copy and tensor.device == flow.device("cpu"):
+        array = array.copy()
+    return np.ascontiguousarray(array)
+
+
 ValueContainer = Union[FileBackendVariableBlob, np.ndarray, "oneflow.Tensor"]
 
 
+def _align_up(x: int, alignment: int) -> int:
+    return (x + alignment - 1) // alignment * alignment
+
+
+def _hash_array(array: np.ndarray, data_type: int) -> bytes:
+    h = hashlib.blake2b(digest_size=_PACKED_HASH_SIZE)
+    h.update(struct.pack(f"<iI{array.ndim}q", data_type, array.ndim, *array.shape))
+    h.update(memoryview(np.ascontiguousarray(array).reshape(-1)).cast("B"))
+    return h.digest()
+
+
+class PackedTensorWriter:
+    r"""Collects tensors during pickling and writes them into a single data
+    file (with every tensor starting at an aligned offset) plus a compact
+    binary index.
+    """
+
+    def __init__(self, alignment: int = PACKED_ALIGNMENT, copy_tensors: bool = False):
+        self.alignment_ = alignment
+        self.copy_tensors_ = copy_tensors
+        self.arrays_: List[Optional[np.ndarray]] = []
+        self.data_types_: List[Optional[int]] = []
+
+    def __len__(self) -> int:
+        return len(self.arrays_)
+
+    def add(self, tensor: Optional["oneflow.Tensor"]) -> int:
+        r"""Registers a tensor and returns its index in the packed file.
+        `None` reserves an index without data, which keeps indices in sync on
+        ranks that do not write anything.
+        """
+        if tensor is None:
+            self.arrays_.append(None)
+            self.data_types_.append(None)
+        else:
+            self.arrays_.append(_tensor_to_host_array(tensor, self.copy_tensors_))
+            self.data_types_.append(
+                oneflow._oneflow_internal.deprecated.GetProtoDtype4OfDtype(tensor.dtype)
+            )
+        return len(self.arrays_) - 1
+
+    def add_array(self, array: np.ndarray, data_type: int) -> int:
+        self.arrays_.append(np.ascontiguousarray(array))
+        self.data_types_.append(data_type)
+        return len(self.arrays_) - 1
+
+    def hashes(
+        self, io_engine: Optional[check_point_io.TensorIOEngine] = None
+    ) -> List[bytes]:
+        items = list(zip(self.arrays_, self.data_types_))
+        if io_engine is None:
+            return [_hash_array(*x) for x in items]
+        # hashlib releases the GIL on large buffers
+        return io_engine.map(lambda x: _hash_array(*x), items)
+
+    def entries(
+        self, refs: Optional[Sequence[Optional[Tuple[int, int]]]] = None
+    ) -> List[Tuple[int, int, int, Tuple[int], int]]:
+        r"""Lays out the tensors in the data file. `refs[i]`, if not None, is
+        the (base number, tensor index) of a base checkpoint already holding
+        the data of tensor i, which is then not written again.
+        """
+        offset = 0
+        entries = []
+        for (i, (array, data_type)) in enumerate(zip(self.arrays_, self.data_types_)):
+            assert array is not None, "Packed tensor data is missing on this rank"
+            if refs is not None and refs[i] is not None:
+                (source, base_idx) = refs[i]
+                entries.append((base_idx, array.nbytes, data_type, array.shape, source))
+                continue
+            offset = _align_up(offset, self.alignment_)
+            entries.append((offset, array.nbytes, data_type, array.shape, -1))
+            offset += array.nbytes
+        return entries
+
+    def write(
+        self,
+        path: Path,
+        io_engine: Optional[check_point_io.TensorIOEngine] = None,
+        base: Optional[Path] = None,
+    ) -> None:
+        r"""Writes the packed checkpoint into `path`. If `base` (a packed
+        checkpoint) is given, tensors whose contents are the same as some
+        tensor in `base` reference it instead of being written again.
+        """
+        hashes = None
+        refs = None
+        bases: List[Path] = []
+        if base is not None:
+            hashes = self.hashes(io_engine)
+            base_reader = PackedTensorReader(base)
+            hash2base_idx = {
+                h: i for (i, h) in enumerate(base_reader.hashes(io_engine))
+            }
+            refs = []
+            for h in hashes:
+                if h not in hash2base_idx:
+                    refs.append(None)
+                    continue
+                # Reference the checkpoint really holding the data, so reading
+                # never walks a chain of deltas
+                (data_path, data_idx) = base_reader.resolve(hash2base_idx[h])
+                if data_path not in bases:
+                    bases.append(data_path)
+                refs.append((bases.index(data_path), data_idx))
+        entries = self.entries(refs)
+        local = [(array, e) for (array, e) in zip(self.arrays_, entries) if e[4] == -1]
+        # Write to temporary files and rename them, so that tensors mmap-ed
+        # from a previous checkpoint at the same path stay valid.
+        data_path = path / PACKED_DATA_FILENAME
+        tmp_data_path = path / f".{PACKED_DATA_FILENAME}.tmp"
+        if io_engine is not None:
+            total_size = local[-1][1][0] + local[-1][1][1] if len(local) > 0 else 0
+            io_engine.write_arrays(
+                tmp_data_path,
+                [array for (array, _) in local],
+                [e[0] for (_, e) in local],
+                total_size,
+            )
+        else:
+            with open(tmp_data_path, "wb") as f:
+                for (array, e) in local:
+                    f.write(b"\0" * (e[0] - f.tell()))
+                    f.write(memoryview(array.reshape(-1)).cast("B"))
+        index_path = path / PACKED_INDEX_FILENAME
+        tmp_index_path = path / f".{PACKED_INDEX_FILENAME}.tmp"
+        tmp_index_path.write_bytes(
+            _serialize_packed_index(
+                entries,
+                self.alignment_,
+                # Relative paths keep a chain of checkpoints movable as a whole
+                [os.path.relpath(b.resolve(), path.resolve()) for b in bases],
+            )
+        )
+        os.replace(tmp_data_path, data_path)
+        os.replace(tmp_index_path, index_path)
+        hashes_path = path / PACKED_HASHES_FILENAME
+        if hashes is not None:
+            hashes_path.write_bytes(b"".join(hashes))
+        elif hashes_path.exists():
+            hashes_path.unlink()
+
+
+def _aligned_empty(nbytes: int, alignment: int) -> np.ndarray:
+    raw = np.empty(nbytes + alignment, dtype=np.uint8)
+    start = -raw.ctypes.data % alignment
+    return raw[start : start + nbytes]
+
+
+def _serialize_packed_index(
+    entries: Sequence[Tuple[int, int, int, Sequence[int], int]],
+    alignment: int,
+    bases: Sequence[str] = (),
+) -> bytes:
+    chunks = [
+        _PACKED_HEADER.pack(
+            PACKED_INDEX_MAGIC, PACKED_INDEX_VERSION, alignment, len(entries)
+        ),
+        _PACKED_BASE.pack(len(bases)),
+    ]
+    for base in bases:
+        encoded = base.encode("utf-8")
+        chunks.append(_PACKED_BASE.pack(len(encoded)))
+        chunks.append(encoded)
+    for (offset, nbytes, data_type, shape, source) in entries:
+        chunks.append(_PACKED_ENTRY.pack(offset, nbytes, data_type, len(shape), source))
+        chunks.append(struct.pack(f"<{len(shape)}q", *shape))
+    return b"".join(chunks)
+
+
+def _parse_packed_index(
+    buf: bytes,
+) -> Tuple[List[Tuple[int, int, int, Tuple[int], int]], List[str]]:
+    magic, version, _, num_entries = _PACKED_HEADER.unpack_from(buf, 0)
+    if magic != PACKED_INDEX_MAGIC:
+        raise RuntimeError("Invalid packed checkpoint index")
+    if version not in (1, PACKED_INDEX_VERSION):
+        raise RuntimeError(f"Unsupported packed checkpoint index version {version}")
+    pos = _PACKED_HEADER.size
+    bases = []
+    if version >= 2:
+        (num_bases,) = _PACKED_BASE.unpack_from(buf, pos)
+        pos += _PACKED_BASE.size
+        for _ in range(num_bases):
+            (length,) = _PACKED_BASE.unpack_from(buf, pos)
+            pos += _PACKED_BASE.size
+            bases.append(buf[pos : pos + length].decode("utf-8"))
+            pos += length
+    entries = []
+    for _ in range(num_entries):
+        if version >= 2:
+            offset, nbytes, data_type, ndim, source = _PACKED_ENTRY.unpack_from(
+                buf, pos
+            )
+            pos += _PACKED_ENTRY.size
+        else:
+            offset, nbytes, data_type, ndim = _PACKED_ENTRY_V1.unpack_from(buf, pos)
+            source = -1
+            pos += _PACKED_ENTRY_V1.size
+        shape = struct.unpack_from(f"<{ndim}q", buf, pos)
+        pos += 8 * ndim
+        entries.append((offset, nbytes, data_type, shape, source))
+    return entries, bases
+
+
+class PackedTensorReader:
+    r"""Reads tensors from a packed checkpoint. By default the data file is
+    memory-mapped copy-on-write, so tensor data is paged in lazily on first
+    access and never copied on load. When an `io_engine` is given, the whole
+    file is instead read eagerly with parallel chunked reads into one aligned
+    host buffer, which is faster on filesystems with high per-request latency.
+    Tensors of an incremental checkpoint that are unchanged since its base are
+    read from the base checkpoint.
+    """
+
+    def __init__(
+        self, path: Path, io_engine: Optional[check_point_io.TensorIOEngine] = None
+    ):
+        self.path_ = path
+        self.entries_, bases = _parse_packed_index(
+            (path / PACKED_INDEX_FILENAME).read_bytes()
+        )
+        self.base_paths_ = [path / base for base in bases]
+        self.base_readers_: Dict[int, "PackedTensorReader"] = {}
+        local_entries = [e for e in self.entries_ if e[4] == -1]
+        data_path = path / PACKED_DATA_FILENAME
+        if io_engine is not None:
+            size = os.path.getsize(data_path)
+            self.buffer_ = _aligned_empty(size, PACKED_ALIGNMENT)
+            io_engine.read_arrays(
+                data_path,
+                [self.buffer_[e[0] : e[0] + e[1]] for e in local_entries],
+                [e[0] for e in local_entries],
+            )
+            return
+        with open(data_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            # mmap does not support empty files
+            self.buffer_ = (
+                mmap.mmap(f.fileno(), size, access=mmap.ACCESS_COPY)
+                if size > 0
+                else None
+            )
+
+    def __len__(self) -> int:
+        return len(self.entries_)
+
+    def _base_reader(self, source: int) -> "PackedTensorReader":
+        if source not in self.base_readers_:
+            base_path = self.base_paths_[source]
+            if not (base_path / PACKED_INDEX_FILENAME).exists():
+                raise FileNotFoundError(
+                    f"Base checkpoint {base_path} of {self.path_} doesn't exist"
+                )
+            self.base_readers_[source] = PackedTensorReader(base_path)
+        return self.base_readers_[source]
+
+    def resolve(self, idx: int) -> Tuple[Path, int]:
+        r"""Returns the checkpoint path and index really holding tensor idx."""
+        offset, _, _, _, source = self.entries_[idx]
+        if source == -1:
+            return self.path_, idx
+        return self._base_reader(source).resolve(offset)
+
+    def hashes(
+        self, io_engine: Optional[check_point_io.TensorIOEngine] = None
+    ) -> List[bytes]:
+        r"""Returns the content hashes of all tensors, computed from the data
+        if the checkpoint was not saved with them.
+        """
+        hashes_path = self.path_ / PACKED_HASHES_FILENAME
+        if hashes_path.exists():
+            buf = hashes_path.read_bytes()
+            assert len(buf) == _PACKED_HASH_SIZE * len(self.entries_)
+            return [
+                buf[i : i + _PACKED_HASH_SIZE]
+                for i in range(0, len(buf), _PACKED_HASH_SIZE)
+            ]
+        items = [(self.numpy(i), self.entries_[i][2]) for i in range(len(self))]
+        if io_engine is None:
+            return [_hash_array(*x) for x in items]
+        return io_engine.map(lambda x: _hash_array(*x), items)
+
+    def data_type(self, idx: int) -> int:
+        return self.entries_[idx][2]
+
+    def numpy(self, idx: int) -> np.ndarray:
+        offset, nbytes, data_type, shape, source = self.entries_[idx]
+        if source != -1:
+            return self._base_reader(source).numpy(offset)
+        np_dtype = np.dtype(
+            dtype_util.convert_oneflow_dtype_to_numpy_dtype(
+                dtype_util.convert_proto_dtype_to_oneflow_dtype(data_type)
+            )
+        )
+        if nbytes == 0:
+            return np.empty(shape, dtype=np_dtype)
+        assert self.buffer_ is not None and offset + nbytes <= len(self.buffer_)
+        return np.frombuffer(
+            self.buffer_,
+            dtype=np_dtype,
+            count=nbytes // np_dtype.itemsize,
+            offset=offset,
+        ).reshape(shape)
+
+    def tensor(self, idx: int) -> "flow.Tensor":
+        # from_numpy shares memory with the mmap-ed array
+        return flow.from_numpy(self.numpy(idx))
+
+
+class PackedVariableBlob:
+    r"""A tensor of a packed checkpoint with the same interface as
+    `FileBackendVariableBlob`. No data is read until `numpy()` is called.
+    """
+
+    def __init__(self, reader: PackedTensorReader, idx: int):
+        self.reader_ = reader
+        self.idx_ = idx
+
+    @property
+    def shape(self) -> Tuple[int]:
+        return tuple(self.reader_.entries_[self.idx_][3])
+
+    @property
+    def dtype(self) -> oneflow.dtype:
+        return dtype_util.convert_proto_dtype_to_oneflow_dtype(
+            self.reader_.data_type(self.idx_)
+        )
+
+    def numpy(self) -> np.ndarray:
+        return self.reader_.numpy(self.idx_)
+
+
+def is_packed_checkpoint(path: Union[str, Path]) -> bool:
+    return (Path(path) / PACKED_INDEX_FILENAME).exists()
+
+
+def compact_checkpoint(
+    path: Union[str, Path],
+    output_path: Optional[Union[str, Path]] = None,
+    num_io_threads: Optional[int] = None,
+) -> None:
+    r"""Merges an incremental checkpoint and the chain of checkpoints it is
+    based on into a self-contained checkpoint.
+
+    Args:
+        path (str): The incremental checkpoint saved by
+            `oneflow.save(..., base=...)`
+        output_path (str, optional): The directory of the merged checkpoint.
+            Defaults to `path`, which is then replaced in place.
+        num_io_threads (int, optional): The number of concurrent readers and
+            writers. Defaults to the ``ONEFLOW_CHECKPOINT_IO_THREADS``
+            environment variable or 8.
+    """
+    path = Path(path)
+    output_path = Path(output_path) if output_path is not None else path
+    assert is_packed_checkpoint(path), f"{path} is not a packed checkpoint"
+    reader = PackedTensorReader(path)
+    writer = PackedTensorWriter()
+    for i in range(len(reader)):
+        # Indices are kept, so the pickled object can be copied as it is
+        writer.add_array(reader.numpy(i), reader.data_type(i))
+    hashes_path = path / PACKED_HASHES_FILENAME
+    tmp_path = output_path.parent / f".{output_path.name}.tmp-{uuid.uuid4().hex}"
+    try:
+        tmp_path.mkdir()
+        with check_point_io.TensorIOEngine(num_io_threads) as io_engine:
+            writer.write(tmp_path, io_engine)
+        if hashes_path.exists():
+            shutil.copyfile(hashes_path, tmp_path / PACKED_HASHES_FILENAME)
+        shutil.copyfile(path / PICKLE_FILENAME, tmp_path / PICKLE_FILENAME)
+        (tmp_path / SNAPSHOT_DONE_FILENAME).touch()
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+    _replace_dir(tmp_path, output_path)
+
+
+def _parse_placement(
+    placement: "flow.placement",
+) -> Tuple[str, Dict[int, List[int]], Tuple[int]]:
+    machine_device_ids = {
+        int(machine_id): sorted(device_ids)
+        for (machine_id, device_ids) in placement.machine_id2device_id_list.items()
+    }
+    return (placement.device_type, machine_device_ids, tuple(placement.hierarchy))
+
+
+def _parallel_id4current_rank(
+    machine_device_ids: Dict[int, List[int]]
+) -> Optional[int]:
+    node_id = flow.env.get_rank() // (
+        flow.env.get_world_size() // flow.env.get_node_size()
+    )
+    machine_device_id = (node_id, flow.env.get_local_rank())
+    sorted_machine_device_ids = sorted(
+        (machine_id, device_id)
+        for (machine_id, device_ids) in machine_device_ids.items()
+        for device_id in device_ids
+    )
+    if machine_device_id not in sorted_machine_device_ids:
+        return None
+    return sorted_machine_device_ids.index(machine_device_id)
+
+
+def _balanced_split(size: int, num: int, idx: int) -> Tuple[int, int]:
+    # Same as BalancedSplitter in oneflow/core/common/balanced_splitter.h
+    base, remainder = divmod(size, num)
+    if idx < remainder:
+        begin = (base + 1) * idx
+        return begin, begin + base + 1
+    begin = (base + 1) * remainder + base * (idx - remainder)
+    return begin, begin + base
+
+
+def _split_axis(sbp: str) -> Optional[int]:
+    m = re.fullmatch(r"S\((\d+)\)", sbp)
+    return int(m.group(1)) if m is not None else None
+
+
+def _tensor_slice4parallel_id(
+    shape: Sequence[int],
+    hierarchy: Sequence[int],
+    sbp: Sequence[str],
+    parallel_id: int,
+) -> List[Tuple[int, int]]:
+    r"""Returns the [begin, end) range in every axis of the part of a consistent
+    tensor held by `parallel_id`, like GetTensorSliceView4ParallelId in
+    oneflow/core/job/nd_sbp_util.h.
+    """
+    ranges = [(0, dim) for dim in shape]
+    coords = np.unravel_index(parallel_id, hierarchy)
+    for (parallel_num, coord, sbp_str) in zip(hierarchy, coords, sbp):
+        axis = _split_axis(sbp_str)
+        if axis is None:
+            continue
+        begin, end = ranges[axis]
+        sub_begin, sub_end = _balanced_split(end - begin, parallel_num, int(coord))
+        ranges[axis] = (begin + sub_begin, begin + sub_end)
+    return ranges
+
+
+def _sbp_from_str(sbp: str) -> "flow.sbp.sbp":
+    axis = _split_axis(sbp)
+    if axis is not None:
+        return flow.sbp.split(axis)
+    if sbp == "B":
+        return flow.sbp.broadcast
+    assert sbp == "P", f"Unrecognized sbp {sbp}"
+    return flow.sbp.partial_sum
+
+
+class ShardedTensorWriter:
+    r"""Collects the local shards of consistent tensors during pickling. Every
+    rank writes the shards it holds into its own `shard_<rank>` directory as a
+    packed checkpoint, together with the slice of the consistent tensor each
+    shard covers. Shards duplicated by broadcast sbp are written only once.
+    """
+
+    def __init__(self, copy_tensors: bool = False):
+        self.num_tensors_ = 0
+        self.packed_writer_ = PackedTensorWriter(copy_tensors=copy_tensors)
+        # (tensor index, index in packed_writer_, slice ranges)
+        self.shards_: List[Tuple[int, int, List[Tuple[int, int]]]] = []
+
+    def add(self, tensor: "oneflow.Tensor") -> Dict[str, Any]:
+        assert not tensor.is_local
+        sbp = [x._ToAttrStr() for x in tensor.sbp]
+        if "P" in sbp:
+            sbp = ["B" if x == "P" else x for x in sbp]
+            tensor = tensor.to_consistent(sbp=[_sbp_from_str(x) for x in sbp])
+        device_type, machine_device_ids, hierarchy = _parse_placement(tensor.placement)
+        idx = self.num_tensors_
+        self.num_tensors_ += 1
+        parallel_id = _parallel_id4current_rank(machine_device_ids)
+        if parallel_id is not None:
+            coords = np.unravel_index(parallel_id, hierarchy)
+            is_unique_shard = all(
+                coord == 0 for (coord, x) in zip(coords, sbp) if _split_axis(x) is None
+            )
+            if is_unique_shard:
+                self.shards_.append(
+                    (
+                        idx,
+                        self.packed_writer_.add(tensor.to_local()),
+                        _tensor_slice4parallel_id(
+                            tensor.shape, hierarchy, sbp, parallel_id
+                        ),
+                    )
+                )
+        return {
+            "sharded_idx": idx,
+            "shape": tuple(tensor.shape),
+            "dtype": tensor.dtype,
+            "device_type": device_type,
+            "machine_device_ids": machine_device_ids,
+            "hierarchy": hierarchy,
+            "sbp": sbp,
+        }
+
+    def write(
+        self, path: Path, io_engine: Optional[check_point_io.TensorIOEngine] = None
+    ) -> None:
+        shard_path = path / f"{SHARD_DIR_PREFIX}{flow.env.get_rank()}"
+        shard_path.mkdir(exist_ok=True)
+        self.packed_writer_.write(shard_path, io_engine)
+        (shard_path / SHARD_INDEX_FILENAME).write_bytes(pickle.dumps(self.shards_))
+
+
+class ShardedTensorReader:
+    r"""Reads consistent tensors from the shards written by all ranks. Shards
+    are memory-mapped, so only the parts overlapping the slice needed by the
+    current rank are actually read, even when the placement or sbp differs
+    from the one at save time.
+    """
+
+    def __init__(self, path: Path):
+        self.shards_: Dict[
+            int, List[Tuple[List[Tuple[int, int]], PackedTensorReader, int]]
+        ] = {}
+        for shard_path in sorted(path.glob(f"{SHARD_DIR_PREFIX}*")):
+            reader = PackedTensorReader(shard_path)
+            for (idx, packed_idx, ranges) in pickle.loads(
+                (shard_path / SHARD_INDEX_FILENAME).read_bytes()
+            ):
+                self.shards_.setdefault(idx, []).append((ranges, reader, packed_idx))
+
+    def tensor(
+        self,
+        meta: Dict[str, Any],
+        placement: Optional["flow.placement"] = None,
+        sbp: Optional[Union["flow.sbp.sbp", Sequence["flow.sbp.sbp"]]] = None,
+    ) -> "flow.Tensor":
+        shape = meta["shape"]
+        if placement is None:
+            placement = flow.placement(
+                meta["device_type"], meta["machine_device_ids"], meta["hierarchy"]
+            )
+        _, machine_device_ids, hierarchy = _parse_placement(placement)
+        if sbp is None:
+            sbp = [_sbp_from_str(x) for x in meta["sbp"]]
+        elif not isinstance(sbp, (list, tuple)):
+            sbp = [sbp] * len(hierarchy)
+        # Tensors with fewer axes than the required split axis are broadcast
+        sbp = [
+            flow.sbp.broadcast
+            if _split_axis(x._ToAttrStr()) is not None
+            and _split_axis(x._ToAttrStr()) >= len(shape)
+            else x
+            for x in sbp
+        ]
+        sbp_str = [x._ToAttrStr() for x in sbp]
+        assert "P" not in sbp_str, "Loading as partial_sum is not supported"
+
+        np_dtype = dtype_util.convert_oneflow_dtype_to_numpy_dtype(meta["dtype"])
+        parallel_id = _parallel_id4current_rank(machine_device_ids)
+        if parallel_id is None:
+            local = np.empty([0] * len(shape), dtype=np_dtype)
+        else:
+            ranges = _tensor_slice4parallel_id(shape, hierarchy, sbp_str, parallel_id)
+            local = np.empty([end - begin for (begin, end) in ranges], dtype=np_dtype)
+            copied = 0
+            for (shard_ranges, reader, packed_idx) in self.shards_.get(
+                meta["sharded_idx"], []
+            ):
+                overlap = [
+                    (max(b, sb), min(e, se))
+                    for ((b, e), (sb, se)) in zip(ranges, shard_ranges)
+                ]
+                if any(begin >= end for (begin, end) in overlap):
+                    continue
+                local[
+                    tuple(
+                        slice(b - rb, e - rb)
+                        for ((b, e), (rb, _)) in zip(overlap, ranges)
+                    )
+                ] = reader.numpy(packed_idx)[
+                    tuple(
+                        slice(b - sb, e - sb)
+                        for ((b, e), (sb, _)) in zip(overlap, shard_ranges)
+                    )
+                ]
+                copied += int(np.prod([e - b for (b, e) in overlap]))
+            if copied != local.size:
+                raise RuntimeError(
+                    f"Shards of tensor {meta['sharded_idx']} are missing in the checkpoint"
+                )
+        return flow.from_numpy(local).to_consistent(placement=placement, sbp=sbp)
+
+
+class LazyLoadedTensor:
+    r"""A proxy of a tensor in an object loaded by
+    `oneflow.load(..., lazy=True)`. Its shape and dtype are known without
+    reading the checkpoint; the data is read on first access. `tensor()`
+    returns the real tensor, whose attributes are also available on the proxy
+    directly, and `copy_to()` reads the data straight into an existing tensor,
+    which is how `Module.load_state_dict` consumes proxies.
+    """
+
+    is_parameter_ = False
+    blob_ = None
+    tensor_ = None
+
+    def __setstate__(self, pickle_dict):
+        # Called inside tensor_pickling_context, like tensor_setstate
+        assert save_load_path is not None
+        if "sharded_idx" in pickle_dict:
+            self.meta_ = pickle_dict
+            self.sharded_reader_ = _get_sharded_tensor_reader()
+            self.placement_ = sharded_load_placement
+            self.sbp_ = sharded_load_sbp
+        elif "packed_idx" in pickle_dict:
+            self.blob_ = PackedVariableBlob(
+                packed_tensor_reader, pickle_dict["packed_idx"]
+            )
+        else:
+            self.blob_ = FileBackendVariableBlob(
+                str(save_load_path / pickle_dict["path"])
+            )
+
+    @property
+    def shape(self) -> "flow.Size":
+        if self.blob_ is None:
+            return flow.Size(self.meta_["shape"])
+        return flow.Size(self.blob_.shape)
+
+    @property
+    def dtype(self) -> oneflow.dtype:
+        if self.blob_ is None:
+            return self.meta_["dtype"]
+        return self.blob_.dtype
+
+    @property
+    def is_materialized(self) -> bool:
+        return self.tensor_ is not None
+
+    def numpy(self) -> np.ndarray:
+        if self.blob_ is None:
+            return self.tensor().numpy()
+        return self.blob_.numpy()
+
+    def tensor(self) -> "flow.Tensor":
+        r"""Reads the data and returns the tensor. The result is cached."""
+        if self.tensor_ is None:
+            if self.blob_ is None:
+                tensor = self.sharded_reader_.tensor(
+                    self.meta_, self.placement_, self.sbp_
+                )
+            else:
+                tensor = flow.from_numpy(self.blob_.numpy())
+            if self.is_parameter_:
+                tensor = flow.nn.Parameter(tensor)
+            self.tensor_ = tensor
+        return self.tensor_
+
+    def copy_to(self, dst: "flow.Tensor") -> None:
+        r"""Copies the data into `dst`. Local data is copied from the
+        checkpoint file (or its memory mapping) into `dst` directly, and only
+        the shards overlapping the slice of `dst` on this rank are read for a
+        sharded consistent tensor. The proxy is not materialized.
+        """
+        if self.tensor_ is not None:
+            src = self.tensor_
+        elif self.blob_ is None:
+            if dst.is_consistent:
+                src = self.sharded_reader_.tensor(self.meta_, dst.placement, dst.sbp)
+            else:
+                src = self.tensor()
+        else:
+            array = self.blob_.numpy()
+            if dst.is_local and dst.dtype == self.dtype:
+                src = array
+            else:
+                src = flow.from_numpy(array)
+        dst.copy_(src)
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.tensor(), name)
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __repr__(self) -> str:
+        return f"LazyLoadedTensor(shape={tuple(self.shape)}, dtype={self.dtype})"
+
+
+class _LazyLoadedParameter(LazyLoadedTensor):
+    is_parameter_ = True
+
+
+class _LazyTensorUnpickler(pickle.Unpickler):
+    def find_class(self, module, name):
+        cls = super().find_class(module, name)
+        if isinstance(cls, type) and issubclass(cls, Tensor):
+            if issubclass(cls, flow.nn.Parameter):
+                return _LazyLoadedParameter
+            return LazyLoadedTensor
+        return cls
+
+
 def _LoadSingleVariable(
     path: Optional[str], consistent_src_rank: Optional[int] = None
 ) -> "flow.Tensor":
@@ -144,6 +901,27 @@ def _LoadSingleVariable(
     return flow.tensor(FileBackendVariableBlob(path).numpy())
 
 
+def _LoadPackedVariable(
+    reader: Optional[PackedTensorReader],
+    idx: int,
+    consistent_src_rank: Optional[int] = None,
+) -> "flow.Tensor":
+    if consistent_src_rank is not None:
+        rank = flow.env.get_rank()
+        if rank == consistent_src_rank:
+            assert reader is not None
+            loaded = reader.tensor(idx).to("cuda")
+        else:
+            loaded = flow.tensor([]).to("cuda")
+        loaded = loaded.to_consistent(
+            flow.placement("cuda", [consistent_src_rank]), flow.sbp.broadcast
+        )
+        return loaded
+
+    assert reader is not None
+    return reader.tensor(idx)
+
+
 def _broadcast_py_object(obj, src: int = 0):
     rank = flow.env.get_rank()
     if src == rank:
@@ -161,25 +939,41 @@ def tensor_getstate(self):
         # save_load_path is not None means setstate/getstate is called inside
         # flow.save or flow.load
         assert isinstance(save_load_path, Path)
+        if sharded_tensor_writer is not None and not self.is_local:
+            return sharded_tensor_writer.add(self)
         if consistent_src_dsk_rank is None:
             assert self.is_local
             rel_dir_name = id_util.UniqueStr("tensor_")
-            abs_dir_name = save_load_path / rel_dir_name
 
             tensor = self
         else:
             assert not self.is_local
             rel_dir_name = f"consistent_tensor_{self.consistent_id()}"
-            abs_dir_name = save_load_path / rel_dir_name
 
             tensor = self.to_consistent(
                 sbp=[flow.sbp.broadcast] * len(self.sbp)
             ).to_local()
-        if (
+        need_write = (
             consistent_src_dsk_rank is None
             or consistent_src_dsk_rank == flow.env.get_rank()
-        ):
-            _save_tensor_to_disk(tensor, abs_dir_name)
+        )
+        if sharded_tensor_writer is not None:
+            # local tensors of a sharded checkpoint are saved by rank 0
+            need_write = flow.env.get_rank() == 0
+        if packed_tensor_writer is not None:
+            idx = packed_tensor_writer.add(tensor if need_write else None)
+            return {"packed_idx": idx}
+        if need_write:
+            # Copy to host here and write from the I/O threads later
+            pending_tensor_writes.append(
+                (
+                    _tensor_to_host_array(tensor, copy_tensors_on_save),
+                    oneflow._oneflow_internal.deprecated.GetProtoDtype4OfDtype(
+                        tensor.dtype
+                    ),
+                    rel_dir_name,
+                )
+            )
 
         return {"path": rel_dir_name}
     else:
@@ -194,8 +988,28 @@ def tensor_getstate(self):
 def tensor_setstate(self, pickle_dict):
     if save_load_path is not None:
         assert isinstance(save_load_path, Path)
+        if "sharded_idx" in pickle_dict:
+            self.__init__(
+                _get_sharded_tensor_reader().tensor(
+                    pickle_dict, sharded_load_placement, sharded_load_sbp
+                )
+            )
+            return
+        if "packed_idx" in pickle_dict:
+            self.__init__(
+                _LoadPackedVariable(
+                    packed_tensor_reader,
+                    pickle_dict["packed_idx"],
+                    consistent_src_dsk_rank,
+                )
+            )
+            return
         rel_dir_name = pickle_dict["path"]
         abs_dir_name = save_load_path / rel_dir_name
+        if tensor_io_engine is not None and consistent_src_dsk_rank is None:
+            # Initialized after all tensor files are read concurrently
+            pending_tensor_loads.append((self, str(abs_dir_name)))
+            return
         self.__init__(_LoadSingleVariable(str(abs_dir_name), consistent_src_dsk_rank))
     else:
         return self.__init__(
@@ -203,6 +1017,13 @@ def tensor_setstate(self, pickle_dict):
         )
 
 
+def _get_sharded_tensor_reader() -> ShardedTensorReader:
+    global sharded_tensor_reader
+    if sharded_tensor_reader is None:
+        sharded_tensor_reader = ShardedTensorReader(save_load_path)
+    return sharded_tensor_reader
+
+
 def RegisterMethods():
     Tensor.__setstate__ = tensor_setstate
     Tensor.__getstate__ = tensor_getstate
@@ -235,19 +1056,76 @@ def legacy_load(
 
 
 @contextmanager
-def tensor_pickling_context(path: Path, consistent_src_dst_rank: int):
+def tensor_pickling_context(
+    path: Path,
+    consistent_src_dst_rank: int,
+    packed_writer: Optional[PackedTensorWriter] = None,
+    packed_reader: Optional[PackedTensorReader] = None,
+    io_engine: Optional[check_point_io.TensorIOEngine] = None,
+    tensor_writes: Optional[List[Tuple[np.ndarray, int, str]]] = None,
+    copy_tensors: bool = False,
+    sharded_writer: Optional[ShardedTensorWriter] = None,
+    sharded_placement: Optional["flow.placement"] = None,
+    sharded_sbp: Optional[Union["flow.sbp.sbp", Sequence["flow.sbp.sbp"]]] = None,
+):
     global save_load_path
     global consistent_src_dsk_rank
+    global packed_tensor_writer
+    global packed_tensor_reader
+    global tensor_io_engine
+    global pending_tensor_writes
+    global pending_tensor_loads
+    global copy_tensors_on_save
+    global sharded_tensor_writer
+    global sharded_tensor_reader
+    global sharded_load_placement
+    global sharded_load_sbp
     consistent_src_dsk_rank = consistent_src_dst_rank
     save_load_path = path
+    packed_tensor_writer = packed_writer
+    packed_tensor_reader = packed_reader
+    tensor_io_engine = io_engine
+    pending_tensor_writes = tensor_writes if tensor_writes is not None else []
+    pending_tensor_loads = []
+    copy_tensors_on_save = copy_tensors
+    sharded_tensor_writer = sharded_writer
+    sharded_tensor_reader = None
+    sharded_load_placement = sharded_placement
+    sharded_load_sbp = sharded_sbp
     try:
         yield
+        if io_engine is not None:
+            _flush_pending_tensor_loads(io_engine)
     finally:
         consistent_src_dsk_rank = None
         save_load_path = None
+        packed_tensor_writer = None
+        packed_tensor_reader = None
+        tensor_io_engine = None
+        pending_tensor_writes = []
+        pending_tensor_loads = []
+        copy_tensors_on_save = False
+        sharded_tensor_writer = None
+        sharded_tensor_reader = None
+        sharded_load_placement = None
+        sharded_load_sbp = None
 
 
-def load(path: str, consistent_src_rank: Optional[int] = None,) -> Any:
+def _flush_pending_tensor_loads(io_engine: check_point_io.TensorIOEngine) -> None:
+    arrays = io_engine.map(_load_array_from_disk, [x[1] for x in pending_tensor_loads])
+    for ((tensor, _), array) in zip(pending_tensor_loads, arrays):
+        tensor.__init__(flow.tensor(array))
+
+
+def load(
+    path: str,
+    consistent_src_rank: Optional[int] = None,
+    use_mmap: bool = True,
+    num_io_threads: Optional[int] = None,
+    placement: Optional["flow.placement"] = None,
+    sbp: Optional[Union["flow.sbp.sbp", Sequence["flow.sbp.sbp"]]] = None,
+    lazy: bool = False,
+) -> Any:
     r"""Loads an object saved with oneflow.save() from a directory.
 
     Args:
@@ -258,11 +1136,30 @@ def load(path: str, consistent_src_rank: Optional[int] = None,) -> Any:
             read the files in `path`, and tensors in the loaded
             object will be consistent with placement = 
             `flow.placement('cuda', [consistent_src_rank])`
+        use_mmap (bool, optional): If True, tensors of a packed
+            checkpoint are memory-mapped and read lazily. Otherwise
+            they are read eagerly by parallel I/O threads. Default: True
+        num_io_threads (int, optional): The number of concurrent
+            readers. Defaults to the ``ONEFLOW_CHECKPOINT_IO_THREADS``
+            environment variable or 8.
+        placement (flow.placement, optional): The placement of consistent
+            tensors loaded from a sharded checkpoint. Defaults to the
+            placement at save time.
+        sbp (flow.sbp.sbp or list of flow.sbp.sbp, optional): The sbp of
+            consistent tensors loaded from a sharded checkpoint. Splits on
+            axes a tensor does not have fall back to broadcast. Defaults
+            to the sbp at save time.
+        lazy (bool, optional): If True, tensors in the loaded object are
+            `LazyLoadedTensor` proxies, which read their data on first
+            access. Only the tensors actually used are read, and
+            `Module.load_state_dict` copies proxies into the existing
+            parameters without materializing them. Not supported with
+            `consistent_src_rank`. Default: False
 
     Returns:
         The loaded object
     """
-    path: Path = Path(path)
+    path: Path = _recover_replaced_dir(Path(path))
     assert path.is_dir(), "Directory {} doesn't exist!".format(path)
     pickle_path = path / PICKLE_FILENAME
     rank = flow.env.get_rank()
@@ -284,14 +1181,52 @@ def load(path: str, consistent_src_rank: Optional[int] = None,) -> Any:
     else:
         pickle_bytes = pickle_path.read_bytes()
 
-    with tensor_pickling_context(path, consistent_src_rank):
-        res = pickle.loads(pickle_bytes)
+    if lazy:
+        assert (
+            consistent_src_rank is None
+        ), "lazy loading does not support consistent_src_rank"
+        packed_reader = PackedTensorReader(path) if is_packed_checkpoint(path) else None
+        with tensor_pickling_context(
+            path,
+            None,
+            packed_reader=packed_reader,
+            sharded_placement=placement,
+            sharded_sbp=sbp,
+        ):
+            res = _LazyTensorUnpickler(io.BytesIO(pickle_bytes)).load()
+        assert res["protocol_version"] == PROTOCOL_VERSION
+        return res["data"]
+
+    with check_point_io.TensorIOEngine(num_io_threads) as io_engine:
+        packed_reader = None
+        if (consistent_src_rank is None or consistent_src_rank == rank) and (
+            is_packed_checkpoint(path)
+        ):
+            packed_reader = PackedTensorReader(
+                path, io_engine=None if use_mmap else io_engine
+            )
+
+        with tensor_pickling_context(
+            path,
+            consistent_src_rank,
+            packed_reader=packed_reader,
+            io_engine=io_engine,
+            sharded_placement=placement,
+            sharded_sbp=sbp,
+        ):
+            res = pickle.loads(pickle_bytes)
     assert res["protocol_version"] == PROTOCOL_VERSION
     return res["data"]
 
 
 def save(
-    obj: Any, path: Union[str, Path], consistent_dst_rank: Optional[int] = None,
+    obj: Any,
+    path: Union[str, Path],
+    consistent_dst_rank: Optional[int] = None,
+    packed: bool = True,
+    num_io_threads: Optional[int] = None,
+    sharded: bool = False,
+    base: Optional[Union[str, Path]] = None,
 ) -> None:
     r"""Save an object to a directory.
 
@@ -303,6 +1238,27 @@ def save(
             will be saved by the process whose rank == 
             consistent_src_rank, while other processes will not do any
             disk I/O.
+        packed (bool, optional): If True, all tensors are written into
+            a single data file with aligned offsets and a binary index,
+            which `oneflow.load` memory-maps without copying. Otherwise
+            every tensor is saved in its own directory. Default: True
+        num_io_threads (int, optional): The number of concurrent
+            writers. Defaults to the ``ONEFLOW_CHECKPOINT_IO_THREADS``
+            environment variable or 8.
+        sharded (bool, optional): If True, every rank writes only the
+            local shards of consistent tensors it holds (split sbp is
+            kept, no tensor is gathered to a single rank), along with
+            their placement and sbp. `oneflow.load` then reads only the
+            parts each rank needs, optionally with a different placement
+            or sbp. `path` must be on a filesystem shared by all ranks.
+            Default: False
+        base (str, optional): A packed checkpoint to save incrementally
+            against. Tensors whose contents are unchanged since `base`
+            are not written again but reference the data in `base`
+            (content hashes of all tensors are saved for this), so
+            `base` must be kept as long as this checkpoint is used, or
+            merged into it with
+            `oneflow.framework.check_point_v2.compact_checkpoint`.
     """
     path: Path = Path(path)
 
@@ -321,15 +1277,289 @@ def save(
 
         return
 
-    obj = {"protocol_version": PROTOCOL_VERSION, "data": obj}
-    with tensor_pickling_context(path, consistent_dst_rank):
-        pickled_bytes = pickle.dumps(obj)
-    rank = flow.env.get_rank()
-    if consistent_dst_rank is None or consistent_dst_rank == rank:
+    if sharded:
+        assert (
+            consistent_dst_rank is None
+        ), "consistent_dst_rank is not supported in sharded mode"
+        assert packed, "sharded checkpoints are always packed"
+        assert base is None, "sharded checkpoints can not be incremental"
+    if base is not None:
+        assert packed, "only packed checkpoints can be incremental"
+        base = Path(base)
+        assert base.resolve() != path.resolve(), "base must be another checkpoint"
+    snapshot = _CheckpointSnapshot.take(
+        obj, path, consistent_dst_rank, packed, sharded=sharded, base=base
+    )
+    if sharded:
+        # Shards from an earlier save (maybe with more ranks) must not be
+        # mixed with the new ones
+        if flow.env.get_rank() == 0:
+            path.mkdir(exist_ok=True)
+            for shard_path in path.glob(f"{SHARD_DIR_PREFIX}*"):
+                shutil.rmtree(shard_path)
+            if (path / SNAPSHOT_DONE_FILENAME).exists():
+                (path / SNAPSHOT_DONE_FILENAME).unlink()
+        flow.comm.barrier()
+    if snapshot is not None:
+        with check_point_io.TensorIOEngine(num_io_threads) as io_engine:
+            snapshot.write(path, io_engine, mark_done=not sharded)
+    if sharded:
+        # snapshot_done is written only after all ranks finish their shards
+        flow.comm.barrier()
+        if flow.env.get_rank() == 0:
+            (path / SNAPSHOT_DONE_FILENAME).touch()
+
+
+class _CheckpointSnapshot:
+    r"""The pickled object and host copies of its tensors, i.e. everything
+    needed to write a checkpoint without touching the original tensors.
+    """
+
+    def __init__(
+        self,
+        pickled_bytes: Optional[bytes],
+        packed_writer: Optional[PackedTensorWriter],
+        tensor_writes: List[Tuple[np.ndarray, int, str]],
+        sharded_writer: Optional[ShardedTensorWriter] = None,
+        base: Optional[Path] = None,
+    ):
+        self.pickled_bytes_ = pickled_bytes
+        self.packed_writer_ = packed_writer
+        self.tensor_writes_ = tensor_writes
+        self.sharded_writer_ = sharded_writer
+        self.base_ = base
+
+    @staticmethod
+    def take(
+        obj: Any,
+        path: Path,
+        consistent_dst_rank: Optional[int],
+        packed: bool,
+        copy_tensors: bool = False,
+        sharded: bool = False,
+        base: Optional[Path] = None,
+    ) -> Optional["_CheckpointSnapshot"]:
+        r"""Pickles `obj`. Returns None on ranks that do not write anything.
+        The packed tensors are written incrementally against `base` if given.
+        """
+        obj = {"protocol_version": PROTOCOL_VERSION, "data": obj}
+        packed_writer = (
+            PackedTensorWriter(copy_tensors=copy_tensors) if packed else None
+        )
+        sharded_writer = (
+            ShardedTensorWriter(copy_tensors=copy_tensors) if sharded else None
+        )
+        tensor_writes = []
+        with tensor_pickling_context(
+            path,
+            consistent_dst_rank,
+            packed_writer=packed_writer,
+            tensor_writes=tensor_writes,
+            copy_tensors=copy_tensors,
+            sharded_writer=sharded_writer,
+        ):
+            pickled_bytes = pickle.dumps(obj)
+        if (
+            consistent_dst_rank is not None
+            and consistent_dst_rank != flow.env.get_rank()
+        ):
+            return None
+        if sharded and flow.env.get_rank() != 0:
+            # Every rank writes its own shards, the pickled object and local
+            # tensors are written by rank 0
+            return _CheckpointSnapshot(None, None, [], sharded_writer=sharded_writer)
+        return _CheckpointSnapshot(
+            pickled_bytes,
+            packed_writer,
+            tensor_writes,
+            sharded_writer=sharded_writer,
+            base=base,
+        )
+
+    def write(
+        self,
+        path: Path,
+        io_engine: check_point_io.TensorIOEngine,
+        mark_done: bool = True,
+    ) -> None:
+        r"""Writes the checkpoint into `path`. `mark_done=False` leaves writing
+        the snapshot_done marker to the caller, e.g. after all ranks have
+        written their shards.
+        """
         path.mkdir(exist_ok=True)
-        pickle_path = path / PICKLE_FILENAME
-        pickle_path.write_bytes(pickled_bytes)
+        # The snapshot_done marker is written last, its absence means the
+        # checkpoint in `path` is incomplete.
+        snapshot_done_path = path / SNAPSHOT_DONE_FILENAME
+        if self.pickled_bytes_ is not None and snapshot_done_path.exists():
+            snapshot_done_path.unlink()
+        if self.sharded_writer_ is not None:
+            self.sharded_writer_.write(path, io_engine)
+        if self.pickled_bytes_ is not None:
+            if self.packed_writer_ is not None:
+                self.packed_writer_.write(path, io_engine, self.base_)
+            io_engine.map(
+                lambda x: _save_array_to_disk(x[0], x[1], path / x[2]),
+                self.tensor_writes_,
+            )
+            (path / PICKLE_FILENAME).write_bytes(self.pickled_bytes_)
+        if mark_done:
+            snapshot_done_path.touch()
+
+
+def _write_snapshot_atomically(
+    snapshot: _CheckpointSnapshot, path: Path, num_io_threads: Optional[int]
+) -> None:
+    # Write into a temporary sibling directory and swap it in afterwards, so
+    # a crash while writing leaves the previous checkpoint in `path` intact.
+    suffix = uuid.uuid4().hex
+    tmp_path = path.parent / f".{path.name}.tmp-{suffix}"
+    try:
+        with check_point_io.TensorIOEngine(num_io_threads) as io_engine:
+            snapshot.write(tmp_path, io_engine)
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+    _replace_dir(tmp_path, path)
+
+
+def _old_dirs(path: Path) -> List[Path]:
+    return list(path.parent.glob(f".{path.name}.old-*"))
+
+
+def _replace_dir(src: Path, dst: Path) -> None:
+    # Two directories can not be swapped atomically, so the previous
+    # checkpoint is moved aside and only removed once the new one is in
+    # place. A crash in between leaves it in `.<name>.old-*`, which `load()`
+    # falls back to.
+    old_path = None
+    if dst.exists():
+        old_path = dst.parent / f".{dst.name}.old-{uuid.uuid4().hex}"
+        os.rename(dst, old_path)
+    os.rename(src, dst)
+    # Also drop the ones left by an earlier crash
+    for path in _old_dirs(dst):
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _recover_replaced_dir(path: Path) -> Path:
+    r"""Returns the checkpoint moved aside by an interrupted `_replace_dir`
+    if `path` itself doesn't exist.
+    """
+    if path.exists():
+        return path
+    candidates = [x for x in _old_dirs(path) if (x / SNAPSHOT_DONE_FILENAME).exists()]
+    if len(candidates) == 0:
+        return path
+    latest = max(candidates, key=lambda x: x.stat().st_mtime)
+    warnings.warn(
+        f"{path} doesn't exist, loading {latest} left by an interrupted save instead",
+        stacklevel=3,
+    )
+    return latest
+
+
+class AsyncCheckpointHandle:
+    r"""The handle of a checkpoint being written by `oneflow.async_save`."""
+
+    def __init__(self, future: Future, path: Path):
+        self.future_ = future
+        self.path_ = path
+
+    @property
+    def path(self) -> Path:
+        return self.path_
+
+    def done(self) -> bool:
+        r"""Returns True if the checkpoint has been completely written (or
+        writing it has failed).
+        """
+        return self.future_.done()
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        r"""Blocks until the checkpoint is completely written. Exceptions
+        raised while writing are re-raised here.
+        """
+        self.future_.result(timeout)
+
+
+def _get_async_save_executor() -> ThreadPoolExecutor:
+    global async_save_executor
+    if async_save_executor is None:
+        # A single worker keeps checkpoints written in the order they are saved
+        async_save_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="async_save"
+        )
+        # Registered after (and so run before) the exit hook that destroys
+        # the oneflow env
+        atexit.register(async_save_executor.shutdown, wait=True)
+    return async_save_executor
+
+
+def async_save(
+    obj: Any,
+    path: Union[str, Path],
+    consistent_dst_rank: Optional[int] = None,
+    packed: bool = True,
+    num_io_threads: Optional[int] = None,
+    base: Optional[Union[str, Path]] = None,
+) -> AsyncCheckpointHandle:
+    r"""Save an object to a directory in the background.
+
+    Tensors in `obj` are copied to host memory before this function returns,
+    so they can be modified right away, e.g. by the next training step. The
+    disk I/O is done by a background worker. The checkpoint is first written
+    into a temporary directory (ending with the `snapshot_done` marker) and
+    then replaces `path` as a whole, so a crash while writing never corrupts
+    the last complete checkpoint. If the crash happens while the directories
+    are being swapped, `oneflow.load(path)` reads the previous checkpoint.
+
+    The arguments are the same as `oneflow.save`.
+
+    Returns:
+        An `AsyncCheckpointHandle` whose `wait()` blocks until the
+        checkpoint is written and `done()` tells whether it is.
+
+    For example:
+
+    .. code-block:: python
+
+        >>> import oneflow as flow
+        >>> import tempfile
+        >>> state_dict = {"weight": flow.ones(2, 3)}
+        >>> path = tempfile.mkdtemp()
+        >>> handle = flow.async_save(state_dict, path)
+        >>> handle.wait()
+        >>> handle.done()
+        True
+    """
+    path: Path = Path(path)
+    if base is not None:
+        assert packed, "only packed checkpoints can be incremental"
+        base = Path(base)
+        assert base.resolve() != path.resolve(), "base must be another checkpoint"
+    snapshot = _CheckpointSnapshot.take(
+        obj, path, consistent_dst_rank, packed, copy_tensors=True, base=base
+    )
+    if snapshot is None:
+        future = Future()
+        future.set_result(None)
+    else:
+        future = _get_async_save_executor().submit(
+            _write_snapshot_atomically, snapshot, path, num_io_threads
+        )
+    return AsyncCheckpointHandle(future, path)
 
 
 save_load_path = None
 consistent_src_dsk_rank = None
+packed_tensor_writer = None
+packed_tensor_reader = None
+tensor_io_engine = None
+pending_tensor_writes = []
+pending_tensor_loads = []
+copy_tensors_on_save = False
+sharded_tensor_writer = None
+sharded_tensor_reader = None
+sharded_load_placement = None
+sharded_load_sbp = None
+async_save_executor = None
@@ -0,0 +1,78 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import oneflow._oneflow_internal
+
+
+class EagerCapture(object):
+    r"""Records the eager ops run in a ``with`` block so that they can be
+    re-run by :meth:`replay` without python dispatch, functional api argument
+    parsing and op infer. It speeds up loops of many small ops whose time is
+    dominated by the interpreter, like cpu inference.
+
+    A replay runs the same kernels on the same tensors as the recorded step, the
+    tensors used in the block act as static buffers: feed new inputs by writing
+    into the input tensors in place (like ``x.copy_(new_x)``), shapes and dtypes
+    can not change, and read the results from the output tensors of the block.
+    Tensor data can not be accessed on host (like ``Tensor.numpy()``) in the
+    block.
+
+    .. code-block:: python
+
+        >>> import oneflow as flow
+        >>> x = flow.ones(2, 3)
+        >>> with flow.eager_capture() as g:
+        ...     y = flow.relu(x * 2 - 1)
+        >>> x.copy_(flow.zeros(2, 3))
+        >>> g.replay()
+        >>> y
+        tensor([[0., 0., 0.],
+                [0., 0., 0.]], dtype=oneflow.float32)
+
+    """
+
+    def __init__(self):
+        self._capture = oneflow._oneflow_internal.eager.EagerCapture()
+
+    def __enter__(self):
+        self._capture.begin()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._capture.end()
+        if exc_type is not None:
+            self._capture.reset()
+
+    @property
+    def num_instructions(self) -> int:
+        r"""The number of recorded virtual machine instructions."""
+        return self._capture.num_instructions
+
+    def replay(self) -> None:
+        r"""Re-runs the recorded ops asynchronously, like running them eagerly."""
+        self._capture.replay()
+
+    def reset(self) -> None:
+        r"""Drops the recorded ops and releases the tensors they hold, so the
+        capture can record again.
+        """
+        self._capture.reset()
+
+
+def eager_capture() -> EagerCapture:
+    r"""Returns an :class:`EagerCapture` to record eager ops in a ``with`` block,
+    see :class:`oneflow.EagerCapture`.
+    """
+    return EagerCapture()
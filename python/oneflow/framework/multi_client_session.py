@@ -59,6 +59,10 @@ class MultiClientSession(object):
         self._check_status(self.Status.INITED)
         oneflow._oneflow_internal.MultiClientSessionContextAddCGraph(graph)
 
+    def RemoveCGraph(self, graph):
+        self._check_status(self.Status.INITED)
+        oneflow._oneflow_internal.MultiClientSessionContextRemoveCGraph(graph)
+
     @property
     def status(self):
         return self.status_
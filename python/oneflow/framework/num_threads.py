@@ -0,0 +1,49 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import oneflow._oneflow_internal
+
+
+def set_num_threads(num_threads: int) -> None:
+    r"""Sets the number of threads used by an eager op on cpu (intra-op
+    parallelism), including the thread launching it. 0 restores the default,
+    which is the ``ONEFLOW_EP_CPU_NUM_THREADS`` environment variable or the
+    size of the compute thread pool. It's capped by the size of the compute
+    thread pool.
+
+    For example:
+
+    .. code-block:: python
+
+        >>> import oneflow as flow
+        >>> flow.set_num_threads(1)
+        >>> flow.get_num_threads()
+        1
+        >>> flow.set_num_threads(0)
+
+    """
+    assert num_threads >= 0, "num_threads should be non-negative"
+    oneflow._oneflow_internal.SetCpuNumThreads(num_threads)
+
+
+def get_num_threads() -> int:
+    r"""Returns the number of threads used by an eager op on cpu."""
+    return oneflow._oneflow_internal.GetCpuNumThreads()
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod(raise_on_error=True)
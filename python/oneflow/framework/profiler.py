@@ -30,3 +30,57 @@ def ProfilerStart():
 
 def ProfilerStop():
     oneflow._oneflow_internal.profiler.ProfilerStop()
+
+
+def InferCacheStats():
+    r"""Returns the hit, miss and eviction counts of the eager infer caches as
+    ``{cache_name: {op_type_name: {"num_hits": ..., "num_misses": ...,
+    "num_evictions": ...}}}``. The caches are ``op_kernel_infer_cache`` (runtime
+    shape infer of kernels) and ``consistent_tensor_infer_cache`` (consistent
+    tensor meta infer of ops).
+    """
+    return oneflow._oneflow_internal.profiler.GetInferCacheStats()
+
+
+def ResetInferCacheStats():
+    oneflow._oneflow_internal.profiler.ResetInferCacheStats()
+
+
+def GetInferCacheCapacity():
+    return oneflow._oneflow_internal.profiler.GetInferCacheCapacity()
+
+
+def SetInferCacheCapacity(capacity):
+    assert capacity >= 0, "capacity should be non-negative"
+    oneflow._oneflow_internal.profiler.SetInferCacheCapacity(capacity)
+
+
+def DataReaderStats():
+    r"""Returns the prefetch queue counters of the data readers as
+    ``{op_type_name: {"num_reads": ..., "num_starved_reads": ...,
+    "num_full_reads": ..., "sum_queue_occupancy": ..., "wait_time_us": ...}}``.
+    A read is starved when no prefetched batch is ready, which means more
+    ``num_loader_threads`` may help; a read is full when the whole
+    ``prefetch_depth`` is loaded ahead, which means the loader threads are idle.
+    ``sum_queue_occupancy / num_reads`` is the mean number of batches ready at a
+    read.
+    """
+    return oneflow._oneflow_internal.profiler.GetDataReaderStats()
+
+
+def ResetDataReaderStats():
+    oneflow._oneflow_internal.profiler.ResetDataReaderStats()
+
+
+def CpuConvStats():
+    r"""Returns the counters of the CPU conv engine as
+    ``{"algo_cache": {"num_hits": ..., "num_misses": ...}, "algo_runs":
+    {algo_name: ...}}``. A miss of ``algo_cache`` times the algorithms for a
+    new conv shape; ``algo_runs`` counts the convs run with each of
+    ``im2col_gemm``, ``gemm_1x1`` and ``winograd_3x3``, the timing runs excluded.
+    """
+    return oneflow._oneflow_internal.profiler.GetCpuConvStats()
+
+
+def ResetCpuConvStats():
+    oneflow._oneflow_internal.profiler.ResetCpuConvStats()
@@ -18,6 +18,7 @@ from multiprocessing.reduction import ForkingPickler
 import oneflow as flow
 from oneflow.nn.parameter import Parameter
 from oneflow.framework.tensor import Tensor
+from oneflow.multiprocessing import shared_memory
 
 
 try:
@@ -31,8 +32,7 @@ except ImportError:
     pass
 
 
-def rebuild_tensor(cls, tensor_data, requires_grad):
-    t = flow.tensor(tensor_data)
+def _finish_rebuild(cls, t, requires_grad):
     if cls == Parameter:
         # we have to pass requires_grad into constructor, rather than set it as an
         # attribute later, because it's an important check for Integer Tensors to
@@ -43,16 +43,48 @@ def rebuild_tensor(cls, tensor_data, requires_grad):
     return t
 
 
+def rebuild_tensor(cls, tensor_data, requires_grad):
+    return _finish_rebuild(cls, flow.tensor(tensor_data), requires_grad)
+
+
+def rebuild_shared_memory_tensor(cls, handle, offset, shape, dtype, requires_grad):
+    mm = shared_memory.open_segment(handle)
+    # from_numpy shares memory with the array viewing the segment
+    t = flow.from_numpy(shared_memory.array_from_segment(mm, offset, shape, dtype))
+    return _finish_rebuild(cls, t, requires_grad)
+
+
 def reduce_tensor(tensor):
-    tensor_data = tensor.numpy()
     requires_grad = tensor.requires_grad
-    return (rebuild_tensor, (type(tensor), tensor_data, requires_grad))
+    if not tensor.is_local or tensor.device.type != "cpu":
+        return (rebuild_tensor, (type(tensor), tensor.numpy(), requires_grad))
+    # numpy() of a cpu tensor shares memory with it
+    tensor_data = tensor.numpy()
+    found = shared_memory.find_segment(tensor_data)
+    if found is None:
+        from oneflow.multiprocessing import get_sharing_strategy
+
+        shared_data = shared_memory.new_shared_array(
+            tensor_data.shape, tensor_data.dtype, get_sharing_strategy()
+        )
+        shared_data[...] = tensor_data
+        found = shared_memory.find_segment(shared_data)
+    (segment, offset) = found
+    return (
+        rebuild_shared_memory_tensor,
+        (
+            type(tensor),
+            shared_memory.share_segment(segment),
+            offset,
+            tensor_data.shape,
+            tensor_data.dtype.str,
+            requires_grad,
+        ),
+    )
 
 
 def reduce_local_tensor(tensor):
-    tensor_data = tensor.numpy()
-    requires_grad = tensor.requires_grad
-    return (rebuild_tensor, (type(tensor), tensor_data, requires_grad))
+    return reduce_tensor(tensor)
 
 
 def init_reductions():
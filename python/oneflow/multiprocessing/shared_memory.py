@@ -0,0 +1,235 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""
+Shared memory segments backing CPU tensors sent between processes.
+
+A segment is a file in ``/dev/shm`` (or the temporary directory where it
+doesn't exist) mapped with ``MAP_SHARED``. Tensors are numpy views on the
+mapping wrapped by :func:`oneflow.from_numpy`, so a receiving process maps the
+same pages and shares the data without copying it. A segment is unmapped when
+the last tensor viewing it in a process is gone.
+
+Two strategies are supported for sharing a segment and cleaning it up:
+
+* ``file_descriptor``: the file is unlinked right after it is created and the
+  file descriptor is sent to other processes, so the kernel frees the memory
+  when the last process closes it.
+* ``file_system``: the file name is sent. Processes count their references in
+  the header of the segment under a file lock, and the last one unlinks it.
+"""
+import fcntl
+import mmap
+import multiprocessing.reduction
+import os
+import struct
+import tempfile
+import threading
+import uuid
+import weakref
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ._atfork import register_after_fork
+
+SHM_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+SHM_PREFIX = "oneflow_"
+# The header holds the cross-process reference count of a file_system
+# segment, data starts at the next cache line
+HEADER_SIZE = 64
+_REFCOUNT = struct.Struct("<q")
+
+
+class SharedMemorySegment(object):
+    def __init__(
+        self,
+        strategy: str,
+        mm: mmap.mmap,
+        fd: Optional[int] = None,
+        filename: Optional[str] = None,
+    ):
+        self.strategy = strategy
+        self.size = len(mm)
+        self.fd = fd
+        self.filename = filename
+        self.address = np.frombuffer(mm, dtype=np.uint8).ctypes.data
+        # The mapping lives as long as arrays viewing it, then the segment is
+        # released
+        self.finalizer = weakref.finalize(
+            mm, _release_segment, self.address, strategy, fd, filename
+        )
+
+    def contains(self, address: int, nbytes: int) -> bool:
+        return (
+            self.address + HEADER_SIZE <= address
+            and address + nbytes <= self.address + self.size
+        )
+
+
+_segments: Dict[int, SharedMemorySegment] = {}
+# Reentrant, a segment may be released by the garbage collector while the
+# lock is held
+_segments_lock = threading.RLock()
+
+
+def _release_segment(
+    address: int, strategy: str, fd: Optional[int], filename: Optional[str]
+) -> None:
+    with _segments_lock:
+        _segments.pop(address, None)
+    if strategy == "file_system":
+        _decref(filename)
+    if fd is not None:
+        os.close(fd)
+
+
+def _add_segment(segment: SharedMemorySegment) -> None:
+    with _segments_lock:
+        _segments[segment.address] = segment
+
+
+def _forget_segments_after_fork():
+    # A forked child inherits the mappings but not the references of its
+    # parent, so it must not release them
+    global _segments_lock
+    for segment in list(_segments.values()):
+        segment.finalizer.detach()
+    _segments.clear()
+    _segments_lock = threading.RLock()
+
+
+register_after_fork(_forget_segments_after_fork)
+
+
+def _update_refcount(filename: str, delta: int) -> int:
+    fd = os.open(filename, os.O_RDWR)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        (count,) = _REFCOUNT.unpack(os.pread(fd, _REFCOUNT.size, 0))
+        count += delta
+        os.pwrite(fd, _REFCOUNT.pack(count), 0)
+        if count == 0:
+            os.unlink(filename)
+        return count
+    finally:
+        os.close(fd)
+
+
+def _incref(filename: str) -> None:
+    _update_refcount(filename, 1)
+
+
+def _decref(filename: str) -> None:
+    try:
+        _update_refcount(filename, -1)
+    except FileNotFoundError:
+        pass
+
+
+def new_segment(nbytes: int, strategy: str) -> mmap.mmap:
+    r"""Creates and maps a segment with `nbytes` of data, owned by this
+    process.
+    """
+    size = HEADER_SIZE + max(nbytes, 1)
+    filename = os.path.join(SHM_DIR, f"{SHM_PREFIX}{os.getpid()}_{uuid.uuid4().hex}")
+    fd = os.open(filename, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o600)
+    try:
+        os.ftruncate(fd, size)
+        os.pwrite(fd, _REFCOUNT.pack(1), 0)
+        mm = mmap.mmap(fd, size)
+    except:
+        os.close(fd)
+        os.unlink(filename)
+        raise
+    if strategy == "file_descriptor":
+        os.unlink(filename)
+        _add_segment(SharedMemorySegment(strategy, mm, fd=fd))
+        return mm
+    os.close(fd)
+    _add_segment(SharedMemorySegment(strategy, mm, filename=filename))
+    return mm
+
+
+def new_shared_array(shape: Sequence[int], dtype, strategy: str) -> np.ndarray:
+    r"""Returns an uninitialized C-contiguous array in a new segment."""
+    dtype = np.dtype(dtype)
+    count = int(np.prod(shape))
+    mm = new_segment(count * dtype.itemsize, strategy)
+    return array_from_segment(mm, HEADER_SIZE, shape, dtype)
+
+
+def array_from_segment(
+    mm: mmap.mmap, offset: int, shape: Sequence[int], dtype
+) -> np.ndarray:
+    r"""Returns an array viewing the data at `offset` of a mapped segment.
+    The array keeps the mapping alive.
+    """
+    dtype = np.dtype(dtype)
+    count = int(np.prod(shape))
+    return np.frombuffer(mm, dtype=dtype, count=count, offset=offset).reshape(shape)
+
+
+def find_segment(array: np.ndarray) -> Optional[Tuple[SharedMemorySegment, int]]:
+    r"""Returns the segment holding the data of a C-contiguous `array` and
+    the offset of the data in it, or None if `array` is not in shared memory.
+    """
+    if not array.flags.c_contiguous:
+        return None
+    address = array.ctypes.data
+    with _segments_lock:
+        for segment in list(_segments.values()):
+            if segment.contains(address, array.nbytes):
+                return segment, address - segment.address
+    return None
+
+
+def share_segment(segment: SharedMemorySegment) -> Tuple:
+    r"""Returns a picklable handle for `open_segment` in another process.
+    Must be called while pickling with `multiprocessing`'s ForkingPickler.
+    """
+    if segment.strategy == "file_descriptor":
+        return (
+            "file_descriptor",
+            multiprocessing.reduction.DupFd(segment.fd),
+            segment.size,
+        )
+    # The reference of the receiver is taken by the sender, so the segment
+    # survives even if the sender releases it before it is received
+    _incref(segment.filename)
+    return ("file_system", segment.filename, segment.size)
+
+
+def open_segment(handle: Tuple) -> mmap.mmap:
+    r"""Maps the segment of a handle returned by `share_segment` and takes
+    over its reference.
+    """
+    (strategy, fd_or_filename, size) = handle
+    if strategy == "file_descriptor":
+        fd = fd_or_filename.detach()
+        try:
+            mm = mmap.mmap(fd, size)
+        except:
+            os.close(fd)
+            raise
+        _add_segment(SharedMemorySegment(strategy, mm, fd=fd))
+        return mm
+    fd = os.open(fd_or_filename, os.O_RDWR)
+    try:
+        mm = mmap.mmap(fd, size)
+    finally:
+        os.close(fd)
+    _add_segment(SharedMemorySegment(strategy, mm, filename=fd_or_filename))
+    return mm
@@ -15,3 +15,4 @@ limitations under the License.
 """
 from .graph import Graph
 from .block import Block
+from .plan_cache import round_up_to_multiple
@@ -0,0 +1,212 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""
+Tools for the on-disk cache of compiled nn.Graph plans, see
+``GraphConfig.enable_plan_cache``.
+
+Each entry of a cache directory is a ``<key_hash>.plan`` file holding the plan
+and the key it was compiled for, and a ``<key_hash>.meta`` text file
+summarizing it. Usage::
+
+    python3 -m oneflow.nn.graph.compiled_plan_cache list [--cache_dir DIR]
+    python3 -m oneflow.nn.graph.compiled_plan_cache prune [--cache_dir DIR]
+        [--max_size_mb N] [--max_age_days N] [--all] [--dry_run]
+"""
+import argparse
+import os
+import time
+from typing import Dict, List, Optional
+
+from google.protobuf import text_format
+
+import oneflow.core.job.plan_cache_pb2 as plan_cache_pb
+
+PLAN_SUFFIX = ".plan"
+META_SUFFIX = ".meta"
+
+
+def default_plan_cache_dir() -> str:
+    return os.getenv(
+        "ONEFLOW_PLAN_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "oneflow", "plans"),
+    )
+
+
+def list_plan_cache(cache_dir: Optional[str] = None) -> List[Dict]:
+    r"""Returns the summaries of the complete entries in `cache_dir`, the
+    least recently used first.
+    """
+    cache_dir = cache_dir if cache_dir is not None else default_plan_cache_dir()
+    if not os.path.isdir(cache_dir):
+        return []
+    entries = []
+    for file_name in os.listdir(cache_dir):
+        if not file_name.endswith(META_SUFFIX):
+            continue
+        key_hash = file_name[: -len(META_SUFFIX)]
+        plan_path = os.path.join(cache_dir, key_hash + PLAN_SUFFIX)
+        meta = plan_cache_pb.PlanCacheMeta()
+        try:
+            with open(os.path.join(cache_dir, file_name), "r") as f:
+                text_format.Parse(f.read(), meta)
+            last_used = os.path.getmtime(plan_path)
+        except (OSError, text_format.ParseError):
+            continue
+        entries.append(
+            {
+                "key_hash": key_hash,
+                "job_name": meta.job_name,
+                "oneflow_version": meta.oneflow_version,
+                "world_size": meta.world_size,
+                "plan_size": meta.plan_size,
+                "compile_time": meta.compile_time,
+                "create_time": meta.create_time,
+                "last_used": last_used,
+            }
+        )
+    return sorted(entries, key=lambda entry: entry["last_used"])
+
+
+def _remove_entry(cache_dir: str, key_hash: str) -> None:
+    # Remove the meta file first, so an entry is never listed without its plan
+    for suffix in (META_SUFFIX, PLAN_SUFFIX):
+        try:
+            os.remove(os.path.join(cache_dir, key_hash + suffix))
+        except FileNotFoundError:
+            pass
+
+
+def prune_plan_cache(
+    cache_dir: Optional[str] = None,
+    max_size: Optional[int] = None,
+    max_age: Optional[float] = None,
+    remove_all: bool = False,
+    dry_run: bool = False,
+) -> List[str]:
+    r"""Removes entries from `cache_dir` and returns their key hashes.
+
+    Entries unused for more than `max_age` seconds are removed, then the least
+    recently used entries until the plans take at most `max_size` bytes.
+    Incomplete entries left by crashed processes are always removed.
+
+    Args:
+        cache_dir (str, optional): the cache directory.
+        max_size (int, optional): the maximum total size of plans in bytes.
+        max_age (float, optional): the maximum time since an entry was last used in seconds.
+        remove_all (bool): remove every entry. Default: False.
+        dry_run (bool): only return the entries which would be removed. Default: False.
+    """
+    cache_dir = cache_dir if cache_dir is not None else default_plan_cache_dir()
+    entries = list_plan_cache(cache_dir)
+    removed = []
+    now = time.time()
+    total_size = sum(entry["plan_size"] for entry in entries)
+    for entry in entries:
+        if (
+            remove_all
+            or (max_age is not None and now - entry["last_used"] > max_age)
+            or (max_size is not None and total_size > max_size)
+        ):
+            removed.append(entry["key_hash"])
+            total_size -= entry["plan_size"]
+    if dry_run:
+        return removed
+    for key_hash in removed:
+        _remove_entry(cache_dir, key_hash)
+    if os.path.isdir(cache_dir):
+        listed = set(entry["key_hash"] for entry in entries)
+        for file_name in os.listdir(cache_dir):
+            (key_hash, suffix) = os.path.splitext(file_name)
+            if key_hash in listed and suffix in (PLAN_SUFFIX, META_SUFFIX):
+                continue
+            if suffix not in (PLAN_SUFFIX, META_SUFFIX) and ".tmp." not in file_name:
+                continue
+            # Leftovers of crashed processes: a plan without meta, a meta without
+            # plan or a temporary file. Recent ones may still be being written.
+            path = os.path.join(cache_dir, file_name)
+            try:
+                if now - os.path.getmtime(path) > 3600:
+                    os.remove(path)
+            except FileNotFoundError:
+                pass
+    return removed
+
+
+def _format_size(nbytes: int) -> str:
+    return f"{nbytes / (1 << 20):.1f}MB"
+
+
+def _format_time(seconds: float) -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(seconds))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python3 -m oneflow.nn.graph.compiled_plan_cache",
+        description="inspect and prune the compiled plan cache of nn.Graph",
+    )
+    parser.add_argument(
+        "--cache_dir", type=str, default=None, help="defaults to ONEFLOW_PLAN_CACHE_DIR"
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+    subparsers.add_parser("list", help="list cached plans")
+    prune_parser = subparsers.add_parser("prune", help="remove cached plans")
+    prune_parser.add_argument("--max_size_mb", type=float, default=None)
+    prune_parser.add_argument("--max_age_days", type=float, default=None)
+    prune_parser.add_argument("--all", default=False, action="store_true")
+    prune_parser.add_argument("--dry_run", default=False, action="store_true")
+    args = parser.parse_args(argv)
+
+    cache_dir = (
+        args.cache_dir if args.cache_dir is not None else default_plan_cache_dir()
+    )
+    if args.command == "list":
+        entries = list_plan_cache(cache_dir)
+        print(
+            f"{'key':<16} {'job':<24} {'world':>5} {'size':>10} {'compile':>8} "
+            f"{'last used':<19} version"
+        )
+        for entry in entries:
+            print(
+                f"{entry['key_hash']:<16} {entry['job_name']:<24} "
+                f"{entry['world_size']:>5} {_format_size(entry['plan_size']):>10} "
+                f"{entry['compile_time']:>7.1f}s {_format_time(entry['last_used']):<19} "
+                f"{entry['oneflow_version']}"
+            )
+        total_size = sum(entry["plan_size"] for entry in entries)
+        print(f"{len(entries)} plans, {_format_size(total_size)} in {cache_dir}")
+    else:
+        if not (
+            args.all or args.max_size_mb is not None or args.max_age_days is not None
+        ):
+            parser.error("prune needs one of --all, --max_size_mb and --max_age_days")
+        removed = prune_plan_cache(
+            cache_dir,
+            max_size=None
+            if args.max_size_mb is None
+            else int(args.max_size_mb * (1 << 20)),
+            max_age=None if args.max_age_days is None else args.max_age_days * 86400,
+            remove_all=args.all,
+            dry_run=args.dry_run,
+        )
+        for key_hash in removed:
+            print(("would remove " if args.dry_run else "removed ") + key_hash)
+        print(f"{len(removed)} plans {'to remove' if args.dry_run else 'removed'}")
+
+
+if __name__ == "__main__":
+    main()
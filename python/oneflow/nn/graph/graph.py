@@ -15,6 +15,7 @@ limitations under the License.
 """
 import os
 import time
+import weakref
 from collections import OrderedDict
 from functools import partial
 from typing import Dict, Optional, Union, List
@@ -33,6 +34,7 @@ from oneflow.framework.tensor_tuple_util import convert_to_tensor_tuple
 from oneflow.nn.graph.block import Block, BlockType, get_block_cls
 from oneflow.nn.graph.graph_config import GraphConfig
 from oneflow.nn.graph.optimizer import OptDict, VariableConfig
+from oneflow.nn.graph.plan_cache import PlanCache, io_signature, pad_to_shape
 from oneflow.nn.graph.util import add_indent, seq_to_func_return, sys_exc_error_msg
 from oneflow.nn.module import Module
 from oneflow.nn.optimizer.lr_scheduler import LrScheduler
@@ -115,6 +117,12 @@ class Graph(object):
         self._debug_max_v_level = 0
         self._outputs_buffer_size = 2
         self._cur_index_of_ouputs_buffer = 0
+        # outputs structure and leases of outputs buffers in zero-copy outputs mode
+        self._outputs_structure = None
+        self._outputs_buffer_lease_counts = None
+        self._outputs_buffer_lease_gens = None
+        # compiled plans per input signature when shape bucketing is enabled
+        self._plan_cache = None
 
         self._c_nn_graph = oneflow._oneflow_internal.nn.graph.CNNGraph(self._name)
         session = session_ctx.GetDefaultSession()
@@ -254,11 +262,64 @@ class Graph(object):
 
         Donot override this function.
         """
+        if self.config._max_cached_plans > 0:
+            return self._run_with_plan_cache(*args)
+
         if not self._is_compiled:
             self._compile(*args)
 
         return self._run(*args)
 
+    def plan_cache_stats(self):
+        r"""Returns the statistics of the plans cached when shape bucketing is
+        enabled with ``config.enable_shape_bucketing()``:
+
+        * ``num_plans``: the number of cached plans.
+        * ``num_hits``/``num_misses``: calls which found/compiled their plan.
+        * ``num_evictions``: plans released to keep at most ``max_cached_plans``.
+        * ``hit_rate``: ``num_hits`` over the number of calls.
+        * ``total_compile_time``: seconds spent to build and compile all plans.
+        * ``compile_time``: seconds spent to compile each cached plan, by input signature.
+        """
+        assert (
+            self.config._max_cached_plans > 0
+        ), "shape bucketing is not enabled, call config.enable_shape_bucketing() first."
+        if self._plan_cache is None:
+            return PlanCache(self.config._max_cached_plans).stats()
+        return self._plan_cache.stats()
+
+    def release_outputs(self, outputs):
+        r"""Returns the outputs of a call leased in zero-copy outputs mode,
+        see ``GraphConfig.enable_zero_copy_outputs()``. Releasing any output of
+        a call releases all outputs of that call, they must not be used after.
+
+        Args:
+            outputs: a tensor or a (nested) list or tuple of tensors returned by the graph.
+        """
+        if self._plan_cache is not None:
+            for plan in self._plan_cache.plans():
+                plan.release_outputs(outputs)
+            return
+        if self._outputs_structure is None:
+            return
+        released = []
+
+        def collect(item):
+            if isinstance(item, Tensor):
+                released.append(item)
+            elif isinstance(item, (list, tuple, TensorTuple)):
+                for sub_item in item:
+                    collect(sub_item)
+
+        collect(outputs)
+        for (idx, outputs_tensor_tuple) in enumerate(self._outputs_tensor_tuple_buffer):
+            if self._outputs_buffer_lease_counts[idx] == 0:
+                continue
+            if any(t is r for t in outputs_tensor_tuple for r in released):
+                self._outputs_buffer_lease_counts[idx] = 0
+                # Leases of the released tensors are stale from now on
+                self._outputs_buffer_lease_gens[idx] += 1
+
     @property
     def name(self):
         r"""Name auto-generated for this graph.
@@ -531,6 +592,8 @@ class Graph(object):
                 0, 0, self._shallow_repr() + " start building plan.",
             )
             compile_and_init_start = time.perf_counter()
+            if self.config._plan_cache_dir is not None:
+                self._c_nn_graph.set_plan_cache_dir(self.config._plan_cache_dir)
             self._c_nn_graph.complie_and_init_runtime()
             compile_and_init_end = time.perf_counter()
             self._print(
@@ -559,6 +622,8 @@ class Graph(object):
             raise
 
         self._is_compiled = True
+        if self.config._zero_copy_outputs:
+            self._init_outputs_leases()
         return eager_outputs
 
     def _build_graph(self, *args):
@@ -742,7 +807,101 @@ class Graph(object):
                     item, "graph_ouputs_buffer_" + str(b_idx) + "_" + str(i_idx)
                 )
 
+    def _init_outputs_leases(self):
+        # Outputs are leased by handing out the tensors of an outputs tensor tuple.
+        # The graph only keeps the structure of outputs, so that the tensors are
+        # freed and their leases expire when the caller drops them.
+        position = 0
+
+        def to_position(t):
+            nonlocal position
+            position += 1
+            return position - 1
+
+        structure = []
+        for item in self._eager_outputs:
+            if item is None:
+                structure.append(None)
+            elif isinstance(item, Tensor):
+                structure.append(to_position(item))
+            else:
+                structure.append((type(item), [to_position(t) for t in item]))
+        self._outputs_structure = structure
+        self._outputs_buffer_lease_counts = [0] * self._outputs_buffer_size
+        self._outputs_buffer_lease_gens = [0] * self._outputs_buffer_size
+        self._eager_outputs = None
+        self._eager_outputs_buffer = None
+
+    def _acquire_outputs_buffer(self):
+        for i in range(self._outputs_buffer_size):
+            idx = (self._cur_index_of_ouputs_buffer + i) % self._outputs_buffer_size
+            if self._outputs_buffer_lease_counts[idx] == 0:
+                self._cur_index_of_ouputs_buffer = (idx + 1) % self._outputs_buffer_size
+                return idx
+        raise RuntimeError(
+            f"All {self._outputs_buffer_size} outputs buffers of nn.Graph {self._name} "
+            "are leased. Drop or release_outputs() the outputs of previous calls, or "
+            "enlarge the pool with config.set_outputs_buffer_size()."
+        )
+
+    def _expire_output_lease(self, idx, gen):
+        if self._outputs_buffer_lease_gens[idx] == gen:
+            self._outputs_buffer_lease_counts[idx] -= 1
+
+    def _lease_outputs(self, idx):
+        outputs_tensor_tuple = self._outputs_tensor_tuple_buffer[idx]
+        gen = self._outputs_buffer_lease_gens[idx]
+
+        def lease(position):
+            tensor = outputs_tensor_tuple[position]
+            self._outputs_buffer_lease_counts[idx] += 1
+            weakref.finalize(tensor, self._expire_output_lease, idx, gen)
+            return tensor
+
+        outputs = []
+        for item in self._outputs_structure:
+            if item is None:
+                outputs.append(None)
+            elif isinstance(item, int):
+                outputs.append(lease(item))
+            else:
+                (seq_type, positions) = item
+                seq = seq_type()
+                for position in positions:
+                    seq.append(lease(position))
+                outputs.append(seq)
+        return outputs
+
+    def _run_with_leased_outputs(self, *args):
+        try:
+            flattened_eager_args = self._flatten_io("input", *args)
+            idx = self._acquire_outputs_buffer()
+            outputs_tensor_tuple = self._outputs_tensor_tuple_buffer[idx]
+            # The buffer may have been used by eager ops of its last lessee.
+            oneflow._oneflow_internal.nn.graph.SoftSyncNNGraphBuffers(
+                outputs_tensor_tuple, self._c_nn_graph
+            )
+            oneflow._oneflow_internal.nn.graph.RunLazyNNGraph(
+                convert_to_tensor_tuple(flattened_eager_args),
+                outputs_tensor_tuple,
+                self._state_tensor_tuple,
+                self._c_nn_graph,
+            )
+        except:
+            self._print(
+                2,
+                0,
+                "[ERROR]"
+                + self._shallow_repr()
+                + " run got error: "
+                + sys_exc_error_msg(),
+            )
+            raise
+        return seq_to_func_return(self._lease_outputs(idx))
+
     def _run(self, *args):
+        if self.config._zero_copy_outputs:
+            return self._run_with_leased_outputs(*args)
         try:
             flattened_eager_args = self._flatten_io("input", *args)
             outputs_tensor_tuple = self._outputs_tensor_tuple_buffer[
@@ -784,6 +943,74 @@ class Graph(object):
         )
         return seq_to_func_return(eager_outputs)
 
+    def _run_with_plan_cache(self, *args):
+        if self._plan_cache is None:
+            assert (
+                len(self._opts) == 0
+            ), "nn.Graph with optimizers doesn't support shape bucketing."
+            self._plan_cache = PlanCache(self.config._max_cached_plans)
+
+        bucketing_rule = self.config._bucketing_rule
+        if bucketing_rule is not None:
+            args = self._mapping_io(
+                "input",
+                lambda t: pad_to_shape(t, tuple(bucketing_rule(tuple(t.shape)))),
+                *args,
+            )
+        signature = io_signature(*args)
+        plan = self._plan_cache.get(signature)
+        if plan is None:
+            # Release evicted plans before compiling to bound the memory in use
+            for evicted in self._plan_cache.evict_for_new_plan():
+                evicted._release_plan()
+            plan = self._new_plan()
+            compile_start = time.perf_counter()
+            try:
+                plan._compile(*args)
+            except:
+                plan._release_plan()
+                raise
+            compile_time = time.perf_counter() - compile_start
+            self._print(
+                0,
+                0,
+                self._shallow_repr()
+                + " cached a new plan "
+                + plan._shallow_repr()
+                + " for inputs "
+                + str(signature)
+                + ", cost time: "
+                + str(round(compile_time, 2))
+                + "s.",
+            )
+            self._plan_cache.add(signature, plan, compile_time)
+        return plan._run(*args)
+
+    def _new_plan(self):
+        # A plan is a graph of the same class sharing modules, configs and
+        # user-defined attributes with this graph, without calling the
+        # __init__ of the subclass.
+        plan = object.__new__(type(self))
+        Graph.__init__(plan)
+        plan.config.proto.CopyFrom(self.config.proto)
+        plan.config._outputs_buffer_size = self.config._outputs_buffer_size
+        plan.config._zero_copy_outputs = self.config._zero_copy_outputs
+        plan.config._plan_cache_dir = self.config._plan_cache_dir
+        plan._debug = self._debug
+        plan._debug_min_s_level = self._debug_min_s_level
+        plan._debug_max_v_level = self._debug_max_v_level
+        for (name, value) in self.__dict__.items():
+            if name not in plan.__dict__:
+                object.__setattr__(plan, name, value)
+        for (name, block) in self._blocks.items():
+            plan._add_block(name, block.origin)
+        return plan
+
+    def _release_plan(self):
+        session = session_ctx.GetDefaultSession()
+        assert type(session) is MultiClientSession
+        session.RemoveCGraph(self._c_nn_graph)
+
     def _build_io(self, io_type, build_func, *args):
         assert io_type in ("input", "output")
         io_type_upper = io_type.upper()
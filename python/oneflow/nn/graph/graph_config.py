@@ -13,8 +13,10 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 """
+import os
 from collections import OrderedDict
 
+from oneflow.nn.graph.compiled_plan_cache import default_plan_cache_dir
 from oneflow.nn.graph.optimizer import OptDict
 import oneflow._oneflow_internal.oneflow.core.job.job_conf as job_conf_cfg
 
@@ -26,6 +28,10 @@ class GraphConfig(object):
     def __init__(self):
         super().__init__()
         self._outputs_buffer_size = 2
+        self._zero_copy_outputs = False
+        self._max_cached_plans = 0
+        self._bucketing_rule = None
+        self._plan_cache_dir = os.getenv("ONEFLOW_PLAN_CACHE_DIR")
         self.proto = job_conf_cfg.JobConfigProto()
         self._train(False)
 
@@ -50,11 +56,98 @@ class GraphConfig(object):
         
         The default outputs buffer size is 2.
 
+        With ``enable_zero_copy_outputs()``, it is the number of calls whose
+        outputs can be held by the caller at the same time.
+
         Args:
             value (int): graph ouputs buffer size.
         """
         self._outputs_buffer_size = value
 
+    def enable_zero_copy_outputs(self, mode: bool = True):
+        r"""If true, the graph returns its outputs buffer tensors themselves
+        instead of copies of them, which saves one allocation and one copy per
+        output per call.
+
+        The outputs of a call are leased to the caller: their buffer is not
+        written by later calls until the caller drops every reference to them
+        or calls ``nn.Graph.release_outputs()``. The graph has
+        ``set_outputs_buffer_size()`` buffers, a call raises an error if all
+        of them are leased.
+
+        .. code-block:: python
+
+            g.config.enable_zero_copy_outputs()
+            out = g(x)
+            result = out.numpy()
+            g.release_outputs(out)  # or del out
+
+        Args:
+            mode (bool, optional): whether to lease outputs buffers. Default is True.
+        """
+        assert type(mode) is bool
+        self._zero_copy_outputs = mode
+
+    def enable_shape_bucketing(
+        self, bucketing_rule=None, max_cached_plans: int = 8,
+    ):
+        r"""Compile and cache one plan per input signature (structure, shapes,
+        data types and devices of the inputs), so that the graph can be called
+        with inputs of different shapes.
+
+        A bucketing rule maps the shape of every input tensor to the shape of
+        its bucket, for example ``flow.nn.graph.round_up_to_multiple(64, dims=[1])``
+        to bucket sequence lengths. Inputs are zero-padded at the end of each
+        dimension to their bucket shape before running, so the outputs have the
+        shapes of the padded inputs. Without a rule, every distinct input shape
+        gets its own plan.
+
+        Plans share the parameters and buffers of the graph. When there are
+        more than `max_cached_plans` plans, the least recently used one is
+        released. Only graphs without optimizers are supported.
+
+        Hit rate and compile time statistics are returned by
+        ``nn.Graph.plan_cache_stats()``.
+
+        Args:
+            bucketing_rule (Callable, optional): maps an input shape tuple to a
+                bucket shape tuple. Default: None.
+            max_cached_plans (int): the maximum number of plans kept. Default: 8.
+        """
+        assert bucketing_rule is None or callable(bucketing_rule)
+        assert isinstance(max_cached_plans, int)
+        assert max_cached_plans >= 1
+        self._bucketing_rule = bucketing_rule
+        self._max_cached_plans = max_cached_plans
+
+    def enable_plan_cache(self, mode: bool = True, cache_dir: str = None):
+        r"""If true, the compiled execution plan of the graph is saved to
+        `cache_dir`, and later processes which build the same graph load it
+        instead of compiling it again.
+
+        Plans are looked up by the content of the graph job (including the
+        graph config), the session resource config, the world size and the
+        OneFlow version, so any change of them compiles a new plan. Use
+        ``python3 -m oneflow.nn.graph.compiled_plan_cache`` to inspect and
+        prune the cache.
+
+        The plan cache is enabled by default if the ``ONEFLOW_PLAN_CACHE_DIR``
+        environment variable is set.
+
+        Args:
+            mode (bool, optional): whether to use the plan cache. Default is True.
+            cache_dir (str, optional): the cache directory. Defaults to the
+                ``ONEFLOW_PLAN_CACHE_DIR`` environment variable or
+                ``~/.cache/oneflow/plans``.
+        """
+        assert type(mode) is bool
+        if mode:
+            self._plan_cache_dir = (
+                cache_dir if cache_dir is not None else default_plan_cache_dir()
+            )
+        else:
+            self._plan_cache_dir = None
+
     def enable_amp(self, mode: bool = True):
         """If true, then graph will use mixed precision mode, it means use both float16 and float32 during model training.
 
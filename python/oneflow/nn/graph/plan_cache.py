@@ -0,0 +1,151 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+from collections import OrderedDict
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import oneflow
+from oneflow.framework.tensor import Tensor, TensorTuple
+
+
+def round_up_to_multiple(
+    multiple: int, dims: Optional[Sequence[int]] = None
+) -> Callable[[Tuple[int, ...]], Tuple[int, ...]]:
+    r"""Returns a bucketing rule for ``GraphConfig.enable_shape_bucketing``
+    which rounds up the sizes of input dimensions to a multiple of `multiple`.
+
+    Args:
+        multiple (int): the bucket granularity.
+        dims (Sequence[int], optional): the dimensions to round up, negative
+            values count from the last dimension. Defaults to all dimensions.
+    """
+    assert multiple > 0, "multiple should be positive"
+
+    def rule(shape):
+        ndim = len(shape)
+        rounded_dims = (
+            range(ndim) if dims is None else [d + ndim if d < 0 else d for d in dims]
+        )
+        return tuple(
+            (s + multiple - 1) // multiple * multiple if i in rounded_dims else s
+            for (i, s) in enumerate(shape)
+        )
+
+    return rule
+
+
+def pad_to_shape(tensor: Tensor, shape: Tuple[int, ...]) -> Tensor:
+    r"""Returns `tensor` zero-padded at the end of every dimension to `shape`."""
+    if tuple(tensor.shape) == shape:
+        return tensor
+    assert tensor.is_local, "only local inputs can be padded to a bucket shape"
+    assert len(shape) == tensor.ndim and all(
+        s >= t for (s, t) in zip(shape, tensor.shape)
+    ), f"bucket shape {shape} is smaller than input shape {tuple(tensor.shape)}"
+    padded = oneflow.zeros(shape, dtype=tensor.dtype, device=tensor.device)
+    padded[tuple(slice(0, s) for s in tensor.shape)] = tensor
+    return padded
+
+
+def _tensor_signature(tensor: Tensor):
+    if tensor.is_consistent:
+        location = (str(tensor.placement), str(tensor.sbp))
+    else:
+        location = str(tensor.device)
+    return (tuple(tensor.shape), str(tensor.dtype), location)
+
+
+def io_signature(*args) -> Tuple:
+    r"""Returns a hashable key of the structure, shapes, data types and
+    devices (or placements and sbp) of graph inputs.
+    """
+    signature = []
+    for arg in args:
+        if arg is None:
+            signature.append(None)
+        elif isinstance(arg, Tensor):
+            signature.append(_tensor_signature(arg))
+        elif isinstance(arg, (TensorTuple, list)):
+            signature.append(
+                tuple(None if t is None else _tensor_signature(t) for t in arg)
+            )
+        else:
+            raise NotImplementedError(
+                "nn.Graph.build()'s input/output only support types: Tensor/list(Tensor)/None."
+            )
+    return tuple(signature)
+
+
+class PlanCache(object):
+    r"""A LRU cache of compiled plans keyed by input signature, with hit and
+    compile time statistics.
+    """
+
+    def __init__(self, max_plans: int):
+        assert max_plans > 0, "max_plans should be positive"
+        self.max_plans_ = max_plans
+        self.plans_ = OrderedDict()
+        self.compile_time_ = OrderedDict()
+        self.num_hits_ = 0
+        self.num_misses_ = 0
+        self.num_evictions_ = 0
+        self.total_compile_time_ = 0.0
+
+    def __len__(self):
+        return len(self.plans_)
+
+    def get(self, signature):
+        plan = self.plans_.get(signature)
+        if plan is None:
+            self.num_misses_ += 1
+            return None
+        self.num_hits_ += 1
+        self.plans_.move_to_end(signature)
+        return plan
+
+    def evict_for_new_plan(self) -> List:
+        r"""Removes and returns the least recently used plans to leave room for
+        a new one.
+        """
+        evicted = []
+        while len(self.plans_) >= self.max_plans_:
+            (signature, plan) = self.plans_.popitem(last=False)
+            del self.compile_time_[signature]
+            evicted.append(plan)
+            self.num_evictions_ += 1
+        return evicted
+
+    def add(self, signature, plan, compile_time: float) -> None:
+        assert signature not in self.plans_
+        assert len(self.plans_) < self.max_plans_
+        self.plans_[signature] = plan
+        self.compile_time_[signature] = compile_time
+        self.total_compile_time_ += compile_time
+
+    def plans(self) -> List:
+        r"""Returns the cached plans, least recently used first."""
+        return list(self.plans_.values())
+
+    def stats(self):
+        num_calls = self.num_hits_ + self.num_misses_
+        return {
+            "num_plans": len(self.plans_),
+            "num_hits": self.num_hits_,
+            "num_misses": self.num_misses_,
+            "num_evictions": self.num_evictions_,
+            "hit_rate": self.num_hits_ / num_calls if num_calls > 0 else 0.0,
+            "total_compile_time": self.total_compile_time_,
+            "compile_time": dict(self.compile_time_),
+        }
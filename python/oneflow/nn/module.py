@@ -62,6 +62,7 @@ class Module(object):
         self._state_dict_hooks = OrderedDict()
         self._load_state_dict_pre_hooks = OrderedDict()
         self._modules = OrderedDict()
+        self._flat_buffers = []
 
     @property
     def consistent(self):
@@ -336,6 +337,8 @@ class Module(object):
         unexpected_keys,
         error_msgs,
     ):
+        from oneflow.framework.check_point_v2 import LazyLoadedTensor
+
         for hook in self._load_state_dict_pre_hooks.values():
             hook(
                 state_dict,
@@ -368,7 +371,11 @@ class Module(object):
                     continue
                 try:
                     with flow.no_grad():
-                        param.copy_(input_param)
+                        if isinstance(input_param, LazyLoadedTensor):
+                            # read the data straight into the parameter
+                            input_param.copy_to(param)
+                        else:
+                            param.copy_(input_param)
                 except Exception as ex:
                     error_msgs.append(
                         'While copying the parameter named "{}", whose dimensions in the model are {} and whose dimensions in the checkpoint are {}, an exception occurred : {}.'.format(
@@ -463,6 +470,31 @@ class Module(object):
     def register_forward_hook(self, hook: Callable[..., None]) -> None:
         self._forward_hooks[len(self._forward_hooks)] = hook
 
+    def contiguous_parameters(self: T) -> T:
+        r"""Moves the data and the gradients of the local parameters requiring
+        grad into contiguous buffers, one per device and dtype. The parameters
+        and their grads become views of the buffers, and gradients are
+        accumulated into them in place.
+
+        Optimizers, :func:`oneflow.nn.utils.clip_grad_norm_` and
+        :func:`oneflow.nn.parallel.DistributedDataParallel` detect the buffers
+        and process each of them with a single op instead of one op per
+        parameter. The grads are zeroed instead of set to None by
+        ``zero_grad`` to keep them in the buffers.
+
+        It should be called after the module is moved to its device and
+        before the optimizer is created. Moving the module again (e.g. by
+        :meth:`to`) gives up the buffers.
+        """
+        from oneflow.nn.utils.flat_buffer import FlatParameterBuffer
+
+        buckets = OrderedDict()
+        for param in self.parameters():
+            if param.is_local and param.requires_grad:
+                buckets.setdefault((str(param.device), param.dtype), []).append(param)
+        self._flat_buffers = [FlatParameterBuffer(b) for b in buckets.values()]
+        return self
+
     def _apply(self, fn, applied_dict=None):
         # A dict to store tensors that has already been applied.
         # There is no need to apply multiple times on a same tensor.
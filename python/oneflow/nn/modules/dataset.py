@@ -53,11 +53,24 @@ class OFRecordReader(Module):
         placement: flow.placement = None,
         sbp: Union[flow.sbp.sbp, List[flow.sbp.sbp]] = None,
         name: Optional[str] = None,
+        num_loader_threads: int = 1,
+        prefetch_depth: int = 4,
+        ordered: bool = True,
+        use_index: bool = False,
+        skip_records: int = 0,
     ):
         super().__init__()
 
         if name is not None:
             print("WARNING: name has been deprecated and has NO effect.\n")
+        if num_loader_threads < 1:
+            raise ValueError(f"invalid num_loader_threads: {num_loader_threads}")
+        if prefetch_depth < 1:
+            raise ValueError(f"invalid prefetch_depth: {prefetch_depth}")
+        if skip_records < 0:
+            raise ValueError(f"invalid skip_records: {skip_records}")
+        if skip_records > 0 and not use_index:
+            raise ValueError("skip_records requires use_index")
         self.ofrecord_dir = ofrecord_dir
         self.batch_size = batch_size
         self.data_part_num = data_part_num
@@ -66,6 +79,11 @@ class OFRecordReader(Module):
         self.random_shuffle = random_shuffle
         self.shuffle_buffer_size = shuffle_buffer_size
         self.shuffle_after_epoch = shuffle_after_epoch
+        self.num_loader_threads = num_loader_threads
+        self.prefetch_depth = prefetch_depth
+        self.ordered = ordered
+        self.use_index = use_index
+        self.skip_records = skip_records
 
         self.placement = placement
         if placement is None:
@@ -102,6 +120,11 @@ class OFRecordReader(Module):
                 random_shuffle=self.random_shuffle,
                 shuffle_after_epoch=self.shuffle_after_epoch,
                 seed=self.seed,
+                num_loader_threads=self.num_loader_threads,
+                prefetch_depth=self.prefetch_depth,
+                ordered=self.ordered,
+                use_index=self.use_index,
+                skip_records=self.skip_records,
                 sbp=self.sbp,
                 placement=self.placement,
             )
@@ -117,6 +140,11 @@ class OFRecordReader(Module):
                 random_shuffle=self.random_shuffle,
                 shuffle_after_epoch=self.shuffle_after_epoch,
                 seed=self.seed,
+                num_loader_threads=self.num_loader_threads,
+                prefetch_depth=self.prefetch_depth,
+                ordered=self.ordered,
+                use_index=self.use_index,
+                skip_records=self.skip_records,
                 device=self.device,
             )
         return res
@@ -801,8 +829,15 @@ class COCOReader(Module):
         device: Union[flow.device, str] = None,
         placement: flow.placement = None,
         sbp: Union[flow.sbp.sbp, List[flow.sbp.sbp]] = None,
+        num_loader_threads: int = 1,
+        prefetch_depth: int = 4,
+        ordered: bool = True,
     ):
         super().__init__()
+        if num_loader_threads < 1:
+            raise ValueError(f"invalid num_loader_threads: {num_loader_threads}")
+        if prefetch_depth < 1:
+            raise ValueError(f"invalid prefetch_depth: {prefetch_depth}")
         self.annotation_file = annotation_file
         self.image_dir = image_dir
         self.batch_size = batch_size
@@ -810,6 +845,9 @@ class COCOReader(Module):
         self.group_by_aspect_ratio = group_by_aspect_ratio
         self.remove_images_without_annotations = remove_images_without_annotations
         self.stride_partition = stride_partition
+        self.num_loader_threads = num_loader_threads
+        self.prefetch_depth = prefetch_depth
+        self.ordered = ordered
         if random_seed is None:
             random_seed = random.randrange(sys.maxsize)
         self.random_seed = random_seed
@@ -864,6 +902,9 @@ class COCOReader(Module):
                 group_by_ratio=self.group_by_aspect_ratio,
                 remove_images_without_annotations=self.remove_images_without_annotations,
                 stride_partition=self.stride_partition,
+                num_loader_threads=self.num_loader_threads,
+                prefetch_depth=self.prefetch_depth,
+                ordered=self.ordered,
                 device=self.device,
             )
         else:
@@ -879,6 +920,9 @@ class COCOReader(Module):
                 group_by_ratio=self.group_by_aspect_ratio,
                 remove_images_without_annotations=self.remove_images_without_annotations,
                 stride_partition=self.stride_partition,
+                num_loader_threads=self.num_loader_threads,
+                prefetch_depth=self.prefetch_depth,
+                ordered=self.ordered,
                 placement=self.placement,
                 sbp=self.sbp,
             )
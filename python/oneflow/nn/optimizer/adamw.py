@@ -57,6 +57,13 @@ class AdamW(Optimizer):
         weight_decay (float, optional): weight decay (L2 penalty) (In the equation is λ, default: 0)
         amsgrad (bool, optional): whether to use the AMSGrad variant of this algorithm. (default: False) 
         do_bias_correction (bool, optional): Whether do bias correction (default: True)
+        foreach (bool, optional): whether to update the local parameters of the
+            same device and dtype together with multi-tensor ops instead of one
+            by one, which saves the per-parameter dispatch overhead of models with
+            many small parameters (default: True)
+        flatten_state (bool, optional): whether to allocate the states of the
+            parameters updated together as views of one contiguous buffer. Only
+            takes effect when ``foreach`` is True (default: False)
 
     .. _Adam\\: A Method for Stochastic Optimization:
         https://arxiv.org/abs/1412.6980
@@ -119,6 +126,8 @@ class AdamW(Optimizer):
         weight_decay: float = 0,
         amsgrad: bool = False,
         do_bias_correction: bool = True,
+        foreach: bool = True,
+        flatten_state: bool = False,
     ):
         assert lr >= 0.0, f"Invalid learning rate: {lr}"
         assert eps >= 0.0, f"Invalid epsilon value: {eps}"
@@ -139,6 +148,8 @@ class AdamW(Optimizer):
         options["do_bias_correction"] = do_bias_correction
         options["amsgrad"] = amsgrad
         super().__init__(parameters, options)
+        self._foreach = foreach
+        self._flatten_state = flatten_state
 
         for param_group in self.param_groups:
             for param in param_group.parameters:
@@ -187,16 +198,21 @@ class AdamW(Optimizer):
                     "amsgrad": param_group["amsgrad"],
                 }
 
-                for param in param_group.parameters:
-                    if param.grad is None:
-                        continue
-
-                    if "exp_avg" not in self._state[param]:
-                        self._state[param]["exp_avg"] = flow.zeros_like(param)
-                    if "exp_avg_sq" not in self._state[param]:
-                        self._state[param]["exp_avg_sq"] = flow.zeros_like(param)
-                    if "max_exp_avg_sq" not in self._state[param]:
-                        self._state[param]["max_exp_avg_sq"] = flow.zeros_like(param)
+                params = [p for p in param_group.parameters if p.grad is not None]
+                if self._foreach:
+                    params = self._multi_tensor_update(
+                        params,
+                        "multi_tensor_adam_update",
+                        ["exp_avg", "exp_avg_sq", "max_exp_avg_sq"],
+                        ["m", "v", "max_v"],
+                        flow._C.dispatch_adam_update,
+                        flatten_state=self._flatten_state,
+                        **kwargs,
+                    )
+                for param in params:
+                    self._init_state(
+                        [param], ["exp_avg", "exp_avg_sq", "max_exp_avg_sq"]
+                    )
                     m_tensor = self._state[param]["exp_avg"]
                     v_tensor = self._state[param]["exp_avg_sq"]
                     max_v_tensor = self._state[param]["max_exp_avg_sq"]
@@ -19,10 +19,12 @@ from copy import deepcopy
 from itertools import chain
 from typing import Any, Callable, Dict, Union
 
+import oneflow as flow
 from oneflow.framework.tensor import Tensor
 from oneflow.nn.graph.block import TensorBlock
 from oneflow.nn.parameter import Parameter
 from oneflow.nn.utils.clip_grad import clip_grad_norm_
+from oneflow.nn.utils.flat_buffer import flat_buffer_of, split_flat_buffers
 
 
 class ParamGroup(object):
@@ -75,12 +77,18 @@ class ParamGroup(object):
         return self._parameters
 
 
+# The maximum number of parameters updated by a single multi-tensor op
+MULTI_TENSOR_CHUNK_SIZE = 256
+
+
 class Optimizer(object):
     def __init__(self, parameters, options):
         self.param_groups = list()
         self._default_options = options
         self._state = dict()
         self._state["step"] = 0
+        self._multi_tensor_ops = dict()
+        self._flat_states = dict()
 
         self._parse_input_parameters(parameters)
 
@@ -244,11 +252,17 @@ class Optimizer(object):
             3. Optimizers have a different behavior if the gradient is 0 or None
             (in one case it does the step with a gradient of 0 and in the other
             it skips the step altogether).
+
+        The grads in the flat buffers of
+        :meth:`oneflow.nn.Module.contiguous_parameters` are always zeroed.
         """
         for param_group in self.param_groups:
-            for param in param_group.parameters:
+            (buffers, params) = split_flat_buffers(param_group.parameters)
+            for buffer in buffers:
+                buffer.zero_grad()
+            for param in params:
                 if param.grad is not None:
-                    if set_to_none:
+                    if set_to_none and flat_buffer_of(param) is None:
                         param.grad = None
                     else:
                         param.grad.zeros_()
@@ -281,6 +295,128 @@ class Optimizer(object):
                 f"params argument given to the optimizer should be an iterable of Tensors or dicts, but got {type(parameters)}"
             )
 
+    def _init_state(self, params, state_names, flatten: bool = False):
+        r"""Creates the zero-initialized `state_names` states of `params` that
+        don't have them yet.
+
+        If `flatten` is True, the new states of the same name are views of one
+        contiguous buffer, so they are allocated at once and updated in memory
+        order. `params` must be local tensors of the same device and dtype then.
+        """
+        for state_name in state_names:
+            new_params = [p for p in params if state_name not in self._state[p]]
+            if len(new_params) == 0:
+                continue
+            if not flatten or len(new_params) == 1:
+                for p in new_params:
+                    self._state[p][state_name] = flow.zeros_like(p)
+                continue
+            buffer = flow.zeros(
+                sum(p.numel() for p in new_params),
+                dtype=new_params[0].dtype,
+                device=new_params[0].device,
+            )
+            offset = 0
+            for p in new_params:
+                self._state[p][state_name] = flow._C.buffer_view(
+                    buffer, p.shape, offset
+                )
+                offset += p.numel()
+
+    def _flat_state(self, buffer, state_name):
+        r"""Returns the state `state_name` of the parameters of a flat buffer
+        as one contiguous tensor. The states of the parameters are views of it,
+        and it's rebuilt from them if they are replaced (e.g. by
+        `load_state_dict`).
+        """
+        key = (id(buffer), state_name)
+        entry = self._flat_states.get(key)
+        if entry is not None:
+            (cached_buffer, state, views) = entry
+            if cached_buffer is buffer and all(
+                self._state[p].get(state_name) is view
+                for (p, view) in zip(buffer.params, views)
+            ):
+                return state
+        with flow.no_grad():
+            state = flow.cat(
+                [
+                    self._state[p][state_name].reshape(-1)
+                    if state_name in self._state[p]
+                    else flow.zeros_like(p).reshape(-1)
+                    for p in buffer.params
+                ]
+            )
+        views = []
+        for (p, offset) in zip(buffer.params, buffer.offsets):
+            view = flow._C.buffer_view(state, p.shape, offset)
+            self._state[p][state_name] = view
+            views.append(view)
+        self._flat_states[key] = (buffer, state, views)
+        return state
+
+    def _multi_tensor_op(self, op_type_name, state_inputs, num):
+        key = (op_type_name, tuple(state_inputs), num)
+        op = self._multi_tensor_ops.get(key)
+        if op is None:
+            builder = (
+                flow.stateful_op(op_type_name)
+                .Input("model", num)
+                .Input("model_diff", num)
+            )
+            for state_input in state_inputs:
+                builder = builder.Input(state_input, num)
+            op = builder.Build()
+            self._multi_tensor_ops[key] = op
+        return op
+
+    def _multi_tensor_update(
+        self,
+        params,
+        op_type_name,
+        state_names,
+        state_inputs,
+        dispatch,
+        flatten_state: bool = False,
+        **kwargs,
+    ):
+        r"""Updates the local tensors of `params` with multi-tensor ops, each of
+        which updates up to ``MULTI_TENSOR_CHUNK_SIZE`` parameters of the same
+        device and dtype in one dispatch. The states `state_names` of the
+        parameters are fed to the inputs `state_inputs` of the op.
+
+        Returns the parameters that are not updated (consistent tensors), which
+        should be updated one by one.
+
+        The flat buffers of :meth:`oneflow.nn.Module.contiguous_parameters`
+        all parameters of which are in `params` are updated as a whole.
+        """
+        (buffers, params) = split_flat_buffers(params)
+        for buffer in buffers:
+            inputs = [buffer.data, buffer.grad]
+            inputs.extend(self._flat_state(buffer, name) for name in state_names)
+            op = self._multi_tensor_op(op_type_name, state_inputs, 1)
+            dispatch(op, tuple(inputs), **kwargs)
+        buckets = collections.OrderedDict()
+        rest = []
+        for p in params:
+            if not p.is_local:
+                rest.append(p)
+                continue
+            key = (str(p.device), p.dtype, p.grad.dtype)
+            buckets.setdefault(key, []).append(p)
+        for bucket in buckets.values():
+            self._init_state(bucket, state_names, flatten_state)
+            for start in range(0, len(bucket), MULTI_TENSOR_CHUNK_SIZE):
+                chunk = bucket[start : start + MULTI_TENSOR_CHUNK_SIZE]
+                inputs = list(chunk)
+                inputs.extend(p.grad for p in chunk)
+                for state_name in state_names:
+                    inputs.extend(self._state[p][state_name] for p in chunk)
+                op = self._multi_tensor_op(op_type_name, state_inputs, len(chunk))
+                dispatch(op, tuple(inputs), **kwargs)
+        return rest
+
     def _generate_grad_clip_conf_for_optim_conf(self, param_group, optimizer_conf):
         if param_group._enable_clip_grad:
             if (
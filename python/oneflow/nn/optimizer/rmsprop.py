@@ -79,6 +79,13 @@ class RMSprop(Optimizer):
         centered (bool, optional) : if ``True``, compute the centered RMSProp,
             the gradient is normalized by an estimation of its variance
         weight_decay (float, optional): weight decay (L2 penalty) (default: 0)
+        foreach (bool, optional): whether to update the local parameters of the
+            same device and dtype together with multi-tensor ops instead of one
+            by one, which saves the per-parameter dispatch overhead of models with
+            many small parameters (default: True)
+        flatten_state (bool, optional): whether to allocate the states of the
+            parameters updated together as views of one contiguous buffer. Only
+            takes effect when ``foreach`` is True (default: False)
 
     For example: 
 
@@ -135,6 +142,8 @@ class RMSprop(Optimizer):
         weight_decay: float = 0,
         momentum: float = 0.0,
         centered: bool = False,
+        foreach: bool = True,
+        flatten_state: bool = False,
     ):
         assert lr >= 0.0, f"Invalid learning rate: {lr}"
         assert alpha >= 0.0, f"Invalid alpha value: {alpha}"
@@ -148,6 +157,8 @@ class RMSprop(Optimizer):
         options["weight_decay"] = weight_decay
         options["centered"] = centered
         super().__init__(parameters, options)
+        self._foreach = foreach
+        self._flatten_state = flatten_state
 
         for param_group in self.param_groups:
             for param in param_group.parameters:
@@ -188,17 +199,34 @@ class RMSprop(Optimizer):
                     "decay_rate": param_group["alpha"],
                     "l2": param_group["weight_decay"],
                 }
-                for param in param_group.parameters:
-                    if param.grad is None:
-                        continue
-
-                    if "square_avg" not in self._state[param]:
-                        self._state[param]["square_avg"] = flow.zeros_like(param)
+                params = [p for p in param_group.parameters if p.grad is not None]
+                if self._foreach and param_group["centered"]:
+                    params = self._multi_tensor_update(
+                        params,
+                        "multi_tensor_rmsprop_update",
+                        ["square_avg", "grad_avg"],
+                        ["mean_square", "mean_gradient"],
+                        flow._C.dispatch_rmsprop_update,
+                        flatten_state=self._flatten_state,
+                        centered=True,
+                        **kwargs,
+                    )
+                elif self._foreach:
+                    params = self._multi_tensor_update(
+                        params,
+                        "multi_tensor_rmsprop_update",
+                        ["square_avg"],
+                        ["mean_square"],
+                        flow._C.dispatch_rmsprop_update,
+                        flatten_state=self._flatten_state,
+                        **kwargs,
+                    )
+                for param in params:
+                    self._init_state([param], ["square_avg"])
                     ms_tensor = self._state[param]["square_avg"]
 
                     if param_group["centered"]:
-                        if "grad_avg" not in self._state[param]:
-                            self._state[param]["grad_avg"] = flow.zeros_like(param)
+                        self._init_state([param], ["grad_avg"])
                         mg_tensor = self._state[param]["grad_avg"]
                         flow._C.dispatch_rmsprop_update(
                             self._centered_rmsprop,
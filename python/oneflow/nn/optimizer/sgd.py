@@ -48,6 +48,13 @@ class SGD(Optimizer):
         lr (float, optional): learning rate (default: 1e-3)
         momentum (float, optional): Momentum factor (default: 0.0)
         weight_decay (float, optional): weight decay (L2 penalty) (default: 0.0)
+        foreach (bool, optional): whether to update the local parameters of the
+            same device and dtype together with multi-tensor ops instead of one
+            by one, which saves the per-parameter dispatch overhead of models with
+            many small parameters (default: True)
+        flatten_state (bool, optional): whether to allocate the states of the
+            parameters updated together as views of one contiguous buffer. Only
+            takes effect when ``foreach`` is True (default: False)
 
     For example: 
 
@@ -101,6 +108,8 @@ class SGD(Optimizer):
         lr: float = 0.001,
         momentum: float = 0.0,
         weight_decay: float = 0.0,
+        foreach: bool = True,
+        flatten_state: bool = False,
     ):
         assert lr >= 0.0, f"Invalid learning rate: {lr}"
         assert momentum >= 0.0, f"Invalid momentum: {momentum}"
@@ -110,6 +119,8 @@ class SGD(Optimizer):
         options["momentum"] = momentum
         options["weight_decay"] = weight_decay
         super().__init__(parameters, options)
+        self._foreach = foreach
+        self._flatten_state = flatten_state
 
         for param_group in self.param_groups:
             for param in param_group.parameters:
@@ -135,16 +146,36 @@ class SGD(Optimizer):
             for param_group in self.param_groups:
                 lr = param_group["lr"]
                 l2 = param_group["weight_decay"]
-                for param in param_group.parameters:
-                    if param.grad is None:
-                        continue
+                params = [p for p in param_group.parameters if p.grad is not None]
+                if self._foreach and param_group["momentum"] == 0.0:
+                    params = self._multi_tensor_update(
+                        params,
+                        "multi_tensor_sgd_update",
+                        [],
+                        [],
+                        flow._C.dispatch_sgd_update,
+                        learning_rate=lr,
+                        l2=l2,
+                    )
+                elif self._foreach:
+                    params = self._multi_tensor_update(
+                        params,
+                        "multi_tensor_momentum_update",
+                        ["momentum_buf"],
+                        ["momentum"],
+                        flow._C.dispatch_momentum_update,
+                        flatten_state=self._flatten_state,
+                        learning_rate=lr,
+                        l2=l2,
+                        beta=param_group["momentum"],
+                    )
+                for param in params:
                     if param_group["momentum"] == 0.0:
                         flow._C.dispatch_sgd_update(
                             self._sgd, (param, param.grad), learning_rate=lr, l2=l2
                         )
                     else:
-                        if "momentum_buf" not in self._state[param]:
-                            self._state[param]["momentum_buf"] = flow.zeros_like(param)
+                        self._init_state([param], ["momentum_buf"])
                         momentum_buf = self._state[param]["momentum_buf"]
                         beta = param_group["momentum"]
                         flow._C.dispatch_momentum_update(
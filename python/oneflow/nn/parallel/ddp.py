@@ -13,56 +13,171 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 """
-from collections import OrderedDict
+from typing import List, Optional
 
 import oneflow as flow
 from oneflow.framework.tensor_tuple_util import convert_to_tensor_tuple
+from oneflow.nn.utils.flat_buffer import (
+    FlatParameterBuffer,
+    flat_buffer_of,
+    split_flat_buffers,
+)
+
+DEFAULT_BUCKET_CAP_MB = 25
+
+
+class _Bucket(object):
+    r"""Parameters whose grads are all-reduced by one collective once all of
+    them are ready. The grads are either gathered into a temporary flat tensor,
+    or already in the flat buffer of ``Module.contiguous_parameters()``.
+    """
+
+    def __init__(self, params, flat_buffer: Optional[FlatParameterBuffer] = None):
+        self.params = params
+        self.flat_buffer = flat_buffer
+        self.num_ready = 0
+        self.reduced = False
+
+    def is_ready(self) -> bool:
+        return self.num_ready == len(self.params)
+
+    def allreduce(self, param, grad, world_size):
+        r"""All-reduces the grads of the bucket. `grad` is the grad of `param`
+        which is being computed (not accumulated yet), and the grad to
+        accumulate into `param` is returned if `param` is in the bucket.
+        """
+        if self.flat_buffer is not None:
+            ret = None
+            if any(p is param for p in self.params):
+                # Accumulated here, so that the whole buffer is all-reduced
+                param.grad.add_(grad)
+                ret = flow.zeros_like(grad)
+            buffer = self.flat_buffer.grad
+            buffer.copy_(flow._C.local_all_reduce(buffer) / world_size)
+            return ret
+        grads = [grad if p is param else p.grad for p in self.params]
+        if len(grads) == 1:
+            flat_grad = grads[0].reshape(-1)
+        else:
+            flat_grad = flow.cat([g.reshape(-1) for g in grads])
+        reduced = flow._C.local_all_reduce(flat_grad / world_size)
+        # The grads become views of the reduced tensor, nothing is copied back
+        ret = None
+        offset = 0
+        for (p, g) in zip(self.params, grads):
+            view = flow._C.buffer_view(reduced, g.shape, offset)
+            offset += g.numel()
+            if p is param:
+                ret = view
+            else:
+                p.grad = view
+        return ret
 
 
-def allreduce_fn(ddp_state_for_reversed_params, param):
+def _make_buckets(params, flat_buffers, bucket_cap_mb: float) -> List[_Bucket]:
+    # Grads are roughly ready in the reversed order of the parameters
+    bucket_cap_bytes = int(bucket_cap_mb * 1024 * 1024)
+    buckets = []
+    flat_buffers = set(id(b) for b in flat_buffers)
+    placed_flat_buffers = set()
+    cur_params = []
+    cur_bytes = 0
+    for param in reversed(params):
+        flat_buffer = flat_buffer_of(param)
+        if flat_buffer is not None and id(flat_buffer) in flat_buffers:
+            if id(flat_buffer) not in placed_flat_buffers:
+                placed_flat_buffers.add(id(flat_buffer))
+                buckets.append(_Bucket(flat_buffer.params, flat_buffer))
+            continue
+        nbytes = param.numel() * param.element_size()
+        if len(cur_params) > 0 and (
+            cur_bytes + nbytes > bucket_cap_bytes
+            or param.device != cur_params[0].device
+            or param.dtype != cur_params[0].dtype
+        ):
+            buckets.append(_Bucket(cur_params))
+            cur_params = []
+            cur_bytes = 0
+        cur_params.append(param)
+        cur_bytes += nbytes
+    if len(cur_params) > 0:
+        buckets.append(_Bucket(cur_params))
+    return buckets
+
+
+def allreduce_fn(ddp_buckets, bucket, param, world_size):
     def allreduce(grad):
-        ddp_state_for_reversed_params[param][0] = True
+        bucket.num_ready += 1
         ret = None
-        for cur_param, (ready, deleted) in ddp_state_for_reversed_params.items():
-            if deleted:
+        # Buckets are all-reduced in the same order on all ranks, no matter
+        # in which order their grads are ready
+        for cur_bucket in ddp_buckets:
+            if cur_bucket.reduced:
                 continue
-            if ready:
-                ddp_state_for_reversed_params[cur_param][1] = True
-                if cur_param is param:
-                    ret = flow._C.local_all_reduce(grad)
-                else:
-                    cur_param.grad = flow._C.local_all_reduce(cur_param.grad)
-            else:
+            if not cur_bucket.is_ready():
                 break
+            cur_bucket.reduced = True
+            cur_ret = cur_bucket.allreduce(param, grad, world_size)
+            if cur_ret is not None:
+                ret = cur_ret
         return ret
 
     return allreduce
 
 
 def DistributedDataParallel(
-    module: "flow.nn.Module", *, broadcast_buffers: bool = True
+    module: "flow.nn.Module",
+    *,
+    broadcast_buffers: bool = True,
+    bucket_cap_mb: float = DEFAULT_BUCKET_CAP_MB,
 ):
+    r"""Makes the grads of the parameters of `module` averaged over all ranks
+    in backward.
+
+    Grads are all-reduced in buckets of about `bucket_cap_mb` MB. A bucket is
+    gathered into one tensor and all-reduced as soon as all grads in it are
+    ready, while backward goes on computing the grads of other buckets. The
+    flat buffers of :meth:`oneflow.nn.Module.contiguous_parameters` are
+    all-reduced in place as a whole.
+
+    Args:
+        module (oneflow.nn.Module): The module to train.
+        broadcast_buffers (bool, optional): Broadcasts the buffers of `module`
+            from rank 0 before each forward. Default: True.
+        bucket_cap_mb (float, optional): The maximum size of a bucket in MB.
+            A parameter larger than it is all-reduced alone, 0 all-reduces
+            each parameter alone. Default: 25.
+    """
     world_size = flow.env.get_world_size()
+    # The parameters in the flat buffers of `module.contiguous_parameters()`
+    # are broadcast buffer by buffer
+    (flat_buffers, _) = split_flat_buffers(module.parameters())
+    flat_params = set(id(p) for b in flat_buffers for p in b.params)
     with flow.no_grad():
+        for buffer in flat_buffers:
+            flow._C.broadcast(buffer.data, inplace=True)
         for x in module.parameters():
+            if id(x) in flat_params:
+                continue
             requires_grad = x.requires_grad
             flow._C.broadcast(x, inplace=True)
             # TODO: fix the bug that x's requires_grad is discarded
             # after flow._C.broadcast
             x.requires_grad_(requires_grad)
 
-    ddp_state_for_reversed_params = OrderedDict(
-        reversed([(x, [False, False]) for x in module.parameters() if x.requires_grad])
-    )
-    module._ddp_state_for_reversed_params = ddp_state_for_reversed_params
-    for param in module.parameters():
-        param.register_hook(lambda grad: grad / world_size)
-        param.register_hook(allreduce_fn(ddp_state_for_reversed_params, param))
+    ddp_params = [x for x in module.parameters() if x.requires_grad]
+    ddp_buckets = _make_buckets(ddp_params, flat_buffers, bucket_cap_mb)
+    module._ddp_params = ddp_params
+    module._ddp_buckets = ddp_buckets
+    for bucket in ddp_buckets:
+        for param in bucket.params:
+            param.register_hook(allreduce_fn(ddp_buckets, bucket, param, world_size))
 
     def post_forward_hook(module, input, output):
-        ddp_state_for_reversed_params = module._ddp_state_for_reversed_params
-        for state in ddp_state_for_reversed_params.values():
-            state[0], state[1] = False, False
+        ddp_params = module._ddp_params
+        for bucket in module._ddp_buckets:
+            bucket.num_ready = 0
+            bucket.reduced = False
         if isinstance(output, (tuple, list)):
             if isinstance(output[0], dict):
                 # For List[Dict[Tensor]] return type.
@@ -74,9 +189,7 @@ def DistributedDataParallel(
                     out_key_list.append(out_keys)
                     out_val_list.extend(out_values)
                 out_values = flow._C.select_top_n(
-                    convert_to_tensor_tuple(
-                        [*out_val_list, *ddp_state_for_reversed_params.keys()]
-                    ),
+                    convert_to_tensor_tuple([*out_val_list, *ddp_params]),
                     n=len(out_val_list),
                 )
                 output = []
@@ -88,29 +201,20 @@ def DistributedDataParallel(
             else:
                 # For List[Tensor] return type.
                 output = flow._C.select_top_n(
-                    convert_to_tensor_tuple(
-                        [*output, *ddp_state_for_reversed_params.keys()]
-                    ),
-                    n=len(output),
+                    convert_to_tensor_tuple([*output, *ddp_params]), n=len(output),
                 )
         elif isinstance(output, dict):
             # For Dict[Tensor] return type.
             out_keys = list(output.keys())
             out_values = list(output.values())
             out_values = flow._C.select_top_n(
-                convert_to_tensor_tuple(
-                    [*out_values, *ddp_state_for_reversed_params.keys()]
-                ),
-                n=len(out_values),
+                convert_to_tensor_tuple([*out_values, *ddp_params]), n=len(out_values),
             )
             return dict(zip(out_keys, out_values))
         else:
             # For Tensor return type.
             output = flow._C.select_top_n(
-                convert_to_tensor_tuple(
-                    [output, *ddp_state_for_reversed_params.keys()]
-                ),
-                n=1,
+                convert_to_tensor_tuple([output, *ddp_params]), n=1,
             )[0]
         return output
 
@@ -23,6 +23,7 @@ import oneflow as flow
 from oneflow.framework.tensor import Tensor
 from oneflow.framework.tensor import register_tensor_op
 from oneflow.nn.module import Module
+from oneflow.nn.utils.flat_buffer import split_flat_buffers
 
 
 _tensor_or_tensors = Union[Tensor, Iterable[Tensor]]
@@ -90,20 +91,21 @@ def clip_grad_norm_(
     norm_type = float(norm_type)
     if len(parameters) == 0:
         return flow.tensor(0.0)
-    device = parameters[0].grad.device
+    # The grads in a flat buffer are processed as a whole
+    (buffers, parameters) = split_flat_buffers(parameters)
+    grads = [buffer.grad for buffer in buffers]
+    grads.extend(p.grad.detach() for p in parameters)
+    device = grads[0].device
     if norm_type == float("inf"):
-        norms = [p.grad.detach().abs().max().to(device) for p in parameters]
+        norms = [g.abs().max().to(device) for g in grads]
         total_norm = norms[0] if len(norms) == 1 else flow.max(flow.stack(norms))
     elif norm_type == float("-inf"):
-        norms = [p.grad.detach().abs().min().to(device) for p in parameters]
+        norms = [g.abs().min().to(device) for g in grads]
         total_norm = norms[0] if len(norms) == 1 else flow.min(flow.stack(norms))
     else:
         total_norm = flow.linalg.vector_norm(
             flow.stack(
-                [
-                    flow.linalg.vector_norm(p.grad.detach(), norm_type).to(device)
-                    for p in parameters
-                ]
+                [flow.linalg.vector_norm(g, norm_type).to(device) for g in grads]
             ),
             norm_type,
         )
@@ -118,8 +120,8 @@ def clip_grad_norm_(
         )
     clip_coef = max_norm / (total_norm + 1e-6)
     clip_coef_clamped = clip_coef.clamp(max=1.0)
-    for p in parameters:
-        p.grad.detach().mul_(clip_coef_clamped.to(p.grad.device))
+    for g in grads:
+        g.mul_(clip_coef_clamped.to(g.device))
     return total_norm
 
 
@@ -0,0 +1,128 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import collections
+import weakref
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import oneflow as flow
+from oneflow.framework.tensor import Tensor
+
+# Maps id(param) to the flat buffer holding it. The buffers are owned by
+# their modules, an entry is gone with its buffer.
+_flat_buffer_of_param = weakref.WeakValueDictionary()
+
+
+class FlatParameterBuffer(object):
+    r"""Contiguous storage of the data and the gradients of parameters.
+
+    The data and the grad of each parameter become views of two 1-D buffers,
+    in the order of `params`. Gradients are accumulated into the views in
+    place by backward, so a whole buffer can be updated, clipped or
+    all-reduced by a single op.
+
+    The grad of a parameter is detached from the buffer once it is assigned
+    (including set to None) or the data of the parameter is replaced, e.g. by
+    :meth:`oneflow.nn.Module.to`. The buffer is not used any more then.
+
+    Args:
+        params (Iterable[Parameter]): Local parameters requiring grad, of the
+            same device and dtype.
+    """
+
+    def __init__(self, params: Iterable[Tensor]):
+        self.params_ = list(params)
+        assert len(self.params_) > 0
+        for p in self.params_:
+            assert p.is_local, "only local tensors can be flattened"
+            assert p.is_leaf and p.requires_grad
+            assert p.device == self.params_[0].device
+            assert p.dtype == self.params_[0].dtype
+        self.offsets_ = []
+        offset = 0
+        for p in self.params_:
+            self.offsets_.append(offset)
+            offset += p.numel()
+        with flow.no_grad():
+            self.data_ = flow.cat([p.detach().reshape(-1) for p in self.params_])
+            self.grad_ = flow.cat(
+                [
+                    flow.zeros_like(p).reshape(-1)
+                    if p.grad is None
+                    else p.grad.detach().reshape(-1)
+                    for p in self.params_
+                ]
+            )
+        for (p, offset) in zip(self.params_, self.offsets_):
+            p.data = flow._C.buffer_view(self.data_, p.shape, offset)
+            p.grad = flow._C.buffer_view(self.grad_, p.shape, offset)
+            # Must be set after the grad, since assigning a grad resets it
+            p._is_grad_acc_inplace = True
+            _flat_buffer_of_param[id(p)] = self
+
+    @property
+    def params(self) -> List[Tensor]:
+        return self.params_
+
+    @property
+    def data(self) -> Tensor:
+        return self.data_
+
+    @property
+    def grad(self) -> Tensor:
+        return self.grad_
+
+    @property
+    def offsets(self) -> List[int]:
+        return self.offsets_
+
+    def is_valid(self) -> bool:
+        r"""Returns whether the data and grads of all parameters are still the
+        views of the buffer.
+        """
+        return all(p._is_grad_acc_inplace for p in self.params_)
+
+    def zero_grad(self) -> None:
+        self.grad_.zeros_()
+
+
+def flat_buffer_of(param: Tensor) -> Optional[FlatParameterBuffer]:
+    r"""Returns the valid flat buffer holding `param`, or None."""
+    buffer = _flat_buffer_of_param.get(id(param))
+    if buffer is None or not buffer.is_valid():
+        return None
+    return buffer
+
+
+def split_flat_buffers(
+    params: Iterable[Tensor],
+) -> Tuple[List[FlatParameterBuffer], List[Tensor]]:
+    r"""Splits `params` into the valid flat buffers all parameters of which are
+    in `params`, and the other parameters.
+    """
+    params = list(collections.OrderedDict((id(p), p) for p in params).values())
+    counts: Dict[int, int] = collections.defaultdict(int)
+    buffers = collections.OrderedDict()
+    for p in params:
+        buffer = flat_buffer_of(p)
+        if buffer is not None:
+            counts[id(buffer)] += 1
+            buffers[id(buffer)] = buffer
+    full_buffers = [
+        buffer for (key, buffer) in buffers.items() if counts[key] == len(buffer.params)
+    ]
+    in_full_buffers = set(id(p) for buffer in full_buffers for p in buffer.params)
+    rest = [p for p in params if id(p) not in in_full_buffers]
+    return full_buffers, rest
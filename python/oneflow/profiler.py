@@ -13,7 +13,15 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 """
+from oneflow.framework.profiler import CpuConvStats as cpu_conv_stats
+from oneflow.framework.profiler import DataReaderStats as data_reader_stats
+from oneflow.framework.profiler import GetInferCacheCapacity as infer_cache_capacity
+from oneflow.framework.profiler import InferCacheStats as infer_cache_stats
 from oneflow.framework.profiler import ProfilerStart as profiler_start
 from oneflow.framework.profiler import ProfilerStop as profiler_stop
 from oneflow.framework.profiler import RangePop as range_pop
 from oneflow.framework.profiler import RangePush as range_push
+from oneflow.framework.profiler import ResetCpuConvStats as reset_cpu_conv_stats
+from oneflow.framework.profiler import ResetDataReaderStats as reset_data_reader_stats
+from oneflow.framework.profiler import ResetInferCacheStats as reset_infer_cache_stats
+from oneflow.framework.profiler import SetInferCacheCapacity as set_infer_cache_capacity
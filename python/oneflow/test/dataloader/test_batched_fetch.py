@@ -0,0 +1,106 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import unittest
+
+import numpy as np
+
+import oneflow as flow
+import oneflow.unittest
+
+
+class BatchedNumpyDataset(flow.utils.data.Dataset):
+    def __init__(self, num_samples):
+        self.x = np.random.randn(num_samples, 4).astype(np.float32)
+        self.y = np.arange(num_samples)
+        self.num_getitems_calls = 0
+
+    def __getitem__(self, index):
+        return self.x[index], self.y[index]
+
+    def __getitems__(self, indices):
+        self.num_getitems_calls += 1
+        return self.x[indices], self.y[indices]
+
+    def __len__(self):
+        return len(self.y)
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestBatchedFetch(flow.unittest.TestCase):
+    def test_getitems(test_case):
+        dataset = BatchedNumpyDataset(50)
+        data_loader = flow.utils.data.DataLoader(dataset, batch_size=8)
+        for (i, (x, y)) in enumerate(data_loader):
+            test_case.assertTrue(
+                np.array_equal(x.numpy(), dataset.x[i * 8 : i * 8 + 8])
+            )
+            test_case.assertTrue(
+                np.array_equal(y.numpy(), dataset.y[i * 8 : i * 8 + 8])
+            )
+        test_case.assertEqual(dataset.num_getitems_calls, 7)
+
+    def test_getitems_with_workers(test_case):
+        dataset = BatchedNumpyDataset(50)
+        data_loader = flow.utils.data.DataLoader(dataset, batch_size=8, num_workers=2)
+        for (i, (x, y)) in enumerate(data_loader):
+            test_case.assertTrue(
+                np.array_equal(x.numpy(), dataset.x[i * 8 : i * 8 + 8])
+            )
+            test_case.assertTrue(
+                np.array_equal(y.numpy(), dataset.y[i * 8 : i * 8 + 8])
+            )
+
+    def test_custom_collate_fn_fetches_samples(test_case):
+        dataset = BatchedNumpyDataset(16)
+        data_loader = flow.utils.data.DataLoader(
+            dataset, batch_size=4, collate_fn=lambda samples: len(samples)
+        )
+        test_case.assertEqual(list(data_loader), [4, 4, 4, 4])
+        test_case.assertEqual(dataset.num_getitems_calls, 0)
+
+    def test_tensor_dataset(test_case):
+        x = flow.randn(20, 3)
+        y = flow.arange(20)
+        dataset = flow.utils.data.TensorDataset(x, y)
+        data_loader = flow.utils.data.DataLoader(dataset, batch_size=6, shuffle=True)
+        num_samples = 0
+        for (batch_x, batch_y) in data_loader:
+            num_samples += batch_y.shape[0]
+            test_case.assertTrue(
+                np.array_equal(batch_x.numpy(), x.numpy()[batch_y.numpy()])
+            )
+        test_case.assertEqual(num_samples, 20)
+
+    def test_getitem_override_fetches_samples(test_case):
+        class NegatedTensorDataset(flow.utils.data.TensorDataset):
+            def __getitem__(self, index):
+                (x, y) = super().__getitem__(index)
+                return (-x, y)
+
+        x = flow.randn(20, 3)
+        y = flow.arange(20)
+        dataset = NegatedTensorDataset(x, y)
+        data_loader = flow.utils.data.DataLoader(dataset, batch_size=6)
+        test_case.assertFalse(data_loader._batched_fetch)
+        for (batch_x, batch_y) in data_loader:
+            test_case.assertTrue(
+                np.array_equal(batch_x.numpy(), -x.numpy()[batch_y.numpy()])
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
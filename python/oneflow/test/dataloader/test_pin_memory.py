@@ -0,0 +1,78 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import gc
+import unittest
+
+import numpy as np
+
+import oneflow as flow
+import oneflow.unittest
+from oneflow.utils.data._utils.pin_memory import (
+    PINNED_BUFFER_ALIGNMENT,
+    PinnedBufferPool,
+    pin_memory,
+)
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestPinMemory(flow.unittest.TestCase):
+    def test_pinned_buffer_pool(test_case):
+        pool = PinnedBufferPool()
+        x = pool.empty((3, 100), np.float32)
+        test_case.assertEqual(x.ctypes.data % PINNED_BUFFER_ALIGNMENT, 0)
+        address = x.ctypes.data
+        del x
+        gc.collect()
+        # a batch of a slightly different size reuses the buffer
+        y = pool.empty((3, 90), np.float32)
+        test_case.assertEqual(y.ctypes.data, address)
+        test_case.assertEqual(pool.stats()["num_allocated"], 1)
+        test_case.assertEqual(pool.stats()["num_reused"], 1)
+        pool.clear()
+        test_case.assertEqual(pool.cached_bytes, 0)
+
+    def test_pin_memory_nested(test_case):
+        pool = PinnedBufferPool()
+        x = flow.randn(2, 3)
+        data = {"x": x, "y": [flow.arange(4), "label"]}
+        pinned = pin_memory(data, pool)
+        test_case.assertTrue(np.array_equal(pinned["x"].numpy(), x.numpy()))
+        test_case.assertTrue(np.array_equal(pinned["y"][0].numpy(), np.arange(4)))
+        test_case.assertEqual(pinned["y"][1], "label")
+        test_case.assertEqual(
+            pinned["x"].numpy().ctypes.data % PINNED_BUFFER_ALIGNMENT, 0
+        )
+
+    def test_dataloader_pin_memory(test_case):
+        features = flow.tensor(np.random.randn(100, 3).astype(np.float32))
+        labels = flow.tensor(np.arange(100))
+        dataset = flow.utils.data.TensorDataset(features, labels)
+        for num_workers in [0, 2]:
+            data_loader = flow.utils.data.DataLoader(
+                dataset, batch_size=10, num_workers=num_workers, pin_memory=True
+            )
+            for (i, (x, y)) in enumerate(data_loader):
+                test_case.assertTrue(
+                    np.array_equal(x.numpy(), features.numpy()[i * 10 : (i + 1) * 10])
+                )
+                test_case.assertTrue(
+                    np.array_equal(y.numpy(), np.arange(i * 10, i * 10 + 10))
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import pickle
+import unittest
+from multiprocessing.reduction import ForkingPickler
+
+import numpy as np
+
+import oneflow as flow
+import oneflow.multiprocessing as mp
+import oneflow.unittest
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestSharedMemoryTensor(flow.unittest.TestCase):
+    def test_pickled_tensor_shares_memory(test_case):
+        default_strategy = mp.get_sharing_strategy()
+        for strategy in mp.get_all_sharing_strategies():
+            mp.set_sharing_strategy(strategy)
+            x = flow.tensor(np.arange(12, dtype=np.float32).reshape(3, 4))
+            y = pickle.loads(ForkingPickler.dumps(x))
+            test_case.assertTrue(np.array_equal(x.numpy(), y.numpy()))
+            # y is in shared memory now, so sending it again shares its data
+            z = pickle.loads(ForkingPickler.dumps(y))
+            y.numpy()[0, 0] = 100
+            test_case.assertEqual(z.numpy()[0, 0], 100)
+            test_case.assertEqual(x.numpy()[0, 0], 0)
+        mp.set_sharing_strategy(default_strategy)
+
+    def test_dataloader_workers(test_case):
+        features = flow.tensor(np.random.randn(100, 3).astype(np.float32))
+        labels = flow.tensor(np.arange(100))
+        dataset = flow.utils.data.TensorDataset(features, labels)
+        data_loader = flow.utils.data.DataLoader(
+            dataset, batch_size=10, shuffle=False, num_workers=2
+        )
+        for (i, (x, y)) in enumerate(data_loader):
+            test_case.assertTrue(
+                np.array_equal(x.numpy(), features.numpy()[i * 10 : (i + 1) * 10])
+            )
+            test_case.assertTrue(
+                np.array_equal(y.numpy(), np.arange(i * 10, i * 10 + 10))
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+import numpy as np
+
+import oneflow as flow
+import oneflow.unittest
+from oneflow.nn.graph.compiled_plan_cache import list_plan_cache, prune_plan_cache
+
+# Builds and runs the same graph in a new process, prints its output
+_GRAPH_SCRIPT = textwrap.dedent(
+    """
+    import numpy as np
+    import oneflow as flow
+
+    linear = flow.nn.Linear(3, 8)
+    flow.nn.init.constant_(linear.weight, 2.3)
+    flow.nn.init.constant_(linear.bias, 0.5)
+
+    class LinearGraph(flow.nn.Graph):
+        def __init__(self):
+            super().__init__()
+            self.linear = linear
+            self.config.enable_plan_cache(cache_dir={cache_dir!r})
+
+        def build(self, x):
+            return self.linear(x)
+
+    x = flow.tensor(np.arange(24, dtype=np.float32).reshape(8, 3))
+    print(LinearGraph()(x).numpy().sum())
+    """
+)
+
+
+def _run_graph_in_new_process(cache_dir):
+    script = _GRAPH_SCRIPT.format(cache_dir=cache_dir)
+    return subprocess.check_output([sys.executable, "-c", script]).decode().strip()
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestGraphPlanCache(oneflow.unittest.TestCase):
+    def test_plan_cache_warm_restart(test_case):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cold_out = _run_graph_in_new_process(cache_dir)
+            entries = list_plan_cache(cache_dir)
+            test_case.assertEqual(len(entries), 1)
+            test_case.assertGreater(entries[0]["plan_size"], 0)
+
+            # The warm restart loads the plan, no entry is added
+            os.utime(os.path.join(cache_dir, entries[0]["key_hash"] + ".plan"), (0, 0))
+            warm_out = _run_graph_in_new_process(cache_dir)
+            test_case.assertEqual(warm_out, cold_out)
+            warm_entries = list_plan_cache(cache_dir)
+            test_case.assertEqual(len(warm_entries), 1)
+            test_case.assertEqual(warm_entries[0]["key_hash"], entries[0]["key_hash"])
+            test_case.assertGreater(warm_entries[0]["last_used"], 0)
+
+    def test_plan_cache_prune(test_case):
+        linear = flow.nn.Linear(3, 8)
+
+        class LinearGraph(flow.nn.Graph):
+            def __init__(self, cache_dir):
+                super().__init__()
+                self.linear = linear
+                self.config.enable_plan_cache(cache_dir=cache_dir)
+
+            def build(self, x):
+                return self.linear(x)
+
+        x = flow.randn(4, 3)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            graphs = [LinearGraph(cache_dir) for _ in range(3)]
+            for g in graphs:
+                test_case.assertTrue(
+                    np.allclose(g(x).numpy(), linear(x).numpy(), 1e-05, 1e-05)
+                )
+            entries = list_plan_cache(cache_dir)
+            test_case.assertEqual(
+                sorted(entry["job_name"] for entry in entries),
+                sorted(g.name for g in graphs),
+            )
+
+            max_size = sum(entry["plan_size"] for entry in entries[1:])
+            test_case.assertEqual(
+                prune_plan_cache(cache_dir, max_size=max_size, dry_run=True),
+                [entries[0]["key_hash"]],
+            )
+            test_case.assertEqual(len(list_plan_cache(cache_dir)), 3)
+            prune_plan_cache(cache_dir, max_size=max_size)
+            test_case.assertEqual(list_plan_cache(cache_dir), entries[1:])
+            prune_plan_cache(cache_dir, remove_all=True)
+            test_case.assertEqual(list_plan_cache(cache_dir), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import os
+import unittest
+import numpy as np
+
+import oneflow as flow
+import oneflow.unittest
+
+
+def _test_shape_bucketing(test_case, device):
+    linear = flow.nn.Linear(16, 8).to(device)
+
+    class LinearGraph(flow.nn.Graph):
+        def __init__(self):
+            super().__init__()
+            self.linear = linear
+            self.config.enable_shape_bucketing(
+                flow.nn.graph.round_up_to_multiple(4, dims=[0]), max_cached_plans=2
+            )
+
+        def build(self, x):
+            return self.linear(x)
+
+    linear_g = LinearGraph()
+    for (batch_size, bucket_size) in [(3, 4), (4, 4), (6, 8), (8, 8), (1, 4)]:
+        x = flow.randn(batch_size, 16, device=device)
+        of_lazy_out = linear_g(x)
+        test_case.assertEqual(of_lazy_out.shape, flow.Size([bucket_size, 8]))
+        test_case.assertTrue(
+            np.allclose(
+                of_lazy_out.numpy()[:batch_size], linear(x).numpy(), 1e-05, 1e-05
+            )
+        )
+    stats = linear_g.plan_cache_stats()
+    test_case.assertEqual(stats["num_plans"], 2)
+    test_case.assertEqual(stats["num_misses"], 2)
+    test_case.assertEqual(stats["num_hits"], 3)
+    test_case.assertAlmostEqual(stats["hit_rate"], 0.6)
+    test_case.assertGreater(stats["total_compile_time"], 0)
+
+    # Parameters are shared by all plans
+    flow.nn.init.zeros_(linear.weight)
+    flow.nn.init.zeros_(linear.bias)
+    of_lazy_out = linear_g(flow.randn(5, 16, device=device))
+    test_case.assertTrue(np.array_equal(of_lazy_out.numpy(), np.zeros((8, 8))))
+
+    # The least recently used plan of bucket 4 is evicted by bucket 12
+    of_lazy_out = linear_g(flow.randn(9, 16, device=device))
+    test_case.assertEqual(of_lazy_out.shape, flow.Size([12, 8]))
+    stats = linear_g.plan_cache_stats()
+    test_case.assertEqual(stats["num_plans"], 2)
+    test_case.assertEqual(stats["num_evictions"], 1)
+    test_case.assertEqual(len(stats["compile_time"]), 2)
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestGraphShapeBucketing(oneflow.unittest.TestCase):
+    @unittest.skipIf(os.getenv("ONEFLOW_TEST_CPU_ONLY"), "only test cpu cases")
+    def test_shape_bucketing_gpu(test_case):
+        _test_shape_bucketing(test_case, flow.device("cuda"))
+
+    def test_shape_bucketing_cpu(test_case):
+        _test_shape_bucketing(test_case, flow.device("cpu"))
+
+
+if __name__ == "__main__":
+    unittest.main()
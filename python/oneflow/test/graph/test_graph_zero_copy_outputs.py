@@ -0,0 +1,87 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import os
+import unittest
+import numpy as np
+
+import oneflow as flow
+import oneflow.unittest
+
+
+def _test_zero_copy_outputs(test_case, device):
+    linear = flow.nn.Linear(4, 3).to(device)
+
+    class LinearGraph(flow.nn.Graph):
+        def __init__(self):
+            super().__init__()
+            self.linear = linear
+            self.config.set_outputs_buffer_size(2)
+            self.config.enable_zero_copy_outputs()
+
+        def build(self, x):
+            y = self.linear(x)
+            return y, [y + 1, y * 2]
+
+    linear_g = LinearGraph()
+    x = flow.randn(2, 4, device=device)
+    expected = linear(x).numpy()
+
+    (out0, (out1, out2)) = linear_g(x)
+    test_case.assertTrue(np.allclose(out0.numpy(), expected, 1e-05, 1e-05))
+    test_case.assertTrue(np.allclose(out1.numpy(), expected + 1, 1e-05, 1e-05))
+    test_case.assertTrue(np.allclose(out2.numpy(), expected * 2, 1e-05, 1e-05))
+    # The outputs are the buffer tensors themselves
+    test_case.assertTrue(
+        any(out0 is t for t in linear_g._outputs_tensor_tuple_buffer[0])
+    )
+
+    held = linear_g(x)
+    # Both buffers are leased
+    with test_case.assertRaises(RuntimeError):
+        linear_g(x)
+
+    # Dropping all references to the outputs of a call returns its buffer
+    del out0, out1, out2
+    (out0, _) = linear_g(x)
+    test_case.assertTrue(np.allclose(out0.numpy(), expected, 1e-05, 1e-05))
+    with test_case.assertRaises(RuntimeError):
+        linear_g(x)
+
+    # Releasing one output releases the whole call
+    linear_g.release_outputs(held[0])
+    other = linear_g(x)
+    test_case.assertTrue(np.allclose(other[0].numpy(), expected, 1e-05, 1e-05))
+
+    # Stale leases of released tensors don't release the reused buffer
+    del held
+    with test_case.assertRaises(RuntimeError):
+        linear_g(x)
+    linear_g.release_outputs(other)
+    test_case.assertTrue(np.allclose(linear_g(x)[0].numpy(), expected, 1e-05, 1e-05))
+
+
+@unittest.skipIf(os.getenv("ONEFLOW_TEST_CPU_ONLY"), "only test cpu cases")
+@flow.unittest.skip_unless_1n1d()
+class TestGraphZeroCopyOutputs(oneflow.unittest.TestCase):
+    def test_zero_copy_outputs_gpu(test_case):
+        _test_zero_copy_outputs(test_case, flow.device("cuda"))
+
+    def test_zero_copy_outputs_cpu(test_case):
+        _test_zero_copy_outputs(test_case, flow.device("cpu"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import unittest
+
+import numpy as np
+
+import oneflow as flow
+import oneflow.unittest
+
+
+def _sync():
+    flow._oneflow_internal.eager.multi_client.Sync()
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestCpuAllocator(flow.unittest.TestCase):
+    def test_reuse_cached_blocks(test_case):
+        flow.cpu.set_caching_limits(1 << 30, 256 << 20)
+        x = flow.ones(1000, 1000)
+        test_case.assertTrue(np.array_equal(x.numpy(), np.ones((1000, 1000))))
+        stats = flow.cpu.memory_stats()
+        test_case.assertGreaterEqual(stats["in_use_bytes"], 4 * 1000 * 1000)
+        del x
+        _sync()
+        stats = flow.cpu.memory_stats()
+        test_case.assertGreaterEqual(stats["cached_bytes"], 4 * 1000 * 1000)
+
+        # A tensor of a close size reuses the cached block
+        y = flow.zeros(999, 1000)
+        test_case.assertTrue(np.array_equal(y.numpy(), np.zeros((999, 1000))))
+        new_stats = flow.cpu.memory_stats()
+        test_case.assertEqual(
+            new_stats["num_system_allocations"], stats["num_system_allocations"]
+        )
+        test_case.assertGreater(new_stats["num_allocations"], stats["num_allocations"])
+        test_case.assertGreaterEqual(
+            new_stats["peak_in_use_bytes"], new_stats["in_use_bytes"]
+        )
+
+    def test_empty_cache(test_case):
+        x = flow.ones(1000, 1000)
+        x.numpy()
+        del x
+        _sync()
+        flow.cpu.empty_cache()
+        test_case.assertEqual(flow.cpu.memory_stats()["cached_bytes"], 0)
+
+    def test_caching_limits(test_case):
+        try:
+            flow.cpu.set_caching_limits(1 << 30, 1 << 20)
+            x = flow.ones(1000, 1000)
+            x.numpy()
+            cached_bytes = flow.cpu.memory_stats()["cached_bytes"]
+            del x
+            _sync()
+            # Blocks larger than max_cached_block_size are not cached
+            test_case.assertEqual(flow.cpu.memory_stats()["cached_bytes"], cached_bytes)
+            flow.cpu.set_caching_limits(0, 256 << 20)
+            test_case.assertEqual(flow.cpu.memory_stats()["cached_bytes"], 0)
+        finally:
+            flow.cpu.set_caching_limits(1 << 30, 256 << 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
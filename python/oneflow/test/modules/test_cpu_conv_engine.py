@@ -0,0 +1,151 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import os
+import unittest
+from collections import OrderedDict
+
+import numpy as np
+from test_util import GenArgList
+
+import oneflow as flow
+import oneflow.unittest
+
+
+def _np_conv2d(x, weight, bias, stride, padding, dilation):
+    (kh, kw) = weight.shape[2:]
+    x = np.pad(x, ((0, 0), (0, 0), (padding, padding), (padding, padding)))
+    oh = (x.shape[2] - dilation * (kh - 1) - 1) // stride + 1
+    ow = (x.shape[3] - dilation * (kw - 1) - 1) // stride + 1
+    out = np.zeros((x.shape[0], weight.shape[0], oh, ow))
+    for i in range(kh):
+        for j in range(kw):
+            patch = x[
+                :,
+                :,
+                i * dilation : i * dilation + (oh - 1) * stride + 1 : stride,
+                j * dilation : j * dilation + (ow - 1) * stride + 1 : stride,
+            ]
+            out += np.einsum("nchw,oc->nohw", patch, weight[:, :, i, j])
+    if bias is not None:
+        out += bias.reshape(1, -1, 1, 1)
+    return out
+
+
+def _test_conv2d_algo(
+    test_case, algo, shape, out_channels, kernel_size, stride, padding, dilation, bias
+):
+    x = np.random.randn(*shape).astype(np.float32)
+    conv = flow.nn.Conv2d(
+        shape[1],
+        out_channels,
+        kernel_size,
+        stride=stride,
+        padding=padding,
+        dilation=dilation,
+        bias=bias,
+    )
+    expected = _np_conv2d(
+        x.astype(np.float64),
+        conv.weight.numpy().astype(np.float64),
+        conv.bias.numpy().astype(np.float64) if bias else None,
+        stride,
+        padding,
+        dilation,
+    )
+    os.environ["ONEFLOW_CPU_CONV_ALGO"] = algo
+    flow.profiler.reset_cpu_conv_stats()
+    try:
+        # numpy() waits for the conv, which reads the env var when it runs
+        out = conv(flow.tensor(x)).numpy()
+    finally:
+        del os.environ["ONEFLOW_CPU_CONV_ALGO"]
+    test_case.assertEqual(out.shape, expected.shape)
+    test_case.assertTrue(np.allclose(out, expected, rtol=1e-4, atol=1e-4))
+    stats = flow.profiler.cpu_conv_stats()
+    test_case.assertEqual(sum(stats["algo_runs"].values()), 1)
+    if algo:
+        test_case.assertEqual(stats["algo_runs"][algo], 1)
+        test_case.assertEqual(stats["algo_cache"], {"num_hits": 0, "num_misses": 0})
+    return stats
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestCpuConvEngine(flow.unittest.TestCase):
+    def test_im2col_gemm(test_case):
+        arg_dict = OrderedDict()
+        arg_dict["algo"] = ["im2col_gemm"]
+        arg_dict["shape"] = [(1, 3, 7, 9), (4, 16, 33, 31)]
+        arg_dict["out_channels"] = [5, 40]
+        arg_dict["kernel_size"] = [1, 3, 5]
+        arg_dict["stride"] = [1, 2]
+        arg_dict["padding"] = [0, 2]
+        arg_dict["dilation"] = [1, 2]
+        arg_dict["bias"] = [True, False]
+        for arg in GenArgList(arg_dict):
+            _test_conv2d_algo(test_case, *arg)
+
+    def test_gemm_1x1(test_case):
+        arg_dict = OrderedDict()
+        arg_dict["algo"] = ["gemm_1x1"]
+        arg_dict["shape"] = [(1, 3, 7, 9), (4, 64, 30, 30)]
+        arg_dict["out_channels"] = [5, 40]
+        arg_dict["kernel_size"] = [1]
+        arg_dict["stride"] = [1]
+        arg_dict["padding"] = [0]
+        arg_dict["dilation"] = [1]
+        arg_dict["bias"] = [True, False]
+        for arg in GenArgList(arg_dict):
+            _test_conv2d_algo(test_case, *arg)
+
+    def test_winograd_3x3(test_case):
+        arg_dict = OrderedDict()
+        arg_dict["algo"] = ["winograd_3x3"]
+        # odd output sizes leave partial tiles
+        arg_dict["shape"] = [(1, 3, 7, 9), (4, 64, 30, 30)]
+        arg_dict["out_channels"] = [5, 40]
+        arg_dict["kernel_size"] = [3]
+        arg_dict["stride"] = [1]
+        arg_dict["padding"] = [0, 1, 2]
+        arg_dict["dilation"] = [1]
+        arg_dict["bias"] = [True, False]
+        for arg in GenArgList(arg_dict):
+            _test_conv2d_algo(test_case, *arg)
+
+    def test_cached_algo(test_case):
+        arg_dict = OrderedDict()
+        # without the env var, the algorithm is searched once per shape and then cached
+        arg_dict["algo"] = [""]
+        arg_dict["shape"] = [(2, 16, 20, 20)]
+        arg_dict["out_channels"] = [32]
+        arg_dict["kernel_size"] = [1, 3]
+        arg_dict["stride"] = [1]
+        arg_dict["padding"] = [0, 1]
+        arg_dict["dilation"] = [1]
+        arg_dict["bias"] = [True]
+        for arg in GenArgList(arg_dict):
+            # the first call searches, the second one hits the cache
+            stats = _test_conv2d_algo(test_case, *arg)
+            test_case.assertEqual(stats["algo_cache"], {"num_hits": 0, "num_misses": 1})
+            searched_algo = next(
+                name for (name, num_runs) in stats["algo_runs"].items() if num_runs
+            )
+            stats = _test_conv2d_algo(test_case, *arg)
+            test_case.assertEqual(stats["algo_cache"], {"num_hits": 1, "num_misses": 0})
+            test_case.assertEqual(stats["algo_runs"][searched_algo], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import os
+import subprocess
+import sys
+import textwrap
+import unittest
+from collections import OrderedDict
+
+import numpy as np
+from test_util import GenArgList
+
+import oneflow as flow
+import oneflow.unittest
+
+# Prints the number of threads from the environment before and after setting
+# it and restoring the default
+_RESTORE_ENV_SCRIPT = textwrap.dedent(
+    """
+    import oneflow as flow
+    print(flow.get_num_threads())
+    flow.set_num_threads(2)
+    flow.set_num_threads(0)
+    print(flow.get_num_threads())
+    """
+)
+
+
+def _run_ops(x, y):
+    return [
+        flow.exp(x),
+        flow.relu(x),
+        x + y,
+        x * y[:1],
+        x - y[:, :1],
+        x > y,
+        flow.softmax(x, dim=-1),
+        flow.log_softmax(x, dim=0),
+        x.permute(1, 0).contiguous(),
+        x.to(flow.float64),
+        x.to(flow.int32),
+    ]
+
+
+def _test_ops_match_single_thread(test_case, shape):
+    x = flow.tensor(np.random.randn(*shape), dtype=flow.float32)
+    y = flow.tensor(np.random.randn(*shape), dtype=flow.float32)
+    default_num_threads = flow.get_num_threads()
+    try:
+        flow.set_num_threads(1)
+        expected = [out.numpy() for out in _run_ops(x, y)]
+        flow.set_num_threads(0)
+        actual = [out.numpy() for out in _run_ops(x, y)]
+    finally:
+        flow.set_num_threads(0)
+    test_case.assertEqual(flow.get_num_threads(), default_num_threads)
+    for (a, b) in zip(expected, actual):
+        test_case.assertTrue(np.allclose(a, b, rtol=1e-6, atol=1e-6))
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestCpuNumThreads(flow.unittest.TestCase):
+    def test_set_num_threads(test_case):
+        default_num_threads = flow.get_num_threads()
+        test_case.assertGreaterEqual(default_num_threads, 1)
+        try:
+            flow.set_num_threads(1)
+            test_case.assertEqual(flow.get_num_threads(), 1)
+            # capped by the size of the compute thread pool
+            flow.set_num_threads(1 << 20)
+            test_case.assertLessEqual(flow.get_num_threads(), default_num_threads)
+        finally:
+            flow.set_num_threads(0)
+        test_case.assertEqual(flow.get_num_threads(), default_num_threads)
+
+    def test_set_num_threads_restores_env(test_case):
+        env = dict(os.environ, ONEFLOW_EP_CPU_NUM_THREADS="1")
+        output = subprocess.check_output(
+            [sys.executable, "-c", _RESTORE_ENV_SCRIPT], env=env
+        )
+        test_case.assertEqual(output.decode().split(), ["1", "1"])
+
+    def test_ops_match_single_thread(test_case):
+        arg_dict = OrderedDict()
+        # smaller than, close to and much larger than the grain size
+        arg_dict["shape"] = [(4, 5), (181, 181), (1023, 517)]
+        for arg in GenArgList(arg_dict):
+            _test_ops_match_single_thread(test_case, *arg)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import math
+import unittest
+from collections import OrderedDict
+
+import numpy as np
+from test_util import GenArgList
+
+import oneflow as flow
+import oneflow.unittest
+
+
+def _np_gelu(x):
+    erf = np.vectorize(math.erf)
+    return 0.5 * x * (1.0 + erf(x / math.sqrt(2.0)))
+
+
+def _np_softmax(x):
+    e = np.exp(x - x.max(axis=-1, keepdims=True))
+    return e / e.sum(axis=-1, keepdims=True)
+
+
+def _np_log_softmax(x):
+    shifted = x - x.max(axis=-1, keepdims=True)
+    return shifted - np.log(np.exp(shifted).sum(axis=-1, keepdims=True))
+
+
+def _test_unary_ops(test_case, shape):
+    np_x = np.random.uniform(-10, 10, size=shape).astype(np.float32)
+    x = flow.tensor(np_x)
+    x64 = np_x.astype(np.float64)
+    cases = [
+        (flow.relu(x), np.maximum(x64, 0)),
+        (flow.gelu(x), _np_gelu(x64)),
+        (flow.tanh(x), np.tanh(x64)),
+        (flow.softmax(x, dim=-1), _np_softmax(x64)),
+        (flow.log_softmax(x, dim=-1), _np_log_softmax(x64)),
+    ]
+    for (out, expected) in cases:
+        test_case.assertEqual(out.dtype, flow.float32)
+        test_case.assertTrue(np.allclose(out.numpy(), expected, rtol=1e-5, atol=1e-5))
+
+
+def _test_binary_ops(test_case, shape):
+    np_x = np.random.uniform(-10, 10, size=shape).astype(np.float32)
+    np_y = np.random.uniform(0.5, 10, size=shape).astype(np.float32)
+    x = flow.tensor(np_x)
+    y = flow.tensor(np_y)
+    # same shape, row and column broadcast, and scalar operands
+    operands = [
+        (x, y, np_x, np_y),
+        (x, y[:1], np_x, np_y[:1]),
+        (x[:, :1], y, np_x[:, :1], np_y),
+        (x, 2.5, np_x, np.float32(2.5)),
+        (3.5, y, np.float32(3.5), np_y),
+    ]
+    for (a, b, np_a, np_b) in operands:
+        cases = [
+            (a + b, np_a + np_b),
+            (a - b, np_a - np_b),
+            (a * b, np_a * np_b),
+            (a / b, np_a / np_b),
+        ]
+        if isinstance(a, flow.Tensor) and isinstance(b, flow.Tensor):
+            cases.append((flow.maximum(a, b), np.maximum(np_a, np_b)))
+            cases.append((flow.minimum(a, b), np.minimum(np_a, np_b)))
+        for (out, expected) in cases:
+            test_case.assertTrue(np.array_equal(out.numpy(), expected))
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestCpuSimdOps(flow.unittest.TestCase):
+    def test_unary_ops(test_case):
+        arg_dict = OrderedDict()
+        # rows not a multiple of any vector width, and long enough to be split among threads
+        arg_dict["shape"] = [(1, 1), (3, 7), (5, 33), (1023, 517)]
+        for arg in GenArgList(arg_dict):
+            _test_unary_ops(test_case, *arg)
+
+    def test_binary_ops(test_case):
+        arg_dict = OrderedDict()
+        arg_dict["shape"] = [(1, 1), (3, 7), (5, 33), (1023, 517)]
+        for arg in GenArgList(arg_dict):
+            _test_binary_ops(test_case, *arg)
+
+
+if __name__ == "__main__":
+    unittest.main()
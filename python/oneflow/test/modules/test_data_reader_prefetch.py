@@ -0,0 +1,124 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import os
+import struct
+import tempfile
+import unittest
+
+import numpy as np
+
+import oneflow as flow
+import oneflow.unittest
+from oneflow.core.record import record_pb2
+
+
+def _write_ofrecord_parts(data_dir, num_parts, num_records_per_part):
+    for part in range(num_parts):
+        with open(os.path.join(data_dir, "part-{}".format(part)), "wb") as f:
+            for i in range(num_records_per_part):
+                label = part * num_records_per_part + i
+                record = record_pb2.OFRecord()
+                record.feature["label"].int32_list.value.append(label)
+                buf = record.SerializeToString()
+                f.write(struct.pack("q", len(buf)))
+                f.write(buf)
+
+
+def _read_labels(data_dir, num_parts, batch_size, num_batches, **kwargs):
+    reader = flow.nn.OFRecordReader(
+        data_dir, batch_size=batch_size, data_part_num=num_parts, **kwargs
+    )
+    decoder = flow.nn.OFRecordRawDecoder("label", shape=(), dtype=flow.int32)
+    return np.concatenate([decoder(reader()).numpy() for _ in range(num_batches)])
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestDataReaderPrefetch(flow.unittest.TestCase):
+    def test_loader_threads_read_every_record(test_case):
+        num_parts, num_records_per_part, batch_size = 4, 8, 4
+        num_loader_threads = 2
+        num_records = num_parts * num_records_per_part
+        with tempfile.TemporaryDirectory() as data_dir:
+            _write_ofrecord_parts(data_dir, num_parts, num_records_per_part)
+            labels = _read_labels(
+                data_dir,
+                num_parts,
+                batch_size,
+                num_records // batch_size,
+                num_loader_threads=num_loader_threads,
+                prefetch_depth=3,
+                ordered=True,
+            )
+            test_case.assertTrue(
+                np.array_equal(np.sort(labels), np.arange(num_records))
+            )
+            # an unordered reader may deliver the next epoch of one loader thread
+            # before the first epoch of another one, so read no more than the
+            # batches of one loader thread's shard
+            labels = _read_labels(
+                data_dir,
+                num_parts,
+                batch_size,
+                num_records // num_loader_threads // batch_size,
+                num_loader_threads=num_loader_threads,
+                prefetch_depth=3,
+                ordered=False,
+            )
+            test_case.assertEqual(len(np.unique(labels)), len(labels))
+            test_case.assertTrue(np.all((labels >= 0) & (labels < num_records)))
+
+    def test_ordered_loader_threads_are_reproducible(test_case):
+        num_parts, num_records_per_part, batch_size = 4, 8, 2
+        with tempfile.TemporaryDirectory() as data_dir:
+            _write_ofrecord_parts(data_dir, num_parts, num_records_per_part)
+            labels = [
+                _read_labels(
+                    data_dir,
+                    num_parts,
+                    batch_size,
+                    8,
+                    num_loader_threads=4,
+                    ordered=True,
+                )
+                for _ in range(2)
+            ]
+            test_case.assertTrue(np.array_equal(labels[0], labels[1]))
+            # batches are delivered round-robin from the loader threads, the
+            # i-th thread reads the i-th part file
+            first_labels = labels[0].reshape(-1, batch_size)[:num_parts, 0]
+            test_case.assertTrue(
+                np.array_equal(
+                    first_labels, np.arange(num_parts) * num_records_per_part
+                )
+            )
+
+    def test_data_reader_stats(test_case):
+        with tempfile.TemporaryDirectory() as data_dir:
+            _write_ofrecord_parts(data_dir, 2, 4)
+            flow.profiler.reset_data_reader_stats()
+            _read_labels(data_dir, 2, 2, 5, num_loader_threads=2, prefetch_depth=2)
+            stats = flow.profiler.data_reader_stats()["OFRecordReader"]
+            test_case.assertEqual(stats["num_reads"], 5)
+            test_case.assertLessEqual(stats["num_starved_reads"], 5)
+            test_case.assertLessEqual(stats["num_full_reads"], 5)
+            test_case.assertLessEqual(stats["sum_queue_occupancy"], 5 * 2)
+            flow.profiler.reset_data_reader_stats()
+            stats = flow.profiler.data_reader_stats()["OFRecordReader"]
+            test_case.assertEqual(stats["num_reads"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -14,12 +14,15 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 import unittest
+from collections import OrderedDict
+
 import oneflow as flow
 from oneflow.nn.parallel import DistributedDataParallel as ddp
 import oneflow.unittest
 
 import numpy as np
 import os
+from test_util import GenArgList
 
 
 def np_allclose_with_shape(a, b, *args, **kwargs):
@@ -192,6 +195,47 @@ class TestDDP(flow.unittest.TestCase):
         for dev_type in test_device:
             test_case._test_broadcast_buffer(dev_type)
 
+    def _test_ddp_bucketing(test_case, dev_type, bucket_cap_mb, contiguous):
+        sizes = [1, 3, 70000, 7, 2, 30000, 5] * 3
+
+        class Model(flow.nn.Module):
+            def __init__(self):
+                super().__init__()
+                for (i, size) in enumerate(sizes):
+                    self.register_parameter(f"w{i}", flow.nn.Parameter(flow.ones(size)))
+
+            def forward(self, x):
+                params = list(self.parameters())
+                # the grads are ready in different orders on the ranks
+                if flow.env.get_rank() == 1:
+                    params = params[::-1]
+                return sum([(x * (i + 1) * p).sum() for (i, p) in enumerate(params)])
+
+        rank = flow.env.get_rank()
+        x = flow.tensor([rank + 1.0]).to(dev_type)
+        m = Model().to(dev_type)
+        if contiguous:
+            m.contiguous_parameters()
+        m = ddp(m, bucket_cap_mb=bucket_cap_mb)
+        for _ in range(2):
+            for p in m.parameters():
+                if p.grad is not None:
+                    p.grad.zeros_()
+            m(x).backward()
+        num = len(sizes)
+        for (i, p) in enumerate(m.parameters()):
+            # rank 0 multiplies the i-th parameter by (i + 1), rank 1 by 2 * (num - i)
+            expected = np.full(p.shape, ((i + 1) + 2 * (num - i)) / 2)
+            test_case.assertTrue(np_allclose_with_shape(p.grad.numpy(), expected))
+
+    def test_ddp_bucketing(test_case):
+        arg_dict = OrderedDict()
+        arg_dict["dev_type"] = test_device
+        arg_dict["bucket_cap_mb"] = [0, 0.1, 25]
+        arg_dict["contiguous"] = [False, True]
+        for arg in GenArgList(arg_dict):
+            test_case._test_ddp_bucketing(*arg)
+
 
 if __name__ == "__main__":
     unittest.main()
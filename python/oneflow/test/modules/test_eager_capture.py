@@ -0,0 +1,89 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import unittest
+from collections import OrderedDict
+
+import numpy as np
+from test_util import GenArgList
+
+import oneflow as flow
+import oneflow.unittest
+
+
+def _test_eager_capture_replay(test_case, device):
+    linear = flow.nn.Linear(8, 4).to(device)
+    x = flow.randn(3, 8, device=device)
+    with flow.eager_capture() as g:
+        y = flow.relu(linear(x)) * 2 + 1
+    test_case.assertGreater(g.num_instructions, 0)
+    for _ in range(3):
+        x_np = np.random.randn(3, 8).astype(np.float32)
+        x.copy_(flow.tensor(x_np, device=device))
+        g.replay()
+        linear_out = x_np @ linear.weight.numpy().T + linear.bias.numpy()
+        test_case.assertTrue(
+            np.allclose(y.numpy(), np.maximum(linear_out, 0) * 2 + 1, 1e-05, 1e-05)
+        )
+
+
+def _test_eager_capture_inplace(test_case, device):
+    x = flow.zeros(2, 3, device=device)
+    with flow.eager_capture() as g:
+        x.add_(1)
+    for _ in range(4):
+        g.replay()
+    test_case.assertTrue(np.array_equal(x.numpy(), np.full((2, 3), 5.0)))
+
+
+def _test_eager_capture_host_access(test_case, device):
+    x = flow.ones(2, 3, device=device)
+    g = flow.eager_capture()
+    with test_case.assertRaises(Exception):
+        with g:
+            y = x + 1
+            y.numpy()
+    test_case.assertEqual(g.num_instructions, 0)
+    # The capture records again after a failed recording
+    with g:
+        y = x + 1
+    x.copy_(flow.zeros(2, 3, device=device))
+    g.replay()
+    test_case.assertTrue(np.array_equal(y.numpy(), np.ones((2, 3))))
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestEagerCapture(flow.unittest.TestCase):
+    def test_eager_capture(test_case):
+        arg_dict = OrderedDict()
+        arg_dict["test_fun"] = [
+            _test_eager_capture_replay,
+            _test_eager_capture_inplace,
+            _test_eager_capture_host_access,
+        ]
+        arg_dict["device"] = ["cpu", "cuda"]
+        for arg in GenArgList(arg_dict):
+            arg[0](test_case, *arg[1:])
+
+    def test_nested_capture(test_case):
+        with flow.eager_capture():
+            with test_case.assertRaises(Exception):
+                with flow.eager_capture():
+                    pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import unittest
+from collections import OrderedDict
+
+import numpy as np
+from test_util import GenArgList
+
+import oneflow as flow
+import oneflow.unittest
+
+
+def _make_linear(device, weight):
+    linear = flow.nn.Linear(4, 2, bias=False).to(device)
+    linear.weight.data.copy_(flow.tensor(weight, device=device))
+    return linear
+
+
+def _test_grad_scaler_step(test_case, device):
+    weight = np.random.randn(2, 4).astype(np.float32)
+    x = flow.randn(3, 4, device=device)
+    ref_linear = _make_linear(device, weight)
+    ref_optimizer = flow.optim.SGD(ref_linear.parameters(), lr=0.1)
+    linear = _make_linear(device, weight)
+    optimizer = flow.optim.SGD(linear.parameters(), lr=0.1)
+    scaler = flow.amp.GradScaler(init_scale=1024.0, growth_interval=2)
+
+    for i in range(3):
+        ref_linear(x).sum().backward()
+        ref_optimizer.step()
+        ref_optimizer.zero_grad()
+
+        loss = linear(x).sum()
+        scaled_loss = scaler.scale(loss)
+        test_case.assertTrue(
+            np.allclose(scaled_loss.numpy(), loss.numpy() * scaler.get_scale())
+        )
+        scaled_loss.backward()
+        scaler.unscale_(optimizer)
+        # Gradients are unscaled in place before step
+        test_case.assertTrue(
+            np.allclose(
+                linear.weight.grad.numpy(), np.tile(x.numpy().sum(0), (2, 1)), 1e-4
+            )
+        )
+        scaler.step(optimizer)
+        scaler.update()
+        optimizer.zero_grad()
+        test_case.assertTrue(
+            np.allclose(linear.weight.numpy(), ref_linear.weight.numpy(), 1e-4, 1e-4)
+        )
+    # Grows once after growth_interval steps without inf
+    test_case.assertEqual(scaler.get_scale(), 2048.0)
+
+
+def _test_grad_scaler_skip_inf(test_case, device):
+    weight = np.random.randn(2, 4).astype(np.float32)
+    linear = _make_linear(device, weight)
+    optimizer = flow.optim.SGD(linear.parameters(), lr=0.1)
+    scaler = flow.amp.GradScaler(init_scale=1024.0)
+    x = flow.tensor([[1.0, float("inf"), 0.0, 0.0]], dtype=flow.float32, device=device)
+    scaler.scale(linear(x).sum()).backward()
+    test_case.assertIsNone(scaler.step(optimizer))
+    scaler.update()
+    test_case.assertTrue(np.array_equal(linear.weight.numpy(), weight))
+    test_case.assertEqual(scaler.get_scale(), 512.0)
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestGradScaler(flow.unittest.TestCase):
+    def test_grad_scaler(test_case):
+        arg_dict = OrderedDict()
+        arg_dict["test_fun"] = [_test_grad_scaler_step, _test_grad_scaler_skip_inf]
+        arg_dict["device"] = ["cpu", "cuda"]
+        for arg in GenArgList(arg_dict):
+            arg[0](test_case, *arg[1:])
+
+    @unittest.skipIf(os.getenv("ONEFLOW_TEST_CPU_ONLY"), "only test cpu cases")
+    def test_unscale_float16(test_case):
+        grads = [
+            flow.tensor(
+                [2.0, 40000.0, float("inf")], dtype=flow.float16, device="cuda"
+            ),
+            flow.tensor([float("nan"), -8.0], dtype=flow.float16, device="cuda"),
+        ]
+        inv_scale = flow.tensor([2.0], dtype=flow.float32, device="cuda")
+        count = flow._C.multi_unscale_count_not_finite(grads, inv_scale)
+        # inf, nan and 80000, which overflows float16
+        test_case.assertEqual(count.numpy()[0], 3)
+        test_case.assertTrue(
+            np.array_equal(
+                grads[0].numpy(), np.array([4.0, np.inf, np.inf], np.float16)
+            )
+        )
+        test_case.assertEqual(grads[1].numpy()[1], np.float16(-16.0))
+        test_case.assertTrue(np.isnan(grads[1].numpy()[0]))
+
+    def test_call_order(test_case):
+        linear = flow.nn.Linear(4, 2)
+        optimizer = flow.optim.SGD(linear.parameters(), lr=0.1)
+        scaler = flow.amp.GradScaler()
+        scaler.scale(linear(flow.randn(3, 4)).sum()).backward()
+        scaler.unscale_(optimizer)
+        with test_case.assertRaises(RuntimeError):
+            scaler.unscale_(optimizer)
+        scaler.step(optimizer)
+        with test_case.assertRaises(RuntimeError):
+            scaler.step(optimizer)
+        scaler.update()
+
+    def test_update_without_inf_checks(test_case):
+        scaler = flow.amp.GradScaler(init_scale=128.0, growth_interval=1)
+        with test_case.assertRaises(RuntimeError):
+            scaler.update()
+        test_case.assertEqual(scaler.get_scale(), 128.0)
+        test_case.assertEqual(scaler.state_dict()["_growth_tracker"], 0)
+
+    def test_state_dict(test_case):
+        scaler = flow.amp.GradScaler(init_scale=128.0, growth_interval=10)
+        scaler.update(new_scale=64.0)
+        other = flow.amp.GradScaler()
+        other.load_state_dict(scaler.state_dict())
+        test_case.assertEqual(other.get_scale(), 64.0)
+        test_case.assertEqual(other.state_dict(), scaler.state_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
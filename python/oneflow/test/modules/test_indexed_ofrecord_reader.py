@@ -0,0 +1,120 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import os
+import struct
+import tempfile
+import unittest
+
+import numpy as np
+
+import oneflow as flow
+import oneflow.unittest
+from oneflow.core.record import record_pb2
+from oneflow.utils.data.ofrecord_index import build_ofrecord_index
+
+
+def _write_ofrecord_parts(data_dir, num_records_per_part):
+    label = 0
+    for (part, num_records) in enumerate(num_records_per_part):
+        with open(os.path.join(data_dir, "part-{}".format(part)), "wb") as f:
+            for _ in range(num_records):
+                record = record_pb2.OFRecord()
+                record.feature["label"].int32_list.value.append(label)
+                # records of different sizes
+                record.feature["pad"].bytes_list.value.append(b"x" * (label % 5))
+                buf = record.SerializeToString()
+                f.write(struct.pack("q", len(buf)))
+                f.write(buf)
+                label += 1
+
+
+def _read_labels(data_dir, data_part_num, batch_size, num_batches, **kwargs):
+    reader = flow.nn.OFRecordReader(
+        data_dir,
+        batch_size=batch_size,
+        data_part_num=data_part_num,
+        use_index=True,
+        **kwargs,
+    )
+    decoder = flow.nn.OFRecordRawDecoder("label", shape=(), dtype=flow.int32)
+    return np.concatenate([decoder(reader()).numpy() for _ in range(num_batches)])
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestIndexedOFRecordReader(flow.unittest.TestCase):
+    def test_build_index(test_case):
+        with tempfile.TemporaryDirectory() as data_dir:
+            _write_ofrecord_parts(data_dir, [5, 0, 3])
+            test_case.assertEqual(build_ofrecord_index(data_dir, 3), [5, 0, 3])
+            for part in range(3):
+                index_file = os.path.join(data_dir, "part-{}.idx".format(part))
+                test_case.assertTrue(os.path.exists(index_file))
+
+    def test_sequential_read(test_case):
+        with tempfile.TemporaryDirectory() as data_dir:
+            _write_ofrecord_parts(data_dir, [5, 0, 7])
+            build_ofrecord_index(data_dir, 3)
+            labels = _read_labels(data_dir, 3, 4, 6)
+            test_case.assertTrue(np.array_equal(labels, np.arange(24) % 12))
+
+    def test_global_shuffle(test_case):
+        num_records = 64
+        with tempfile.TemporaryDirectory() as data_dir:
+            _write_ofrecord_parts(data_dir, [16, 16, 16, 16])
+            build_ofrecord_index(data_dir, 4)
+            labels = _read_labels(
+                data_dir, 4, 8, 2 * num_records // 8, random_shuffle=True, seed=1
+            ).reshape(2, num_records)
+            for epoch_labels in labels:
+                # every epoch reads every record exactly once ...
+                test_case.assertTrue(
+                    np.array_equal(np.sort(epoch_labels), np.arange(num_records))
+                )
+                # ... mixed across the part files
+                test_case.assertFalse(
+                    np.array_equal(epoch_labels, np.arange(num_records))
+                )
+            test_case.assertFalse(np.array_equal(labels[0], labels[1]))
+
+    def test_skip_records(test_case):
+        with tempfile.TemporaryDirectory() as data_dir:
+            _write_ofrecord_parts(data_dir, [9, 11])
+            build_ofrecord_index(data_dir, 2)
+            for num_loader_threads in (1, 2):
+                labels = _read_labels(
+                    data_dir,
+                    2,
+                    4,
+                    10,
+                    random_shuffle=True,
+                    seed=3,
+                    num_loader_threads=num_loader_threads,
+                )
+                resumed_labels = _read_labels(
+                    data_dir,
+                    2,
+                    4,
+                    7,
+                    random_shuffle=True,
+                    seed=3,
+                    num_loader_threads=num_loader_threads,
+                    skip_records=3 * 4,
+                )
+                test_case.assertTrue(np.array_equal(labels[3 * 4 :], resumed_labels))
+
+
+if __name__ == "__main__":
+    unittest.main()
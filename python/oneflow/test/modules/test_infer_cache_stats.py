@@ -0,0 +1,61 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import unittest
+
+import oneflow as flow
+import oneflow.unittest
+
+
+def _consistent_relu(x):
+    placement = flow.placement("cpu", {0: [0]})
+    return flow.relu(x.to_consistent(placement=placement, sbp=flow.sbp.broadcast))
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestInferCacheStats(flow.unittest.TestCase):
+    def test_consistent_tensor_infer_cache_stats(test_case):
+        capacity = flow.profiler.infer_cache_capacity()
+        try:
+            flow.profiler.set_infer_cache_capacity(2)
+            # Leaves only these 2 entries in the cache of relu
+            for n in [97, 98]:
+                _consistent_relu(flow.ones(n, 4))
+            flow.profiler.reset_infer_cache_stats()
+            for n in [1, 2, 1, 3, 1, 2]:
+                _consistent_relu(flow.ones(n, 4))
+        finally:
+            flow.profiler.set_infer_cache_capacity(capacity)
+        stats = flow.profiler.infer_cache_stats()["consistent_tensor_infer_cache"]
+        test_case.assertEqual(stats["relu"]["num_misses"], 4)
+        test_case.assertEqual(stats["relu"]["num_hits"], 2)
+        test_case.assertEqual(stats["relu"]["num_evictions"], 4)
+
+        flow.profiler.reset_infer_cache_stats()
+        stats = flow.profiler.infer_cache_stats()["consistent_tensor_infer_cache"]
+        test_case.assertEqual(stats["relu"]["num_misses"], 0)
+
+    def test_set_infer_cache_capacity(test_case):
+        capacity = flow.profiler.infer_cache_capacity()
+        try:
+            flow.profiler.set_infer_cache_capacity(16)
+            test_case.assertEqual(flow.profiler.infer_cache_capacity(), 16)
+        finally:
+            flow.profiler.set_infer_cache_capacity(capacity)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,6 +15,7 @@ limitations under the License.
 """
 
 import os
+import shutil
 import warnings
 import tempfile
 import unittest
@@ -201,6 +202,155 @@ class TestModule(flow.unittest.TestCase):
         res2 = m()
         test_case.assertTrue(np.array_equal(res1.numpy(), res2.numpy()))
 
+    @flow.unittest.skip_unless_1n1d()
+    def test_save_state_dict_packed_and_per_directory(test_case):
+        state_dict = {
+            "weight": flow.randn(3, 5),
+            "bias": flow.randn(7),
+            "steps": flow.tensor([1, 2, 3], dtype=flow.int64),
+            "empty": flow.randn(0, 4),
+        }
+        for (packed, use_mmap, num_io_threads) in [
+            (True, True, None),
+            (True, False, 4),
+            (False, True, 1),
+            (False, True, 4),
+        ]:
+            with tempfile.TemporaryDirectory() as save_dir:
+                flow.save(
+                    state_dict, save_dir, packed=packed, num_io_threads=num_io_threads
+                )
+                test_case.assertEqual(
+                    os.path.exists(os.path.join(save_dir, "packed_index")), packed
+                )
+                if packed:
+                    test_case.assertEqual(
+                        set(os.listdir(save_dir)),
+                        {
+                            "packed_data",
+                            "packed_index",
+                            "pickled_data",
+                            "snapshot_done",
+                        },
+                    )
+                loaded_state_dict = flow.load(
+                    save_dir, use_mmap=use_mmap, num_io_threads=num_io_threads
+                )
+            test_case.assertEqual(loaded_state_dict.keys(), state_dict.keys())
+            for (k, v) in state_dict.items():
+                test_case.assertEqual(loaded_state_dict[k].dtype, v.dtype)
+                test_case.assertEqual(loaded_state_dict[k].shape, v.shape)
+                test_case.assertTrue(
+                    np.array_equal(loaded_state_dict[k].numpy(), v.numpy())
+                )
+
+    @flow.unittest.skip_unless_1n1d()
+    def test_lazy_load_state_dict(test_case):
+        from oneflow.framework.check_point_v2 import LazyLoadedTensor
+
+        m = flow.nn.Linear(4, 5)
+        for packed in [True, False]:
+            with tempfile.TemporaryDirectory() as save_dir:
+                flow.save(m.state_dict(), save_dir, packed=packed)
+                loaded_state_dict = flow.load(save_dir, lazy=True)
+                weight = loaded_state_dict["weight"]
+                test_case.assertTrue(isinstance(weight, LazyLoadedTensor))
+                test_case.assertEqual(weight.shape, m.weight.shape)
+                test_case.assertEqual(weight.dtype, m.weight.dtype)
+                test_case.assertFalse(weight.is_materialized)
+                m2 = flow.nn.Linear(4, 5)
+                m2.load_state_dict(loaded_state_dict)
+                test_case.assertFalse(weight.is_materialized)
+                test_case.assertTrue(
+                    np.array_equal(m2.weight.numpy(), m.weight.numpy())
+                )
+                test_case.assertTrue(np.array_equal(m2.bias.numpy(), m.bias.numpy()))
+                test_case.assertTrue(
+                    np.allclose(weight.sum().numpy(), m.weight.sum().numpy())
+                )
+                test_case.assertTrue(weight.is_materialized)
+        # proxies of an incremental checkpoint read unchanged tensors from base
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            base_dir = os.path.join(tmp_dir, "base")
+            delta_dir = os.path.join(tmp_dir, "delta")
+            flow.save(m.state_dict(), base_dir)
+            with flow.no_grad():
+                m.bias.fill_(1)
+            flow.async_save(m.state_dict(), delta_dir, base=base_dir).wait()
+            loaded_state_dict = flow.load(delta_dir, lazy=True)
+            m2 = flow.nn.Linear(4, 5)
+            m2.load_state_dict(loaded_state_dict)
+            test_case.assertFalse(loaded_state_dict["weight"].is_materialized)
+            test_case.assertTrue(np.array_equal(m2.weight.numpy(), m.weight.numpy()))
+            test_case.assertTrue(np.array_equal(m2.bias.numpy(), m.bias.numpy()))
+
+    @flow.unittest.skip_unless_1n1d()
+    def test_async_save_state_dict(test_case):
+        m = flow.nn.Linear(4, 5)
+        expected = {k: v.numpy().copy() for (k, v) in m.state_dict().items()}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            save_dir = os.path.join(tmp_dir, "ckpt")
+            for packed in [True, False]:
+                handle = flow.async_save(m.state_dict(), save_dir, packed=packed)
+                # modifying parameters does not affect the saved snapshot
+                with flow.no_grad():
+                    m.weight.fill_(0)
+                handle.wait()
+                test_case.assertTrue(handle.done())
+                test_case.assertTrue(
+                    os.path.exists(os.path.join(save_dir, "snapshot_done"))
+                )
+                test_case.assertEqual(os.listdir(tmp_dir), ["ckpt"])
+                loaded_state_dict = flow.load(save_dir)
+                for (k, v) in expected.items():
+                    test_case.assertTrue(
+                        np.array_equal(loaded_state_dict[k].numpy(), v)
+                    )
+                m.load_state_dict(loaded_state_dict)
+            # a crash between moving the old checkpoint aside and moving the
+            # new one in leaves only the old one
+            os.rename(save_dir, os.path.join(tmp_dir, ".ckpt.old-0"))
+            with test_case.assertWarns(UserWarning):
+                loaded_state_dict = flow.load(save_dir)
+            for (k, v) in expected.items():
+                test_case.assertTrue(np.array_equal(loaded_state_dict[k].numpy(), v))
+
+    @flow.unittest.skip_unless_1n1d()
+    def test_save_incremental_state_dict(test_case):
+        from oneflow.framework.check_point_v2 import compact_checkpoint
+
+        state_dict = {"frozen": flow.randn(256, 256), "head": flow.randn(4, 4)}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            full_dir = os.path.join(tmp_dir, "full")
+            delta_dir = os.path.join(tmp_dir, "delta")
+            flow.save(state_dict, full_dir)
+            state_dict["head"] = flow.randn(4, 4)
+            flow.save(state_dict, delta_dir, base=full_dir)
+            # only the changed tensor is written again
+            test_case.assertLess(
+                os.path.getsize(os.path.join(delta_dir, "packed_data")),
+                os.path.getsize(os.path.join(full_dir, "packed_data")) // 100,
+            )
+            expected = {k: v.numpy().copy() for (k, v) in state_dict.items()}
+            loaded_state_dict = flow.load(delta_dir)
+            for (k, v) in expected.items():
+                test_case.assertTrue(np.array_equal(loaded_state_dict[k].numpy(), v))
+            # nothing changed since delta_dir, whose data is partly in full_dir
+            async_dir = os.path.join(tmp_dir, "async")
+            flow.async_save(state_dict, async_dir, base=delta_dir).wait()
+            test_case.assertEqual(
+                os.path.getsize(os.path.join(async_dir, "packed_data")), 0
+            )
+            compact_checkpoint(delta_dir)
+            compact_checkpoint(async_dir)
+            shutil.rmtree(full_dir)
+            for save_dir in [delta_dir, async_dir]:
+                loaded_state_dict = flow.load(save_dir)
+                for (k, v) in expected.items():
+                    test_case.assertTrue(
+                        np.array_equal(loaded_state_dict[k].numpy(), v)
+                    )
+
     @flow.unittest.skip_unless_1n2d()
     def test_save_and_load_consistent_from_nested_dict(test_case):
         class CustomModule(flow.nn.Module):
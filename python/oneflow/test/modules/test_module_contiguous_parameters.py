@@ -0,0 +1,131 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import unittest
+from collections import OrderedDict
+
+import numpy as np
+from test_util import GenArgList
+
+import oneflow as flow
+import oneflow.unittest
+
+
+def _make_model(device):
+    model = flow.nn.Sequential(
+        flow.nn.Linear(8, 16), flow.nn.ReLU(), flow.nn.Linear(16, 4)
+    )
+    return model.to(device)
+
+
+def _train(model, optimizer, inputs_seq, clip=False):
+    for x in inputs_seq:
+        optimizer.zero_grad()
+        loss = model(x).sum()
+        loss.backward()
+        if clip:
+            flow.nn.utils.clip_grad_norm_(model.parameters(), 0.1)
+        optimizer.step()
+    return [p.numpy() for p in model.parameters()]
+
+
+def _test_params_are_views(test_case, device):
+    model = _make_model(device)
+    params_before = [p.numpy() for p in model.parameters()]
+    model.contiguous_parameters()
+    test_case.assertEqual(len(model._flat_buffers), 1)
+    buffer = model._flat_buffers[0]
+    test_case.assertEqual(
+        buffer.data.numel(), sum(p.numel() for p in model.parameters())
+    )
+    for (p, before) in zip(model.parameters(), params_before):
+        test_case.assertTrue(np.array_equal(p.numpy(), before))
+    # writes to the buffer are seen by the parameters
+    buffer.data.add_(flow.ones_like(buffer.data))
+    for (p, before) in zip(model.parameters(), params_before):
+        test_case.assertTrue(np.allclose(p.numpy(), before + 1))
+    # grads are accumulated into the buffer
+    x = flow.randn(2, 8, device=flow.device(device))
+    model(x).sum().backward()
+    model(x).sum().backward()
+    offset = 0
+    for p in model.parameters():
+        grad = buffer.grad.numpy()[offset : offset + p.numel()].reshape(p.shape)
+        test_case.assertTrue(np.allclose(p.grad.numpy(), grad))
+        test_case.assertTrue(np.abs(grad).sum() > 0)
+        offset += p.numel()
+    # zero_grad keeps the grads in the buffer
+    optimizer = flow.optim.SGD(model.parameters(), lr=0.1)
+    optimizer.zero_grad(set_to_none=True)
+    test_case.assertTrue(buffer.is_valid())
+    test_case.assertTrue(np.all(buffer.grad.numpy() == 0))
+    # assigning a grad detaches the buffer
+    p = next(model.parameters())
+    p.grad = None
+    test_case.assertFalse(buffer.is_valid())
+
+
+def _test_train_matches(test_case, device, optim_cls, optim_kwargs, clip):
+    inputs_seq = [
+        flow.tensor(
+            np.random.randn(4, 8), dtype=flow.float32, device=flow.device(device)
+        )
+        for _ in range(3)
+    ]
+    model = _make_model(device)
+    state_dict = model.state_dict()
+    expected = _train(
+        model, optim_cls(model.parameters(), **optim_kwargs), inputs_seq, clip
+    )
+    model = _make_model(device)
+    model.load_state_dict(state_dict)
+    model.contiguous_parameters()
+    actual = _train(
+        model, optim_cls(model.parameters(), **optim_kwargs), inputs_seq, clip
+    )
+    for (x, y) in zip(expected, actual):
+        test_case.assertTrue(np.allclose(x, y, rtol=1e-4, atol=1e-5))
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestModuleContiguousParameters(flow.unittest.TestCase):
+    def test_params_are_views(test_case):
+        for device in ["cpu", "cuda"]:
+            _test_params_are_views(test_case, device)
+
+    def test_train_matches(test_case):
+        arg_dict = OrderedDict()
+        arg_dict["device"] = ["cpu", "cuda"]
+        arg_dict["optim"] = [
+            (flow.optim.SGD, {"lr": 0.1, "momentum": 0.9}),
+            (flow.optim.Adam, {"lr": 0.01}),
+            (flow.optim.AdamW, {"lr": 0.01, "weight_decay": 0.1}),
+            (flow.optim.RMSprop, {"lr": 0.01, "centered": True}),
+        ]
+        arg_dict["clip"] = [False, True]
+        for (device, (optim_cls, optim_kwargs), clip) in GenArgList(arg_dict):
+            _test_train_matches(test_case, device, optim_cls, optim_kwargs, clip)
+
+    def test_to_gives_up_buffers(test_case):
+        model = _make_model("cpu")
+        model.contiguous_parameters()
+        buffer = model._flat_buffers[0]
+        model.to("cpu").double()
+        test_case.assertFalse(buffer.is_valid())
+        model(flow.randn(2, 8, dtype=flow.float64)).sum().backward()
+
+
+if __name__ == "__main__":
+    unittest.main()
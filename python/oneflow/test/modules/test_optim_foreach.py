@@ -0,0 +1,131 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import unittest
+from collections import OrderedDict
+
+import numpy as np
+from test_util import GenArgList
+
+import oneflow as flow
+import oneflow.unittest
+from oneflow.nn.parameter import Parameter
+
+
+def _make_params(shapes, device):
+    return [
+        Parameter(flow.tensor(np.random.randn(*shape), device=flow.device(device)))
+        for shape in shapes
+    ]
+
+
+def _train(optim_cls, optim_kwargs, init_values, grads_seq, device, **kwargs):
+    params = [
+        Parameter(flow.tensor(value, dtype=flow.float32, device=flow.device(device)))
+        for value in init_values
+    ]
+    optimizer = optim_cls(params, **optim_kwargs, **kwargs)
+    for grads in grads_seq:
+        for (param, grad) in zip(params, grads):
+            if grad is None:
+                param.grad = None
+            else:
+                param.grad = flow.tensor(
+                    grad, dtype=flow.float32, device=flow.device(device)
+                )
+        optimizer.step()
+    return [param.numpy() for param in params], optimizer
+
+
+def _test_foreach_matches_loop(test_case, device, optim_cls, optim_kwargs):
+    # more parameters than a multi-tensor op updates at once
+    shapes = [(3, 4), (5,), (1,), (2, 3, 2)] * 80
+    init_values = [np.random.randn(*shape).astype(np.float32) for shape in shapes]
+    grads_seq = []
+    for i in range(3):
+        grads = [np.random.randn(*shape).astype(np.float32) for shape in shapes]
+        # parameters without grad are skipped
+        grads[i] = None
+        grads_seq.append(grads)
+    (expected, _) = _train(
+        optim_cls, optim_kwargs, init_values, grads_seq, device, foreach=False
+    )
+    for flatten_state in [False, True]:
+        (actual, optimizer) = _train(
+            optim_cls,
+            optim_kwargs,
+            init_values,
+            grads_seq,
+            device,
+            foreach=True,
+            flatten_state=flatten_state,
+        )
+        for (x, y) in zip(expected, actual):
+            test_case.assertTrue(np.allclose(x, y, rtol=1e-5, atol=1e-6))
+    # the states of flattened optimizer can be saved and reloaded
+    state_dict = optimizer.state_dict()
+    optimizer.load_state_dict(state_dict)
+
+
+@flow.unittest.skip_unless_1n1d()
+class TestOptimizerForeach(flow.unittest.TestCase):
+    def test_foreach_matches_loop(test_case):
+        arg_dict = OrderedDict()
+        arg_dict["device"] = ["cpu", "cuda"]
+        arg_dict["optim"] = [
+            (flow.optim.SGD, {"lr": 0.1}),
+            (flow.optim.SGD, {"lr": 0.1, "momentum": 0.9, "weight_decay": 0.01}),
+            (flow.optim.Adam, {"lr": 0.01, "weight_decay": 0.01}),
+            (flow.optim.Adam, {"lr": 0.01, "amsgrad": True}),
+            (flow.optim.AdamW, {"lr": 0.01, "weight_decay": 0.01}),
+            (flow.optim.RMSprop, {"lr": 0.01}),
+            (flow.optim.RMSprop, {"lr": 0.01, "centered": True}),
+        ]
+        for arg in GenArgList(arg_dict):
+            (device, (optim_cls, optim_kwargs)) = arg
+            _test_foreach_matches_loop(test_case, device, optim_cls, optim_kwargs)
+
+    def test_flatten_state_shares_buffer(test_case):
+        params = _make_params([(2, 3), (4,)], "cpu")
+        optimizer = flow.optim.Adam(params, lr=0.1, flatten_state=True)
+        for param in params:
+            param.grad = flow.ones_like(param)
+        optimizer.step()
+        m0 = optimizer._state[params[0]]["exp_avg"]
+        m1 = optimizer._state[params[1]]["exp_avg"]
+        test_case.assertEqual(m0.shape, params[0].shape)
+        test_case.assertEqual(m1.shape, params[1].shape)
+        # grad of ones gives (1 - beta1) in every element after the first step
+        test_case.assertTrue(np.allclose(m0.numpy(), np.full((2, 3), 0.1)))
+        test_case.assertTrue(np.allclose(m1.numpy(), np.full((4,), 0.1)))
+        # the states are views of one buffer in parameter order, separately
+        # allocated states would both start at offset 0
+        test_case.assertEqual(m0.storage_offset(), 0)
+        test_case.assertEqual(m1.storage_offset(), 6)
+
+    def test_buffer_view(test_case):
+        buffer = flow.zeros(10)
+        view = flow._C.buffer_view(buffer, (2, 2), 3)
+        view.add_(flow.ones(2, 2))
+        test_case.assertTrue(
+            np.array_equal(buffer.numpy(), np.array([0, 0, 0, 1, 1, 1, 1, 0, 0, 0]))
+        )
+        with test_case.assertRaises(Exception):
+            flow._C.buffer_view(buffer, (3, 3), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
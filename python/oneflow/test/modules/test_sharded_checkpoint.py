@@ -0,0 +1,82 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import oneflow as flow
+import oneflow.unittest
+
+
+def _shared_tmp_dir():
+    path = os.path.join(tempfile.gettempdir(), "oneflow_test_sharded_checkpoint")
+    if flow.env.get_rank() == 0:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+    flow.comm.barrier()
+    return path
+
+
+def _to_numpy(x):
+    return x.to_consistent(sbp=[flow.sbp.broadcast] * len(x.sbp)).to_local().numpy()
+
+
+@flow.unittest.skip_unless_1n2d()
+class TestShardedCheckpoint(flow.unittest.TestCase):
+    def test_save_and_load_sharded(test_case):
+        placement = flow.placement("cpu", {0: range(2)})
+        np_weight = np.arange(5 * 6, dtype=np.float32).reshape(5, 6)
+        np_bias = np.arange(6, dtype=np.float32)
+        weight = flow.tensor(np_weight).to_consistent(placement, flow.sbp.broadcast)
+        weight = weight.to_consistent(sbp=flow.sbp.split(0))
+        bias = flow.tensor(np_bias).to_consistent(placement, flow.sbp.broadcast)
+        state_dict = {
+            "weight": weight,
+            "bias": bias,
+            "step": flow.tensor([3], dtype=flow.int64),
+        }
+        path = _shared_tmp_dir()
+        flow.save(state_dict, path, sharded=True)
+        test_case.assertTrue(os.path.exists(os.path.join(path, "snapshot_done")))
+        test_case.assertTrue(os.path.isdir(os.path.join(path, "shard_0")))
+        test_case.assertTrue(os.path.isdir(os.path.join(path, "shard_1")))
+
+        loaded = flow.load(path)
+        test_case.assertEqual(loaded["weight"].sbp, (flow.sbp.split(0),))
+        test_case.assertEqual(loaded["weight"].placement, placement)
+        test_case.assertEqual(
+            tuple(loaded["weight"].to_local().shape), (3 - flow.env.get_rank(), 6)
+        )
+        test_case.assertTrue(np.array_equal(_to_numpy(loaded["weight"]), np_weight))
+        test_case.assertEqual(loaded["bias"].sbp, (flow.sbp.broadcast,))
+        test_case.assertTrue(np.array_equal(_to_numpy(loaded["bias"]), np_bias))
+        test_case.assertTrue(np.array_equal(loaded["step"].numpy(), [3]))
+
+        # load with an sbp different from the one at save time
+        loaded = flow.load(path, sbp=flow.sbp.split(1))
+        test_case.assertEqual(loaded["weight"].sbp, (flow.sbp.split(1),))
+        test_case.assertEqual(tuple(loaded["weight"].to_local().shape), (5, 3))
+        test_case.assertTrue(np.array_equal(_to_numpy(loaded["weight"]), np_weight))
+        # bias has no axis 1, so it is loaded as broadcast
+        test_case.assertEqual(loaded["bias"].sbp, (flow.sbp.broadcast,))
+        test_case.assertTrue(np.array_equal(_to_numpy(loaded["bias"]), np_bias))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -23,6 +23,8 @@ import re
 import collections
 
 import oneflow as flow
+from oneflow.multiprocessing import shared_memory
+from .worker import get_worker_info
 
 
 string_classes = (str, bytes)
@@ -71,13 +73,40 @@ default_convert_err_msg_format = (
 )
 
 
+def _can_stack_into_shared_memory(batch):
+    elem = batch[0]
+    return all(
+        x.is_local
+        and x.device.type == "cpu"
+        and x.dtype == elem.dtype
+        and x.shape == elem.shape
+        for x in batch
+    )
+
+
+def _stack_into_shared_memory(batch):
+    from oneflow.multiprocessing import get_sharing_strategy
+
+    arrays = [x.numpy() for x in batch]
+    out = shared_memory.new_shared_array(
+        (len(arrays),) + arrays[0].shape, arrays[0].dtype, get_sharing_strategy()
+    )
+    for (i, array) in enumerate(arrays):
+        out[i] = array
+    return flow.from_numpy(out)
+
+
 def default_collate(batch):
     r"""Puts each data field into a tensor with outer dimension batch size"""
 
     elem = batch[0]
     elem_type = type(elem)
     if isinstance(elem, (flow.Tensor, flow._oneflow_internal.Tensor)):
-        # TODO: tensor.storage()._new_shared(numel)
+        if get_worker_info() is not None and _can_stack_into_shared_memory(batch):
+            # If we're in a background process, stack directly into shared
+            # memory, so the main process maps the batch instead of receiving
+            # a copy of it
+            return _stack_into_shared_memory(batch)
         return flow._C.stack(batch, dim=0)
     elif (
         elem_type.__module__ == "numpy"
@@ -55,14 +55,21 @@ class _IterableDatasetFetcher(_BaseDatasetFetcher):
 
 
 class _MapDatasetFetcher(_BaseDatasetFetcher):
-    def __init__(self, dataset, auto_collation, collate_fn, drop_last):
+    def __init__(
+        self, dataset, auto_collation, collate_fn, drop_last, batched_fetch=False
+    ):
         super(_MapDatasetFetcher, self).__init__(
             dataset, auto_collation, collate_fn, drop_last
         )
+        self.batched_fetch = batched_fetch
 
     def fetch(self, possibly_batched_index):
         if self.auto_collation:
-            data = [self.dataset[idx] for idx in possibly_batched_index]
+            if self.batched_fetch:
+                # The whole batch of indices in one call, see `Dataset`
+                data = self.dataset.__getitems__(possibly_batched_index)
+            else:
+                data = [self.dataset[idx] for idx in possibly_batched_index]
         else:
             data = self.dataset[possibly_batched_index]
         return self.collate_fn(data)
@@ -0,0 +1,208 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+r""""Contains definitions of the methods used by the _BaseDataLoaderIter to put
+fetched tensors into pinned memory.
+
+These **needs** to be in global scope since Py2 doesn't support serializing
+static methods.
+"""
+import collections
+import os
+import queue
+import threading
+import weakref
+from typing import Dict, List, Optional
+
+import numpy as np
+
+import oneflow as flow
+from . import MP_STATUS_CHECK_INTERVAL
+from .worker import ExceptionWrapper
+
+string_classes = (str, bytes)
+
+# Page size, so that buffers can be page-locked and copies from them start at
+# an aligned address
+PINNED_BUFFER_ALIGNMENT = 4096
+DEFAULT_MAX_CACHED_BYTES = 1 << 30
+
+
+def _default_max_cached_bytes() -> int:
+    return int(
+        os.getenv("ONEFLOW_DATALOADER_PINNED_POOL_BYTES", DEFAULT_MAX_CACHED_BYTES)
+    )
+
+
+class PinnedBufferPool(object):
+    r"""A pool of reusable, aligned host buffers for batches.
+
+    Buffers are page-locked with ``cudaHostRegister`` when CUDA is available,
+    so that copying a batch to the device is done by DMA. Otherwise they are
+    ordinary page-aligned host memory. A buffer goes back to the pool when the
+    tensor viewing it is freed, so steady-state training does not allocate
+    (nor page-lock, which is expensive) memory for each batch.
+
+    Buffer sizes are rounded up to a power of two (at least one page), so
+    batches of slightly different sizes share buffers.
+
+    Args:
+        max_cached_bytes (int, optional): The maximum total size of free buffers
+            kept in the pool. Defaults to the
+            ``ONEFLOW_DATALOADER_PINNED_POOL_BYTES`` environment variable or 1GB.
+    """
+
+    def __init__(self, max_cached_bytes: Optional[int] = None):
+        self.max_cached_bytes_ = (
+            max_cached_bytes
+            if max_cached_bytes is not None
+            else _default_max_cached_bytes()
+        )
+        self.page_locked_ = flow.cuda.is_available()
+        self.free_buffers_: Dict[int, List[np.ndarray]] = {}
+        self.cached_bytes_ = 0
+        self.lock_ = threading.Lock()
+        self.num_allocated_ = 0
+        self.num_reused_ = 0
+
+    @property
+    def page_locked(self) -> bool:
+        return self.page_locked_
+
+    @property
+    def cached_bytes(self) -> int:
+        return self.cached_bytes_
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "num_allocated": self.num_allocated_,
+            "num_reused": self.num_reused_,
+            "cached_bytes": self.cached_bytes_,
+        }
+
+    @staticmethod
+    def _size_class(nbytes: int) -> int:
+        return max(1 << (max(nbytes, 1) - 1).bit_length(), PINNED_BUFFER_ALIGNMENT)
+
+    def _new_buffer(self, size: int) -> np.ndarray:
+        raw = np.empty(size + PINNED_BUFFER_ALIGNMENT, dtype=np.uint8)
+        start = -raw.ctypes.data % PINNED_BUFFER_ALIGNMENT
+        buffer = raw[start : start + size]
+        if self.page_locked_:
+            if flow._oneflow_internal.CudaHostRegister(buffer.ctypes.data, size):
+                weakref.finalize(
+                    raw, flow._oneflow_internal.CudaHostUnregister, buffer.ctypes.data
+                )
+        return buffer
+
+    def _release(self, buffer: np.ndarray) -> None:
+        with self.lock_:
+            if self.cached_bytes_ + buffer.nbytes > self.max_cached_bytes_:
+                return
+            self.free_buffers_.setdefault(buffer.nbytes, []).append(buffer)
+            self.cached_bytes_ += buffer.nbytes
+
+    def empty(self, shape, dtype) -> np.ndarray:
+        r"""Returns an uninitialized array in a pooled buffer. The buffer is
+        reused after the array (and everything viewing it) is freed.
+        """
+        dtype = np.dtype(dtype)
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+        size = self._size_class(nbytes)
+        with self.lock_:
+            free_buffers = self.free_buffers_.get(size)
+            if free_buffers:
+                buffer = free_buffers.pop()
+                self.cached_bytes_ -= size
+                self.num_reused_ += 1
+            else:
+                buffer = None
+                self.num_allocated_ += 1
+        if buffer is None:
+            buffer = self._new_buffer(size)
+        array = buffer[:nbytes].view(dtype).reshape(shape)
+        weakref.finalize(array, self._release, buffer)
+        return array
+
+    def clear(self) -> None:
+        r"""Frees all cached buffers."""
+        with self.lock_:
+            self.free_buffers_.clear()
+            self.cached_bytes_ = 0
+
+
+_default_pool = None
+
+
+def default_pinned_buffer_pool() -> PinnedBufferPool:
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = PinnedBufferPool()
+    return _default_pool
+
+
+def _pin_tensor(tensor, pool: PinnedBufferPool):
+    if not tensor.is_local or tensor.device.type != "cpu":
+        return tensor
+    # numpy() of a cpu tensor shares memory with it
+    array = tensor.numpy()
+    pinned = pool.empty(array.shape, array.dtype)
+    pinned[...] = array
+    # from_numpy shares memory with the pinned array
+    return flow.from_numpy(pinned)
+
+
+def pin_memory(data, pool: Optional[PinnedBufferPool] = None):
+    r"""Copies the cpu tensors in `data` into pinned buffers of `pool`."""
+    if pool is None:
+        pool = default_pinned_buffer_pool()
+    if isinstance(data, (flow.Tensor, flow._oneflow_internal.Tensor)):
+        return _pin_tensor(data, pool)
+    elif isinstance(data, string_classes):
+        return data
+    elif isinstance(data, collections.abc.Mapping):
+        return {k: pin_memory(sample, pool) for (k, sample) in data.items()}
+    elif isinstance(data, tuple) and hasattr(data, "_fields"):  # namedtuple
+        return type(data)(*(pin_memory(sample, pool) for sample in data))
+    elif isinstance(data, collections.abc.Sequence):
+        return [pin_memory(sample, pool) for sample in data]
+    elif hasattr(data, "pin_memory"):
+        return data.pin_memory()
+    else:
+        return data
+
+
+def _pin_memory_loop(in_queue, out_queue, done_event, pool):
+    # See NOTE [ Data Loader Multiprocessing Shutdown Logic ] for details on the
+    # logic of this function.
+    while not done_event.is_set():
+        try:
+            r = in_queue.get(timeout=MP_STATUS_CHECK_INTERVAL)
+        except queue.Empty:
+            continue
+        (idx, data) = r
+        if not done_event.is_set() and not isinstance(data, ExceptionWrapper):
+            try:
+                data = pin_memory(data, pool)
+            except Exception:
+                data = ExceptionWrapper(where="in pin memory thread")
+            r = (idx, data)
+        while not done_event.is_set():
+            try:
+                out_queue.put(r, timeout=MP_STATUS_CHECK_INTERVAL)
+                break
+            except queue.Full:
+                continue
+        del r  # save memory
@@ -275,6 +275,7 @@ def _worker_loop(
     auto_collation,
     collate_fn,
     drop_last,
+    batched_fetch,
     generator,
     base_seed,
     init_fn,
@@ -316,7 +317,12 @@ def _worker_loop(
                 init_fn(worker_id)
 
             fetcher = _DatasetKind.create_fetcher(
-                dataset_kind, dataset, auto_collation, collate_fn, drop_last
+                dataset_kind,
+                dataset,
+                auto_collation,
+                collate_fn,
+                drop_last,
+                batched_fetch,
             )
         except Exception:
             init_exception = ExceptionWrapper(
@@ -350,7 +356,12 @@ def _worker_loop(
                 iteration_end = False
                 # Recreate the fetcher for worker-reuse policy
                 fetcher = _DatasetKind.create_fetcher(
-                    dataset_kind, dataset, auto_collation, collate_fn, drop_last
+                    dataset_kind,
+                    dataset,
+                    auto_collation,
+                    collate_fn,
+                    drop_last,
+                    batched_fetch,
                 )
                 continue
             elif r is None:
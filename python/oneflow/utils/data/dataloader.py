@@ -97,10 +97,12 @@ class _DatasetKind(object):
     Iterable = 1
 
     @staticmethod
-    def create_fetcher(kind, dataset, auto_collation, collate_fn, drop_last):
+    def create_fetcher(
+        kind, dataset, auto_collation, collate_fn, drop_last, batched_fetch=False
+    ):
         if kind == _DatasetKind.Map:
             return _utils.fetch._MapDatasetFetcher(
-                dataset, auto_collation, collate_fn, drop_last
+                dataset, auto_collation, collate_fn, drop_last, batched_fetch
             )
         else:
             return _utils.fetch._IterableDatasetFetcher(
@@ -108,6 +110,18 @@ class _DatasetKind(object):
             )
 
 
+def _implements_getitems(dataset):
+    # `__getitems__` only replaces the `__getitem__` of its own class, a
+    # subclass overriding `__getitem__` alone still fetches per sample
+    def defining_class(name):
+        return next((cls for cls in type(dataset).__mro__ if name in vars(cls)), None)
+
+    getitems_class = defining_class("__getitems__")
+    return getitems_class is not None and getitems_class is defining_class(
+        "__getitem__"
+    )
+
+
 class _InfiniteConstantSampler(Sampler):
     r"""Analogous to ``itertools.repeat(None, None)``.
     Used as sampler for :class:`~flow.utils.data.IterableDataset`.
@@ -152,7 +166,15 @@ class DataLoader(Generic[T_co]):
             loading (default: ``0``). ``0`` means that the data will be loaded in the main process.
         collate_fn (callable, optional): merges a list of samples to form a
             mini-batch of Tensor(s).  Used when using batched loading from a
-            map-style dataset.
+            map-style dataset. If it is not specified and the class of the dataset
+            implementing ``__getitems__`` also implements its ``__getitem__``, each
+            batch is fetched by one ``__getitems__`` call and only converted to
+            Tensor(s), without per-sample collation.
+        pin_memory (bool, optional): If ``True``, the data loader will copy Tensors
+            into pooled, page-aligned host buffers before returning them. The
+            buffers are page-locked when CUDA is available, so that copying
+            batches to the device is faster, and are reused after the batches
+            are freed. (default: ``False``)
         drop_last (bool, optional): set to ``True`` to drop the last incomplete batch,
             if the dataset size is not divisible by the batch size. If ``False`` and
             the size of dataset is not divisible by the batch size, then the last batch
@@ -207,6 +229,7 @@ class DataLoader(Generic[T_co]):
         batch_sampler: Optional[Sampler[Sequence[int]]] = None,
         num_workers: int = 0,
         collate_fn: Optional[_collate_fn_t] = None,
+        pin_memory: bool = False,
         drop_last: bool = False,
         timeout: float = 0,
         worker_init_fn: Optional[_worker_init_fn_t] = None,
@@ -241,6 +264,7 @@ class DataLoader(Generic[T_co]):
             raise ValueError("persistent_workers option needs num_workers > 0")
 
         self.dataset = dataset
+        self.pin_memory = pin_memory
         self.prefetch_factor = prefetch_factor
         self.timeout = timeout
         self.worker_init_fn = worker_init_fn
@@ -342,8 +366,17 @@ class DataLoader(Generic[T_co]):
         self.batch_sampler = batch_sampler
         self.generator = generator
 
+        # Batches of a map-style dataset implementing `__getitems__` are
+        # fetched in one call and already collated, unless a custom
+        # `collate_fn` expects a list of samples
+        self._batched_fetch = (
+            collate_fn is None
+            and self._auto_collation
+            and self._dataset_kind == _DatasetKind.Map
+            and _implements_getitems(dataset)
+        )
         if collate_fn is None:
-            if self._auto_collation:
+            if self._auto_collation and not self._batched_fetch:
                 collate_fn = _utils.collate.default_collate
             else:
                 collate_fn = _utils.collate.default_convert
@@ -517,11 +550,14 @@ class _BaseDataLoaderIter(object):
         self._dataset_kind = loader._dataset_kind
         self._IterableDataset_len_called = loader._IterableDataset_len_called
         self._auto_collation = loader._auto_collation
+        self._batched_fetch = loader._batched_fetch
         self._drop_last = loader.drop_last
         self._index_sampler = loader._index_sampler
         self._num_workers = loader.num_workers
         self._prefetch_factor = loader.prefetch_factor
-        self._pin_memory = False
+        self._pin_memory = loader.pin_memory
+        if self._pin_memory:
+            self._pin_memory_pool = _utils.pin_memory.default_pinned_buffer_pool()
         self._timeout = loader.timeout
         self._collate_fn = loader.collate_fn
         self._sampler_iter = iter(self._index_sampler)
@@ -586,13 +622,15 @@ class _SingleProcessDataLoaderIter(_BaseDataLoaderIter):
             self._auto_collation,
             self._collate_fn,
             self._drop_last,
+            self._batched_fetch,
         )
 
     def _next_data(self):
         index = self._next_index()  # may raise StopIteration
+        data = self._dataset_fetcher.fetch(index)  # may raise StopIteration
         if self._pin_memory:
-            raise NotImplementedError("Dataloader pin memory is not support yet!")
-        return self._dataset_fetcher.fetch(index)
+            data = _utils.pin_memory.pin_memory(data, self._pin_memory_pool)
+        return data
 
 
 class _MultiProcessingDataLoaderIter(_BaseDataLoaderIter):
@@ -944,6 +982,7 @@ class _MultiProcessingDataLoaderIter(_BaseDataLoaderIter):
                     self._auto_collation,
                     self._collate_fn,
                     self._drop_last,
+                    self._batched_fetch,
                     self._generator,
                     self._base_seed,
                     self._worker_init_fn,
@@ -964,7 +1003,6 @@ class _MultiProcessingDataLoaderIter(_BaseDataLoaderIter):
             self._workers.append(w)
 
         if self._pin_memory:
-            raise NotImplementedError("Dataloader pin memory is not support yet!")
             self._pin_memory_thread_done_event = threading.Event()
 
             # Queue is not type-annotated
@@ -974,8 +1012,8 @@ class _MultiProcessingDataLoaderIter(_BaseDataLoaderIter):
                 args=(
                     self._worker_result_queue,
                     self._data_queue,
-                    flow.cuda.current_device(),  # TODO:flow.cuda.current_device()
                     self._pin_memory_thread_done_event,
+                    self._pin_memory_pool,
                 ),
             )
             pin_memory_thread.daemon = True
@@ -64,6 +64,14 @@ class Dataset(Generic[T_co]):
     :class:`~flow.utils.data.Sampler` implementations and the default options
     of :class:`~flow.utils.data.DataLoader`.
 
+    Subclasses could also optionally implement ``__getitems__(indices)``,
+    which fetches a whole batch in one call and returns it already collated,
+    e.g. by fancy-indexing a NumPy array. Unless a custom ``collate_fn`` is
+    given, :class:`~flow.utils.data.DataLoader` then passes it the list of
+    indices of each batch instead of calling :meth:`__getitem__` per sample,
+    and skips per-sample collation. A subclass overriding only
+    :meth:`__getitem__` is fetched per sample again.
+
     .. note::
       :class:`~flow.utils.data.DataLoader` by default constructs a index
       sampler that yields integral indices.  To make it work with a map-style
@@ -205,6 +213,14 @@ class TensorDataset(Dataset[Tuple[Tensor, ...]]):
     def __getitem__(self, index):
         return tuple(tensor[index] for tensor in self.tensors)
 
+    def __getitems__(self, indices):
+        # One gather per tensor instead of one slice per sample and a stack,
+        # in the layout `default_collate` gives to a batch of tuples
+        return [
+            tensor[flow.tensor(indices, dtype=flow.int64, device=tensor.device)]
+            for tensor in self.tensors
+        ]
+
     def __len__(self):
         return self.tensors[0].size(0)
 
@@ -0,0 +1,111 @@
+"""
+Copyright 2020 The OneFlow Authors. All rights reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+"""Builds the index files read by ``flow.nn.OFRecordReader(use_index=True)``.
+
+The index of an OFRecord part file is written next to it as ``<part file>.idx``.
+It holds one native int64 per record, the byte offset of the int64 length header
+of the record in the part file. Run it as::
+
+    python3 -m oneflow.utils.data.ofrecord_index --data_dir /path/to/ofrecord --data_part_num 256
+"""
+import argparse
+import os
+import struct
+
+INDEX_FILE_SUFFIX = ".idx"
+
+_INT64 = struct.Struct("q")
+
+
+def ofrecord_part_file_path(
+    data_dir, part_id, part_name_prefix, part_name_suffix_length
+):
+    num = str(part_id)
+    return os.path.join(
+        data_dir,
+        part_name_prefix + "0" * max(part_name_suffix_length - len(num), 0) + num,
+    )
+
+
+def build_part_index(part_file_path):
+    r"""Writes the index file of one part file and returns its number of records."""
+    offsets = []
+    part_file_size = os.path.getsize(part_file_path)
+    with open(part_file_path, "rb") as f:
+        offset = 0
+        while offset < part_file_size:
+            header = f.read(_INT64.size)
+            assert len(header) == _INT64.size, "truncated record at %d of %s" % (
+                offset,
+                part_file_path,
+            )
+            (record_size,) = _INT64.unpack(header)
+            assert record_size > 0 and offset + _INT64.size + record_size <= (
+                part_file_size
+            ), "invalid record at %d of %s" % (offset, part_file_path)
+            offsets.append(offset)
+            offset += _INT64.size + record_size
+            f.seek(offset)
+    index_file_path = part_file_path + INDEX_FILE_SUFFIX
+    # write and rename, so that readers never see a partial index
+    tmp_file_path = index_file_path + ".tmp"
+    with open(tmp_file_path, "wb") as f:
+        f.write(struct.pack("%dq" % len(offsets), *offsets))
+    os.replace(tmp_file_path, index_file_path)
+    return len(offsets)
+
+
+def build_ofrecord_index(
+    data_dir: str,
+    data_part_num: int,
+    part_name_prefix: str = "part-",
+    part_name_suffix_length: int = -1,
+):
+    r"""Writes the index files of the part files of an OFRecord dataset, named as
+    :class:`oneflow.nn.OFRecordReader` names them, and returns the number of
+    records of every part file.
+    """
+    return [
+        build_part_index(
+            ofrecord_part_file_path(
+                data_dir, part_id, part_name_prefix, part_name_suffix_length
+            )
+        )
+        for part_id in range(data_part_num)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="build the index files of OFRecords")
+    parser.add_argument("--data_dir", type=str, required=True)
+    parser.add_argument("--data_part_num", type=int, required=True)
+    parser.add_argument("--part_name_prefix", type=str, default="part-")
+    parser.add_argument("--part_name_suffix_length", type=int, default=-1)
+    args = parser.parse_args()
+    num_records = build_ofrecord_index(
+        args.data_dir,
+        args.data_part_num,
+        args.part_name_prefix,
+        args.part_name_suffix_length,
+    )
+    print(
+        "indexed %d records of %d part files in %s"
+        % (sum(num_records), len(num_records), args.data_dir)
+    )
+
+
+if __name__ == "__main__":
+    main()